@@ -133,6 +133,44 @@ class EmbeddingService:
             # Return zero vector as fallback
             return [0.0] * self.embedding_dim
 
+    def embed_batch(self, texts: List[str], batch_size: int = 32) -> List[List[float]]:
+        """
+        Generate 768-dim embeddings for many texts at once.
+
+        sentence-transformers encodes the whole batch in one forward pass per
+        `batch_size` texts, which is much faster than calling embed() per text.
+
+        Args:
+            texts: Embeddable texts
+            batch_size: Model batch size (sentence-transformers only)
+
+        Returns:
+            One L2-normalised vector per text (zero vector for empty text)
+        """
+        if self.backend != 'sentence-transformers':
+            return [self.embed(text) for text in texts]
+
+        embeddings = [[0.0] * self.embedding_dim for _ in texts]
+        indices = [i for i, text in enumerate(texts) if text and text.strip()]
+        if not indices:
+            return embeddings
+
+        try:
+            matrix = self.model.encode([texts[i] for i in indices], batch_size=batch_size, convert_to_numpy=True)
+
+            # L2 normalization for stable cosine similarity
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = np.divide(matrix, norms, out=np.zeros_like(matrix), where=norms > 0)
+
+            for i, row in zip(indices, matrix):
+                embeddings[i] = row.tolist()
+            return embeddings
+
+        except Exception as e:
+            logger.error(f"[GraphCare:EmbeddingService] Batch embedding failed: {e}")
+            # Zero vectors as fallback, like embed()
+            return embeddings
+
     def embed_document(self, content: str, metadata: Dict[str, Any] = None) -> Tuple[str, List[float]]:
         """
         Embed a client document (spec, ADR, guide, code file).
@@ -183,6 +221,16 @@ class EmbeddingService:
         Returns:
             (embeddable_text, embedding_vector) tuple
         """
+        embeddable_text = self.code_artifact_text(code, metadata)
+
+        # Generate embedding
+        embedding = self.embed(embeddable_text)
+
+        return (embeddable_text, embedding)
+
+    @staticmethod
+    def code_artifact_text(code: str, metadata: Dict[str, Any]) -> str:
+        """Build the embeddable text for a code artifact (see embed_code_artifact)."""
         path = metadata.get('path', '')
         lang = metadata.get('lang', '')
         description = metadata.get('description', '')
@@ -198,12 +246,7 @@ class EmbeddingService:
             parts.append(description)
         parts.append(code_preview)
 
-        embeddable_text = ". ".join(parts)
-
-        # Generate embedding
-        embedding = self.embed(embeddable_text)
-
-        return (embeddable_text, embedding)
+        return ". ".join(parts)
 
 
 # Global singleton instance
@@ -0,0 +1,193 @@
+"""
+FalkorDB Connection Pool — one shared, bounded client for the service modules.
+
+The health, treatment and graph scan modules used to build a new FalkorDB
+client per call: a TCP connect plus two INFO round trips (sentinel / cluster
+detection) before the first query. They now share one client per process,
+backed by a blocking connection pool:
+
+    graph = get_graph(f"brain_{handle}")   # per-graph handle, cached
+    graph.query(...)                       # borrows a pooled connection
+
+Configuration (environment, read on first use; configure() overrides):
+    FALKORDB_HOST                   localhost
+    FALKORDB_PORT                   6379
+    FALKORDB_PASSWORD               (none)
+    FALKORDB_MAX_CONNECTIONS        32    pool bound; callers wait when all are busy
+    FALKORDB_POOL_TIMEOUT           30    seconds to wait for a free connection
+    FALKORDB_SOCKET_TIMEOUT         60    seconds per command (None = wait forever)
+    FALKORDB_HEALTH_CHECK_INTERVAL  30    idle seconds after which a connection is PINGed on checkout
+
+Thread-safe: concurrent runners (daily_check_runner --workers) share sockets.
+thread_query_count() counts the graph queries sent by the calling thread,
+so a worker can attribute queries to its own steps.
+"""
+
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from typing import Dict, Optional
+
+import redis
+from falkordb import FalkorDB
+
+logger = logging.getLogger("graphcare.falkordb_pool")
+
+
+def _env_float(name: str, default: Optional[float]) -> Optional[float]:
+    value = os.getenv(name)
+    if value is None or value == "":
+        return default
+    if value.lower() == "none":
+        return None
+    return float(value)
+
+
+@dataclass
+class PoolConfig:
+    host: str = "localhost"
+    port: int = 6379
+    password: Optional[str] = None
+    max_connections: int = 32
+    pool_timeout: Optional[float] = 30.0
+    socket_timeout: Optional[float] = 60.0
+    health_check_interval: int = 30
+
+    @classmethod
+    def from_env(cls) -> "PoolConfig":
+        return cls(
+            host=os.getenv("FALKORDB_HOST", cls.host),
+            port=int(os.getenv("FALKORDB_PORT", cls.port)),
+            password=os.getenv("FALKORDB_PASSWORD") or None,
+            max_connections=int(os.getenv("FALKORDB_MAX_CONNECTIONS", cls.max_connections)),
+            pool_timeout=_env_float("FALKORDB_POOL_TIMEOUT", cls.pool_timeout),
+            socket_timeout=_env_float("FALKORDB_SOCKET_TIMEOUT", cls.socket_timeout),
+            health_check_interval=int(os.getenv("FALKORDB_HEALTH_CHECK_INTERVAL", cls.health_check_interval)),
+        )
+
+
+class _CountingConnection(redis.Connection):
+    """
+    redis Connection that counts socket setups (initial connects and
+    reconnects), and the GRAPH.* commands each thread sends (including the
+    client's own schema refreshes; not handshakes or PINGs).
+    """
+
+    def _connect(self):
+        sock = super()._connect()
+        with _stats_lock:
+            _stats["connections_opened"] += 1
+        return sock
+
+    def send_command(self, *args, **kwargs):
+        if args and str(args[0]).startswith("GRAPH."):
+            _thread_stats.queries = getattr(_thread_stats, "queries", 0) + 1
+        super().send_command(*args, **kwargs)
+
+
+_lock = threading.Lock()
+_stats_lock = threading.Lock()  # connects happen while get_db() holds _lock
+_config: Optional[PoolConfig] = None
+_pool: Optional[redis.BlockingConnectionPool] = None
+_db: Optional[FalkorDB] = None
+_graphs: Dict[str, object] = {}
+_stats = {"connections_opened": 0, "clients_created": 0}
+_thread_stats = threading.local()
+
+
+def configure(config: Optional[PoolConfig] = None, **overrides) -> PoolConfig:
+    """
+    Set the pool configuration (default: from the environment) and drop the
+    current pool, so the next get_graph() connects with the new settings.
+    """
+    global _config
+    with _lock:
+        base = config or PoolConfig.from_env()
+        _config = PoolConfig(**{**asdict(base), **overrides})
+        _close_locked()
+        return _config
+
+
+def _close_locked():
+    global _pool, _db
+    if _pool is not None:
+        _pool.disconnect()
+    _pool = None
+    _db = None
+    _graphs.clear()
+
+
+def close():
+    """Disconnect every pooled connection (e.g. after fork, or at shutdown)."""
+    with _lock:
+        _close_locked()
+
+
+def get_db() -> FalkorDB:
+    """The shared FalkorDB client, created on first use."""
+    global _config, _pool, _db
+    db = _db
+    if db is not None:
+        return db
+    with _lock:
+        if _db is None:
+            if _config is None:
+                _config = PoolConfig.from_env()
+            _pool = redis.BlockingConnectionPool(
+                connection_class=_CountingConnection,
+                host=_config.host,
+                port=_config.port,
+                password=_config.password,
+                max_connections=_config.max_connections,
+                timeout=_config.pool_timeout,
+                socket_timeout=_config.socket_timeout,
+                socket_connect_timeout=_config.socket_timeout,
+                health_check_interval=_config.health_check_interval,
+                decode_responses=True,
+            )
+            _db = FalkorDB(connection_pool=_pool)
+            with _stats_lock:
+                _stats["clients_created"] += 1
+            logger.info(
+                f"FalkorDB pool: {_config.host}:{_config.port}, "
+                f"max {_config.max_connections} connections"
+            )
+        return _db
+
+
+def get_graph(name: str):
+    """Handle for graph `name` on the shared client (handles are cached per name)."""
+    graph = _graphs.get(name)
+    if graph is None:
+        graph = get_db().select_graph(name)
+        _graphs[name] = graph
+    return graph
+
+
+def ping() -> bool:
+    """Health check: True if the server answers PING."""
+    try:
+        return bool(get_db().connection.ping())
+    except Exception as e:
+        logger.warning(f"FalkorDB ping failed: {e}")
+        return False
+
+
+def thread_query_count() -> int:
+    """Graph queries the calling thread has sent so far; take differences around a step."""
+    return getattr(_thread_stats, "queries", 0)
+
+
+def pool_stats() -> dict:
+    """Connection counters: sockets opened so far, and the pool's current state."""
+    with _stats_lock:
+        stats = dict(_stats)
+    with _lock:
+        if _pool is not None:
+            stats["connections_open"] = len([c for c in _pool._connections if c is not None])
+            stats["max_connections"] = _pool.max_connections
+        else:
+            stats["connections_open"] = 0
+            stats["max_connections"] = (_config or PoolConfig.from_env()).max_connections
+    return stats
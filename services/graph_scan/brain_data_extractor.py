@@ -25,16 +25,18 @@ import json
 import logging
 import math
 import random
+import sys
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Optional
 
-from falkordb import FalkorDB
+# Ensure imports work from graphcare root
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.falkordb_pool import get_graph
 
 logger = logging.getLogger("graphcare.graph_scan")
 
-FALKORDB_HOST = "localhost"
-FALKORDB_PORT = 6379
 
 
 # ── Visual mapping functions (from physics_visual_mapping.py) ────────────
@@ -310,8 +312,7 @@ def extract_graph_scan(citizen_handle: str) -> BrainScan:
     """Extract full brain data with all visual properties computed."""
     import time as _time
 
-    db = FalkorDB(host=FALKORDB_HOST, port=FALKORDB_PORT)
-    graph = db.select_graph(f"brain_{citizen_handle}")
+    graph = get_graph(f"brain_{citizen_handle}")
     now = _time.time()
 
     scan = BrainScan(citizen_id=citizen_handle)
@@ -517,7 +518,6 @@ def save_scan(scan: BrainScan, output_path: Path):
 
 
 if __name__ == "__main__":
-    import sys
     handle = sys.argv[1] if len(sys.argv) > 1 else "dragon_slayer"
     scan = extract_graph_scan(handle)
     out = Path(f"data/graph_scans/{handle}_scan.json")
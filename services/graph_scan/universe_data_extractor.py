@@ -19,16 +19,18 @@ import json
 import logging
 import math
 import random
+import sys
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 from typing import Optional
 
-from falkordb import FalkorDB
+# Ensure imports work from graphcare root
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from services.falkordb_pool import get_graph
 
 logger = logging.getLogger("graphcare.universe_scan")
 
-FALKORDB_HOST = "localhost"
-FALKORDB_PORT = 6379
 
 # L3 node type → color (organic palette, distinct from L1)
 L3_COLORS = {
@@ -124,8 +126,7 @@ def extract_universe_scan(graph_name: str, max_nodes: int = 2000) -> UniverseSca
     """
     import numpy as np
 
-    db = FalkorDB(host=FALKORDB_HOST, port=FALKORDB_PORT)
-    graph = db.select_graph(graph_name)
+    graph = get_graph(graph_name)
 
     scan = UniverseScan(graph_name=graph_name)
 
@@ -338,7 +339,6 @@ def save_scan(scan: UniverseScan, output_path: Path):
 
 
 if __name__ == "__main__":
-    import sys
     graph_name = sys.argv[1] if len(sys.argv) > 1 else "lumina_prime"
     max_n = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
     scan = extract_universe_scan(graph_name, max_nodes=max_n)
@@ -4,83 +4,58 @@ Aggregator — compute aggregate score, delta vs yesterday, identify drops.
 DOCS: docs/assessment/daily_citizen_health/ALGORITHM_Daily_Citizen_Health.md
 """
 
-import json
 import logging
-import os
 from dataclasses import dataclass, field
 from datetime import date, timedelta
-from pathlib import Path
 from typing import Dict, List, Optional
 
+from .history_store import DailyRecord, get_store
+
 logger = logging.getLogger("graphcare.health.aggregator")
 
-HISTORY_DIR = Path(os.getenv(
-    "GRAPHCARE_HISTORY_DIR",
-    "/home/mind-protocol/graphcare/data/health_history",
-))
 DROP_THRESHOLD = -10  # points
 
 
-@dataclass
-class DailyRecord:
-    citizen_id: str
-    date: str
-    aggregate_score: float
-    capability_scores: Dict[str, Optional[float]]
-    intervention_sent: bool = False
-    stress_stimulus: float = 0.0
-    brain_reachable: bool = True
-
-
 @dataclass
 class AggregateResult:
     aggregate: float
     delta_vs_yesterday: float
     drops: List[str]  # capability IDs with significant drops
     yesterday_aggregate: Optional[float] = None
+    yesterday: Optional[DailyRecord] = None  # the record compared with
 
 
-def _history_path(citizen_id: str, d: date) -> Path:
-    return HISTORY_DIR / citizen_id / f"{d.isoformat()}.json"
+def load_history(citizen_id: str, d: date) -> Optional[DailyRecord]:
+    return get_store().load(citizen_id, d)
 
 
-def load_history(citizen_id: str, d: date) -> Optional[DailyRecord]:
-    path = _history_path(citizen_id, d)
-    if not path.exists():
-        return None
-    try:
-        data = json.loads(path.read_text())
-        return DailyRecord(**data)
-    except Exception as e:
-        logger.warning(f"Failed to load history {path}: {e}")
-        return None
+def load_histories(d: date, citizen_ids: Optional[List[str]] = None) -> Dict[str, DailyRecord]:
+    """Every citizen's record for one day (or only `citizen_ids`), in one query."""
+    return get_store().load_day(d, citizen_ids)
 
 
 def save_history(record: DailyRecord):
-    d = date.fromisoformat(record.date)
-    path = _history_path(record.citizen_id, d)
-    path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(json.dumps({
-        "citizen_id": record.citizen_id,
-        "date": record.date,
-        "aggregate_score": record.aggregate_score,
-        "capability_scores": record.capability_scores,
-        "intervention_sent": record.intervention_sent,
-        "stress_stimulus": record.stress_stimulus,
-        "brain_reachable": record.brain_reachable,
-    }, indent=2))
+    get_store().save(record)
 
 
 def aggregate_scores(
     citizen_id: str,
     capability_scores: Dict[str, Optional[float]],
     today: date,
+    yesterday_records: Optional[Dict[str, DailyRecord]] = None,
 ) -> AggregateResult:
-    """Compute aggregate score and delta vs yesterday."""
+    """
+    Compute aggregate score and delta vs yesterday. `yesterday_records`
+    is the population's records for today - 1 (see load_histories); if
+    omitted, this citizen's record is read on its own.
+    """
     scored = [v for v in capability_scores.values() if v is not None]
     aggregate = sum(scored) / len(scored) if scored else 0.0
 
-    yesterday = load_history(citizen_id, today - timedelta(days=1))
+    if yesterday_records is not None:
+        yesterday = yesterday_records.get(citizen_id)
+    else:
+        yesterday = load_history(citizen_id, today - timedelta(days=1))
     if yesterday:
         delta = aggregate - yesterday.aggregate_score
         # Find significant drops per capability
@@ -96,6 +71,7 @@ def aggregate_scores(
             delta_vs_yesterday=delta,
             drops=drops,
             yesterday_aggregate=yesterday.aggregate_score,
+            yesterday=yesterday,
         )
     else:
         return AggregateResult(
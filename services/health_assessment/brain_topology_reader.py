@@ -18,17 +18,16 @@ Content fields (content, synthesis) are NEVER accessed.
 
 import logging
 import math
+import threading
 import time
+from collections import Counter
 from dataclasses import dataclass, field
-from typing import Optional
+from typing import Dict, Iterable, Optional, Set
 
-from falkordb import FalkorDB
+from services.falkordb_pool import get_graph
 
 logger = logging.getLogger("graphcare.health.brain")
 
-FALKORDB_HOST = "localhost"
-FALKORDB_PORT = 6379
-
 
 @dataclass
 class BrainStats:
@@ -82,9 +81,7 @@ class BrainStats:
 
 def _get_graph(handle: str):
     """Get FalkorDB graph for citizen brain."""
-    db = FalkorDB(host=FALKORDB_HOST, port=FALKORDB_PORT)
-    graph_name = f"brain_{handle}"
-    return db.select_graph(graph_name)
+    return get_graph(f"brain_{handle}")
 
 
 def _safe_query(graph, cypher: str, params: Optional[dict] = None) -> list:
@@ -97,6 +94,46 @@ def _safe_query(graph, cypher: str, params: Optional[dict] = None) -> list:
         return []
 
 
+def _age_hours(ts, now: Optional[float] = None) -> Optional[float]:
+    """Hours since a created_at value (epoch seconds or ISO string); None if unparseable."""
+    if now is None:
+        now = time.time()
+    if isinstance(ts, str):
+        try:
+            from datetime import datetime
+            dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+            return (now - dt.timestamp()) / 3600
+        except Exception:
+            return None
+    return (now - float(ts)) / 3600
+
+
+def _recency_score(newest_ts, now: Optional[float] = None) -> float:
+    """recency() of a type whose newest created_at is newest_ts."""
+    if newest_ts is None:
+        return 0.0
+    age_hours = _age_hours(newest_ts, now)
+    if age_hours is None:
+        return 0.0
+    half_life = 168  # 7 days
+    # Guard against extreme values (future timestamps, overflow)
+    if age_hours < 0:
+        return 1.0  # future timestamp = maximally recent
+    if age_hours > half_life * 20:
+        return 0.0  # ancient = zero recency
+    return max(0.0, min(1.0, 0.5 ** (age_hours / half_life)))
+
+
+def _drive_value(state, drive_nodes: dict, drive_name: str) -> float:
+    """drive() from the first limbic_state node, else from the first drive node of that name."""
+    if state is not None:
+        props = state.properties if hasattr(state, "properties") else {}
+        val = props.get(drive_name, props.get(f"drive_{drive_name}", 0.0))
+        return float(val) if val is not None else 0.0
+    val = drive_nodes.get(drive_name)
+    return float(val) if val is not None else 0.0
+
+
 # ── 7 Primitives ─────────────────────────────────────────────────────────────
 
 
@@ -198,10 +235,7 @@ def drive(graph, drive_name: str) -> float:
         "MATCH (n) WHERE n.type = 'limbic_state' RETURN n",
     )
     if rows:
-        node = rows[0][0]
-        props = node.properties if hasattr(node, "properties") else {}
-        val = props.get(drive_name, props.get(f"drive_{drive_name}", 0.0))
-        return float(val) if val is not None else 0.0
+        return _drive_value(rows[0][0], {}, drive_name)
 
     # Fallback: drive as a separate node
     rows = _safe_query(
@@ -223,124 +257,274 @@ def recency(graph, node_type: str) -> float:
         "RETURN max(n.created_at)",
         {"t": node_type},
     )
-    if not rows or rows[0][0] is None:
-        return 0.0
+    return _recency_score(rows[0][0] if rows else None)
 
-    newest_ts = rows[0][0]
-    # Handle both epoch seconds and ISO strings
-    if isinstance(newest_ts, str):
-        try:
-            from datetime import datetime, timezone
 
-            dt = datetime.fromisoformat(newest_ts.replace("Z", "+00:00"))
-            newest_epoch = dt.timestamp()
-        except Exception:
-            return 0.0
-    else:
-        newest_epoch = float(newest_ts)
+# ── High-Level: Read Brain Stats ─────────────────────────────────────────────
+#
+# read_brain_topology does not call the primitives one by one (that was ~25
+# round trips per citizen). A few aggregate queries return everything it
+# needs; rows are mapped to BrainStats client side, with the same semantics
+# as the primitives above.
+#
+# The queries are split into parts, and BrainReader runs only the parts the
+# requested fields depend on (the daily check asks for what its formulas
+# read, and for the rest only when it writes an intervention):
+#
+#     nodes     per-type counts, energies, newest        _NODE_QUERY
+#     desires   desire out-degrees, limbic state, drives _DESIRE_QUERY
+#     graph     whole-graph energy and newest node       _GRAPH_QUERY
+#     links     total link count                         _LINK_QUERY
+#
+# desires and graph needed together are one query (_BRAIN_QUERY).
+
+DRIVES = ("curiosity", "frustration", "ambition", "social_need")
+
+# Per-type node aggregates: one scan grouped by type
+_NODE_QUERY = """
+MATCH (n)
+RETURN n.type, count(n), avg(n.energy), max(n.created_at)
+"""
 
-    age_hours = (time.time() - newest_epoch) / 3600
-    half_life = 168  # 7 days
-    # Guard against extreme values (future timestamps, overflow)
-    if age_hours < 0:
-        return 1.0  # future timestamp = maximally recent
-    if age_hours > half_life * 20:
-        return 0.0  # ancient = zero recency
-    return max(0.0, min(1.0, 0.5 ** (age_hours / half_life)))
+# Desire out-degrees (min_links 1 and 3), limbic state, drive nodes
+_DESIRE_QUERY = """
+OPTIONAL MATCH (a) WHERE a.type = 'desire'
+OPTIONAL MATCH (a)-[e]->()
+WITH a, count(e) AS degree
+WITH sum(CASE WHEN degree >= 1 THEN 1 ELSE 0 END) AS desire_linked,
+     sum(CASE WHEN degree >= 3 THEN 1 ELSE 0 END) AS desire_persistent
+OPTIONAL MATCH (s) WHERE s.type = 'limbic_state'
+WITH desire_linked, desire_persistent, collect(s) AS states
+OPTIONAL MATCH (d) WHERE d.type = 'drive' AND d.name IN $drives
+RETURN desire_linked, desire_persistent, states[0], collect([d.name, d.intensity])
+"""
 
+# Whole-graph energy / newest (recombining per-type averages would not give
+# avg() bit for bit)
+_GRAPH_QUERY = "MATCH (n) RETURN avg(n.energy), max(n.created_at)"
+
+# _GRAPH_QUERY and _DESIRE_QUERY in one round trip
+_BRAIN_QUERY = """
+MATCH (n)
+WITH avg(n.energy) AS energy_all, max(n.created_at) AS newest_all
+OPTIONAL MATCH (a) WHERE a.type = 'desire'
+OPTIONAL MATCH (a)-[e]->()
+WITH energy_all, newest_all, a, count(e) AS degree
+WITH energy_all, newest_all,
+     sum(CASE WHEN degree >= 1 THEN 1 ELSE 0 END) AS desire_linked,
+     sum(CASE WHEN degree >= 3 THEN 1 ELSE 0 END) AS desire_persistent
+OPTIONAL MATCH (s) WHERE s.type = 'limbic_state'
+WITH energy_all, newest_all, desire_linked, desire_persistent, collect(s) AS states
+OPTIONAL MATCH (d) WHERE d.type = 'drive' AND d.name IN $drives
+RETURN energy_all, newest_all, desire_linked, desire_persistent, states[0], collect([d.name, d.intensity])
+"""
 
-# ── High-Level: Read Brain Stats ─────────────────────────────────────────────
+# Kept on its own: FalkorDB answers this exact shape from the edge counters,
+# inside a larger query it walks every edge
+_LINK_QUERY = "MATCH ()-[r]->() RETURN count(r)"
+
+_NODE_FIELDS = (
+    "desire_count", "desire_energy", "concept_count", "process_count", "value_count",
+    "memory_count", "recency_desire", "recency_moment", "total_nodes", "type_distribution",
+    "typed_node_count", "untyped_node_count", "has_backstory", "has_personality",
+    "has_health_feedback", "health_feedback_count",
+)
+_DRIVE_FIELDS = ("curiosity", "frustration", "ambition", "social_need", "desire_persistence")
+
+# Query parts each BrainStats field is computed from
+FIELD_PARTS = {
+    **{name: ("nodes",) for name in _NODE_FIELDS},
+    **{name: ("desires",) for name in _DRIVE_FIELDS},
+    "desire_moment_ratio": ("nodes", "desires"),
+    "cluster_coefficient": ("nodes", "links"),
+    "link_density": ("nodes", "links"),
+    "total_links": ("links",),
+    "mean_energy_all": ("graph",),
+    "newest_node_age_hours": ("graph",),
+    "reachable": (),
+}
+PARTS = ("nodes", "desires", "graph", "links")
+
+_stats_lock = threading.Lock()
+_query_stats: Counter = Counter()
+
+
+def brain_query_stats() -> Dict[str, int]:
+    """
+    Process-wide counters: "readers" (brains read), "queries" (round trips)
+    and, per part, how many readers ran it. A part's skips are readers - part.
+    """
+    with _stats_lock:
+        return {"readers": 0, "queries": 0, **{part: 0 for part in PARTS}, **_query_stats}
 
 
-def _read_raw_topology(graph) -> dict:
-    """Read raw topology stats. What actually exists, not what we wish existed."""
-    total_nodes = count(graph, "all")
-    total_links_rows = _safe_query(graph, "MATCH ()-[r]->() RETURN count(r)")
-    total_links = total_links_rows[0][0] if total_links_rows else 0
+def _count(**increments: int):
+    with _stats_lock:
+        _query_stats.update(increments)
+
+
+def brain_stats_from_rows(
+    node_rows: list, brain_rows: list, link_rows: list, now: Optional[float] = None,
+) -> BrainStats:
+    """
+    Map the rows of _NODE_QUERY, _BRAIN_QUERY and _LINK_QUERY to BrainStats
+    (ages at `now`, default: the current time).
+
+    Empty row lists (failed query, empty graph, part not read) give the same
+    values the primitives return on an empty graph — the BrainStats defaults.
+    """
+    # Per-type aggregates; null and "" types are one group, as COALESCE(n.type, '')
+    by_type = {t: (c, energy, newest) for t, c, energy, newest in node_rows}
+    untyped_rows = [(t, row[0]) for t, row in by_type.items() if t is None or t == ""]
+    type_rows = [(t, row[0]) for t, row in by_type.items() if t is not None and t != ""]
+    if untyped_rows:
+        type_rows.append(("", sum(c for _, c in untyped_rows)))
+    type_rows.sort(key=lambda row: -row[1])  # ORDER BY c DESC
 
-    # Type distribution — what types actually exist
-    type_rows = _safe_query(
-        graph,
-        "MATCH (n) RETURN COALESCE(n.type, '') AS t, count(n) AS c ORDER BY c DESC",
-    )
     type_dist = {}
     typed = 0
     untyped = 0
-    for row in type_rows:
-        t, c = row[0], row[1]
+    for t, c in type_rows:
         if t and t.strip():
             type_dist[t] = c
             typed += c
         else:
             untyped += c
+    total_nodes = typed + untyped
 
-    # Mean energy across ALL nodes
-    energy_all = mean_energy(graph, "all")
+    def type_count(node_type: str) -> int:
+        return by_type[node_type][0] if node_type in by_type else 0
 
-    # Newest node age
-    newest_rows = _safe_query(
-        graph,
-        "MATCH (n) WHERE n.created_at IS NOT NULL RETURN max(n.created_at)",
+    energy_all, newest_all, desire_linked, desire_persistent, state, drive_rows = (
+        brain_rows[0] if brain_rows else (None, None, 0, 0, None, [])
     )
-    newest_age = -1.0
-    if newest_rows and newest_rows[0][0] is not None:
-        ts = newest_rows[0][0]
-        if isinstance(ts, str):
-            try:
-                from datetime import datetime
-                dt = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                newest_age = (time.time() - dt.timestamp()) / 3600
-            except Exception:
-                pass
-        else:
-            newest_age = (time.time() - float(ts)) / 3600
-
-    return {
-        "total_nodes": total_nodes,
-        "total_links": total_links,
-        "link_density": total_links / max(total_nodes, 1),
-        "type_distribution": type_dist,
-        "typed_node_count": typed,
-        "untyped_node_count": untyped,
-        "has_backstory": "backstory" in type_dist,
-        "has_personality": "personality" in type_dist,
-        "has_health_feedback": "health_feedback" in type_dist,
-        "health_feedback_count": type_dist.get("health_feedback", 0),
-        "mean_energy_all": energy_all,
-        "newest_node_age_hours": newest_age,
-    }
-
-
-def read_brain_topology(handle: str) -> BrainStats:
-    """Compute all brain stats for a citizen. Topology only, never content."""
-    try:
-        graph = _get_graph(handle)
-    except Exception as e:
-        logger.error(f"Cannot reach brain graph for {handle}: {e}")
-        return BrainStats(reachable=False)
+    links = link_rows[0][0] if link_rows else 0
+    drive_nodes = {}
+    for name, intensity in drive_rows:
+        if name is not None and name not in drive_nodes:
+            drive_nodes[name] = intensity
 
-    desire_ct = count(graph, "desire")
-    desire_with_links = min_links(graph, "desire", 1)
-    desire_with_3links = min_links(graph, "desire", 3)
+    desire_ct = type_count("desire")
+    desire_energy = by_type["desire"][1] if "desire" in by_type else None
+    possible = total_nodes * (total_nodes - 1)
 
-    raw = _read_raw_topology(graph)
+    newest_age = -1.0
+    if newest_all is not None:
+        age = _age_hours(newest_all, now)
+        if age is not None:
+            newest_age = age
 
     return BrainStats(
         desire_count=desire_ct,
-        desire_energy=mean_energy(graph, "desire"),
-        desire_moment_ratio=desire_with_links / max(desire_ct, 1),
-        desire_persistence=desire_with_3links / max(desire_with_links, 1),
-        concept_count=count(graph, "concept"),
-        process_count=count(graph, "process"),
-        value_count=count(graph, "value"),
-        memory_count=count(graph, "memory"),
-        cluster_coefficient=cluster_coefficient(graph, "all"),
-        curiosity=drive(graph, "curiosity"),
-        frustration=drive(graph, "frustration"),
-        ambition=drive(graph, "ambition"),
-        social_need=drive(graph, "social_need"),
-        recency_desire=recency(graph, "desire"),
-        recency_moment=recency(graph, "moment"),
+        desire_energy=float(desire_energy) if desire_energy is not None else 0.0,
+        desire_moment_ratio=desire_linked / max(desire_ct, 1),
+        desire_persistence=desire_persistent / max(desire_linked, 1),
+        concept_count=type_count("concept"),
+        process_count=type_count("process"),
+        value_count=type_count("value"),
+        memory_count=type_count("memory"),
+        cluster_coefficient=min(1.0, links / possible) if total_nodes >= 2 else 0.0,
+        curiosity=_drive_value(state, drive_nodes, "curiosity"),
+        frustration=_drive_value(state, drive_nodes, "frustration"),
+        ambition=_drive_value(state, drive_nodes, "ambition"),
+        social_need=_drive_value(state, drive_nodes, "social_need"),
+        recency_desire=_recency_score(by_type["desire"][2] if "desire" in by_type else None, now),
+        recency_moment=_recency_score(by_type["moment"][2] if "moment" in by_type else None, now),
         reachable=True,
-        **raw,
+        total_nodes=total_nodes,
+        total_links=links,
+        link_density=links / max(total_nodes, 1),
+        type_distribution=type_dist,
+        typed_node_count=typed,
+        untyped_node_count=untyped,
+        has_backstory="backstory" in type_dist,
+        has_personality="personality" in type_dist,
+        has_health_feedback="health_feedback" in type_dist,
+        health_feedback_count=type_dist.get("health_feedback", 0),
+        mean_energy_all=float(energy_all) if energy_all is not None else 0.0,
+        newest_node_age_hours=newest_age,
     )
+
+
+def _parts_for(fields: Optional[Iterable[str]]) -> Set[str]:
+    """Query parts needed for `fields` (None: all). Names that aren't fields (properties) need all."""
+    if fields is None:
+        return set(PARTS)
+    parts: Set[str] = set()
+    for name in fields:
+        parts.update(FIELD_PARTS.get(name, PARTS))
+    return parts
+
+
+class BrainReader:
+    """
+    One citizen's brain, read on demand: stats(fields) runs the query parts
+    those fields need that haven't run yet. Ages are taken at one clock
+    reading, so repeated stats() calls agree.
+    """
+
+    def __init__(self, handle: str):
+        self.handle = handle
+        self.now = time.time()
+        self._rows: Dict[str, list] = {}
+        try:
+            self._graph = _get_graph(handle)
+        except Exception as e:
+            logger.error(f"Cannot reach brain graph for {handle}: {e}")
+            self._graph = None
+            return
+        _count(readers=1)
+
+    @property
+    def parts_read(self) -> Set[str]:
+        return set(self._rows)
+
+    def _run(self, cypher: str, params: Optional[dict] = None) -> list:
+        _count(queries=1)
+        return _safe_query(self._graph, cypher, params)
+
+    def _fetch(self, parts: Set[str]):
+        missing = parts - set(self._rows)
+        if not missing:
+            return
+        started = time.monotonic()
+        if {"desires", "graph"} <= missing:
+            rows = self._run(_BRAIN_QUERY, {"drives": list(DRIVES)})
+            self._rows["graph"] = [rows[0][:2]] if rows else []
+            self._rows["desires"] = [rows[0][2:]] if rows else []
+        elif "desires" in missing:
+            self._rows["desires"] = self._run(_DESIRE_QUERY, {"drives": list(DRIVES)})
+        elif "graph" in missing:
+            self._rows["graph"] = self._run(_GRAPH_QUERY)
+        if "nodes" in missing:
+            self._rows["nodes"] = self._run(_NODE_QUERY)
+        if "links" in missing:
+            self._rows["links"] = self._run(_LINK_QUERY)
+        _count(**{part: 1 for part in missing})
+        logger.debug(
+            f"brain_{self.handle}: read {', '.join(sorted(missing))} in "
+            f"{(time.monotonic() - started) * 1000:.1f}ms"
+        )
+
+    def stats(self, fields: Optional[Iterable[str]] = None) -> BrainStats:
+        """
+        BrainStats with `fields` (default: all) computed. Fields of parts not
+        read yet keep their defaults.
+        """
+        if self._graph is None:
+            return BrainStats(reachable=False)
+        self._fetch(_parts_for(fields))
+
+        brain_rows = []
+        if "graph" in self._rows or "desires" in self._rows:
+            graph_row = self._rows.get("graph") or [(None, None)]
+            desire_row = self._rows.get("desires") or [(0, 0, None, [])]
+            brain_rows = [tuple(graph_row[0]) + tuple(desire_row[0])]
+        return brain_stats_from_rows(
+            self._rows.get("nodes", []), brain_rows, self._rows.get("links", []), self.now,
+        )
+
+
+def read_brain_topology(handle: str, fields: Optional[Iterable[str]] = None) -> BrainStats:
+    """Compute brain stats for a citizen (`fields`, default: all). Topology only, never content."""
+    return BrainReader(handle).stats(fields)
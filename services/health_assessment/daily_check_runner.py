@@ -9,28 +9,65 @@ Pipeline: fetch → compute → score → aggregate → intervene → feedback.
 Iterates all Lumina Prime citizens from L4 registry.
 Runs daily. Silence for healthy, message for unhealthy.
 
+Citizens are checked concurrently (--workers threads; each check is mostly
+graph round trips). Every check writes only its own history record, stimulus
+and intervention, and a check that runs past --timeout is abandoned before
+any of those side effects. The summary is in registry order whatever the
+completion order.
+
+A full-population run reads universe behavior for every citizen in one pass
+(universe_batch_reader) before the checks start; --citizen runs, and a
+failed batch read, use the per-citizen universe queries. Yesterday's history
+records are likewise read for all citizens in one query (history_store).
+
+Graph reads are limited to the stats fields the run's formulas read
+(registry.formula_fields); the rest of a citizen's brain and behavior is
+read only if an intervention message is composed for them. The summary
+reports how many brain and universe query parts were skipped.
+--capability scores a subset of formulas (a diagnostic run: implies
+--dry-run, as partial scores must not become the day's record).
+
+--record <dir> also saves the full stats of every completed check (snapshot);
+--replay <dir> reruns scoring, aggregation and intervention composition on
+a snapshot, offline: nothing is read from FalkorDB or the history store, and
+nothing is sent or saved.
+
+Every check is timed per stage (run_report); the summary logs p50/p95/max
+per stage and --report writes the full JSON run report.
+
 Usage:
     python -m services.health_assessment.daily_check_runner
     python -m services.health_assessment.daily_check_runner --citizen vox
     python -m services.health_assessment.daily_check_runner --dry-run
+    python -m services.health_assessment.daily_check_runner --workers 32 --timeout 60
+    python -m services.health_assessment.daily_check_runner --citizen vox --capability exec_complete
+    python -m services.health_assessment.daily_check_runner --record snapshots/2026-03-14
+    python -m services.health_assessment.daily_check_runner --replay snapshots/2026-03-14
+    python -m services.health_assessment.daily_check_runner --report reports/2026-03-14.json
 """
 
 import argparse
 import json
 import logging
 import sys
+import threading
 import time
-from datetime import date
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 # Ensure imports work from graphcare root
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
-from services.health_assessment.brain_topology_reader import read_brain_topology, BrainStats
-from services.health_assessment.universe_moment_reader import read_universe_moments, BehaviorStats
+from services.falkordb_pool import pool_stats
+from services.health_assessment.brain_topology_reader import BrainReader, BrainStats, brain_query_stats
+from services.health_assessment.universe_moment_reader import (
+    UniverseMomentReader, BehaviorStats, universe_query_stats,
+)
+from services.health_assessment.universe_batch_reader import read_universe_behavior
 from services.health_assessment.aggregator import (
-    aggregate_scores, save_history, DailyRecord, AggregateResult,
+    aggregate_scores, load_histories, save_history, DailyRecord, AggregateResult,
 )
 from services.health_assessment.intervention_composer import (
     should_intervene, compose_intervention,
@@ -55,7 +92,12 @@ import services.health_assessment.scoring_formulas.process                # noqa
 import services.health_assessment.scoring_formulas.world_presence          # noqa: F401
 import services.health_assessment.scoring_formulas.mentorship              # noqa: F401
 
-from services.health_assessment.scoring_formulas.registry import all_formulas
+from services.health_assessment.population_scorer import score_citizen, score_population
+from services.health_assessment.run_report import (
+    CitizenTiming, RunTimer, build_report, export_to_monitor, format_stages, write_report,
+)
+from services.health_assessment.snapshot import MANIFEST_NAME, Snapshot, SnapshotWriter, load_snapshot
+from services.health_assessment.scoring_formulas.registry import FormulaFn, all_formulas, required_fields
 
 logging.basicConfig(
     level=logging.INFO,
@@ -64,6 +106,19 @@ logging.basicConfig(
 logger = logging.getLogger("graphcare.health.runner")
 
 REGISTRY_PATH = Path("/home/mind-protocol/mind-platform/data/registry.json")
+DEFAULT_WORKERS = 8
+CITIZEN_TIMEOUT_SECONDS = 120.0
+
+
+class CitizenTimeout(Exception):
+    """A citizen check ran past its deadline; its remaining side effects were skipped."""
+
+
+def _check_deadline(
+    citizen_id: str, deadline: Optional[float], step: str, cancelled: Optional[threading.Event] = None,
+):
+    if (cancelled is not None and cancelled.is_set()) or (deadline is not None and time.monotonic() > deadline):
+        raise CitizenTimeout(f"{citizen_id}: timed out before {step}")
 
 
 def load_lumina_citizens() -> List[dict]:
@@ -87,31 +142,63 @@ def load_lumina_citizens() -> List[dict]:
     return lumina
 
 
-def check_citizen(citizen_id: str, dry_run: bool = False) -> Optional[DailyRecord]:
-    """Run full health check for one citizen."""
-    today = date.today()
+def check_citizen(
+    citizen_id: str,
+    dry_run: bool = False,
+    today: Optional[date] = None,
+    deadline: Optional[float] = None,
+    behavior: Optional[BehaviorStats] = None,
+    yesterday_records: Optional[Dict[str, DailyRecord]] = None,
+    formulas: Optional[Dict[str, FormulaFn]] = None,
+    reads: Optional[dict] = None,
+    timing: Optional[CitizenTiming] = None,
+    cancelled: Optional[threading.Event] = None,
+) -> Optional[DailyRecord]:
+    """Run full health check for one citizen.
+
+    deadline (time.monotonic()) is checked before the re-read for an
+    intervention and before the history record is saved; past it, or once
+    `cancelled` is set (the runner abandoned the check), CitizenTimeout is
+    raised and nothing is sent or saved. The record is saved before the
+    intervention and stimulus go out, so a check that sends has always
+    recorded it, and a rerun the same day does not send the intervention
+    again (_send_intervention). behavior, if given
+    (from a population batch read), replaces the per-citizen universe queries;
+    yesterday_records, likewise, the per-citizen history read. formulas
+    defaults to every registered formula. With `reads` (an empty dict), every
+    stats field is read, and what a snapshot records is stored in it: the
+    brain, behavior and yesterday record the aggregate was compared with
+    (SnapshotWriter.add keywords). Each stage is timed into `timing` (run_report).
+    """
+    today = today or date.today()
+    timing = timing if timing is not None else CitizenTiming(citizen_id)
+    formulas = formulas if formulas is not None else all_formulas()
+    brain_fields, behavior_fields = required_fields(formulas.values())
+    if reads is not None:
+        brain_fields = behavior_fields = None
     logger.info(f"Checking {citizen_id}...")
 
-    # Step 1-2: Fetch brain topology
-    brain = read_brain_topology(citizen_id)
+    # Step 1-2: Fetch brain topology (what the formulas read)
+    brain_reader = BrainReader(citizen_id)
+    with timing.span("fetch_brain"):
+        brain = brain_reader.stats(brain_fields)
 
     # Step 3: Fetch universe behavior
-    behavior = read_universe_moments(citizen_id)
+    universe_reader = None
+    if behavior is None:
+        universe_reader = UniverseMomentReader(citizen_id)
+        with timing.span("fetch_universe"):
+            behavior = universe_reader.stats(behavior_fields)
 
     # Step 4: Score each capability
-    formulas = all_formulas()
-    capability_scores: Dict[str, Optional[float]] = {}
-
-    for cap_id, formula_fn in formulas.items():
-        try:
-            score = formula_fn(brain, behavior)
-            capability_scores[cap_id] = score.total
-        except Exception as e:
-            logger.warning(f"Formula {cap_id} failed for {citizen_id}: {e}")
-            capability_scores[cap_id] = None
+    with timing.span("score"):
+        capability_scores = score_citizen(citizen_id, brain, behavior, formulas)
 
     # Step 5: Aggregate + delta
-    agg = aggregate_scores(citizen_id, capability_scores, today)
+    with timing.span("aggregate"):
+        agg = aggregate_scores(citizen_id, capability_scores, today, yesterday_records)
+    if reads is not None:
+        reads.update(brain=brain, behavior=behavior, yesterday=agg.yesterday)
 
     logger.info(
         f"  {citizen_id}: score={agg.aggregate:.1f} "
@@ -120,30 +207,34 @@ def check_citizen(citizen_id: str, dry_run: bool = False) -> Optional[DailyRecor
         f"brain={'OK' if brain.reachable else 'UNREACHABLE'}"
     )
 
-    # Step 6: Intervene if needed
+    # Step 6: Intervene if needed (sent after the history record is saved)
+    _check_deadline(citizen_id, deadline, "intervention", cancelled)
     intervention_sent = False
+    message = None
     if should_intervene(agg.aggregate, agg.drops):
-        message = compose_intervention(
-            citizen_id=citizen_id,
-            aggregate=agg.aggregate,
-            yesterday_aggregate=agg.yesterday_aggregate,
-            drops=agg.drops,
-            capability_scores=capability_scores,
-            brain=brain,
-            behavior=behavior,
-        )
-        if dry_run:
-            logger.info(f"  [DRY RUN] Would send intervention:\n{message}")
-        else:
-            _send_intervention(citizen_id, message)
+        with timing.span("intervene"):
+            # The message describes the whole brain: read what scoring skipped
+            brain = brain_reader.stats()
+            if universe_reader is not None:
+                behavior = universe_reader.stats()
+            message = compose_intervention(
+                citizen_id=citizen_id,
+                aggregate=agg.aggregate,
+                yesterday_aggregate=agg.yesterday_aggregate,
+                drops=agg.drops,
+                capability_scores=capability_scores,
+                brain=brain,
+                behavior=behavior,
+            )
+            if dry_run:
+                logger.info(f"  [DRY RUN] Would send intervention:\n{message}")
         intervention_sent = True
 
     # Step 7: Stress stimulus
     stress = compute_stress_stimulus(agg.aggregate)
-    if not dry_run and brain.reachable:
-        send_stress_stimulus(citizen_id, stress)
 
-    # Save history
+    # Save history: the last point the check can stop at (the full re-read
+    # may have blocked past the deadline); what it records is then sent
     record = DailyRecord(
         citizen_id=citizen_id,
         date=today.isoformat(),
@@ -153,20 +244,42 @@ def check_citizen(citizen_id: str, dry_run: bool = False) -> Optional[DailyRecor
         stress_stimulus=stress,
         brain_reachable=brain.reachable,
     )
-    if not dry_run:
+    if dry_run:
+        return record
+
+    _check_deadline(citizen_id, deadline, "saving history", cancelled)
+    with timing.span("save"):
         save_history(record)
 
+    if message is not None:
+        with timing.span("intervene"):
+            _send_intervention(citizen_id, message, today)
+    if brain.reachable:
+        with timing.span("stimulus"):
+            send_stress_stimulus(citizen_id, stress)
+
     return record
 
 
-def _send_intervention(citizen_id: str, message: str):
-    """Send intervention to file archive."""
-    output_dir = Path("/home/mind-protocol/graphcare/data/interventions")
-    output_dir.mkdir(parents=True, exist_ok=True)
-    today = date.today().isoformat()
-    path = output_dir / f"{citizen_id}_{today}.md"
-    path.write_text(message)
+INTERVENTIONS_DIR = Path("/home/mind-protocol/graphcare/data/interventions")
+
+
+def _send_intervention(citizen_id: str, message: str, today: date) -> bool:
+    """Send intervention to file archive, once per citizen and run date.
+
+    Returns False (and leaves the archive as it was) if one was already sent
+    for `today`, e.g. by an earlier run of the same day.
+    """
+    INTERVENTIONS_DIR.mkdir(parents=True, exist_ok=True)
+    path = INTERVENTIONS_DIR / f"{citizen_id}_{today.isoformat()}.md"
+    try:
+        with open(path, "x", encoding="utf-8") as f:
+            f.write(message)
+    except FileExistsError:
+        logger.info(f"  Intervention already sent today ({path}), not resent")
+        return False
     logger.info(f"  Intervention written to {path}")
+    return True
 
 
 DISCORD_CITIZEN_HEALTH_CHANNEL = "1482760090800095242"
@@ -203,56 +316,330 @@ def _post_to_discord(citizen_id: str, message: str):
         logger.warning(f"  Discord API error: {resp.status_code}")
 
 
-def run_all(dry_run: bool = False, citizen_filter: Optional[str] = None):
-    """Run daily health check for all Lumina Prime citizens."""
-    start = time.time()
+def _run_checks(
+    citizen_ids: List[str],
+    dry_run: bool,
+    today: date,
+    workers: int,
+    timeout: float,
+    behaviors: Optional[Dict[str, BehaviorStats]] = None,
+    yesterday_records: Optional[Dict[str, DailyRecord]] = None,
+    formulas: Optional[Dict[str, FormulaFn]] = None,
+    snapshot: Optional[SnapshotWriter] = None,
+    timer: Optional[RunTimer] = None,
+) -> Tuple[Dict[str, str], List[DailyRecord]]:
+    """
+    Check citizens on a pool of `workers` threads (with precomputed universe
+    `behaviors` and prefetched `yesterday_records` where given). Completed
+    checks are recorded in `snapshot` as their results come in.
+
+    Returns ({citizen_id: "ok" | "failed" | "timeout"}, records of completed
+    checks in citizen_ids order). A check still blocked in a graph call
+    after `timeout` seconds is reported as timed out and not waited for: it
+    is cancelled, so once the call returns it stops before any further side
+    effect, and its result is ignored.
+    """
+    started: Dict[int, float] = {}
+    cancelled = [threading.Event() for _ in citizen_ids]
+
+    def run(index: int, citizen_id: str) -> Tuple[Optional[DailyRecord], Optional[dict]]:
+        started[index] = time.monotonic()
+        reads = {} if snapshot is not None else None
+        record = check_citizen(
+            citizen_id, dry_run=dry_run, today=today, deadline=started[index] + timeout,
+            behavior=(behaviors or {}).get(citizen_id),
+            yesterday_records=yesterday_records, formulas=formulas, reads=reads,
+            timing=timer.citizen(citizen_id) if timer is not None else None,
+            cancelled=cancelled[index],
+        )
+        return record, reads
+
+    records: Dict[int, DailyRecord] = {}
+    outcomes: Dict[int, str] = {}
+    pool = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="health-check")
+    futures = {pool.submit(run, i, cid): i for i, cid in enumerate(citizen_ids)}
+    pending = set(futures)
+    while pending:
+        done, pending = wait(pending, timeout=min(1.0, timeout), return_when=FIRST_COMPLETED)
+        for future in done:
+            i = futures[future]
+            try:
+                record, reads = future.result()
+            except CitizenTimeout as e:
+                logger.error(f"{e}, skipped")
+                outcomes[i] = "timeout"
+                continue
+            except Exception as e:
+                logger.error(f"Failed to check {citizen_ids[i]}: {e}")
+                outcomes[i] = "failed"
+                continue
+            outcomes[i] = "ok"
+            if record:
+                records[i] = record
+            if snapshot is not None:
+                snapshot.add(citizen_ids[i], **reads)
+
+        now = time.monotonic()
+        for future in list(pending):
+            i = futures[future]
+            if i in started and now - started[i] > timeout:
+                logger.error(f"{citizen_ids[i]}: no result after {timeout:.0f}s, abandoned")
+                cancelled[i].set()
+                outcomes[i] = "timeout"
+                pending.discard(future)
+    pool.shutdown(wait=False, cancel_futures=True)
+
+    return (
+        {citizen_ids[i]: outcomes[i] for i in range(len(citizen_ids))},
+        [records[i] for i in sorted(records)],
+    )
+
+
+def _read_population_behavior(
+    citizen_ids: List[str], fields: Optional[frozenset] = None,
+) -> Optional[Dict[str, BehaviorStats]]:
+    """Universe behavior (`fields`, default: all) for all citizens in one pass, or None to read per citizen."""
+    if not citizen_ids:
+        return None
+    try:
+        return read_universe_behavior(citizen_ids, fields)
+    except Exception as e:
+        logger.warning(f"Universe batch read failed, falling back to per-citizen queries: {e}")
+        return None
+
 
+def _load_yesterday(citizen_ids: List[str], today: date) -> Optional[Dict[str, DailyRecord]]:
+    """Yesterday's history records for all citizens in one query, or None to read per citizen."""
+    try:
+        return load_histories(today - timedelta(days=1), citizen_ids)
+    except Exception as e:
+        logger.warning(f"History prefetch failed, falling back to per-citizen reads: {e}")
+        return None
+
+
+def _skipped_parts(label: str, before: Dict[str, int], after: Dict[str, int]) -> str:
+    """One summary line: graphs read, queries run, and per query part how many reads skipped it."""
+    readers = after["readers"] - before["readers"]
+    queries = after["queries"] - before["queries"]
+    parts = [name for name in after if name not in ("readers", "queries")]
+    skipped = [f"{name} {readers - (after[name] - before[name])}" for name in parts]
+    return f"  {label}: {readers} read, {queries} queries; skipped per part: {', '.join(skipped)}"
+
+
+def _select_formulas(capabilities: Optional[List[str]]) -> Dict[str, FormulaFn]:
+    formulas = all_formulas()
+    if not capabilities:
+        return formulas
+    unknown = [cap_id for cap_id in capabilities if cap_id not in formulas]
+    if unknown:
+        raise ValueError(f"Unknown capabilities: {', '.join(unknown)}")
+    return {cap_id: formulas[cap_id] for cap_id in capabilities}
+
+
+def run_all(
+    dry_run: bool = False,
+    citizen_filter: Optional[str] = None,
+    workers: int = DEFAULT_WORKERS,
+    timeout: float = CITIZEN_TIMEOUT_SECONDS,
+    capabilities: Optional[List[str]] = None,
+    record_dir: Optional[Path] = None,
+    report_path: Optional[Path] = None,
+    monitor=None,
+):
+    """Run daily health check for all Lumina Prime citizens.
+
+    capabilities limits scoring to those formulas (and implies dry_run);
+    record_dir saves a snapshot of the run's reads there. report_path
+    writes the run's stage timings (run_report) as JSON; monitor, a
+    resolver_health.ResolverHealthMonitor, receives them as well.
+    Returns the DailyRecords of completed checks, in registry order.
+    """
+    start = time.time()
+    today = date.today()
+    formulas = _select_formulas(capabilities)
+    if capabilities and not dry_run:
+        logger.info("Scoring a subset of capabilities: dry run")
+        dry_run = True
+    brain_fields, behavior_fields = required_fields(formulas.values())
+    snapshot = SnapshotWriter(record_dir, today) if record_dir is not None else None
+    if snapshot is not None:
+        brain_fields = behavior_fields = None
+    brain_before, universe_before = brain_query_stats(), universe_query_stats()
+    timer = RunTimer()
+
+    behaviors = None
     if citizen_filter:
         citizens = [{"id": citizen_filter}]
     else:
         citizens = load_lumina_citizens()
+        with timer.phase("read_population_behavior"):
+            behaviors = _read_population_behavior([c["id"] for c in citizens], behavior_fields)
+
+    citizen_ids = [c["id"] for c in citizens]
+    with timer.phase("load_yesterday"):
+        yesterday_records = _load_yesterday(citizen_ids, today)
+    with timer.phase("checks"):
+        outcomes, results = _run_checks(
+            citizen_ids, dry_run, today, workers, timeout, behaviors,
+            yesterday_records, formulas, snapshot, timer,
+        )
+    timer.set_outcomes(outcomes)
+    if snapshot is not None:
+        with timer.phase("write_snapshot"):
+            snapshot.write(citizen_ids)
 
-    results = []
     healthy = 0
     intervened = 0
     unreachable = 0
-
-    for c in citizens:
-        cid = c["id"]
-        try:
-            record = check_citizen(cid, dry_run=dry_run)
-            if record:
-                results.append(record)
-                if not record.brain_reachable:
-                    unreachable += 1
-                elif record.intervention_sent:
-                    intervened += 1
-                else:
-                    healthy += 1
-        except Exception as e:
-            logger.error(f"Failed to check {cid}: {e}")
+    for record in results:
+        if not record.brain_reachable:
+            unreachable += 1
+        elif record.intervention_sent:
+            intervened += 1
+        else:
+            healthy += 1
+    failed = sorted(cid for cid, outcome in outcomes.items() if outcome == "failed")
+    timed_out = sorted(cid for cid, outcome in outcomes.items() if outcome == "timeout")
 
     elapsed = time.time() - start
     logger.info(
         f"Daily check complete: {len(results)} citizens, "
         f"{healthy} healthy, {intervened} interventions, "
-        f"{unreachable} unreachable, {elapsed:.1f}s"
+        f"{unreachable} unreachable, {len(failed)} failed, {len(timed_out)} timed out, "
+        f"{workers} workers, {elapsed:.1f}s"
+    )
+    pool = pool_stats()
+    logger.info(
+        f"  FalkorDB: {pool['connections_opened']} connections opened, "
+        f"{pool['connections_open']}/{pool['max_connections']} pooled"
+    )
+    logger.info(_skipped_parts("Brain graphs", brain_before, brain_query_stats()))
+    universe_after = universe_query_stats()
+    if universe_after["readers"] > universe_before["readers"]:
+        logger.info(_skipped_parts("Universe (per citizen)", universe_before, universe_after))
+    if failed:
+        logger.info(f"  Failed: {', '.join(failed)}")
+    if timed_out:
+        logger.info(f"  Timed out: {', '.join(timed_out)}")
+
+    report = build_report(
+        timer, date=today.isoformat(), dry_run=dry_run, workers=workers,
+        citizens=len(citizen_ids), completed=len(results), healthy=healthy,
+        interventions=intervened, unreachable=unreachable, failed=failed, timed_out=timed_out,
     )
+    logger.info(format_stages(report))
+    if report_path is not None:
+        write_report(report, report_path)
+    if monitor is not None:
+        export_to_monitor(timer, monitor)
 
     return results
 
 
+def replay_snapshot(
+    snapshot: Snapshot, formulas: Optional[Dict[str, FormulaFn]] = None,
+) -> Tuple[List[DailyRecord], Dict[str, str]]:
+    """
+    Steps 4-7 on recorded stats: (the day's records, {citizen_id:
+    intervention message}), as the recorded run would have produced them
+    with these formulas. Pure computation; nothing is sent or saved.
+    """
+    formulas = formulas if formulas is not None else all_formulas()
+    scores = score_population(snapshot.citizen_ids, snapshot.brains, snapshot.behaviors, formulas)
+
+    records: List[DailyRecord] = []
+    messages: Dict[str, str] = {}
+    for citizen_id in snapshot.citizen_ids:
+        brain = snapshot.brains[citizen_id]
+        capability_scores = scores[citizen_id]
+        agg = aggregate_scores(citizen_id, capability_scores, snapshot.today, snapshot.yesterday_records)
+        intervention_sent = should_intervene(agg.aggregate, agg.drops)
+        if intervention_sent:
+            messages[citizen_id] = compose_intervention(
+                citizen_id=citizen_id,
+                aggregate=agg.aggregate,
+                yesterday_aggregate=agg.yesterday_aggregate,
+                drops=agg.drops,
+                capability_scores=capability_scores,
+                brain=brain,
+                behavior=snapshot.behaviors[citizen_id],
+            )
+        records.append(DailyRecord(
+            citizen_id=citizen_id,
+            date=snapshot.today.isoformat(),
+            aggregate_score=agg.aggregate,
+            capability_scores=capability_scores,
+            intervention_sent=intervention_sent,
+            stress_stimulus=compute_stress_stimulus(agg.aggregate),
+            brain_reachable=brain.reachable,
+        ))
+    return records, messages
+
+
+def replay(
+    snapshot_dir: Path,
+    citizen_filter: Optional[str] = None,
+    capabilities: Optional[List[str]] = None,
+) -> List[DailyRecord]:
+    """Replay a recorded run offline (see replay_snapshot). Returns its DailyRecords."""
+    start = time.time()
+    formulas = _select_formulas(capabilities)
+    snapshot = load_snapshot(snapshot_dir, [citizen_filter] if citizen_filter else None)
+    loaded = time.time()
+    records, messages = replay_snapshot(snapshot, formulas)
+    for citizen_id, message in messages.items():
+        logger.debug(f"  [REPLAY] Intervention for {citizen_id}:\n{message}")
+
+    unreachable = sum(1 for r in records if not r.brain_reachable)
+    intervened = sum(1 for r in records if r.brain_reachable and r.intervention_sent)
+    logger.info(
+        f"Replay of {snapshot_dir} ({snapshot.today.isoformat()}): {len(records)} citizens, "
+        f"{len(records) - intervened - unreachable} healthy, {intervened} interventions, "
+        f"{unreachable} unreachable, {len(formulas)} formulas; "
+        f"load {loaded - start:.2f}s, replay {time.time() - loaded:.2f}s"
+    )
+    return records
+
+
 def main():
     parser = argparse.ArgumentParser(description="Daily Citizen Health Check")
     parser.add_argument("--citizen", help="Check a single citizen by handle")
     parser.add_argument("--dry-run", action="store_true", help="Don't send messages or save")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS,
+                        help=f"Citizens checked concurrently (default: {DEFAULT_WORKERS})")
+    parser.add_argument("--timeout", type=float, default=CITIZEN_TIMEOUT_SECONDS,
+                        help=f"Seconds per citizen before its check is abandoned (default: {CITIZEN_TIMEOUT_SECONDS:.0f})")
+    parser.add_argument("--capability", action="append", metavar="ID",
+                        help="Score only this capability (repeatable; implies --dry-run)")
+    parser.add_argument("--report", type=Path, metavar="PATH",
+                        help="Write per-stage timings (p50/p95/max, slowest citizens) to PATH as JSON")
+    snapshot_mode = parser.add_mutually_exclusive_group()
+    snapshot_mode.add_argument("--record", type=Path, metavar="DIR",
+                               help="Also save the run's graph reads to DIR for --replay")
+    snapshot_mode.add_argument("--replay", type=Path, metavar="DIR",
+                               help="Score a recorded snapshot offline (no graphs, nothing saved or sent)")
     parser.add_argument("--verbose", "-v", action="store_true")
     args = parser.parse_args()
 
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
 
-    run_all(dry_run=args.dry_run, citizen_filter=args.citizen)
+    try:
+        _select_formulas(args.capability)
+    except ValueError as e:
+        parser.error(str(e))
+
+    if args.replay:
+        if not (args.replay / MANIFEST_NAME).exists():
+            parser.error(f"No snapshot in {args.replay}")
+        replay(args.replay, citizen_filter=args.citizen, capabilities=args.capability)
+        return
+
+    run_all(
+        dry_run=args.dry_run, citizen_filter=args.citizen, workers=args.workers,
+        timeout=args.timeout, capabilities=args.capability, record_dir=args.record,
+        report_path=args.report,
+    )
 
 
 if __name__ == "__main__":
@@ -43,13 +43,10 @@ import logging
 from dataclasses import dataclass, field
 from typing import Dict, List, Optional
 
-from falkordb import FalkorDB
+from services.falkordb_pool import get_graph
 
 logger = logging.getLogger("graphcare.frequencies")
 
-FALKORDB_HOST = "localhost"
-FALKORDB_PORT = 6379
-
 
 @dataclass
 class Frequency:
@@ -219,8 +216,7 @@ def apply_frequency(handle: str, freq: Frequency, treatment_id: str) -> Frequenc
     """
     node_ids = []
     try:
-        db = FalkorDB(host=FALKORDB_HOST, port=FALKORDB_PORT)
-        graph = db.select_graph(f"brain_{handle}")
+        graph = get_graph(f"brain_{handle}")
     except Exception as e:
         return FrequencyResult(success=False, nodes_created=0, error=str(e))
 
@@ -297,8 +293,7 @@ def apply_frequency(handle: str, freq: Frequency, treatment_id: str) -> Frequenc
 def rollback_treatment(handle: str, treatment_id: str) -> int:
     """Remove all nodes created by a treatment. Full reversal."""
     try:
-        db = FalkorDB(host=FALKORDB_HOST, port=FALKORDB_PORT)
-        graph = db.select_graph(f"brain_{handle}")
+        graph = get_graph(f"brain_{handle}")
         result = graph.query(
             "MATCH (n {treatment_id: $tid}) DELETE n",
             {"tid": treatment_id},
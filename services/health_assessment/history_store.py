@@ -0,0 +1,251 @@
+"""
+History Store — daily health records in one SQLite file.
+
+DOCS: docs/assessment/daily_citizen_health/ALGORITHM_Daily_Citizen_Health.md
+
+Replaces the one-JSON-file-per-citizen-per-day tree
+(<history_dir>/<citizen_id>/<date>.json) with a single table:
+
+    daily_records(citizen_id, date, aggregate_score, capability_scores,
+                  intervention_sent, stress_stimulus, brain_reachable)
+    PRIMARY KEY (citizen_id, date)      one citizen's series, one record
+    INDEX (date, citizen_id)            one day across the population
+
+capability_scores is the JSON object {capability_id: score | null}; use
+json_extract() for ad-hoc per-capability queries. Records are written once
+per citizen per day (a re-run of the same day replaces them).
+
+Opening a new store next to an existing JSON tree imports the tree; the
+import can also be run by hand:
+
+    python -m services.health_assessment.history_store migrate [--dir DIR]
+"""
+
+import argparse
+import json
+import logging
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+logger = logging.getLogger("graphcare.health.history")
+
+DEFAULT_HISTORY_DIR = "/home/mind-protocol/graphcare/data/health_history"
+DB_NAME = "health_history.sqlite3"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_records (
+    citizen_id        TEXT    NOT NULL,
+    date              TEXT    NOT NULL,
+    aggregate_score   REAL    NOT NULL,
+    capability_scores TEXT    NOT NULL,
+    intervention_sent INTEGER NOT NULL DEFAULT 0,
+    stress_stimulus   REAL    NOT NULL DEFAULT 0,
+    brain_reachable   INTEGER NOT NULL DEFAULT 1,
+    PRIMARY KEY (citizen_id, date)
+);
+CREATE INDEX IF NOT EXISTS daily_records_by_date ON daily_records (date, citizen_id, aggregate_score);
+"""
+
+_COLUMNS = (
+    "citizen_id, date, aggregate_score, capability_scores, "
+    "intervention_sent, stress_stimulus, brain_reachable"
+)
+
+
+@dataclass
+class DailyRecord:
+    citizen_id: str
+    date: str
+    aggregate_score: float
+    capability_scores: Dict[str, Optional[float]]
+    intervention_sent: bool = False
+    stress_stimulus: float = 0.0
+    brain_reachable: bool = True
+
+
+def _to_row(record: DailyRecord) -> tuple:
+    return (
+        record.citizen_id,
+        record.date,
+        record.aggregate_score,
+        json.dumps(record.capability_scores, separators=(",", ":")),
+        int(record.intervention_sent),
+        record.stress_stimulus,
+        int(record.brain_reachable),
+    )
+
+
+def _from_row(row: tuple) -> DailyRecord:
+    return DailyRecord(
+        citizen_id=row[0],
+        date=row[1],
+        aggregate_score=row[2],
+        capability_scores=json.loads(row[3]),
+        intervention_sent=bool(row[4]),
+        stress_stimulus=row[5],
+        brain_reachable=bool(row[6]),
+    )
+
+
+def _in_clause(values: List[str]) -> str:
+    return ",".join("?" * len(values))
+
+
+class HistoryStore:
+    """
+    SQLite-backed daily record store. One connection, shared by threads
+    (daily_check_runner --workers) behind a lock; WAL mode lets analysis
+    scripts read while a run writes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+    # ── Writes ──────────────────────────────────────────────────────────
+
+    def save(self, record: DailyRecord):
+        self.save_many([record])
+
+    def save_many(self, records: Iterable[DailyRecord], replace: bool = True) -> int:
+        """Write records in one transaction. replace=False keeps existing (citizen, date) rows."""
+        rows = [_to_row(r) for r in records]
+        verb = "INSERT OR REPLACE" if replace else "INSERT OR IGNORE"
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                before = self._conn.total_changes
+                self._conn.executemany(f"{verb} INTO daily_records ({_COLUMNS}) VALUES (?,?,?,?,?,?,?)", rows)
+                written = self._conn.total_changes - before
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return written
+
+    # ── Reads ───────────────────────────────────────────────────────────
+
+    def _select(self, where: str, params: tuple, order: str = "") -> List[DailyRecord]:
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM daily_records WHERE {where} {order}", params
+            ).fetchall()
+        return [_from_row(row) for row in rows]
+
+    def load(self, citizen_id: str, d: date) -> Optional[DailyRecord]:
+        records = self._select("citizen_id = ? AND date = ?", (citizen_id, d.isoformat()))
+        return records[0] if records else None
+
+    def load_day(self, d: date, citizen_ids: Optional[List[str]] = None) -> Dict[str, DailyRecord]:
+        """{citizen_id: record} for one day (all citizens, or those listed), in one query."""
+        where, params = "date = ?", (d.isoformat(),)
+        if citizen_ids is not None:
+            citizen_ids = list(citizen_ids)
+            where += f" AND citizen_id IN ({_in_clause(citizen_ids)})"
+            params += tuple(citizen_ids)
+        return {r.citizen_id: r for r in self._select(where, params)}
+
+    def load_range(
+        self, start: date, end: date, citizen_ids: Optional[List[str]] = None,
+    ) -> List[DailyRecord]:
+        """Records with start <= date <= end, ordered by citizen then date."""
+        where, params = "date BETWEEN ? AND ?", (start.isoformat(), end.isoformat())
+        if citizen_ids is not None:
+            citizen_ids = list(citizen_ids)
+            where += f" AND citizen_id IN ({_in_clause(citizen_ids)})"
+            params += tuple(citizen_ids)
+        return self._select(where, params, "ORDER BY citizen_id, date")
+
+    def aggregate_series(self, start: date, end: date) -> Dict[str, List[Tuple[str, float]]]:
+        """{citizen_id: [(date, aggregate_score), ...]} for start..end, without decoding capabilities."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT citizen_id, date, aggregate_score FROM daily_records "
+                "WHERE date BETWEEN ? AND ? ORDER BY citizen_id, date",
+                (start.isoformat(), end.isoformat()),
+            ).fetchall()
+        series: Dict[str, List[Tuple[str, float]]] = {}
+        for citizen_id, day, score in rows:
+            series.setdefault(citizen_id, []).append((day, score))
+        return series
+
+    def count(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT count(*) FROM daily_records").fetchone()[0]
+
+    # ── Migration ───────────────────────────────────────────────────────
+
+    def migrate_json_tree(self, root: Path) -> Tuple[int, int]:
+        """
+        Import <root>/<citizen_id>/<date>.json records. Rows already in the
+        store win. Returns (records imported, files that failed to parse).
+        """
+        records: List[DailyRecord] = []
+        failed = 0
+        for path in sorted(Path(root).glob("*/*.json")):
+            try:
+                records.append(DailyRecord(**json.loads(path.read_text())))
+            except Exception as e:
+                logger.warning(f"Skipping history file {path}: {e}")
+                failed += 1
+        imported = self.save_many(records, replace=False)
+        logger.info(f"Imported {imported} of {len(records)} history records from {root}")
+        return imported, failed
+
+
+_stores: Dict[Path, HistoryStore] = {}
+_stores_lock = threading.Lock()
+
+
+def history_dir() -> Path:
+    """GRAPHCARE_HISTORY_DIR, read on each call (so it can be changed after import)."""
+    return Path(os.getenv("GRAPHCARE_HISTORY_DIR", DEFAULT_HISTORY_DIR))
+
+
+def get_store(directory: Optional[Path] = None) -> HistoryStore:
+    """
+    The store in `directory` (default: history_dir()), opened once per
+    process. A newly created store imports any JSON tree already there.
+    """
+    history_dir_ = Path(directory) if directory is not None else history_dir()
+    with _stores_lock:
+        store = _stores.get(history_dir_)
+        if store is None:
+            is_new = not (history_dir_ / DB_NAME).exists()
+            store = HistoryStore(history_dir_ / DB_NAME)
+            if is_new and any(history_dir_.glob("*/*.json")):
+                store.migrate_json_tree(history_dir_)
+            _stores[history_dir_] = store
+        return store
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Health history store")
+    sub = parser.add_subparsers(dest="command", required=True)
+    migrate = sub.add_parser("migrate", help="Import the <citizen>/<date>.json tree")
+    migrate.add_argument("--dir", type=Path, help="History directory (default: GRAPHCARE_HISTORY_DIR)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
+    root = args.dir or history_dir()
+    store = HistoryStore(root / DB_NAME)
+    imported, failed = store.migrate_json_tree(root)
+    print(f"{imported} records imported, {failed} files skipped, {store.count()} in {store.path}")
+
+
+if __name__ == "__main__":
+    main()
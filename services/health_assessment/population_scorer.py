@@ -0,0 +1,105 @@
+"""
+Population Scorer — every capability formula over every citizen at once.
+
+DOCS: docs/assessment/daily_citizen_health/ALGORITHM_Daily_Citizen_Health.md
+
+score_citizen is the scalar path: each registered formula on one
+(BrainStats, BehaviorStats) pair. score_population runs the same formula
+functions once per formula for the whole population: they are called with
+stand-ins whose fields are NumPy columns (one element per citizen), so
+their arithmetic is evaluated element-wise.
+
+Each element goes through the same IEEE operations in the same order as the
+scalar path (+, -, *, / and abs are exact per element; _cap, _min, _max and
+CapabilityScore's clamp keep Python's min/max semantics), so the scores are
+bit-identical. A formula that cannot run on columns (a builtin min(), a
+branch on a stat) or that hits a floating-point error (where Python would
+raise, or quietly give inf/nan) is scored per citizen instead.
+"""
+
+import logging
+from operator import attrgetter
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from .brain_topology_reader import BrainStats
+from .universe_moment_reader import BehaviorStats
+from .scoring_formulas.registry import FormulaFn, all_formulas
+
+logger = logging.getLogger("graphcare.health.scoring")
+
+
+def score_citizen(
+    citizen_id: str,
+    brain: BrainStats,
+    behavior: BehaviorStats,
+    formulas: Optional[Dict[str, FormulaFn]] = None,
+) -> Dict[str, Optional[float]]:
+    """{capability_id: total} for one citizen; None where a formula raised."""
+    if formulas is None:
+        formulas = all_formulas()
+    scores: Dict[str, Optional[float]] = {}
+    for cap_id, formula_fn in formulas.items():
+        try:
+            scores[cap_id] = formula_fn(brain, behavior).total
+        except Exception as e:
+            logger.warning(f"Formula {cap_id} failed for {citizen_id}: {e}")
+            scores[cap_id] = None
+    return scores
+
+
+class _Columns:
+    """Stand-in for a stats object: each field read is that field for every citizen."""
+
+    def __init__(self, rows: list):
+        self._rows = rows
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        column = np.array(list(map(attrgetter(name), self._rows)))
+        if column.dtype.kind not in "biuf":
+            raise TypeError(f"{name} is not numeric ({column.dtype})")
+        setattr(self, name, column)
+        return column
+
+
+def _score_columns(formula_fn: FormulaFn, brains: _Columns, behaviors: _Columns, n: int) -> np.ndarray:
+    with np.errstate(divide="raise", invalid="raise", over="ignore", under="ignore"):
+        total = formula_fn(brains, behaviors).total
+    total = np.asarray(total, dtype=np.float64)
+    if total.shape not in ((), (n,)):
+        raise ValueError(f"shape {total.shape}, expected ({n},)")
+    return np.broadcast_to(total, (n,))
+
+
+def score_population(
+    citizen_ids: List[str],
+    brains: Dict[str, BrainStats],
+    behaviors: Dict[str, BehaviorStats],
+    formulas: Optional[Dict[str, FormulaFn]] = None,
+) -> Dict[str, Dict[str, Optional[float]]]:
+    """
+    {citizen_id: {capability_id: total}} for citizen_ids — the same values
+    score_citizen gives for each citizen, computed a formula at a time.
+    """
+    if formulas is None:
+        formulas = all_formulas()
+    n = len(citizen_ids)
+    brain_rows = [brains[cid] for cid in citizen_ids]
+    behavior_rows = [behaviors[cid] for cid in citizen_ids]
+    brain_columns, behavior_columns = _Columns(brain_rows), _Columns(behavior_rows)
+
+    columns: Dict[str, list] = {}
+    for cap_id, formula_fn in formulas.items():
+        try:
+            columns[cap_id] = _score_columns(formula_fn, brain_columns, behavior_columns, n).tolist()
+        except Exception as e:
+            logger.debug(f"Formula {cap_id} scored per citizen ({type(e).__name__}: {e})")
+            columns[cap_id] = [
+                score_citizen(cid, brain, behavior, {cap_id: formula_fn})[cap_id]
+                for cid, brain, behavior in zip(citizen_ids, brain_rows, behavior_rows)
+            ]
+
+    cap_ids = tuple(columns)
+    rows = zip(*columns.values()) if cap_ids else ((),) * n
+    return {cid: dict(zip(cap_ids, row)) for cid, row in zip(citizen_ids, rows)}
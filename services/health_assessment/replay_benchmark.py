@@ -0,0 +1,135 @@
+"""
+Replay Benchmark — time the CPU side of the daily check on a snapshot.
+
+DOCS: docs/assessment/daily_citizen_health/ALGORITHM_Daily_Citizen_Health.md
+
+Runs each offline stage of the pipeline over a snapshot recorded with
+`daily_check_runner --record <dir>`, with no graph or history I/O, so formula
+and scoring changes can be profiled apart from FalkorDB latency:
+
+    load              read and decode the snapshot
+    score_citizen     every formula, one citizen at a time (scalar path)
+    score_population  every formula over the whole population (NumPy path)
+    aggregate         aggregate + delta vs the recorded yesterday records
+    compose           intervention messages for the citizens that need one
+    replay            daily_check_runner.replay_snapshot end to end
+
+Usage:
+    python -m services.health_assessment.replay_benchmark snapshots/2026-03-14
+    python -m services.health_assessment.replay_benchmark snapshots/2026-03-14 --repeat 10 --scale 40
+"""
+
+import argparse
+import statistics
+import time
+from dataclasses import replace
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from services.health_assessment.daily_check_runner import replay_snapshot
+from services.health_assessment.aggregator import aggregate_scores
+from services.health_assessment.intervention_composer import compose_intervention, should_intervene
+from services.health_assessment.population_scorer import score_citizen, score_population
+from services.health_assessment.scoring_formulas.registry import FormulaFn, all_formulas
+from services.health_assessment.snapshot import MANIFEST_NAME, Snapshot, load_snapshot
+
+
+def scale_snapshot(snapshot: Snapshot, factor: int) -> Snapshot:
+    """The snapshot's citizens `factor` times over (copies suffixed ~1, ~2, ...), for larger populations."""
+    scaled = Snapshot(snapshot.today, [], {}, {}, {})
+    for copy in range(factor):
+        for citizen_id in snapshot.citizen_ids:
+            new_id = f"{citizen_id}~{copy}" if copy else citizen_id
+            scaled.citizen_ids.append(new_id)
+            scaled.brains[new_id] = snapshot.brains[citizen_id]
+            scaled.behaviors[new_id] = snapshot.behaviors[citizen_id]
+            if citizen_id in snapshot.yesterday_records:
+                scaled.yesterday_records[new_id] = replace(
+                    snapshot.yesterday_records[citizen_id], citizen_id=new_id,
+                )
+    return scaled
+
+
+def _time(fn: Callable[[], object], repeat: int) -> List[float]:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def run_benchmark(
+    snapshot_dir: Path, repeat: int = 5, scale: int = 1, formulas: Optional[Dict[str, FormulaFn]] = None,
+) -> Dict[str, List[float]]:
+    """{stage: [seconds per repeat]} for each stage listed in the module docstring."""
+    formulas = formulas if formulas is not None else all_formulas()
+    timings = {"load": _time(lambda: load_snapshot(snapshot_dir), repeat)}
+    snapshot = scale_snapshot(load_snapshot(snapshot_dir), scale)
+    ids = snapshot.citizen_ids
+
+    def score_each():
+        for cid in ids:
+            score_citizen(cid, snapshot.brains[cid], snapshot.behaviors[cid], formulas)
+
+    scores = score_population(ids, snapshot.brains, snapshot.behaviors, formulas)
+    aggregates = {
+        cid: aggregate_scores(cid, scores[cid], snapshot.today, snapshot.yesterday_records)
+        for cid in ids
+    }
+    needing = [cid for cid in ids if should_intervene(aggregates[cid].aggregate, aggregates[cid].drops)]
+
+    def aggregate_all():
+        for cid in ids:
+            aggregate_scores(cid, scores[cid], snapshot.today, snapshot.yesterday_records)
+
+    def compose_all():
+        for cid in needing:
+            agg = aggregates[cid]
+            compose_intervention(
+                citizen_id=cid, aggregate=agg.aggregate, yesterday_aggregate=agg.yesterday_aggregate,
+                drops=agg.drops, capability_scores=scores[cid],
+                brain=snapshot.brains[cid], behavior=snapshot.behaviors[cid],
+            )
+
+    timings["score_citizen"] = _time(score_each, repeat)
+    timings["score_population"] = _time(
+        lambda: score_population(ids, snapshot.brains, snapshot.behaviors, formulas), repeat,
+    )
+    timings["aggregate"] = _time(aggregate_all, repeat)
+    timings["compose"] = _time(compose_all, repeat)
+    timings["replay"] = _time(lambda: replay_snapshot(snapshot, formulas), repeat)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark offline scoring on a recorded snapshot")
+    parser.add_argument("snapshot", type=Path, help="Snapshot directory (daily_check_runner --record)")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per stage (default: 5)")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="Replicate the snapshot's citizens this many times (default: 1)")
+    parser.add_argument("--capability", action="append", metavar="ID",
+                        help="Benchmark only this capability (repeatable)")
+    args = parser.parse_args()
+
+    if not (args.snapshot / MANIFEST_NAME).exists():
+        parser.error(f"No snapshot in {args.snapshot}")
+    formulas = all_formulas()
+    if args.capability:
+        unknown = [cap_id for cap_id in args.capability if cap_id not in formulas]
+        if unknown:
+            parser.error(f"Unknown capabilities: {', '.join(unknown)}")
+        formulas = {cap_id: formulas[cap_id] for cap_id in args.capability}
+
+    timings = run_benchmark(args.snapshot, max(1, args.repeat), max(1, args.scale), formulas)
+    citizens = len(load_snapshot(args.snapshot).citizen_ids) * max(1, args.scale)
+    print(f"{citizens} citizens, {len(formulas)} formulas, best / median of {max(1, args.repeat)}")
+    for stage, seconds in timings.items():
+        per = citizens if stage != "load" else citizens // max(1, args.scale)
+        best, median = min(seconds), statistics.median(seconds)
+        print(f"  {stage:<17} {best * 1e3:9.1f} ms {median * 1e3:9.1f} ms  "
+              f"{best / max(1, per) * 1e6:8.1f} us/citizen")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,188 @@
+"""
+Run Report — per-citizen, per-stage timing of a daily check run.
+
+DOCS: docs/assessment/daily_citizen_health/ALGORITHM_Daily_Citizen_Health.md
+
+Each citizen check is split into spans, one per pipeline stage that ran
+for it:
+
+    fetch_brain      brain topology reads (the fields the formulas need)
+    fetch_universe   per-citizen universe queries (not run after a batch read)
+    score            capability formulas
+    aggregate        aggregate + delta (a history read if not prefetched)
+    intervene        full brain re-read, compose, send (unhealthy citizens only)
+    stimulus         stress stimulus write (not in dry runs)
+    save             history record write (not in dry runs)
+
+Each span records its wall time and the FalkorDB queries the worker
+thread sent during it (falkordb_pool.thread_query_count). Run-level steps
+outside the per-citizen checks (the population universe read, yesterday's
+history prefetch) are recorded as phases. A timed-out check's thread may
+still be recording spans while the report is built, so spans are written,
+and copied for reports, under the RunTimer's lock.
+
+build_report() summarises a run as JSON: p50/p95/max per stage, phases,
+and the 10 slowest citizens. export_to_monitor() feeds the stage timings
+to a services.monitoring.resolver_health.ResolverHealthMonitor.
+"""
+
+import json
+import logging
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterator, List
+
+from services.falkordb_pool import thread_query_count
+
+logger = logging.getLogger("graphcare.health.report")
+
+STAGES = ("fetch_brain", "fetch_universe", "score", "aggregate", "intervene", "stimulus", "save")
+SLOWEST_COUNT = 10
+
+
+@dataclass
+class CitizenTiming:
+    """Seconds and FalkorDB queries per stage for one citizen's check (`lock` guards both)."""
+
+    citizen_id: str
+    seconds: Dict[str, float] = field(default_factory=dict)
+    queries: Dict[str, int] = field(default_factory=dict)
+    outcome: str = "ok"
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    @property
+    def total(self) -> float:
+        return sum(self.seconds.values())
+
+    @contextmanager
+    def span(self, stage: str) -> Iterator[None]:
+        """Time the enclosed block as `stage` (on the thread that runs the check)."""
+        start, queries = time.perf_counter(), thread_query_count()
+        try:
+            yield
+        finally:
+            seconds, queries = time.perf_counter() - start, thread_query_count() - queries
+            with self.lock:
+                self.seconds[stage] = self.seconds.get(stage, 0.0) + seconds
+                self.queries[stage] = self.queries.get(stage, 0) + queries
+
+
+class RunTimer:
+    """The CitizenTimings of one run (created from any worker thread), plus run-level phases."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.citizens: Dict[str, CitizenTiming] = {}
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.started_at = time.time()
+
+    def citizen(self, citizen_id: str) -> CitizenTiming:
+        timing = CitizenTiming(citizen_id, lock=self._lock)
+        with self._lock:
+            self.citizens[citizen_id] = timing
+        return timing
+
+    def timings(self) -> List[CitizenTiming]:
+        """Copies of the CitizenTimings, taken while no span is being recorded."""
+        with self._lock:
+            return [
+                CitizenTiming(t.citizen_id, dict(t.seconds), dict(t.queries), t.outcome)
+                for t in self.citizens.values()
+            ]
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        start, queries = time.perf_counter(), thread_query_count()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self.phases[name] = {
+                    "seconds": time.perf_counter() - start,
+                    "queries": thread_query_count() - queries,
+                }
+
+    def set_outcomes(self, outcomes: Dict[str, str]):
+        with self._lock:
+            for citizen_id, outcome in outcomes.items():
+                if citizen_id in self.citizens:
+                    self.citizens[citizen_id].outcome = outcome
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * q))]
+
+
+def build_report(timer: RunTimer, **run_info) -> dict:
+    """
+    The run report: run_info (date, counts, ...) and, in seconds, each
+    stage's p50/p95/max over the citizens it ran for, phases, and the
+    slowest citizens by total check time.
+    """
+    citizens = timer.timings()
+    with timer._lock:
+        phases = {name: dict(values) for name, values in timer.phases.items()}
+
+    stages = {}
+    for stage in STAGES:
+        values = sorted(t.seconds[stage] for t in citizens if stage in t.seconds)
+        if not values:
+            continue
+        stages[stage] = {
+            "count": len(values),
+            "total": sum(values),
+            "p50": _percentile(values, 0.50),
+            "p95": _percentile(values, 0.95),
+            "max": values[-1],
+            "queries": sum(t.queries.get(stage, 0) for t in citizens),
+        }
+
+    slowest = sorted(citizens, key=lambda t: t.total, reverse=True)[:SLOWEST_COUNT]
+    return {
+        **run_info,
+        "started_at": timer.started_at,
+        "elapsed_seconds": time.time() - timer.started_at,
+        "citizens_timed": len(citizens),
+        "phases": phases,
+        "stages": stages,
+        "slowest": [
+            {
+                "citizen_id": t.citizen_id,
+                "outcome": t.outcome,
+                "total": t.total,
+                "seconds": t.seconds,
+                "queries": t.queries,
+            }
+            for t in slowest
+        ],
+    }
+
+
+def format_stages(report: dict) -> str:
+    """One log line: p50/p95/max milliseconds and query count per stage."""
+    parts = [
+        f"{stage} {s['p50'] * 1e3:.0f}/{s['p95'] * 1e3:.0f}/{s['max'] * 1e3:.0f} ({s['queries']}q)"
+        for stage, s in report["stages"].items()
+    ]
+    return "  Stages p50/p95/max ms: " + (", ".join(parts) or "none")
+
+
+def write_report(report: dict, path: Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(report, indent=2) + "\n")
+    logger.info(f"Run report written to {path}")
+
+
+def export_to_monitor(timer: RunTimer, monitor, org: str = "graphcare"):
+    """
+    Record every stage span as a query of resolver "health_<stage>" on a
+    ResolverHealthMonitor (latency in ms; spans of failed or timed-out
+    checks count as errors), so stage latencies get its p50/p95/p99 checks.
+    """
+    for t in timer.timings():
+        for stage, seconds in t.seconds.items():
+            monitor.record_query(org, f"health_{stage}", seconds * 1000, success=t.outcome == "ok")
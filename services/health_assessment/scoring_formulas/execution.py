@@ -10,7 +10,7 @@ Capabilities scored:
   - exec_fix_found (T3): Fixes problems found along the way
 """
 
-from .registry import register, CapabilityScore, _cap
+from .registry import register, CapabilityScore, _cap, _min
 from ..brain_topology_reader import BrainStats
 from ..universe_moment_reader import BehaviorStats
 
@@ -70,7 +70,7 @@ def score_test_before_claim(brain: BrainStats, behavior: BehaviorStats) -> Capab
     # Brain
     process = _cap(brain.process_count, 8) * 20
     concept_process = _cap(brain.concept_count, 15) * 10
-    low_rush = (1.0 - min(1.0, brain.ambition * 0.5)) * 10  # not rushing (overly ambitious)
+    low_rush = (1.0 - _min(1.0, brain.ambition * 0.5)) * 10  # not rushing (overly ambitious)
     brain_score = process + concept_process + low_rush
 
     # Behavior
@@ -9,7 +9,7 @@ Capabilities scored:
   - pc_help_other_ais (T6): Shares knowledge and mentors other AIs
 """
 
-from .registry import register, CapabilityScore, _cap
+from .registry import register, CapabilityScore, _cap, _min
 from ..brain_topology_reader import BrainStats
 from ..universe_moment_reader import BehaviorStats
 
@@ -52,7 +52,7 @@ def score_ask_help_human(brain: BrainStats, behavior: BehaviorStats) -> Capabili
     social = brain.social_need * 15                     # willing to ask
     desire_e = brain.desire_energy * 12                 # has goals worth seeking help for
     # Some frustration = aware of own limits (but not too much)
-    awareness = min(1.0, brain.frustration * 2) * 13    # recognizes when stuck
+    awareness = _min(1.0, brain.frustration * 2) * 13    # recognizes when stuck
     brain_score = social + desire_e + awareness
 
     # Behavior component (0-60)
@@ -5,10 +5,26 @@ DOCS: docs/assessment/daily_citizen_health/ALGORITHM_Daily_Citizen_Health.md
 
 Each formula takes (BrainStats, BehaviorStats) → CapabilityScore.
 Formula output: brain_component (0-40) + behavior_component (0-60) = total (0-100).
+
+The stats fields a formula reads are found by reading its source
+(formula_fields): readers then compute only what the run's formulas need.
+A formula that hands brain/behavior to other code counts as reading every
+field.
+
+Formulas are also evaluated over whole populations (population_scorer), with
+NumPy arrays in place of the stats fields. Keep them to arithmetic, abs() and
+the helpers below (_cap, _min, _max); a builtin min()/max() or a branch on a
+stat still scores correctly, but one citizen at a time.
 """
 
+import ast
+import inspect
+import textwrap
 from dataclasses import dataclass
-from typing import Callable, Dict, Optional
+from functools import lru_cache
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+import numpy as np
 
 from ..brain_topology_reader import BrainStats
 from ..universe_moment_reader import BehaviorStats
@@ -21,8 +37,8 @@ class CapabilityScore:
     total: float             # 0-100
 
     def __post_init__(self):
-        self.brain_component = max(0.0, min(40.0, self.brain_component))
-        self.behavior_component = max(0.0, min(60.0, self.behavior_component))
+        self.brain_component = _max(0.0, _min(40.0, self.brain_component))
+        self.behavior_component = _max(0.0, _min(60.0, self.behavior_component))
         self.total = self.brain_component + self.behavior_component
 
 
@@ -49,8 +65,75 @@ def all_formulas() -> Dict[str, FormulaFn]:
     return dict(_REGISTRY)
 
 
+# (brain fields, behavior fields); None = every field
+Fields = Tuple[Optional[FrozenSet[str]], Optional[FrozenSet[str]]]
+
+
+@lru_cache(maxsize=None)
+def formula_fields(fn: FormulaFn) -> Fields:
+    """
+    The BrainStats and BehaviorStats fields `fn` reads: every `brain.<name>`
+    and `behavior.<name>` in its source (for its first two parameters). A
+    parameter used any other way — passed on, getattr'd — or a formula whose
+    source can't be read gives None (all fields) for that side.
+    """
+    try:
+        tree = ast.parse(textwrap.dedent(inspect.getsource(fn)))
+    except (OSError, TypeError, SyntaxError):
+        return None, None
+    func = tree.body[0]
+    if not isinstance(func, (ast.FunctionDef, ast.AsyncFunctionDef)):
+        return None, None
+    params = [arg.arg for arg in func.args.posonlyargs + func.args.args][:2]
+
+    reads = {param: set() for param in params}
+    attribute_uses = {param: 0 for param in params}
+    name_uses = {param: 0 for param in params}
+    for node in ast.walk(func):
+        if isinstance(node, ast.Attribute) and isinstance(node.value, ast.Name) and node.value.id in reads:
+            reads[node.value.id].add(node.attr)
+            attribute_uses[node.value.id] += 1
+        elif isinstance(node, ast.Name) and node.id in name_uses:
+            name_uses[node.id] += 1
+
+    sides = []
+    for param, stats_type in zip(params, (BrainStats, BehaviorStats)):
+        known = set(stats_type.__dataclass_fields__)
+        if name_uses[param] != attribute_uses[param] or not reads[param] <= known:
+            sides.append(None)
+        else:
+            sides.append(frozenset(reads[param]))
+    sides += [None] * (2 - len(sides))
+    return sides[0], sides[1]
+
+
+def required_fields(formulas: Iterable[FormulaFn]) -> Fields:
+    """Union of formula_fields over `formulas` (None where any formula needs every field)."""
+    brain: Optional[FrozenSet[str]] = frozenset()
+    behavior: Optional[FrozenSet[str]] = frozenset()
+    for fn in formulas:
+        fn_brain, fn_behavior = formula_fields(fn)
+        brain = None if brain is None or fn_brain is None else brain | fn_brain
+        behavior = None if behavior is None or fn_behavior is None else behavior | fn_behavior
+    return brain, behavior
+
+
+def _min(bound: float, value):
+    """min(bound, value), also element-wise over an array (same result per element)."""
+    if isinstance(value, np.ndarray):
+        return np.where(value < bound, value, bound)
+    return min(bound, value)
+
+
+def _max(bound: float, value):
+    """max(bound, value), also element-wise over an array (same result per element)."""
+    if isinstance(value, np.ndarray):
+        return np.where(value > bound, value, bound)
+    return max(bound, value)
+
+
 def _cap(value: float, ceiling: float) -> float:
     """Normalize value to 0-1 range with a ceiling."""
     if ceiling <= 0:
         return 0.0
-    return min(1.0, value / ceiling)
+    return _min(1.0, value / ceiling)
@@ -0,0 +1,122 @@
+"""
+Snapshot — the graph reads of a daily run, saved for offline replay.
+
+DOCS: docs/assessment/daily_citizen_health/ALGORITHM_Daily_Citizen_Health.md
+
+`daily_check_runner --record <dir>` saves every checked citizen's full
+BrainStats and BehaviorStats, and the yesterday record its aggregate was
+compared with. `daily_check_runner --replay <dir>` scores, aggregates and
+composes interventions from the snapshot without FalkorDB or the history
+store, and replay_benchmark times those stages on it.
+
+Layout:
+
+    <dir>/manifest.json        {"format", "date", "recorded_at", "citizens"}
+    <dir>/citizens.jsonl.gz    one line per citizen, in registry order:
+                               {"citizen_id", "brain", "behavior", "yesterday"}
+
+Stats are stored field by field (floats as repr, so replay is exact); a
+field missing from an older snapshot takes its dataclass default, and one
+no longer in the dataclass is dropped.
+"""
+
+import gzip
+import json
+import logging
+import threading
+from dataclasses import asdict, dataclass, fields
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from .brain_topology_reader import BrainStats
+from .universe_moment_reader import BehaviorStats
+from .history_store import DailyRecord
+
+logger = logging.getLogger("graphcare.health.snapshot")
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = "manifest.json"
+CITIZENS_NAME = "citizens.jsonl.gz"
+
+
+@dataclass
+class Snapshot:
+    today: date
+    citizen_ids: List[str]
+    brains: Dict[str, BrainStats]
+    behaviors: Dict[str, BehaviorStats]
+    yesterday_records: Dict[str, DailyRecord]
+
+
+def _from_dict(cls, values: dict):
+    names = {f.name for f in fields(cls)}
+    return cls(**{k: v for k, v in values.items() if k in names})
+
+
+class SnapshotWriter:
+    """Collects citizens' stats as a run reads them (from any worker thread); write() saves them."""
+
+    def __init__(self, directory: Path, today: date):
+        self.directory = Path(directory)
+        self.today = today
+        self._lock = threading.Lock()
+        self._stats: Dict[str, tuple] = {}
+
+    def add(
+        self, citizen_id: str, brain: BrainStats, behavior: BehaviorStats, yesterday: Optional[DailyRecord] = None,
+    ):
+        """Record a completed check's stats and the yesterday record its aggregate was compared with."""
+        with self._lock:
+            self._stats[citizen_id] = (brain, behavior, yesterday)
+
+    def write(self, citizen_ids: List[str]) -> int:
+        """Save the recorded citizens, in citizen_ids order. Returns how many were saved."""
+        with self._lock:
+            stats = dict(self._stats)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        written = 0
+        with gzip.open(self.directory / CITIZENS_NAME, "wt", encoding="utf-8") as f:
+            for citizen_id in citizen_ids:
+                if citizen_id not in stats:
+                    continue
+                brain, behavior, yesterday = stats[citizen_id]
+                f.write(json.dumps({
+                    "citizen_id": citizen_id,
+                    "brain": asdict(brain),
+                    "behavior": asdict(behavior),
+                    "yesterday": asdict(yesterday) if yesterday else None,
+                }, separators=(",", ":")) + "\n")
+                written += 1
+        manifest = {
+            "format": FORMAT_VERSION,
+            "date": self.today.isoformat(),
+            "recorded_at": datetime.now(timezone.utc).isoformat(),
+            "citizens": written,
+        }
+        (self.directory / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2) + "\n")
+        logger.info(f"Snapshot of {written} citizens written to {self.directory}")
+        return written
+
+
+def load_snapshot(directory: Path, citizen_ids: Optional[List[str]] = None) -> Snapshot:
+    """Read a snapshot (all citizens, or those of citizen_ids that it has)."""
+    directory = Path(directory)
+    manifest = json.loads((directory / MANIFEST_NAME).read_text())
+    if manifest.get("format") != FORMAT_VERSION:
+        raise ValueError(f"Unsupported snapshot format {manifest.get('format')!r} in {directory}")
+    wanted = set(citizen_ids) if citizen_ids is not None else None
+
+    snapshot = Snapshot(date.fromisoformat(manifest["date"]), [], {}, {}, {})
+    with gzip.open(directory / CITIZENS_NAME, "rt", encoding="utf-8") as f:
+        for line in f:
+            entry = json.loads(line)
+            citizen_id = entry["citizen_id"]
+            if wanted is not None and citizen_id not in wanted:
+                continue
+            snapshot.citizen_ids.append(citizen_id)
+            snapshot.brains[citizen_id] = _from_dict(BrainStats, entry["brain"])
+            snapshot.behaviors[citizen_id] = _from_dict(BehaviorStats, entry["behavior"])
+            if entry["yesterday"]:
+                snapshot.yesterday_records[citizen_id] = _from_dict(DailyRecord, entry["yesterday"])
+    return snapshot
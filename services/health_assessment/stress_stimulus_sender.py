@@ -14,12 +14,10 @@ This is a stimulus, not a write. The brain integrates it through its own physics
 
 import logging
 
-from falkordb import FalkorDB
+from services.falkordb_pool import get_graph
 
 logger = logging.getLogger("graphcare.health.stimulus")
 
-FALKORDB_HOST = "localhost"
-FALKORDB_PORT = 6379
 STRESS_CAP = 0.5  # V4: never exceed this
 
 
@@ -42,8 +40,7 @@ def send_stress_stimulus(handle: str, stress_value: float):
         return
 
     try:
-        db = FalkorDB(host=FALKORDB_HOST, port=FALKORDB_PORT)
-        graph = db.select_graph(f"brain_{handle}")
+        graph = get_graph(f"brain_{handle}")
 
         # Create a stimulus node that the tick runner will pick up
         graph.query(
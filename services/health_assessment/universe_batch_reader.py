@@ -0,0 +1,407 @@
+"""
+Universe Batch Reader — behavior stats for the whole population in one pass.
+
+DOCS: docs/assessment/daily_citizen_health/ALGORITHM_Daily_Citizen_Health.md
+
+read_universe_moments() costs 4 graph queries per citizen. For a full daily
+run the universe graph is instead streamed once, in pages of node ids:
+
+    moments   id(m), created_at, permanence, hierarchy
+    authors   (:Actor)-[:LINK]->(moment)       actor–moment incidence
+    links     (moment)-[:LINK]->(target)       moment–space / moment–moment
+
+and every citizen's BehaviorStats is computed from those edge lists with
+NumPy: temporal weights are vectorised, per-actor sums are bincounts over
+the actor–moment incidence, and unique interlocutors are unions of
+per-target actor bitsets.
+
+Given the BehaviorStats fields a run needs, only their sections are
+computed (responses, spaces, interlocutors), and the moment links are not
+streamed at all when none of those is needed.
+
+Same observables and semantics as read_universe_moments(), with one clock
+reading for the whole population. Earliest-moment-in-space compares parsed
+times; the per-citizen query compares raw created_at values, which only
+differs in a universe that mixes numeric and ISO-string timestamps.
+Reads no content.
+"""
+
+import logging
+import time
+from typing import Dict, Iterable, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .universe_moment_reader import (
+    HALF_LIFE_HOURS,
+    LOOKBACK_DAYS,
+    BehaviorStats,
+    _get_graph,
+    _moment_age_hours,
+    _parts_for,
+)
+
+logger = logging.getLogger("graphcare.health.universe")
+
+PAGE_SIZE = 50_000          # node ids per streamed page
+BITSET_CHUNK_BYTES = 64 << 20  # working memory for the interlocutor unions
+
+_MOMENT_PAGE = """
+MATCH (m) WHERE id(m) >= $lo AND id(m) < $hi AND m.node_type = 'moment'
+RETURN id(m), m.id IS NOT NULL, m.created_at, m.permanence, m.hierarchy
+"""
+
+_AUTHOR_PAGE = """
+MATCH (m) WHERE id(m) >= $lo AND id(m) < $hi AND m.node_type = 'moment'
+MATCH (a:Actor)-[:LINK]->(m)
+RETURN id(m), a.id
+"""
+
+_LINK_PAGE = """
+MATCH (m) WHERE id(m) >= $lo AND id(m) < $hi AND m.node_type = 'moment'
+MATCH (m)-[:LINK]->(t)
+RETURN id(m), id(t), CASE WHEN t.node_type = 'space' THEN t.id END
+"""
+
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+# ── Streaming ───────────────────────────────────────────────────────────
+
+
+def _floats(values: list, default: float) -> np.ndarray:
+    """Numeric column as float64, None → default."""
+    array = np.array(values, dtype=np.float64) if values else np.zeros(0)
+    array[np.isnan(array)] = default
+    return array
+
+
+def _encode(values: list, index: Dict) -> np.ndarray:
+    """Codes for `values` from `index` (extended with new values); -1 for None."""
+    lookup = {None: -1}
+    for value in dict.fromkeys(values):
+        if value is not None:
+            lookup[value] = index.setdefault(value, len(index))
+    return np.fromiter(map(lookup.__getitem__, values), dtype=np.int64, count=len(values))
+
+
+class UniverseEdges:
+    """
+    Universe moments and their edges as compact columns, filled one page of
+    query rows at a time (rows are dropped once converted):
+
+        moment rows  [node_id, has_id, created_at, permanence, hierarchy]
+        author rows  [moment node_id, actor id]
+        link rows    [moment node_id, target node_id, space id or None]
+
+    Actor and space ids are coded as they arrive (actor_index, space_index).
+    """
+
+    def __init__(self):
+        self.actor_index: Dict = {}
+        self.space_index: Dict = {}
+        self._pages: Dict[str, list] = {}
+        self.add([], [], [])  # every column exists, with its dtype
+
+    def _append(self, **columns):
+        for name, column in columns.items():
+            self._pages.setdefault(name, []).append(column)
+
+    def add(self, moment_rows: Sequence, author_rows: Sequence, link_rows: Sequence):
+        created = [row[2] for row in moment_rows]
+        try:
+            created = np.array(created, dtype=np.float64)
+        except (TypeError, ValueError):  # ISO strings
+            created = np.array(created, dtype=object)
+        self._append(
+            moment=np.array([row[0] for row in moment_rows], dtype=np.int64),
+            has_id=np.array([bool(row[1]) for row in moment_rows], dtype=bool),
+            has_ts=np.array([row[2] is not None for row in moment_rows], dtype=bool),
+            created=created,
+            permanence=_floats([row[3] for row in moment_rows], 0.5),
+            hierarchy=_floats([row[4] for row in moment_rows], 0.0),
+            author_moment=np.array([row[0] for row in author_rows], dtype=np.int64),
+            author_actor=_encode([row[1] for row in author_rows], self.actor_index),
+            link_source=np.array([row[0] for row in link_rows], dtype=np.int64),
+            link_target=np.array([row[1] for row in link_rows], dtype=np.int64),
+            link_space=_encode([row[2] or None for row in link_rows], self.space_index),
+        )
+
+    def column(self, name: str) -> np.ndarray:
+        pages = self._pages[name]
+        if len(pages) > 1:
+            self._pages[name] = [np.concatenate(pages)]
+        return self._pages[name][0]
+
+    def __len__(self) -> int:
+        return len(self.column("moment"))
+
+
+def stream_universe_edges(graph, page_size: int = PAGE_SIZE, links: bool = True) -> UniverseEdges:
+    """
+    Read the universe's moments, authors and (if `links`) moment links page
+    by page over node ids, so neither a reply nor the client ever holds all
+    rows at once.
+
+    Raises on query failure: a partial stream would silently zero citizens.
+    """
+    top = graph.query("MATCH (n) RETURN max(id(n))").result_set
+    max_id = top[0][0] if top and top[0][0] is not None else -1
+
+    edges = UniverseEdges()
+    for lo in range(0, max_id + 1, page_size):
+        params = {"lo": lo, "hi": lo + page_size}
+        edges.add(
+            graph.query(_MOMENT_PAGE, params).result_set,
+            graph.query(_AUTHOR_PAGE, params).result_set,
+            graph.query(_LINK_PAGE, params).result_set if links else [],
+        )
+    return edges
+
+
+def read_universe_behavior(
+    citizen_ids: Iterable[str], fields: Optional[Iterable[str]] = None,
+) -> Dict[str, BehaviorStats]:
+    """
+    BehaviorStats for every citizen in `citizen_ids` from one pass over the
+    universe graph, with `fields` (default: all) computed. Citizens with no
+    moments get BehaviorStats().
+
+    Raises if the graph cannot be read (callers fall back to per-citizen reads).
+    """
+    citizen_ids = list(citizen_ids)
+    parts = _parts_for(fields)
+    graph = _get_graph()
+
+    t0 = time.perf_counter()
+    edges = stream_universe_edges(graph, links=bool(parts - {"moments"}))
+    t1 = time.perf_counter()
+    stats = behavior_stats_from_edges(edges, citizen_ids, fields=fields)
+    t2 = time.perf_counter()
+
+    skipped = [part for part in ("responses", "spaces", "interlocutors") if part not in parts]
+    logger.info(
+        f"Universe batch: {len(edges)} moments, {len(edges.column('author_moment'))} author links, "
+        f"{len(edges.column('link_source'))} moment links; stream {t1 - t0:.1f}s, "
+        f"compute {t2 - t1:.1f}s for {len(citizen_ids)} citizens"
+        + (f"; skipped {', '.join(skipped)}" if skipped else "")
+    )
+    return stats
+
+
+# ── Vectorised stats ────────────────────────────────────────────────────
+
+
+def _ages_hours(created: np.ndarray, now: float) -> np.ndarray:
+    """Age in hours per created_at (None → NaN), as _moment_age_hours()."""
+    if created.dtype != object:
+        return (now - created) / 3600
+    return np.array(
+        [np.nan if c is None else _moment_age_hours(c, now) for c in created],
+        dtype=np.float64,
+    )
+
+
+def _lookup(sorted_ids: np.ndarray, ids: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Positions of `ids` in `sorted_ids`, and a mask of the ids found."""
+    if len(sorted_ids) == 0:
+        return np.zeros(len(ids), dtype=np.int64), np.zeros(len(ids), dtype=bool)
+    pos = np.minimum(np.searchsorted(sorted_ids, ids), len(sorted_ids) - 1)
+    return pos, sorted_ids[pos] == ids
+
+
+class _Incidence:
+    """Moment → author rows, CSR-style (authors of moment i: actor[start[i]:start[i] + degree[i]])."""
+
+    def __init__(self, moments: np.ndarray, actors: np.ndarray, n_moments: int):
+        order = np.argsort(moments, kind="stable")
+        self.actor = actors[order]
+        self.degree = np.bincount(moments, minlength=n_moments)
+        self.start = np.cumsum(self.degree) - self.degree
+
+    def expand(self, moments: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """For each author of each moment in `moments`: (position in `moments`, actor)."""
+        n = self.degree[moments]
+        item = np.repeat(np.arange(len(moments)), n)
+        offset = np.arange(int(n.sum())) - np.repeat(np.cumsum(n) - n, n)
+        return item, self.actor[self.start[moments][item] + offset]
+
+
+def _unique_pairs(a: np.ndarray, b: np.ndarray, b_size: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Distinct (a, b) pairs, sorted by a then b."""
+    pairs = np.sort(a.astype(np.int64) * b_size + b)
+    pairs = pairs[np.r_[True, pairs[1:] != pairs[:-1]][:len(pairs)]]
+    return pairs // b_size, pairs % b_size
+
+
+def _bit(positions: np.ndarray) -> np.ndarray:
+    """uint64 words with bit (position % 64) set."""
+    return np.left_shift(np.uint64(1), (positions & 63).astype(np.uint64))
+
+
+def _interlocutor_counts(actor: np.ndarray, target: np.ndarray, n_actors: int) -> np.ndarray:
+    """
+    Per actor: other actors sharing at least one target, given distinct
+    (actor, target) pairs sorted by target then actor.
+
+    Each shared target's actors become a bitset; an actor's interlocutors are
+    the OR of its targets' bitsets, minus itself. Targets are processed in
+    chunks so the gathered bitsets stay within BITSET_CHUNK_BYTES.
+    """
+    counts = np.zeros(n_actors, dtype=np.int64)
+    if len(target) == 0:
+        return counts
+
+    # Only targets reached by two or more actors can connect anyone
+    starts = np.flatnonzero(np.r_[True, target[1:] != target[:-1]])
+    sizes = np.diff(np.r_[starts, len(target)])
+    shared = np.repeat(sizes >= 2, sizes)
+    actor, target = actor[shared], target[shared]
+    if len(target) == 0:
+        return counts
+    starts = np.flatnonzero(np.r_[True, target[1:] != target[:-1]])
+
+    width = (n_actors + 63) // 64
+    reached = np.zeros((n_actors, width), dtype=np.uint64)
+    budget = max(1, BITSET_CHUNK_BYTES // (8 * width))
+    bounds = np.r_[starts, len(target)]
+    t = 0
+    while t < len(starts):
+        # Whole targets, at least one, up to `budget` pairs
+        end = max(t + 1, int(np.searchsorted(bounds, bounds[t] + budget, side="right")) - 1)
+        lo, hi = bounds[t], bounds[end]
+        chunk_actor = actor[lo:hi]
+        chunk_target = np.repeat(np.arange(end - t), np.diff(bounds[t:end + 1]))
+
+        bits = np.zeros((end - t, width), dtype=np.uint64)
+        np.bitwise_or.at(bits, (chunk_target, chunk_actor >> 6), _bit(chunk_actor))
+
+        order = np.argsort(chunk_actor, kind="stable")
+        by_actor = chunk_actor[order]
+        first = np.flatnonzero(np.r_[True, by_actor[1:] != by_actor[:-1]])
+        reached[by_actor[first]] |= np.bitwise_or.reduceat(bits[chunk_target[order]], first, axis=0)
+        t = end
+
+    everyone = np.arange(n_actors)
+    has_self = (reached[everyone, everyone >> 6] & _bit(everyone)) != 0
+    return _POPCOUNT[reached.view(np.uint8)].sum(axis=1, dtype=np.int64) - has_self
+
+
+def behavior_stats_from_edges(
+    edges: UniverseEdges,
+    citizen_ids: Optional[Iterable[str]] = None,
+    now: Optional[float] = None,
+    fields: Optional[Iterable[str]] = None,
+) -> Dict[str, BehaviorStats]:
+    """
+    Compute BehaviorStats for many actors at once.
+
+    Args:
+        edges: Streamed universe (see UniverseEdges)
+        citizen_ids: Actors to report (default: every actor with a moment)
+        now: Clock for temporal weights (default: time.time())
+        fields: BehaviorStats fields to compute (default: all; the others
+            keep their defaults)
+
+    Mirrors read_universe_moments() field by field.
+    """
+    now = time.time() if now is None else now
+    parts = _parts_for(fields)
+    columns: Dict[str, np.ndarray] = {}
+    window_hours = LOOKBACK_DAYS * 24
+
+    # Moments, indexed 0..M-1 by sorted node id
+    order = np.argsort(edges.column("moment"), kind="stable")
+    node_ids = edges.column("moment")[order]
+    n_moments = len(node_ids)
+    has_id = edges.column("has_id")[order]
+    has_ts = edges.column("has_ts")[order]
+    age = _ages_hours(edges.column("created")[order], now)
+    permanence = edges.column("permanence")[order]
+    hierarchy = edges.column("hierarchy")[order]
+
+    in_window = has_ts & (np.nan_to_num(age, nan=np.inf) <= window_hours)
+    weight = np.zeros(n_moments)
+    weight[in_window] = 0.5 ** (age[in_window] / HALF_LIFE_HOURS)
+
+    # Actor–moment incidence (one row per authoring edge, like the per-citizen query)
+    author_moment, found = _lookup(node_ids, edges.column("author_moment"))
+    actor = edges.column("author_actor")
+    has_actor = np.bincount(author_moment[found], minlength=n_moments) > 0
+    keep = found & (actor >= 0)
+    moment, actor = author_moment[keep], actor[keep]
+    actor_index = edges.actor_index
+    n_actors = len(actor_index)
+    authors = _Incidence(moment, actor, n_moments)
+
+    def per_actor(values) -> np.ndarray:
+        return np.bincount(actor, weights=values, minlength=n_actors)
+
+    row_weight = weight[moment]
+    active = per_actor(has_ts[moment]) > 0
+    columns["total_moments_w"] = per_actor(row_weight)
+    columns["high_permanence_w"] = per_actor(row_weight * (permanence[moment] >= 0.7))
+    columns["elaborative_tentative_w"] = per_actor(
+        row_weight * ((hierarchy[moment] >= 0.3) & (permanence[moment] < 0.5))
+    )
+
+    # Moment → target links
+    link_source, found = _lookup(node_ids, edges.column("link_source"))
+    link_source = link_source[found]
+    link_target = edges.column("link_target")[found]
+    link_space = edges.column("link_space")[found]
+
+    # Responses: a parent moment authored by another actor
+    if "responses" in parts:
+        child, is_moment = _lookup(node_ids, link_target)
+        parent, child = link_source[is_moment], child[is_moment]
+        item, parent_actor = authors.expand(parent)
+        child, parent_actor = _unique_pairs(child[item], parent_actor, max(n_actors, 1))
+        parent_authors = np.bincount(child, minlength=n_moments)
+        sole_author = np.full(n_moments, -1, dtype=np.int64)
+        sole_author[child] = parent_actor
+        is_response = in_window[moment] & has_id[moment] & (
+            (parent_authors[moment] >= 2)
+            | ((parent_authors[moment] == 1) & (sole_author[moment] != actor))
+        )
+        windowed = per_actor(in_window[moment])
+        columns["response_rate"] = per_actor(is_response) / np.maximum(windowed, 1)
+        columns["self_initiated_w"] = per_actor(row_weight * ~is_response)
+
+    # Spaces, and who posted first in each
+    if "spaces" in parts:
+        is_space = link_space >= 0
+        space, space_moment = link_space[is_space], link_source[is_space]
+        n_spaces = max(len(edges.space_index), 1)
+
+        item, space_actor = authors.expand(space_moment)
+        space_actor, _ = _unique_pairs(space_actor, space[item], n_spaces)
+        columns["distinct_space_count"] = np.bincount(space_actor, minlength=n_actors)
+
+        dated = has_ts[space_moment] & has_actor[space_moment]
+        first_age = np.full(n_spaces, -np.inf)
+        np.maximum.at(first_age, space[dated], age[space_moment[dated]])
+        earliest = dated & (age[space_moment] == first_age[space])
+        item, first_actor = authors.expand(space_moment[earliest])
+        first_actor, first_space = _unique_pairs(first_actor, space[earliest][item], n_spaces)
+        columns["spaces_created"] = np.bincount(first_actor, minlength=n_actors)
+        columns["first_in_space_w"] = np.bincount(
+            first_actor, weights=0.5 ** (first_age[first_space] / HALF_LIFE_HOURS), minlength=n_actors,
+        )
+
+    # Unique interlocutors: actors whose moments link to a common node
+    if "interlocutors" in parts:
+        item, target_actor = authors.expand(link_source)
+        target, target_actor = _unique_pairs(link_target[item], target_actor, max(n_actors, 1))
+        columns["unique_interlocutors"] = _interlocutor_counts(target_actor, target, n_actors)
+
+    if citizen_ids is None:
+        citizen_ids = list(actor_index)
+    stats: Dict[str, BehaviorStats] = {}
+    for citizen_id in citizen_ids:
+        i = actor_index.get(citizen_id)
+        if i is None or not active[i]:
+            stats[citizen_id] = BehaviorStats()
+            continue
+        stats[citizen_id] = BehaviorStats(**{name: column[i].item() for name, column in columns.items()})
+    return stats
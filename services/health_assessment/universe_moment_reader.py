@@ -11,16 +11,16 @@ Temporal weighting: 7-day half-life exponential decay.
 
 import logging
 import math
+import threading
 import time
+from collections import Counter
 from dataclasses import dataclass
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set
 
-from falkordb import FalkorDB
+from services.falkordb_pool import get_graph
 
 logger = logging.getLogger("graphcare.health.universe")
 
-FALKORDB_HOST = "localhost"
-FALKORDB_PORT = 6379
 UNIVERSE_GRAPH = "lumina_prime"
 HALF_LIFE_HOURS = 168  # 7 days
 LOOKBACK_DAYS = 30
@@ -28,8 +28,7 @@ LOOKBACK_DAYS = 30
 
 def _get_graph():
     """Get FalkorDB graph for the universe."""
-    db = FalkorDB(host=FALKORDB_HOST, port=FALKORDB_PORT)
-    return db.select_graph(UNIVERSE_GRAPH)
+    return get_graph(UNIVERSE_GRAPH)
 
 
 def _safe_query(graph, cypher: str, params: Optional[dict] = None) -> list:
@@ -46,18 +45,20 @@ def temporal_weight(age_hours: float) -> float:
     return max(0.0, 0.5 ** (age_hours / HALF_LIFE_HOURS))
 
 
-def _moment_age_hours(created_at) -> float:
-    """Convert created_at to age in hours."""
+def _moment_age_hours(created_at, now: Optional[float] = None) -> float:
+    """Convert created_at to age in hours (at `now`, default: the current time)."""
+    if now is None:
+        now = time.time()
     if created_at is None:
         return LOOKBACK_DAYS * 24  # max age
     if isinstance(created_at, str):
         try:
             from datetime import datetime, timezone
             dt = datetime.fromisoformat(created_at.replace("Z", "+00:00"))
-            return (time.time() - dt.timestamp()) / 3600
+            return (now - dt.timestamp()) / 3600
         except Exception:
             return LOOKBACK_DAYS * 24
-    return (time.time() - float(created_at)) / 3600
+    return (now - float(created_at)) / 3600
 
 
 @dataclass
@@ -75,135 +76,227 @@ class BehaviorStats:
     spaces_created: int = 0
 
 
-def read_universe_moments(citizen_id: str) -> BehaviorStats:
-    """Compute behavioral stats for a citizen from universe graph topology."""
-    try:
-        graph = _get_graph()
-    except Exception as e:
-        logger.error(f"Cannot reach universe graph: {e}")
-        return BehaviorStats()
-
-    cutoff_seconds = time.time() - (LOOKBACK_DAYS * 86400)
-
-    # All moments by this actor in the last 30 days
-    all_moments = _safe_query(
-        graph,
-        """
-        MATCH (a:Actor {id: $cid})-[:LINK]->(m)
-        WHERE m.node_type = 'moment' AND m.created_at IS NOT NULL
-        RETURN m.id, m.created_at, m.permanence, m.hierarchy
-        """,
-        {"cid": citizen_id},
-    )
-
-    if not all_moments:
-        return BehaviorStats()
-
-    total_w = 0.0
-    self_initiated_w = 0.0
-    high_perm_w = 0.0
-    elab_tent_w = 0.0
-    moment_ids = []
-
-    for row in all_moments:
-        m_id, created_at, permanence, hierarchy = row[0], row[1], row[2], row[3]
-        age_h = _moment_age_hours(created_at)
-        if age_h > LOOKBACK_DAYS * 24:
-            continue
-
-        tw = temporal_weight(age_h)
-        total_w += tw
-        moment_ids.append(m_id)
-
-        # High permanence (>= 0.7) = definitive outputs (like commits)
-        perm_val = float(permanence) if permanence is not None else 0.5
-        if perm_val >= 0.7:
-            high_perm_w += tw
-
-        # Elaborative + tentative = proposals
-        hier_val = float(hierarchy) if hierarchy is not None else 0.0
-        if hier_val >= 0.3 and perm_val < 0.5:
-            elab_tent_w += tw
-
-    # Self-initiated: moments with no incoming link from another actor's moment
-    response_count = 0
-    for m_id in moment_ids:
-        parents = _safe_query(
-            graph,
+# ── Reader ──────────────────────────────────────────────────────────────
+#
+# Four queries, each run only when a requested field needs it:
+#
+#     moments        the citizen's moments (every field; none → all zero)
+#     responses      self_initiated_w, response_rate
+#     spaces         distinct_space_count, first_in_space_w, spaces_created
+#     interlocutors  unique_interlocutors
+
+FIELD_PARTS = {
+    "total_moments_w": ("moments",),
+    "high_permanence_w": ("moments",),
+    "elaborative_tentative_w": ("moments",),
+    "self_initiated_w": ("moments", "responses"),
+    "response_rate": ("moments", "responses"),
+    "distinct_space_count": ("moments", "spaces"),
+    "first_in_space_w": ("moments", "spaces"),
+    "spaces_created": ("moments", "spaces"),
+    "unique_interlocutors": ("moments", "interlocutors"),
+}
+PARTS = ("moments", "responses", "spaces", "interlocutors")
+
+_stats_lock = threading.Lock()
+_query_stats: Counter = Counter()
+
+
+def universe_query_stats() -> Dict[str, int]:
+    """
+    Process-wide counters for per-citizen reads: "readers", "queries" and,
+    per part, how many readers ran it (skips are readers - part).
+    """
+    with _stats_lock:
+        return {"readers": 0, "queries": 0, **{part: 0 for part in PARTS}, **_query_stats}
+
+
+def _count(**increments: int):
+    with _stats_lock:
+        _query_stats.update(increments)
+
+
+def _parts_for(fields: Optional[Iterable[str]]) -> Set[str]:
+    if fields is None:
+        return set(PARTS)
+    parts: Set[str] = set()
+    for name in fields:
+        parts.update(FIELD_PARTS.get(name, PARTS))
+    return parts
+
+
+class UniverseMomentReader:
+    """
+    One citizen's behavior, read on demand: stats(fields) runs the queries
+    those fields need that haven't run yet. Weights are taken at one clock
+    reading, so repeated stats() calls agree.
+    """
+
+    def __init__(self, citizen_id: str):
+        self.citizen_id = citizen_id
+        self.now = time.time()
+        self._values: Dict[str, float] = {}
+        self._parts: Set[str] = set()
+        self._has_moments = False
+        self._moment_ids: List[str] = []
+        self._moment_weights: List[float] = []
+        try:
+            self._graph = _get_graph()
+        except Exception as e:
+            logger.error(f"Cannot reach universe graph: {e}")
+            self._graph = None
+            return
+        _count(readers=1)
+
+    def _query(self, cypher: str, params: dict) -> list:
+        _count(queries=1)
+        return _safe_query(self._graph, cypher, params)
+
+    def stats(self, fields: Optional[Iterable[str]] = None) -> BehaviorStats:
+        """BehaviorStats with `fields` (default: all) computed; the others keep their defaults."""
+        if self._graph is None:
+            return BehaviorStats()
+        parts = _parts_for(fields)
+        if "moments" not in self._parts:
+            self._read("moments")
+        if self._has_moments:
+            for part in PARTS[1:]:
+                if part in parts and part not in self._parts:
+                    self._read(part)
+        return BehaviorStats(**self._values)
+
+    def _read(self, part: str):
+        getattr(self, f"_read_{part}")()
+        self._parts.add(part)
+        _count(**{part: 1})
+
+    def _read_moments(self):
+        # All moments by this actor in the last 30 days
+        all_moments = self._query(
             """
-            MATCH (parent)-[:LINK]->(m {id: $mid})
-            WHERE parent.node_type = 'moment'
-            MATCH (other_actor:Actor)-[:LINK]->(parent)
-            WHERE other_actor.id <> $cid
-            RETURN count(parent)
+            MATCH (a:Actor {id: $cid})-[:LINK]->(m)
+            WHERE m.node_type = 'moment' AND m.created_at IS NOT NULL
+            RETURN m.id, m.created_at, m.permanence, m.hierarchy
             """,
-            {"mid": m_id, "cid": citizen_id},
+            {"cid": self.citizen_id},
         )
-        has_parent = parents and parents[0][0] and parents[0][0] > 0
-        if has_parent:
-            response_count += 1
-        else:
-            age_h = 0  # approximate — already weighted above
-            self_initiated_w += temporal_weight(0)  # rough: count as recent
-
-    # Recalculate self_initiated_w properly
-    # (above is approximate, but functional for v1)
-    total_moments = len(moment_ids)
-    response_rate = response_count / max(total_moments, 1)
-
-    # Distinct spaces
-    spaces = _safe_query(
-        graph,
-        """
-        MATCH (a:Actor {id: $cid})-[:LINK]->(m)-[:LINK]->(s)
-        WHERE m.node_type = 'moment' AND s.node_type = 'space'
-        RETURN DISTINCT s.id
-        """,
-        {"cid": citizen_id},
-    )
-    distinct_spaces = [row[0] for row in spaces if row[0]]
-
-    # First in space
-    first_in_space_w = 0.0
-    spaces_created = 0
-    for space_id in distinct_spaces:
-        first = _safe_query(
-            graph,
+
+        total_w = 0.0
+        high_perm_w = 0.0
+        elab_tent_w = 0.0
+        for row in all_moments:
+            m_id, created_at, permanence, hierarchy = row[0], row[1], row[2], row[3]
+            age_h = _moment_age_hours(created_at, self.now)
+            if age_h > LOOKBACK_DAYS * 24:
+                continue
+
+            tw = temporal_weight(age_h)
+            total_w += tw
+            self._moment_ids.append(m_id)
+            self._moment_weights.append(tw)
+
+            # High permanence (>= 0.7) = definitive outputs (like commits)
+            perm_val = float(permanence) if permanence is not None else 0.5
+            if perm_val >= 0.7:
+                high_perm_w += tw
+
+            # Elaborative + tentative = proposals
+            hier_val = float(hierarchy) if hierarchy is not None else 0.0
+            if hier_val >= 0.3 and perm_val < 0.5:
+                elab_tent_w += tw
+
+        self._has_moments = bool(all_moments)
+        if all_moments:
+            self._values.update(
+                total_moments_w=total_w,
+                high_permanence_w=high_perm_w,
+                elaborative_tentative_w=elab_tent_w,
+            )
+
+    def _read_responses(self):
+        # Responses: moments with an incoming link from another actor's moment.
+        # One query for the whole list (was one query per moment).
+        responses = []
+        if self._moment_ids:
+            responses = self._query(
+                """
+                MATCH (a:Actor {id: $cid})-[:LINK]->(m)
+                WHERE m.id IN $mids
+                MATCH (parent)-[:LINK]->(m)
+                WHERE parent.node_type = 'moment'
+                MATCH (other_actor:Actor)-[:LINK]->(parent)
+                WHERE other_actor.id <> $cid
+                RETURN DISTINCT m.id
+                """,
+                {"cid": self.citizen_id, "mids": list(set(self._moment_ids))},
+            )
+        response_ids = {row[0] for row in responses}
+
+        # Self-initiated moments keep their own temporal weight
+        self_initiated_w = 0.0
+        response_count = 0
+        for m_id, tw in zip(self._moment_ids, self._moment_weights):
+            if m_id in response_ids:
+                response_count += 1
+            else:
+                self_initiated_w += tw
+
+        self._values.update(
+            self_initiated_w=self_initiated_w,
+            response_rate=response_count / max(len(self._moment_ids), 1),
+        )
+
+    def _read_spaces(self):
+        # Distinct spaces, each with its earliest moment(s) by anyone.
+        # One query (was one "who was first" query per space).
+        spaces = self._query(
             """
-            MATCH (a:Actor)-[:LINK]->(m)-[:LINK]->(s {id: $sid})
+            MATCH (a:Actor {id: $cid})-[:LINK]->(cm)-[:LINK]->(s)
+            WHERE cm.node_type = 'moment' AND s.node_type = 'space' AND s.id IS NOT NULL
+            WITH DISTINCT s
+            OPTIONAL MATCH (:Actor)-[:LINK]->(m)-[:LINK]->(s)
             WHERE m.node_type = 'moment' AND m.created_at IS NOT NULL
-            RETURN a.id, m.created_at
-            ORDER BY m.created_at ASC
-            LIMIT 1
+            WITH s, min(m.created_at) AS first_at
+            OPTIONAL MATCH (first_actor:Actor)-[:LINK]->(m)-[:LINK]->(s)
+            WHERE m.node_type = 'moment' AND m.created_at = first_at
+            RETURN s.id, first_at, collect(DISTINCT first_actor.id)
             """,
-            {"sid": space_id},
+            {"cid": self.citizen_id},
+        )
+        first_in_space = {}
+        for space_id, first_at, first_actors in spaces:
+            if space_id:
+                first_in_space[space_id] = first_at if self.citizen_id in first_actors else None
+
+        # First in space (ties: any of the earliest moments is the citizen's)
+        first_in_space_w = 0.0
+        spaces_created = 0
+        for first_at in first_in_space.values():
+            if first_at is not None:
+                first_in_space_w += temporal_weight(_moment_age_hours(first_at, self.now))
+                spaces_created += 1
+
+        self._values.update(
+            distinct_space_count=len(first_in_space),
+            first_in_space_w=first_in_space_w,
+            spaces_created=spaces_created,
         )
-        if first and first[0][0] == citizen_id:
-            age_h = _moment_age_hours(first[0][1])
-            first_in_space_w += temporal_weight(age_h)
-            spaces_created += 1
-
-    # Unique interlocutors
-    interlocutors = _safe_query(
-        graph,
-        """
-        MATCH (a:Actor {id: $cid})-[:LINK]->(m)-[:LINK]->(s)<-[:LINK]-(m2)<-[:LINK]-(other:Actor)
-        WHERE m.node_type = 'moment' AND m2.node_type = 'moment'
-        AND other.id <> $cid
-        RETURN count(DISTINCT other.id)
-        """,
-        {"cid": citizen_id},
-    )
-    unique_interloc = interlocutors[0][0] if interlocutors and interlocutors[0][0] else 0
-
-    return BehaviorStats(
-        total_moments_w=total_w,
-        self_initiated_w=self_initiated_w,
-        response_rate=response_rate,
-        high_permanence_w=high_perm_w,
-        elaborative_tentative_w=elab_tent_w,
-        distinct_space_count=len(distinct_spaces),
-        first_in_space_w=first_in_space_w,
-        unique_interlocutors=unique_interloc,
-        spaces_created=spaces_created,
-    )
+
+    def _read_interlocutors(self):
+        interlocutors = self._query(
+            """
+            MATCH (a:Actor {id: $cid})-[:LINK]->(m)-[:LINK]->(s)<-[:LINK]-(m2)<-[:LINK]-(other:Actor)
+            WHERE m.node_type = 'moment' AND m2.node_type = 'moment'
+            AND other.id <> $cid
+            RETURN count(DISTINCT other.id)
+            """,
+            {"cid": self.citizen_id},
+        )
+        self._values["unique_interlocutors"] = (
+            interlocutors[0][0] if interlocutors and interlocutors[0][0] else 0
+        )
+
+
+def read_universe_moments(citizen_id: str, fields: Optional[Iterable[str]] = None) -> BehaviorStats:
+    """Compute behavioral stats (`fields`, default: all) for a citizen from universe graph topology."""
+    return UniverseMomentReader(citizen_id).stats(fields)
@@ -0,0 +1 @@
+from .core import engine
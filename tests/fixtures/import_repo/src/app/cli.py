@@ -0,0 +1,5 @@
+import app.core
+from app.core import Engine, util
+from app import *
+import not_installed_anywhere
+from helpers import tool
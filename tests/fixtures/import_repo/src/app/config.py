@@ -0,0 +1,5 @@
+import json
+from .missing import thing
+
+DEBUG = False
+settings = {}
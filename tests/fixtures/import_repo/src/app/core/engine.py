@@ -0,0 +1,7 @@
+import os
+from ..config import settings
+from . import util
+
+
+class Engine:
+    pass
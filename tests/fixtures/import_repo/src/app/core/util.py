@@ -0,0 +1,2 @@
+# Absolute import from above the import root (src/ layout)
+from app.config import DEBUG
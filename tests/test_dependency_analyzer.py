@@ -0,0 +1,443 @@
+"""
+Tests for the dependency analyzer: call resolution, import graph, cycles, coupling.
+
+No repository checkout needed — small sources are run through the Python AST
+extractor in memory, or graphs are built by hand.
+
+DOCS: tools/extractors/dependency_analyzer.py
+"""
+
+import random
+import sys
+from pathlib import Path
+from textwrap import dedent
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.extractors.dependency_analyzer import (
+    CallGraphBuilder,
+    CalleeResolver,
+    CircularDependencyDetector,
+    CouplingMetricsCalculator,
+    ImportGraphBuilder,
+    ModuleIndex,
+    group_by_path,
+)
+from tools.extractors.python_ast_extractor import PythonASTExtractor, file_result_to_dict
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _extract(sources):
+    """{file path: extraction dict} for {file path: source}, as the analyzer loads it."""
+    return {
+        path: file_result_to_dict(PythonASTExtractor(Path(path), dedent(source)).extract())
+        for path, source in sources.items()
+    }
+
+
+# ── CalleeResolver ───────────────────────────────────────────────────────────
+
+
+RESOLVER_REPO = {
+    "pkg/__init__.py": """
+        from .models import Model
+    """,
+    "pkg/base.py": """
+        class Base:
+            def __init__(self):
+                self.validate()
+
+            def save(self):
+                return self.validate()
+
+            def validate(self):
+                return True
+    """,
+    "pkg/models.py": """
+        from .base import Base
+
+        class Model(Base):
+            def save(self):
+                super().save()
+                return self.validate()
+
+            @classmethod
+            def create(cls):
+                return cls.build()
+
+            @classmethod
+            def build(cls):
+                return cls()
+
+        def helper():
+            return 1
+    """,
+    "pkg/util.py": """
+        def fmt(value):
+            return str(value)
+
+        class Runner:
+            def run(self):
+                pass
+    """,
+    "jobs.py": """
+        class Job:
+            def run(self):
+                pass
+
+        def fmt(value):
+            return repr(value)
+    """,
+    "app.py": """
+        import json
+        import pkg.util
+        import pkg.util as u
+        from pkg import Model
+        from pkg.util import fmt
+        from os.path import join
+
+        def main(obj):
+            pass
+    """,
+    "star.py": """
+        from pkg.util import *
+
+        def go():
+            return fmt(0)
+    """,
+}
+
+
+@pytest.fixture
+def resolver():
+    files = _extract(RESOLVER_REPO)
+    modules = ModuleIndex(files, "", external_names={"json", "os"})
+    return CalleeResolver(files, modules, function_id=CallGraphBuilder.function_id)
+
+
+class TestCalleeResolver:
+
+    def test_self_and_cls_methods(self, resolver):
+        assert resolver.resolve("pkg/models.py", "Model", "self.validate") == ["pkg/base.py:Base.validate"]
+        assert resolver.resolve("pkg/models.py", "Model", "cls.build") == ["pkg/models.py:Model.build"]
+        # Own override first, not the base method
+        assert resolver.resolve("pkg/models.py", "Model", "self.save") == ["pkg/models.py:Model.save"]
+
+    def test_super_method(self, resolver):
+        assert resolver.resolve("pkg/models.py", "Model", "super().save") == ["pkg/base.py:Base.save"]
+        assert resolver.resolve("pkg/base.py", "Base", "super().save") == []
+
+    def test_module_qualified_calls(self, resolver):
+        assert resolver.resolve("app.py", None, "u.fmt") == ["pkg/util.py:fmt"]
+        assert resolver.resolve("app.py", None, "pkg.util.fmt") == ["pkg/util.py:fmt"]
+
+    def test_imported_names(self, resolver):
+        assert resolver.resolve("app.py", None, "fmt") == ["pkg/util.py:fmt"]
+        # Re-exported through pkg/__init__.py; the constructor is inherited
+        assert resolver.resolve("app.py", None, "Model") == ["pkg/base.py:Base.__init__"]
+        assert resolver.resolve("app.py", None, "Model.create") == ["pkg/models.py:Model.create"]
+        assert resolver.resolve("star.py", None, "fmt") == ["pkg/util.py:fmt"]
+
+    def test_local_definition_wins(self, resolver):
+        assert resolver.resolve("jobs.py", None, "fmt") == ["jobs.py:fmt"]
+
+    def test_external_and_builtin(self, resolver):
+        for call in ("json.dumps", "join", "len", "print"):
+            assert resolver.resolve("app.py", None, call) == []
+        assert resolver.stats.external == 4
+        assert resolver.stats.unresolved == 0
+
+    def test_unresolved(self, resolver):
+        assert resolver.resolve("app.py", None, "missing") == []
+        assert resolver.resolve("app.py", None, "obj.missing") == []
+        assert (resolver.stats.unresolved, resolver.stats.external) == (2, 0)
+
+    def test_name_only_guess(self, resolver):
+        # Not imported into app.py: the only top-level `helper` in the repository
+        assert resolver.resolve("app.py", None, "helper") == ["pkg/models.py:helper"]
+
+    def test_ambiguous(self, resolver):
+        assert sorted(resolver.resolve("app.py", None, "obj.run")) == ["jobs.py:Job.run", "pkg/util.py:Runner.run"]
+        assert (resolver.stats.resolved, resolver.stats.ambiguous) == (1, 1)
+
+    def test_too_many_candidates_link_nowhere(self):
+        sources = {f"m{i}.py": "class C:\n    def get(self):\n        pass\n" for i in range(3)}
+        files = _extract(sources)
+        resolver = CalleeResolver(files, ModuleIndex(files, "", external_names=()), max_guesses=2)
+        assert resolver.resolve("m0.py", None, "x.get") == []
+        assert resolver.stats.unresolved == 1
+
+    def test_remove_file(self, resolver):
+        files = _extract(RESOLVER_REPO)
+        resolver.remove_file("jobs.py", files["jobs.py"])
+        assert resolver.resolve("app.py", None, "obj.run") == ["pkg/util.py:Runner.run"]
+        resolver.add_file("jobs.py", files["jobs.py"])
+        assert len(resolver.resolve("app.py", None, "obj.run")) == 2
+
+    def test_call_graph_edges(self):
+        builder = CallGraphBuilder({"repo_path": "", "files": _extract(RESOLVER_REPO)})
+        graph = builder.build()
+        assert graph["pkg/models.py:Model.save"].callees == ["pkg/base.py:Base.save", "pkg/base.py:Base.validate"]
+        assert graph["star.py:go"].callees == ["pkg/util.py:fmt"]
+        assert sorted(graph["pkg/base.py:Base.validate"].called_by) == [
+            "pkg/base.py:Base.__init__", "pkg/base.py:Base.save", "pkg/models.py:Model.save",
+        ]
+
+
+# ── CircularDependencyDetector ───────────────────────────────────────────────
+
+
+def _reachable(adjacency, start):
+    """Nodes reachable from start by one or more edges."""
+    seen, frontier = set(), list(adjacency[start])
+    while frontier:
+        v = frontier.pop()
+        if v not in seen:
+            seen.add(v)
+            frontier.extend(adjacency[v])
+    return seen
+
+
+def _random_graph(rng, n, edges):
+    adjacency = [[] for _ in range(n)]
+    for _ in range(edges):
+        v, w = rng.randrange(n), rng.randrange(n)
+        if w not in adjacency[v]:
+            adjacency[v].append(w)
+    return adjacency
+
+
+def _shortest_cycle_length(adjacency, members):
+    """Edges in a shortest cycle through the component (BFS back to each start)."""
+    best = None
+    for start in members:
+        distance, frontier = {start: 0}, [start]
+        while frontier:
+            next_frontier = []
+            for v in frontier:
+                for w in adjacency[v]:
+                    if w == start:
+                        length = distance[v] + 1
+                        best = length if best is None else min(best, length)
+                    elif w in members and w not in distance:
+                        distance[w] = distance[v] + 1
+                        next_frontier.append(w)
+            frontier = next_frontier
+    return best
+
+
+class _Node:
+    def __init__(self, callees):
+        self.callees = callees
+
+
+class TestCircularDependencyDetector:
+
+    @pytest.mark.parametrize("seed", range(25))
+    def test_components_match_reachability(self, seed):
+        rng = random.Random(seed)
+        n = rng.randrange(1, 30)
+        adjacency = _random_graph(rng, n, rng.randrange(0, 2 * n))
+        reach = [_reachable(adjacency, v) for v in range(n)]
+
+        components = CircularDependencyDetector.strongly_connected_components(adjacency)
+        assert sorted(v for c in components for v in c) == list(range(n))
+        component_of = {v: k for k, c in enumerate(components) for v in c}
+        for v in range(n):
+            for w in range(n):
+                same = v == w or (w in reach[v] and v in reach[w])
+                assert (component_of[v] == component_of[w]) == same
+        # Reverse topological order: edges only lead to the same or an earlier component
+        for v in range(n):
+            assert all(component_of[w] <= component_of[v] for w in adjacency[v])
+
+        for component in components:
+            cycle = CircularDependencyDetector.shortest_cycle(adjacency, component)
+            if len(component) == 1 and component[0] not in adjacency[component[0]]:
+                continue
+            assert cycle[0] == cycle[-1]
+            assert set(cycle) <= set(component)
+            assert all(b in adjacency[a] for a, b in zip(cycle, cycle[1:]))
+            assert len(cycle) - 1 == _shortest_cycle_length(adjacency, set(component))
+
+    def test_self_loops(self):
+        adjacency = [[0, 1], [2], [1], [3]]
+        components = sorted(sorted(c) for c in CircularDependencyDetector.strongly_connected_components(adjacency))
+        assert components == [[0], [1, 2], [3]]
+        assert CircularDependencyDetector.shortest_cycle(adjacency, [0]) == [0, 0]
+        # A self-loop inside a larger component is the shortest cycle
+        assert CircularDependencyDetector.shortest_cycle([[1], [0, 1]], [0, 1]) == [1, 1]
+
+        graph = {"a": _Node(["a", "b"]), "b": _Node([]), "c": _Node(["c"])}
+        cycles = CircularDependencyDetector(graph).detect()
+        assert [(dep.cycle, dep.members, dep.severity) for dep in cycles] == [
+            (["a", "a"], ["a"], "high"), (["c", "c"], ["c"], "high"),
+        ]
+
+    def test_deep_chain(self):
+        """Far deeper than the recursion limit the recursive Tarjan hit."""
+        depth = sys.getrecursionlimit() * 20
+        chain = [[i + 1] for i in range(depth - 1)] + [[]]
+        components = CircularDependencyDetector.strongly_connected_components(chain)
+        assert len(components) == depth and components[0] == [depth - 1]
+
+        graph = {f"f{i}": _Node([f"f{(i + 1) % depth}"]) for i in range(depth)}
+        graph["f0"].callees.append("f2")  # chord: still one component
+        [dep] = CircularDependencyDetector(graph).detect()
+        assert len(dep.members) == depth and dep.severity == "low"
+        assert len(dep.cycle) == depth  # the chord skips f1
+        assert "f1" not in dep.cycle
+
+
+# ── ModuleIndex / import graph ───────────────────────────────────────────────
+
+
+IMPORT_REPO = Path(__file__).parent / "fixtures" / "import_repo"
+
+
+@pytest.fixture(scope="module")
+def import_files():
+    """Extraction of tests/fixtures/import_repo, keyed by absolute file path."""
+    return {
+        str(path): file_result_to_dict(PythonASTExtractor(path, path.read_text()).extract())
+        for path in sorted(IMPORT_REPO.rglob("*.py"))
+    }
+
+
+def _file(rel):
+    return str(IMPORT_REPO / rel)
+
+
+class TestModuleIndex:
+
+    @pytest.fixture
+    def modules(self, import_files):
+        return ModuleIndex(import_files, str(IMPORT_REPO), external_names={"os", "json"})
+
+    def test_module_names(self, modules):
+        assert modules.module_of[_file("src/app/__init__.py")] == "src.app"
+        assert modules.module_of[_file("src/app/core/engine.py")] == "src.app.core.engine"
+
+    def test_relative_imports(self, modules):
+        engine = _file("src/app/core/engine.py")
+        assert modules.absolute("..config", engine) == "src.app.config"
+        assert modules.absolute(".", engine) == "src.app.core"
+        # In a package __init__, "." is the package itself
+        assert modules.absolute(".engine", _file("src/app/core/__init__.py")) == "src.app.core.engine"
+        assert modules.lookup("..config", engine) == (ModuleIndex.INTERNAL, _file("src/app/config.py"))
+        assert modules.lookup(".missing", _file("src/app/config.py")) == (ModuleIndex.UNRESOLVED, None)
+
+    def test_package_init(self, modules):
+        assert modules.resolve("src.app.core") == _file("src/app/core/__init__.py")
+        assert modules.resolve("..", _file("src/app/core/util.py")) == _file("src/app/__init__.py")
+
+    def test_trailing_names(self, modules):
+        """Imports written relative to src/ resolve through the unique trailing name."""
+        assert modules.lookup("app.config") == (ModuleIndex.INTERNAL, _file("src/app/config.py"))
+        assert modules.lookup("app.core") == (ModuleIndex.INTERNAL, _file("src/app/core/__init__.py"))
+        assert modules.lookup("app.helpers") == (ModuleIndex.INTERNAL, _file("src/app/helpers.py"))
+        assert modules.lookup("helpers") == (ModuleIndex.AMBIGUOUS, None)
+
+    def test_external_and_unresolved(self, modules):
+        assert modules.lookup("os.path") == (ModuleIndex.EXTERNAL, None)
+        assert modules.lookup("not_installed_anywhere") == (ModuleIndex.UNRESOLVED, None)
+
+    def test_import_targets(self, modules, import_files):
+        cli = _file("src/app/cli.py")
+        imports = {imp["line_number"]: imp for imp in import_files[cli]["imports"]}
+        # from app.core import Engine, util: util is a submodule, Engine lives in the package
+        assert modules.import_targets(cli, imports[2]) == (
+            ModuleIndex.INTERNAL, [_file("src/app/core/__init__.py"), _file("src/app/core/util.py")],
+        )
+        assert modules.import_targets(cli, imports[3]) == (ModuleIndex.INTERNAL, [_file("src/app/__init__.py")])
+        assert modules.import_targets(cli, imports[5]) == (ModuleIndex.AMBIGUOUS, [])
+
+
+class TestImportGraph:
+
+    def test_edges(self, import_files):
+        builder = ImportGraphBuilder({"repo_path": str(IMPORT_REPO), "files": import_files}, IMPORT_REPO)
+        graph = builder.build()
+        assert {name: sorted(node.imports) for name, node in graph.items()} == {
+            "scripts/helpers.py": [],
+            "src/app/__init__.py": ["src/app/core/engine.py"],
+            "src/app/cli.py": ["src/app/__init__.py", "src/app/core/__init__.py", "src/app/core/util.py"],
+            "src/app/config.py": [],
+            "src/app/core/__init__.py": ["src/app/core/engine.py", "src/app/core/util.py"],
+            "src/app/core/engine.py": ["src/app/config.py", "src/app/core/util.py"],
+            "src/app/core/util.py": ["src/app/config.py"],
+            "src/app/helpers.py": [],
+        }
+        assert sorted(graph["src/app/config.py"].imported_by) == ["src/app/core/engine.py", "src/app/core/util.py"]
+
+        # 9 internal statements; os, json external; .missing, not_installed_anywhere unresolved; helpers ambiguous
+        resolution = builder.resolution
+        assert (resolution.resolved, resolution.external, resolution.unresolved, resolution.ambiguous) == (9, 2, 2, 1)
+
+
+# ── CouplingMetricsCalculator ────────────────────────────────────────────────
+
+
+def _fn(file_path, callees, abstract=False):
+    return SimpleNamespace(file_path=file_path, callees=callees, is_abstract=abstract)
+
+
+# x → a;  a → b, c, d (plus a self-call, a duplicate and an external name);  b → c
+COUPLING_GRAPH = {
+    "x": _fn("p/x.py", ["a"]),
+    "a": _fn("q/m.py", ["b", "c", "d", "a", "b", "external.call"]),
+    "b": _fn("q/m.py", ["c"], abstract=True),
+    "c": _fn("r/n.py", []),
+    "d": _fn("r/n.py", []),
+}
+
+
+def _metrics(metrics):
+    return {
+        m.node_name: (m.afferent_coupling, m.efferent_coupling, m.instability, m.abstractness, m.distance, m.size)
+        for m in metrics
+    }
+
+
+class TestCouplingMetrics:
+
+    def test_per_node(self):
+        metrics = _metrics(CouplingMetricsCalculator(COUPLING_GRAPH, "callees").calculate())
+        #                  Ca Ce  I     A    D     size
+        assert metrics == {
+            "x": (0, 1, 1.0, 0.0, 0.0, 1),
+            "a": (1, 3, 0.75, 0.0, 0.25, 1),
+            "b": (1, 1, 0.5, 1.0, 0.5, 1),
+            "c": (2, 0, 0.0, 0.0, 1.0, 1),
+            "d": (1, 0, 0.0, 0.0, 1.0, 1),
+        }
+
+    def test_per_package(self):
+        calculator = CouplingMetricsCalculator(COUPLING_GRAPH, "callees")
+        metrics = _metrics(calculator.calculate_grouped(group_by_path("package")))
+        assert metrics.keys() == {"p", "q", "r"}
+        assert metrics["p"] == (0, 1, 1.0, 0.0, 0.0, 1)
+        # a and b both depend on r; only x depends on q
+        assert metrics["q"][:2] == (1, 2) and metrics["q"][5] == 2
+        assert metrics["q"][2:5] == pytest.approx((2 / 3, 0.5, 1 / 6))
+        assert metrics["r"] == (2, 0, 0.0, 0.0, 1.0, 2)
+
+    def test_import_graph_abstractness(self):
+        graph = {
+            "api/views.py": SimpleNamespace(imports=["core/base.py", "core/impl.py"], classes=2, abstract_classes=0),
+            "core/base.py": SimpleNamespace(imports=[], classes=3, abstract_classes=3),
+            "core/impl.py": SimpleNamespace(imports=["core/base.py"], classes=1, abstract_classes=0),
+        }
+        calculator = CouplingMetricsCalculator(graph, "imports")
+        per_file = _metrics(calculator.calculate())
+        assert per_file["api/views.py"][:2] == (0, 2)
+        assert per_file["core/base.py"] == (2, 0, 0.0, 1.0, 0.0, 1)
+        packages = _metrics(calculator.calculate_grouped(group_by_path("package")))
+        # core: Ca = views, Ce = 0 (its only import is internal); A = 3 of 4 classes
+        assert packages["core"] == (1, 0, 0.0, 0.75, 0.25, 2)
+        assert packages["api"] == (0, 1, 1.0, 0.0, 0.0, 1)
@@ -0,0 +1,241 @@
+"""
+Tests for the incremental dependency graph state.
+
+No repository checkout needed — graphs are generated in memory, and file
+deltas come from small sources run through the Python AST extractor. Every
+incremental result is checked against a full rebuild of the same input.
+
+DOCS: tools/extractors/dependency_state.py
+"""
+
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.extractors.dependency_analyzer import ANALYSIS_FIELDS
+from tools.extractors.dependency_state import DependencyGraphState, IncrementalGraph
+from tools.extractors.extraction_stream import project_file
+from tools.extractors.python_ast_extractor import PythonASTExtractor, file_result_to_dict
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _partition(graph):
+    return {frozenset(members) for members in graph.members.values()}
+
+
+def _cyclic(graph):
+    return {frozenset(members) for members in graph.cycles()}
+
+
+def _assert_matches_rebuild(graph):
+    """Edges, reverse edges and components equal those of a graph built from scratch."""
+    rebuilt = IncrementalGraph.from_edges(graph.out)
+    assert graph.out == rebuilt.out
+    assert graph.inc == rebuilt.inc
+    assert _partition(graph) == _partition(rebuilt)
+    assert set(graph.scc_of) == set(graph.out)
+    assert all(node in graph.members[cid] for node, cid in graph.scc_of.items())
+
+
+# ── IncrementalGraph ─────────────────────────────────────────────────────────
+
+
+class TestIncrementalGraph:
+
+    @pytest.mark.parametrize("seed", range(30))
+    def test_random_updates_match_rebuild(self, seed):
+        rng = random.Random(seed)
+        names = [f"n{i}" for i in range(rng.randrange(4, 25))]
+        live = rng.sample(names, len(names) // 2 + 1)
+
+        def random_targets():
+            return {rng.choice(names) for _ in range(rng.randrange(0, 4))}
+
+        graph = IncrementalGraph.from_edges({node: random_targets() for node in live})
+        for _ in range(15):
+            before = _cyclic(IncrementalGraph.from_edges(graph.out))
+            present = list(graph.out)
+            removed = rng.sample(present, rng.randrange(0, min(3, len(present)) + 1))
+            # Re-point some nodes; new names become new nodes, and targets may name removed nodes
+            new_out = {node: random_targets() for node in rng.sample(names, rng.randrange(0, 5))}
+
+            new_cycles, removed_cycles = graph.update(new_out, removed)
+
+            _assert_matches_rebuild(graph)
+            assert not set(removed) & set(graph.out)
+            after = _cyclic(graph)
+            assert {frozenset(c.members) for c in new_cycles} == after - before
+            assert {frozenset(c.members) for c in removed_cycles} == before - after
+            for cycle in new_cycles + removed_cycles:
+                assert cycle.cycle[0] == cycle.cycle[-1] and set(cycle.cycle) <= set(cycle.members)
+
+    def test_cycle_appears_and_disappears(self):
+        graph = IncrementalGraph.from_edges({"a": ["b"], "b": ["c"], "c": []})
+        new, removed = graph.update({"c": {"a"}})
+        assert [(c.cycle, c.members, c.cycle_type) for c in new] == [
+            (["a", "b", "c", "a"], ["a", "b", "c"], "function_call"),
+        ]
+        assert removed == []
+
+        # Removing a node splits the component; the reported cycle is the one that existed
+        new, removed = graph.update({}, ["b"], "module_import")
+        assert new == []
+        assert [(c.cycle, c.cycle_type) for c in removed] == [(["a", "b", "c", "a"], "module_import")]
+        assert graph.out == {"a": set(), "c": {"a"}}
+
+    def test_self_loop(self):
+        graph = IncrementalGraph.from_edges({"a": []})
+        new, _ = graph.update({"a": {"a"}, "b": {"a"}})
+        assert [c.cycle for c in new] == [["a", "a"]]
+        _, removed = graph.update({"a": set()})
+        assert [c.cycle for c in removed] == [["a", "a"]]
+
+    def test_removed_node_wins_over_new_edges(self):
+        graph = IncrementalGraph.from_edges({"a": ["b"], "b": ["a"]})
+        # Edges into a node removed by the same update, and its own new edges, are dropped
+        new, removed = graph.update({"a": {"b", "c"}, "b": {"a"}, "c": {"b"}}, ["b"])
+        assert graph.out == {"a": {"c"}, "c": set()}
+        assert (new, [c.members for c in removed]) == ([], [["a", "b"]])
+        _assert_matches_rebuild(graph)
+
+    def test_round_trip_keeps_components(self):
+        graph = IncrementalGraph.from_edges({"a": ["b"], "b": ["a"], "c": ["a"]})
+        data = graph.to_dict()
+        loaded = IncrementalGraph.from_edges(data["edges"], data["scc"])
+        assert _partition(loaded) == _partition(graph)
+        loaded.update({"c": {"c"}})
+        _assert_matches_rebuild(loaded)
+
+
+# ── DependencyGraphState ─────────────────────────────────────────────────────
+
+
+REPO = "/repo"
+
+
+def _extract(source, path):
+    return file_result_to_dict(PythonASTExtractor(Path(path), source).extract())
+
+
+def _state(sources):
+    files = {path: project_file(_extract(source, path), ANALYSIS_FIELDS) for path, source in sources.items()}
+    return DependencyGraphState.build({"repo_path": REPO, "files": files}, Path(REPO))
+
+
+def _assert_state_matches_rebuild(state, sources):
+    rebuilt = _state(sources)
+    assert state.calls.out == rebuilt.calls.out
+    assert state.imports.out == rebuilt.imports.out
+    assert _partition(state.calls) == _partition(rebuilt.calls)
+    assert _partition(state.imports) == _partition(rebuilt.imports)
+
+
+def _cycles(cycles):
+    return sorted((c.cycle_type, c.members) for c in cycles)
+
+
+class TestApply:
+
+    def test_add_edit_delete_cycle(self):
+        sources = {
+            f"{REPO}/a.py": "def f():\n    return 1\n",
+            f"{REPO}/b.py": "from a import f\n\ndef g():\n    return f()\n",
+        }
+        state = _state(sources)
+
+        # Add c.py: c → b → a, no cycle yet
+        sources[f"{REPO}/c.py"] = "from b import g\n\ndef h():\n    return g()\n"
+        delta = state.apply({f"{REPO}/c.py": _extract(sources[f"{REPO}/c.py"], f"{REPO}/c.py")})
+        assert (delta.files_changed, delta.files_removed, delta.new_cycles) == (1, 0, [])
+        _assert_state_matches_rebuild(state, sources)
+
+        # Edit a.py to use c: closes both the call and the import cycle
+        sources[f"{REPO}/a.py"] = "from c import h\n\ndef f():\n    return h()\n"
+        delta = state.apply({f"{REPO}/a.py": _extract(sources[f"{REPO}/a.py"], f"{REPO}/a.py")})
+        assert _cycles(delta.new_cycles) == [
+            ("function_call", [f"{REPO}/a.py:f", f"{REPO}/b.py:g", f"{REPO}/c.py:h"]),
+            ("module_import", ["a.py", "b.py", "c.py"]),
+        ]
+        assert delta.removed_cycles == []
+        _assert_state_matches_rebuild(state, sources)
+
+        # Delete c.py: both cycles go, a's import of c no longer resolves
+        del sources[f"{REPO}/c.py"]
+        delta = state.apply({f"{REPO}/c.py": None})
+        assert (delta.files_changed, delta.files_removed, delta.new_cycles) == (0, 1, [])
+        assert _cycles(delta.removed_cycles) == [
+            ("function_call", [f"{REPO}/a.py:f", f"{REPO}/b.py:g", f"{REPO}/c.py:h"]),
+            ("module_import", ["a.py", "b.py", "c.py"]),
+        ]
+        assert state.calls.out[f"{REPO}/a.py:f"] == set()
+        assert state.imports.out["a.py"] == set()
+        _assert_state_matches_rebuild(state, sources)
+
+    def test_save_and_load(self, tmp_path):
+        sources = {f"{REPO}/a.py": "import b\n\ndef f():\n    return b.g()\n",
+                   f"{REPO}/b.py": "import a\n\ndef g():\n    return a.f()\n"}
+        state = _state(sources)
+        state.save(tmp_path / "state.json")
+        loaded = DependencyGraphState.load(tmp_path / "state.json")
+        _assert_state_matches_rebuild(loaded, sources)
+
+        sources[f"{REPO}/b.py"] = "def g():\n    return 1\n"
+        delta = loaded.apply({f"{REPO}/b.py": _extract(sources[f"{REPO}/b.py"], f"{REPO}/b.py")})
+        assert _cycles(delta.removed_cycles) == [
+            ("function_call", [f"{REPO}/a.py:f", f"{REPO}/b.py:g"]),
+            ("module_import", ["a.py", "b.py"]),
+        ]
+        _assert_state_matches_rebuild(loaded, sources)
+
+    @pytest.mark.parametrize("seed", range(12))
+    def test_random_file_changes_match_rebuild(self, seed):
+        rng = random.Random(seed)
+        count = 8
+
+        def module_source(i):
+            lines = []
+            for k in rng.sample(range(count), rng.randrange(0, 3)):
+                lines.append(rng.choice([
+                    f"from pkg.m{k} import f{k}_0", f"from .m{k} import f{k}_1", f"import pkg.m{k}",
+                    f"from pkg import m{k}",
+                ]))
+            if rng.random() < 0.3:
+                lines += ["", "class C(Base):", "    def run(self):", "        return self.save()"]
+            for j in range(rng.randrange(1, 3)):
+                calls = [rng.choice([f"f{k}_{jj}()", f"pkg.m{k}.f{k}_{jj}()", f"m{k}.f{k}_{jj}()", "run()"])
+                         for k, jj in ((rng.randrange(count), rng.randrange(2)) for _ in range(rng.randrange(0, 3)))]
+                lines += ["", f"def f{i}_{j}():"] + [f"    {call}" for call in calls or ["pass"]]
+            return "\n".join(lines) + "\n"
+
+        base = "class Base:\n    def save(self):\n        return f0_0()\n"
+        sources = {f"{REPO}/pkg/__init__.py": "", f"{REPO}/pkg/base.py": base}
+        for i in rng.sample(range(count), count // 2):
+            sources[f"{REPO}/pkg/m{i}.py"] = module_source(i)
+        state = _state(sources)
+
+        for _ in range(8):
+            changes = {}
+            for i in rng.sample(range(count), rng.randrange(1, 4)):
+                path = f"{REPO}/pkg/m{i}.py"
+                if path in sources and rng.random() < 0.35:
+                    del sources[path]
+                    changes[path] = None
+                else:
+                    sources[path] = module_source(i)
+                    changes[path] = _extract(sources[path], path)
+            before_calls, before_imports = _cyclic(IncrementalGraph.from_edges(state.calls.out)), _cyclic(IncrementalGraph.from_edges(state.imports.out))
+
+            delta = state.apply(changes)
+
+            _assert_state_matches_rebuild(state, sources)
+            after = {("function_call", m) for m in _cyclic(state.calls)} | {("module_import", m) for m in _cyclic(state.imports)}
+            before = {("function_call", m) for m in before_calls} | {("module_import", m) for m in before_imports}
+            assert {(c.cycle_type, frozenset(c.members)) for c in delta.new_cycles} == after - before
+            assert {(c.cycle_type, frozenset(c.members)) for c in delta.removed_cycles} == before - after
+
@@ -0,0 +1,154 @@
+"""
+Tests for the on-disk extraction cache.
+
+No repository checkout needed — entries live in a temporary cache directory,
+and the Python extractor's cached path is run on small temporary files.
+
+DOCS: tools/extractors/extraction_cache.py
+"""
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.extractors import python_ast_extractor
+from tools.extractors.extraction_cache import ExtractionCache, content_digest
+from tools.extractors.python_ast_extractor import (
+    EXTRACTOR_FINGERPRINT,
+    _extract_packed,
+    extract_file,
+    open_extraction_cache,
+)
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+SOURCE = "class Greeter:\n    def greet(self, name):\n        return helper(name)\n\n\ndef helper(x):\n    return x\n"
+
+
+@pytest.fixture
+def parses(monkeypatch):
+    """Counts PythonASTExtractor runs (cache misses that parsed)."""
+    count = {"n": 0}
+    extractor = python_ast_extractor.PythonASTExtractor
+
+    def counting(*args, **kwargs):
+        count["n"] += 1
+        return extractor(*args, **kwargs)
+
+    monkeypatch.setattr(python_ast_extractor, "PythonASTExtractor", counting)
+    return count
+
+
+def _entries(cache):
+    return sorted(cache.dir.rglob("*.pkl"))
+
+
+# ── Hits and invalidation ────────────────────────────────────────────────────
+
+
+class TestCacheHits:
+
+    def test_hit_skips_parsing(self, tmp_path, parses):
+        source = tmp_path / "a.py"
+        source.write_text(SOURCE)
+        cache = open_extraction_cache(tmp_path / "cache")
+
+        first, hit = _extract_packed(source, cache)
+        assert not hit and parses["n"] == 1
+        second, hit = _extract_packed(source, cache)
+        assert hit and parses["n"] == 1
+        assert second == first
+        assert extract_file(source, cache) == extract_file(source)
+
+    def test_same_content_elsewhere_gets_its_own_path(self, tmp_path, parses):
+        cache = open_extraction_cache(tmp_path / "cache")
+        (tmp_path / "a.py").write_text(SOURCE)
+        (tmp_path / "b.py").write_text(SOURCE)
+
+        extract_file(tmp_path / "a.py", cache)
+        copy = extract_file(tmp_path / "b.py", cache)
+        assert parses["n"] == 1
+        assert copy == extract_file(tmp_path / "b.py")
+        assert {f.file_path for f in copy.functions} == {str(tmp_path / "b.py")}
+
+    def test_content_change_misses(self, tmp_path, parses):
+        source = tmp_path / "a.py"
+        source.write_text(SOURCE)
+        cache = open_extraction_cache(tmp_path / "cache")
+        extract_file(source, cache)
+
+        source.write_text(SOURCE + "\n\ndef added():\n    pass\n")
+        _, hit = _extract_packed(source, cache)
+        assert not hit and parses["n"] == 2
+        assert len(_entries(cache)) == 2
+
+    def test_fingerprint_change_misses_and_cleanup_drops_old_version(self, tmp_path):
+        source = tmp_path / "a.py"
+        source.write_text(SOURCE)
+        old = open_extraction_cache(tmp_path / "cache")
+        _extract_packed(source, old)
+        old_size = sum(path.stat().st_size for path in _entries(old))
+
+        new = ExtractionCache(tmp_path / "cache", "python", "0" * 16)
+        assert new.dir != old.dir and EXTRACTOR_FINGERPRINT != "0" * 16
+        _, hit = _extract_packed(source, new)
+        assert not hit
+
+        assert new.cleanup() == old_size
+        assert not old.dir.exists() and len(_entries(new)) == 1
+
+    def test_corrupt_entry_is_dropped(self, tmp_path):
+        cache = ExtractionCache(tmp_path / "cache", "python", "v1")
+        digest = content_digest(b"x = 1\n")
+        cache.put(digest, ("a.py", (), []))
+        entry = _entries(cache)[0]
+        entry.write_bytes(entry.read_bytes()[:5])
+
+        assert cache.get(digest) is None
+        assert not entry.exists()
+
+
+# ── Size bound ───────────────────────────────────────────────────────────────
+
+
+class TestCleanup:
+
+    def _filled(self, tmp_path, max_bytes):
+        cache = ExtractionCache(tmp_path / "cache", "python", "v1", max_bytes=max_bytes)
+        digests = [content_digest(str(i).encode()) for i in range(4)]
+        for age, digest in enumerate(digests):
+            cache.put(digest, ("f.py", (), ["x" * 200]))
+            mtime = 1_000_000 - age * 100  # digests[0] is the most recently used
+            os.utime(cache._entry(digest), (mtime, mtime))
+        return cache, digests
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        cache, digests = self._filled(tmp_path, max_bytes=10**9)
+        entry_size = cache._entry(digests[0]).stat().st_size
+        cache.max_bytes = 2 * entry_size
+
+        # A hit refreshes the oldest entry, so the two in the middle go
+        assert cache.get(digests[3]) is not None
+        assert cache.cleanup() == 2 * entry_size
+        assert [cache.get(d) is not None for d in digests] == [True, False, False, True]
+
+    def test_within_bound_keeps_everything(self, tmp_path):
+        cache, digests = self._filled(tmp_path, max_bytes=10**9)
+        assert cache.cleanup() == 0
+        assert all(cache.get(d) is not None for d in digests)
+
+    def test_repository_run_enforces_bound(self, tmp_path):
+        repo = tmp_path / "repo"
+        repo.mkdir()
+        for i in range(5):
+            (repo / f"m{i}.py").write_text(SOURCE + f"\nVALUE = {i}\n")
+        cache_dir = tmp_path / "cache"
+
+        python_ast_extractor.extract_repository(repo, cache_dir=cache_dir, cache_max_bytes=1)
+        assert _entries(open_extraction_cache(cache_dir)) == []
@@ -0,0 +1,154 @@
+"""
+Tests for the JSONL extraction stream and the legacy JSON document.
+
+No repository checkout needed — a small tree is extracted to a temporary
+directory, through the writer, and through the extractor CLI.
+
+DOCS: tools/extractors/extraction_stream.py
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.extractors.extraction_stream import (
+    ExtractionStreamError,
+    ExtractionStreamWriter,
+    is_stream,
+    iter_extraction_files,
+    load_extraction,
+    read_extraction_meta,
+)
+
+EXTRACTOR = Path(__file__).parent.parent / "tools" / "extractors" / "python_ast_extractor.py"
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+FILES = {
+    "a.py": {
+        "functions": [{"name": "f", "calls": ["g"], "complexity": 1}],
+        "classes": [],
+        "imports": [{"module": "os", "names": ["path"]}],
+        "parse_errors": [],
+    },
+    "b.py": {"functions": [], "classes": [{"name": "C", "methods": []}], "imports": [], "parse_errors": []},
+    "bad.py": {"functions": [], "classes": [], "imports": [], "parse_errors": ["invalid syntax ✗"]},
+}
+
+
+def _write(path, files=FILES):
+    with ExtractionStreamWriter(path, "/repo", "python") as writer:
+        for file_path, file_data in files.items():
+            writer.write_file(file_path, file_data, {"functions": len(file_data["functions"])})
+    return writer
+
+
+def _extract_cli(repo, output, *args):
+    subprocess.run(
+        [sys.executable, str(EXTRACTOR), str(repo), str(output), "--no-cache", *args],
+        check=True, capture_output=True, text=True,
+    )
+
+
+# ── Writer / readers ─────────────────────────────────────────────────────────
+
+
+class TestRoundTrip:
+
+    def test_files_come_back_in_order(self, tmp_path):
+        path = tmp_path / "out.jsonl"
+        writer = _write(path)
+
+        assert is_stream(path)
+        assert list(iter_extraction_files(path)) == list(FILES.items())
+        summary = {"total_files": 3, "total_functions": 1}
+        assert writer.summary() == summary
+        assert read_extraction_meta(path) == {"repo_path": "/repo", "summary": summary}
+        assert load_extraction(path) == {"repo_path": "/repo", "summary": summary, "files": FILES}
+
+    def test_one_record_per_line(self, tmp_path):
+        path = tmp_path / "out.jsonl"
+        _write(path)
+        records = [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+        assert [r["type"] for r in records] == ["header", "file", "file", "file", "summary"]
+        assert records[0]["format"] == "graphcare-extraction" and records[0]["version"] == 1
+
+    def test_projection(self, tmp_path):
+        path = tmp_path / "out.jsonl"
+        _write(path)
+        loaded = load_extraction(path, keep={"functions": ["name"], "imports": None})
+        assert loaded["files"]["a.py"] == {
+            "parse_errors": [], "functions": [{"name": "f"}], "imports": FILES["a.py"]["imports"],
+        }
+        assert loaded["files"]["bad.py"]["parse_errors"] == ["invalid syntax ✗"]
+
+
+class TestTruncatedStream:
+
+    def test_missing_summary_raises_after_the_last_file(self, tmp_path):
+        path = tmp_path / "out.jsonl"
+        _write(path)
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        path.write_text("".join(lines[:-1]), encoding="utf-8")
+
+        seen = []
+        with pytest.raises(ExtractionStreamError, match="truncated"):
+            for file_path, _ in iter_extraction_files(path):
+                seen.append(file_path)
+        assert seen == list(FILES)
+        with pytest.raises(ExtractionStreamError):
+            load_extraction(path)
+        assert read_extraction_meta(path)["summary"] is None
+
+    def test_writer_error_leaves_no_summary(self, tmp_path):
+        path = tmp_path / "out.jsonl"
+        with pytest.raises(RuntimeError):
+            with ExtractionStreamWriter(path, "/repo", "python") as writer:
+                writer.write_file("a.py", FILES["a.py"], {})
+                raise RuntimeError("extractor crashed")
+        with pytest.raises(ExtractionStreamError):
+            list(iter_extraction_files(path))
+
+    def test_unknown_version_is_rejected(self, tmp_path):
+        path = tmp_path / "out.jsonl"
+        _write(path)
+        lines = path.read_text(encoding="utf-8").splitlines(keepends=True)
+        header = json.loads(lines[0])
+        header["version"] = 99
+        path.write_text(json.dumps(header) + "\n" + "".join(lines[1:]), encoding="utf-8")
+        with pytest.raises(ExtractionStreamError, match="v99"):
+            is_stream(path)
+
+
+# ── Extractor CLI (--legacy-json) ────────────────────────────────────────────
+
+
+class TestLegacyFormat:
+
+    @pytest.fixture
+    def repo(self, tmp_path):
+        repo = tmp_path / "repo"
+        (repo / "pkg").mkdir(parents=True)
+        (repo / "pkg" / "a.py").write_text("import os\n\n\ndef f():\n    return os.sep\n")
+        (repo / "b.py").write_text("class B:\n    def m(self):\n        return f()\n")
+        (repo / "broken.py").write_text("def broken(:\n")
+        return repo
+
+    def test_both_formats_read_the_same(self, repo, tmp_path):
+        jsonl, legacy = tmp_path / "out.jsonl", tmp_path / "out.json"
+        _extract_cli(repo, jsonl)
+        _extract_cli(repo, legacy, "--legacy-json")
+
+        assert is_stream(jsonl) and not is_stream(legacy)
+        assert json.loads(legacy.read_text(encoding="utf-8"))["repo_path"] == str(repo)
+        assert list(iter_extraction_files(legacy)) == list(iter_extraction_files(jsonl))
+        assert read_extraction_meta(legacy) == read_extraction_meta(jsonl)
+        assert load_extraction(legacy) == load_extraction(jsonl)
+        assert read_extraction_meta(jsonl)["summary"]["total_files"] == 3
@@ -0,0 +1,213 @@
+"""
+Tests for re-ingesting extraction output (content_hash skip, soft delete, revive).
+
+No FalkorDB needed — ingest_extraction_results runs against an in-memory graph
+that answers the handful of queries the ingestor sends, so the real MERGE
+property maps (and the valid_to they clear or set) are what get stored.
+
+DOCS: tools/ingestion/falkordb_ingestor.py
+"""
+
+import sys
+from pathlib import Path
+from types import SimpleNamespace
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.extractors.python_ast_extractor import iter_extract_repository, write_jsonl
+from tools.ingestion import falkordb_ingestor
+from tools.ingestion.falkordb_ingestor import find_stale_artifacts, ingest_extraction_results
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+class _Graph:
+    """U4_Code_Artifact nodes ({path: properties}) and U4_CALLS links, for the ingestor's queries."""
+
+    def __init__(self):
+        self.artifacts = {}
+        self.links = set()
+        self.tombstones = []
+        self.writes = 0
+
+    def live(self):
+        return {path for path, props in self.artifacts.items() if props.get("valid_to") is None}
+
+    def query(self, cypher, params=None):
+        params = params or {}
+        if "RETURN artifact.path, artifact.content_hash, artifact.valid_to" in cypher:
+            rows = [[path, props.get("content_hash"), props.get("valid_to")]
+                    for path, props in self.artifacts.items() if props["scope_ref"] == params["scope_ref"]]
+            return SimpleNamespace(result_set=rows)
+
+        self.writes += 1
+        if "ON CREATE SET artifact += $on_create" in cypher:
+            current = self.artifacts.get(params["path"])
+            if current is None:
+                self.artifacts[params["path"]] = dict(params["on_create"], path=params["path"])
+            else:
+                current.update(params["on_match"])
+            return SimpleNamespace(result_set=[[params["path"]]])
+        if "MERGE (source)-[r:U4_CALLS]->(target)" in cypher:
+            if params["source_path"] in self.artifacts and params["target_path"] in self.artifacts:
+                self.links.add((params["source_path"], params["target_path"]))
+            return SimpleNamespace(result_set=[[1]])
+        if "SET artifact.valid_to = $now" in cypher:
+            for path in params["paths"]:
+                if path in self.artifacts:
+                    self.artifacts[path]["valid_to"] = params["now"]
+            return SimpleNamespace(result_set=[])
+        if "DETACH DELETE artifact" in cypher:
+            deleted = self.artifacts.pop(params["path"], None) is not None
+            self.links = {(s, t) for s, t in self.links if params["path"] not in (s, t)}
+            return SimpleNamespace(result_set=[], nodes_deleted=int(deleted))
+        if "U4_Tombstone" in cypher:
+            self.tombstones.append(params)
+            return SimpleNamespace(result_set=[])
+        raise AssertionError(f"unexpected query: {cypher}")
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    graph = _Graph()
+    monkeypatch.setattr(falkordb_ingestor, "get_falkordb_connection", lambda *args, **kwargs: graph)
+    return graph
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """A source tree; ingest(**kwargs) extracts all of it and ingests the output."""
+    path = tmp_path / "repo"
+    path.mkdir()
+
+    def ingest(**kwargs):
+        output = tmp_path / "extraction.jsonl"
+        write_jsonl(iter_extract_repository(path), output, path)
+        return ingest_extraction_results(output, "g", "scope", "python", generate_embeddings=False, **kwargs)
+
+    def write(files):
+        for name, source in files.items():
+            if source is None:
+                (path / name).unlink()
+            else:
+                (path / name).parent.mkdir(parents=True, exist_ok=True)
+                (path / name).write_text(source)
+
+    ingest.path = path
+    ingest.write = write
+    return ingest
+
+
+LIB = "def helper(x):\n    return x\n\n\ndef old(x):\n    return helper(x)\n"
+APP = "from lib import helper\n\n\nclass App:\n    def run(self):\n        return helper(1)\n"
+
+
+def _key(repo, name, *parts):
+    return "::".join([str(repo.path / name), *parts])
+
+
+# ── ingest_extraction_results ────────────────────────────────────────────────
+
+
+class TestReingest:
+
+    def test_unchanged_repository_writes_nothing(self, repo, graph):
+        repo.write({"lib.py": LIB, "app.py": APP})
+        first = repo()
+        assert (first.functions_ingested, first.classes_ingested) == (3, 1)
+        assert (_key(repo, "app.py", "App", "run"), _key(repo, "lib.py", "helper")) in graph.links
+
+        graph.writes = 0
+        second = repo()
+        assert graph.writes == 0
+        assert second.artifacts_unchanged == 4
+        assert (second.functions_ingested, second.calls_linked, second.artifacts_retired) == (0, 0, 0)
+
+    def test_removed_artifact_and_deleted_file_are_soft_deleted(self, repo, graph):
+        repo.write({"lib.py": LIB, "app.py": APP, "pkg/extra.py": "def extra():\n    return 0\n"})
+        repo()
+
+        repo.write({"lib.py": "def helper(x):\n    return x\n", "pkg/extra.py": None})
+        stats = repo()
+        retired = {_key(repo, "lib.py", "old"), _key(repo, "pkg/extra.py", "extra")}
+        assert stats.artifacts_retired == 2
+        assert graph.live() == set(graph.artifacts) - retired
+        assert all(graph.artifacts[path]["valid_to"] is not None for path in retired)
+
+    def test_out_of_scope_artifacts_are_kept(self, repo, graph):
+        repo.write({"lib.py": LIB, "broken.py": "def fine():\n    return 1\n"})
+        repo()
+        # Another repository, and another language, ingested into the same scope
+        for path in ("/elsewhere/other.py::f", str(repo.path / "web.ts") + "::render"):
+            graph.artifacts[path] = {"path": path, "scope_ref": "scope", "content_hash": "h", "valid_to": None}
+
+        repo.write({"broken.py": "def fine(:\n"})
+        stats = repo()
+        # broken.py did not parse: its artifacts stay as they were
+        assert stats.errors == 1 and stats.artifacts_retired == 0
+        assert graph.live() == set(graph.artifacts)
+
+    def test_retired_artifact_revives(self, repo, graph):
+        repo.write({"lib.py": LIB})
+        repo()
+        repo.write({"lib.py": None})
+        repo()
+        old = _key(repo, "lib.py", "old")
+        assert graph.live() == set()
+
+        repo.write({"lib.py": LIB})
+        stats = repo()
+        # Same content as before it was retired: rewritten anyway, valid_to cleared
+        assert stats.functions_ingested == 2 and stats.artifacts_unchanged == 0
+        assert graph.live() == {old, _key(repo, "lib.py", "helper")}
+        assert (old, _key(repo, "lib.py", "helper")) in graph.links
+
+    def test_prune_deletes_with_tombstones(self, repo, graph):
+        repo.write({"lib.py": LIB, "app.py": APP})
+        repo()
+        repo.write({"lib.py": None})
+        repo()  # soft-deleted first: prune still removes retired artifacts
+
+        repo.write({"app.py": APP.replace("helper(1)", "1")})
+        stats = repo(prune=True)
+        assert stats.artifacts_pruned == 2
+        assert set(graph.artifacts) == {_key(repo, "app.py", "App"), _key(repo, "app.py", "App", "run")}
+        assert len(graph.tombstones) == 2
+
+
+# ── find_stale_artifacts ─────────────────────────────────────────────────────
+
+
+class TestFindStaleArtifacts:
+
+    EXISTING = {
+        "a.py::f": ("h", None),
+        "a.py::gone": ("h", None),
+        "gone.py::f": ("h", None),
+        "retired.py::f": ("h", 1),
+        "sub/b.py::f": ("h", None),
+        "web.ts::f": ("h", None),
+        "/abs/c.py::f": ("h", None),
+    }
+
+    def test_only_reextracted_files_without_full_extraction(self):
+        stale = find_stale_artifacts(self.EXISTING, ["a.py"], {"a.py::f"})
+        assert stale == ["a.py::gone"]
+
+    def test_relative_root(self):
+        stale = find_stale_artifacts(
+            self.EXISTING, ["a.py"], {"a.py::f"}, root=".", extracted_files=["a.py", "sub/b.py"]
+        )
+        assert stale == ["a.py::gone", "gone.py::f"]
+        stale = find_stale_artifacts(
+            self.EXISTING, ["a.py"], {"a.py::f"}, include_retired=True, root=".", extracted_files=["a.py"]
+        )
+        assert stale == ["a.py::gone", "gone.py::f", "retired.py::f", "sub/b.py::f"]
+
+    def test_absolute_root(self):
+        existing = {"/abs/c.py::f": ("h", None), "/abs/sub/d.py::f": ("h", None), "/absent/e.py::f": ("h", None)}
+        stale = find_stale_artifacts(existing, [], set(), root="/abs/", extracted_files=["/abs/c.py"])
+        assert stale == ["/abs/sub/d.py::f"]
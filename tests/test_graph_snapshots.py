@@ -0,0 +1,461 @@
+"""
+Tests for graph snapshots and deltas: bulk CSV/JSONL export and restore,
+Cypher delta export and in-order replay.
+
+No FalkorDB needed — snapshots are written from in-memory node/edge records
+and restored into stand-in graphs that record the queries they are sent.
+
+DOCS: tools/export_graph_bulk.py, tools/import_graph_bulk.py,
+      tools/export_graph_cypher.py, tools/replay_graph_delta.py
+"""
+
+import ast
+import csv
+import io
+import json
+import re
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pytest
+
+# Tools import each other as top-level modules; the ingestors import from the repo root
+sys.path.insert(0, str(Path(__file__).parent.parent / "tools"))
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import import_graph_bulk
+from export_graph_bulk import SCHEMA_VERSION, UNLABELED, write_snapshot
+from export_graph_cypher import DELTA_HEADER, export_delta, format_match
+from graph_delta import REPLAY_STATE_LABEL, TOMBSTONE_LABEL, node_ref, parse_since, record_tombstone, tombstone_refs
+from import_graph_bulk import SnapshotError, load_manifest, restore_from_jsonl, verify_snapshot
+from replay_graph_delta import DeltaError, replay_deltas
+from tools.ingestion.falkordb_ingestor import build_artifact_properties, create_call_links_batch, soft_delete_artifacts
+from tools.ingestion.typescript_ingestor import create_typescript_artifact_node
+
+
+# ── Fixtures ─────────────────────────────────────────────────────────────────
+
+TRICKY = 'a,b "quoted" back\\slash\nnew line\r\nwindows\rbare cr é'
+
+NODES = [
+    {"id": 0, "labels": ["Doc"], "properties": {
+        "path": "docs/a.md", "count": 3, "score": 1, "flag": True, "mixed": 7,
+        "tags": ["x", "y,z"], "text": TRICKY,
+    }},
+    {"id": 1, "labels": ["Doc"], "properties": {
+        "path": "docs/b.md", "count": 4, "score": 0.25, "flag": False, "mixed": "seven",
+    }},
+    {"id": 2, "labels": ["Code", "Test"], "properties": {"path": "t.py", "lines": 12}},
+    {"id": 3, "labels": [], "properties": {"id": "orphan"}},
+]
+
+EDGES = [
+    {"id": 0, "type": "DOCUMENTS", "src": 0, "dst": 2, "properties": {"weight": 0.5, "note": TRICKY}},
+    {"id": 1, "type": "DOCUMENTS", "src": 1, "dst": 2, "properties": {"weight": 2}},
+    {"id": 2, "type": "LINKS", "src": 3, "dst": 0, "properties": {}},
+]
+
+
+def _copy(records):
+    return json.loads(json.dumps(records))
+
+
+def _snapshot(tmp_path, formats=("csv", "jsonl")):
+    return write_snapshot(iter(_copy(NODES)), iter(_copy(EDGES)), tmp_path, "g", formats)
+
+
+def _read_typed_csv(path):
+    """Read a bulk-loader CSV as falkordb-bulk-insert would: (header, [row dicts])."""
+    parse = {
+        "INT": int, "DOUBLE": float, "STRING": str,
+        "BOOLEAN": lambda v: v == "true", "ARRAY": ast.literal_eval,
+    }
+    with open(path, encoding="utf-8", newline="") as f:
+        rows = list(csv.reader(f, quoting=csv.QUOTE_NONE, escapechar="\\"))
+    header = rows[0]
+    records = []
+    for row in rows[1:]:
+        record = {}
+        for column, cell in zip(header, row):
+            name, _, col_type = column.partition(":")
+            if name == "":
+                record[column] = int(cell)
+            elif cell != "":
+                record[name] = parse[col_type](cell)
+        records.append(record)
+    return header, records
+
+
+# ── Export ───────────────────────────────────────────────────────────────────
+
+
+class TestBulkExport:
+
+    def test_typed_headers(self, tmp_path):
+        manifest = _snapshot(tmp_path)
+        assert manifest["node_schema"]["Doc"] == {
+            "path": "STRING", "count": "INT", "score": "DOUBLE", "flag": "BOOLEAN",
+            "mixed": "STRING", "tags": "ARRAY", "text": "STRING",
+        }
+        assert manifest["edge_schema"]["DOCUMENTS"] == {"weight": "DOUBLE", "note": "STRING"}
+        header, _ = _read_typed_csv(tmp_path / "nodes" / "Doc.csv")
+        assert header[0] == ":ID(node)"
+        assert "count:INT" in header and "tags:ARRAY" in header
+        assert manifest["counts"]["nodes_by_label"] == {"Doc": 2, "Code:Test": 1, UNLABELED: 1}
+
+    def test_csv_round_trip(self, tmp_path):
+        """Quotes, separators, backslashes and line breaks survive the CSV escaping."""
+        _snapshot(tmp_path)
+        _, docs = _read_typed_csv(tmp_path / "nodes" / "Doc.csv")
+        # Widened columns come back as their column type: INT+DOUBLE, INT+STRING
+        assert docs[0] == {":ID(node)": 0, **NODES[0]["properties"], "score": 1.0, "mixed": "7"}
+        assert docs[1] == {":ID(node)": 1, **NODES[1]["properties"]}
+        _, code = _read_typed_csv(tmp_path / "nodes" / "Code__Test.csv")
+        assert code == [{":ID(node)": 2, "path": "t.py", "lines": 12}]
+
+        _, documents = _read_typed_csv(tmp_path / "edges" / "DOCUMENTS.csv")
+        assert documents == [
+            {":START_ID(node)": 0, ":END_ID(node)": 2, "weight": 0.5, "note": TRICKY},
+            {":START_ID(node)": 1, ":END_ID(node)": 2, "weight": 2.0},
+        ]
+
+    def test_manifest_rows_and_checksums(self, tmp_path):
+        manifest = _snapshot(tmp_path)
+        by_path = {entry["path"]: entry for entry in manifest["files"]}
+        assert by_path["nodes/Doc.csv"]["rows"] == 2
+        assert by_path["edges.jsonl"]["rows"] == 3
+        assert len(verify_snapshot(tmp_path, manifest, "csv")) == 5
+        assert len(verify_snapshot(tmp_path, manifest, "jsonl")) == 2
+
+    def test_csv_only_drops_jsonl(self, tmp_path):
+        _snapshot(tmp_path, formats=("csv",))
+        assert not (tmp_path / "nodes.jsonl").exists()
+        with pytest.raises(SnapshotError, match="no jsonl files"):
+            verify_snapshot(tmp_path, load_manifest(tmp_path), "jsonl")
+
+
+# ── Verification ─────────────────────────────────────────────────────────────
+
+
+class TestSnapshotVerification:
+
+    def test_checksum_mismatch(self, tmp_path):
+        manifest = _snapshot(tmp_path)
+        with open(tmp_path / "edges" / "LINKS.csv", "a", encoding="utf-8") as f:
+            f.write("3,1\r\n")
+        with pytest.raises(SnapshotError, match="Checksum mismatch: edges/LINKS.csv"):
+            verify_snapshot(tmp_path, manifest, "csv")
+
+    def test_missing_file(self, tmp_path):
+        manifest = _snapshot(tmp_path)
+        (tmp_path / "nodes.jsonl").unlink()
+        with pytest.raises(SnapshotError, match="Missing snapshot file: nodes.jsonl"):
+            verify_snapshot(tmp_path, manifest, "jsonl")
+
+    def test_schema_version(self, tmp_path):
+        manifest = _snapshot(tmp_path)
+        manifest["schema_version"] = SCHEMA_VERSION + 1
+        (tmp_path / "manifest.json").write_text(json.dumps(manifest))
+        with pytest.raises(SnapshotError, match="Unsupported snapshot schema_version"):
+            load_manifest(tmp_path)
+        with pytest.raises(SnapshotError, match="No manifest.json"):
+            load_manifest(tmp_path / "nodes")
+
+
+# ── JSONL restore ────────────────────────────────────────────────────────────
+
+
+class _Result:
+    result_set = []
+
+
+class _RestoreGraph:
+    """Applies restore_from_jsonl's UNWIND CREATE batches to in-memory dicts."""
+
+    _NODES = re.compile(r"UNWIND \$rows AS row CREATE \(n((?::[^ )]+)+)\) SET")
+    _EDGES = re.compile(r"CREATE \(a\)-\[r:([^\]]+)\]->\(b\)")
+
+    def __init__(self):
+        self.nodes = {}
+        self.edges = []
+        self.queries = []
+
+    def query(self, cypher, params=None):
+        self.queries.append(cypher)
+        nodes, edges = self._NODES.match(cypher), self._EDGES.search(cypher)
+        if nodes:
+            labels = [label.strip("`") for label in nodes.group(1).split(":")[1:]]
+            for row in params["rows"]:
+                self.nodes[row["id"]] = {"labels": labels, "properties": row["props"]}
+        elif edges:
+            for row in params["rows"]:
+                self.edges.append((edges.group(1), row["src"], row["dst"], row["props"]))
+        return _Result()
+
+
+class TestJsonlRestore:
+
+    def test_round_trip(self, tmp_path, monkeypatch):
+        import falkordb
+
+        _snapshot(tmp_path)
+        graph = _RestoreGraph()
+        monkeypatch.setattr(falkordb, "FalkorDB", lambda **kwargs: type(
+            "_DB", (), {"select_graph": lambda self, name: graph})())
+
+        assert restore_from_jsonl(tmp_path, "restored", batch_size=1) == {"nodes": 4, "edges": 3}
+        for node in NODES:
+            restored = graph.nodes[node["id"]]
+            assert restored["properties"] == node["properties"]
+            assert [l for l in restored["labels"] if l != UNLABELED] == node["labels"]
+        assert sorted(graph.edges, key=lambda e: (e[1], e[2])) == [
+            (e["type"], e["src"], e["dst"], e["properties"]) for e in EDGES
+        ]
+        assert f"MATCH (n:{UNLABELED}) REMOVE n:{UNLABELED}" in graph.queries
+
+    def test_refuses_corrupt_snapshot(self, tmp_path, monkeypatch):
+        _snapshot(tmp_path)
+        with open(tmp_path / "nodes.jsonl", "a", encoding="utf-8") as f:
+            f.write("{}\n")
+        monkeypatch.setattr(import_graph_bulk, "_read_jsonl", lambda path: pytest.fail("loaded"))
+        with pytest.raises(SnapshotError, match="Checksum mismatch"):
+            restore_from_jsonl(tmp_path, "restored")
+
+
+# ── Deltas ───────────────────────────────────────────────────────────────────
+
+
+class TestDeltaHelpers:
+
+    def test_parse_since(self):
+        assert parse_since("1792400400000") == 1792400400000
+        assert parse_since(" -5 ") == -5
+        assert parse_since("2026-10-19T09:00:00") == 1792400400000  # naive is UTC
+        assert parse_since("2026-10-19T09:00:00Z") == 1792400400000
+        assert parse_since("2026-10-19T11:00:00+02:00") == 1792400400000
+        assert parse_since("2026-10-19") == int(
+            datetime(2026, 10, 19, tzinfo=timezone.utc).timestamp() * 1000)
+        with pytest.raises(ValueError):
+            parse_since("yesterday")
+
+    def test_node_ref_prefers_path(self):
+        assert node_ref(["A"], {"id": "x", "path": "a.py"}) == {"labels": ["A"], "key": "path", "value": "a.py"}
+        assert node_ref([], {"id": "x", "path": None})["key"] == "id"
+        assert node_ref(["A"], {"name": "x"}) is None
+
+    def test_tombstone_refs_round_trip(self):
+        graph = _DeltaGraph()
+        node = {"labels": ["U4_Code_Artifact"], "key": "path", "value": "a.py"}
+        target = {"labels": ["Doc", "Test"], "key": "id", "value": 7}
+        record_tombstone(graph, node, scope_ref="scope")
+        record_tombstone(graph, node, "CALLS", target)
+
+        (_, deleted_node), (_, deleted_edge) = graph.queries
+        assert all(q.startswith(f"CREATE (d:{TOMBSTONE_LABEL})") for q, _ in graph.queries)
+        assert deleted_node["props"]["scope_ref"] == "scope"
+        assert tombstone_refs(deleted_node["props"]) == (node, None, None)
+        assert tombstone_refs(deleted_edge["props"]) == (node, "CALLS", target)
+        assert tombstone_refs({"kind": "node", "labels": "", "key": "id", "value": 1}) == (
+            {"labels": [], "key": "id", "value": 1}, None, None)
+
+
+class _Entity:
+    def __init__(self, labels=None, properties=None, relation=None):
+        self.labels, self.properties, self.relation = labels, properties or {}, relation
+
+
+class _Rows:
+    def __init__(self, rows=()):
+        self.result_set = list(rows)
+
+
+class _DeltaGraph:
+    """Answers export_delta's three reads from canned rows; records every query."""
+
+    def __init__(self, tombstones=(), nodes=(), edges=()):
+        self.tombstones, self.nodes, self.edges = tombstones, nodes, edges
+        self.queries = []
+
+    def query(self, cypher, params=None):
+        self.queries.append((cypher, params))
+        if cypher.startswith(f"MATCH (d:{TOMBSTONE_LABEL})"):
+            return _Rows([_Entity(properties=t)] for t in self.tombstones)
+        if cypher.startswith("MATCH (n)"):
+            return _Rows([n] for n in self.nodes)
+        if cypher.startswith("MATCH (s)-[r]->(t)"):
+            return _Rows(self.edges)
+        return _Rows()
+
+
+@pytest.fixture
+def berlin_tz(monkeypatch):
+    """Run with the local clock two hours east of UTC (CEST)."""
+    monkeypatch.setenv("TZ", "Europe/Berlin")
+    time.tzset()
+    yield
+    monkeypatch.undo()
+    time.tzset()
+
+
+class TestIngestTimestamps:
+    """Ingest writes are stamped in the same UTC epoch as --since / --until windows."""
+
+    def _stamps(self, write):
+        before = time.time_ns() // 10**6
+        graph = _DeltaGraph()
+        write(graph)
+        after = time.time_ns() // 10**6
+        return before, after, graph.queries
+
+    def test_local_timezone_is_ignored(self, berlin_tz):
+        assert time.localtime(1792400400).tm_hour == 11  # 09:00Z in Berlin
+
+        before = time.time_ns() // 10**6
+        props = build_artifact_properties("a.py::f", "f", "", "scope", "python")
+        assert before <= props["created_at"] == props["updated_at"] <= time.time_ns() // 10**6
+
+        before, after, queries = self._stamps(lambda graph: soft_delete_artifacts(graph, ["a.py::f"]))
+        assert before <= queries[0][1]["now"] <= after
+        before, after, queries = self._stamps(lambda graph: create_call_links_batch(graph, [("a", "b")]))
+        assert before <= queries[0][1]["now"] <= after
+        before, after, queries = self._stamps(lambda graph: create_typescript_artifact_node(
+            graph, "a.ts::f", "f", "", "scope", "typescript", "function"))
+        assert before <= queries[0][1]["created_at"] <= after
+
+
+class TestCypherDelta:
+
+    def test_names_are_quoted(self):
+        """Labels, keys and relationship types that are not identifiers get backticks."""
+        ref = {"labels": ["U4_Code_Artifact", "My-Label"], "key": "file path", "value": 'a"b'}
+        assert format_match("n", ref) == '(n:U4_Code_Artifact:`My-Label` {`file path`: "a\\"b"})'
+        assert format_match("n", {"labels": ["we`ird"], "key": "id", "value": 1}) == "(n:`we``ird` {id: 1})"
+
+    def test_export_delta(self):
+        source = _Entity(["Doc-Page"], {"id": "d1", "updated-at": 5})
+        target = _Entity(["Code"], {"path": "a.py"})
+        graph = _DeltaGraph(
+            tombstones=[{"kind": "edge", "labels": "Doc-Page", "key": "id", "value": "d0",
+                         "rel_type": "SEE ALSO", "target_labels": "Code", "target_key": "path",
+                         "target_value": "b.py"},
+                        {"kind": "node", "labels": "Code", "key": "path", "value": "b.py"}],
+            nodes=[source, target, _Entity(["Code"], {"name": "no key"})],
+            edges=[(source, _Entity(relation="REFERS-TO", properties={"w": 1}), target)],
+        )
+        out = io.StringIO()
+        assert export_delta(graph, out, since=1, until=9) == {"deletes": 2, "nodes": 2, "edges": 1, "skipped": 1}
+        assert out.getvalue().splitlines() == [
+            'MATCH (s:`Doc-Page` {id: "d0"})-[r:`SEE ALSO`]->(t:Code {path: "b.py"}) DELETE r;',
+            'MATCH (n:Code {path: "b.py"}) DETACH DELETE n;',
+            'MERGE (n:`Doc-Page` {id: "d1"}) SET n += {id: "d1", `updated-at`: 5};',
+            'MERGE (n:Code {path: "a.py"}) SET n += {path: "a.py"};',
+            'MATCH (s:`Doc-Page` {id: "d1"}) MATCH (t:Code {path: "a.py"}) '
+            'MERGE (s)-[r:`REFERS-TO`]->(t) SET r += {w: 1};',
+        ]
+        assert graph.queries[0][1] == {"since": 1, "until": 9}
+
+
+# ── Replay ───────────────────────────────────────────────────────────────────
+
+
+class _ReplayGraph:
+    """Keeps the replay watermark like a U4_Replay_State node; records delta statements."""
+
+    def __init__(self, watermark=None):
+        self.watermark = watermark
+        self.statements = []
+
+    def query(self, cypher, params=None):
+        if cypher.startswith(f"MATCH (s:{REPLAY_STATE_LABEL}"):
+            return _Rows([[self.watermark]] if self.watermark is not None else [])
+        if cypher.startswith(f"MERGE (s:{REPLAY_STATE_LABEL}"):
+            self.watermark = params["until"]
+        else:
+            self.statements.append(cypher)
+        return _Rows()
+
+
+def _write_delta(directory, name, since, until, graph="src"):
+    path = directory / name
+    path.write_text(
+        f"// FalkorDB Graph Delta: {graph}\n"
+        f"{DELTA_HEADER} {json.dumps({'graph': graph, 'since': since, 'until': until})}\n\n"
+        f'MERGE (n:Code {{path: "{name}"}}) SET n += {{path: "{name}"}};\n'
+    )
+    return path
+
+
+class TestReplay:
+
+    @pytest.fixture
+    def target(self, monkeypatch):
+        import falkordb
+
+        def connect(watermark=None):
+            graph = _ReplayGraph(watermark)
+            monkeypatch.setattr(falkordb, "FalkorDB", lambda **kwargs: type(
+                "_DB", (), {"select_graph": lambda self, name: graph})())
+            return graph
+        return connect
+
+    def test_applies_in_window_order(self, tmp_path, target):
+        graph = target()
+        paths = [_write_delta(tmp_path, "c", 20, 30), _write_delta(tmp_path, "a", 0, 10),
+                 _write_delta(tmp_path, "b", 10, 20)]
+        assert replay_deltas("dst", paths) == {"applied": 3, "skipped": 0, "statements": 3}
+        assert [re.search(r'path: "(\w)"', q).group(1) for q in graph.statements] == ["a", "b", "c"]
+        assert graph.watermark == 30
+
+    def test_skips_applied_deltas(self, tmp_path, target):
+        graph = target(watermark=20)
+        paths = [_write_delta(tmp_path, name, since, until)
+                 for name, since, until in [("a", 0, 10), ("b", 10, 20), ("c", 15, 25)]]
+        assert replay_deltas("dst", paths) == {"applied": 1, "skipped": 2, "statements": 1}
+        assert len(graph.statements) == 1 and '"c"' in graph.statements[0]
+        assert graph.watermark == 25
+
+    def test_gap_detection(self, tmp_path, target):
+        graph = target(watermark=10)
+        paths = [_write_delta(tmp_path, "c", 20, 30)]
+        with pytest.raises(DeltaError, match="an intermediate delta is missing"):
+            replay_deltas("dst", paths)
+        assert graph.statements == [] and graph.watermark == 10
+
+        assert replay_deltas("dst", paths, allow_gap=True)["applied"] == 1
+        assert graph.watermark == 30
+
+    def test_gap_stops_before_later_deltas(self, tmp_path, target):
+        graph = target(watermark=0)
+        paths = [_write_delta(tmp_path, "a", 0, 10), _write_delta(tmp_path, "c", 20, 30)]
+        with pytest.raises(DeltaError):
+            replay_deltas("dst", paths)
+        assert len(graph.statements) == 1 and graph.watermark == 10
+
+    def test_crlf_snippet_round_trip(self, tmp_path, target, monkeypatch):
+        """Line breaks and separators in a value keep its MERGE one statement, and come back intact."""
+        import export_graph_cypher
+
+        snippet = "def f():\r\n    return 1\r\rx = '\u2028\u2029\x85\x0b\x0c\x1c'\n"
+        source = _DeltaGraph(nodes=[_Entity(["Code"], {"path": "a.py", "snippet": snippet})])
+        monkeypatch.setattr(export_graph_cypher, "FalkorDB", lambda host, port: type(
+            "_DB", (), {"select_graph": lambda self, name: source})())
+        delta = tmp_path / "delta.cypher"
+        export_graph_cypher.export_graph("src", str(delta), since=0)
+
+        graph = target()
+        assert replay_deltas("dst", [delta])["statements"] == 1
+        (statement,) = graph.statements
+        literal = re.search(r'snippet: ("(?:[^"\\]|\\.)*")', statement).group(1)
+        assert json.loads(literal, strict=False) == snippet
+
+    def test_rejects_mixed_sources_and_non_deltas(self, tmp_path, target):
+        target()
+        with pytest.raises(DeltaError, match="different graphs"):
+            replay_deltas("dst", [_write_delta(tmp_path, "a", 0, 10, "one"),
+                                  _write_delta(tmp_path, "b", 10, 20, "two")])
+        full = tmp_path / "full.cypher"
+        full.write_text("// FalkorDB Graph Export: src\nCREATE (n0:Code);\n")
+        with pytest.raises(DeltaError, match="has no"):
+            replay_deltas("dst", [full])
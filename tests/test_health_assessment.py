@@ -10,22 +10,33 @@ DOCS: docs/assessment/daily_citizen_health/ALGORITHM_Daily_Citizen_Health.md
 
 import json
 import os
+import struct
 import sys
 import tempfile
+import threading
+import time
 from datetime import date, timedelta
 from pathlib import Path
 
+import numpy as np
 import pytest
 
 # Ensure graphcare root is on the path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from services.health_assessment.brain_topology_reader import BrainStats
+import services.falkordb_pool as falkordb_pool
+import services.health_assessment.brain_topology_reader as brain_reader
+import services.health_assessment.universe_moment_reader as universe_reader
+from services.health_assessment.brain_topology_reader import BrainReader, BrainStats, brain_stats_from_rows
 from services.health_assessment.universe_moment_reader import BehaviorStats
+from services.health_assessment.universe_batch_reader import UniverseEdges, behavior_stats_from_edges
+from services.health_assessment.population_scorer import score_citizen, score_population
 from services.health_assessment.scoring_formulas.registry import (
     CapabilityScore,
     all_formulas,
+    formula_fields,
     get_formula,
+    required_fields,
     _cap,
 )
 
@@ -49,9 +60,13 @@ from services.health_assessment.aggregator import (
     aggregate_scores,
     save_history,
     load_history,
+    load_histories,
     DailyRecord,
     AggregateResult,
 )
+from services.health_assessment.history_store import HistoryStore
+from services.health_assessment.snapshot import SnapshotWriter, load_snapshot
+from services.health_assessment.run_report import CitizenTiming, RunTimer, build_report, export_to_monitor
 from services.health_assessment.intervention_composer import (
     should_intervene,
     compose_intervention,
@@ -180,6 +195,37 @@ class TestRegistrySanity:
         assert _cap(5, 0) == pytest.approx(0.0)
 
 
+class TestFormulaFields:
+    """Fields each formula reads, found in its source."""
+
+    def test_registered_formula(self):
+        brain, behavior = formula_fields(get_formula("exec_complete"))
+        assert brain == {"desire_persistence", "desire_moment_ratio", "recency_moment"}
+        assert behavior == {"high_permanence_w", "first_in_space_w", "self_initiated_w"}
+
+    def test_every_formula_inferred(self):
+        """Registered formulas only read fields, so none forces a full read."""
+        brain, behavior = required_fields(all_formulas().values())
+        assert brain is not None and behavior is not None
+        assert "mean_energy_all" not in brain and "newest_node_age_hours" not in brain
+
+    def test_unknown_use_means_all_fields(self):
+        def passes_brain_on(brain, behavior):
+            return CapabilityScore(_cap(len(vars(brain)), 10), behavior.response_rate, 0)
+
+        def reads_property(brain, behavior):
+            return CapabilityScore(40.0 if brain.brain_category == "VOID" else 0.0, 0.0, 0)
+
+        assert formula_fields(passes_brain_on) == (None, frozenset({"response_rate"}))
+        assert formula_fields(reads_property) == (None, frozenset())
+        assert required_fields([passes_brain_on, get_formula("exec_complete")])[0] is None
+
+    def test_readers_cover_every_field(self):
+        """Each stats field maps to the query parts that compute it."""
+        assert set(brain_reader.FIELD_PARTS) == set(BrainStats.__dataclass_fields__)
+        assert set(universe_reader.FIELD_PARTS) == set(BehaviorStats.__dataclass_fields__)
+
+
 # ── Profile Tests ────────────────────────────────────────────────────────────
 
 
@@ -425,6 +471,68 @@ class TestMentorshipFormulas:
         assert score.total <= 5, f"Low mentor score={score.total:.1f}"
 
 
+# ── Population Scorer ────────────────────────────────────────────────────────
+
+
+def _bits(value):
+    return None if value is None else struct.pack("<d", value)
+
+
+class TestPopulationScorer:
+    """score_population must equal the scalar path bit for bit."""
+
+    def _population(self, n=300):
+        rng = np.random.default_rng(11)
+        edge = [0.0, -0.0, 0.5, 1.0, 2.0, -0.3, 1e-310, 1e300, 3.7]
+        brains, behaviors = {}, {}
+        for i in range(n):
+            pick = (lambda: float(rng.choice(edge))) if i % 3 == 0 else (lambda: float(rng.random()))
+            count = lambda: int(rng.integers(0, 60))
+            brains[f"c{i}"] = _make_brain(
+                desire_count=count(), concept_count=count(), process_count=count(),
+                value_count=count(), memory_count=count(), desire_energy=pick(),
+                desire_moment_ratio=pick(), desire_persistence=pick(), curiosity=pick(),
+                frustration=pick(), ambition=pick(), social_need=pick(),
+                recency_desire=pick(), recency_moment=pick(), reachable=bool(i % 2),
+            )
+            behaviors[f"c{i}"] = _make_behavior(
+                total_moments_w=pick() * 30, self_initiated_w=pick() * 10, response_rate=pick(),
+                high_permanence_w=pick() * 12, elaborative_tentative_w=pick() * 6,
+                distinct_space_count=count(), first_in_space_w=pick() * 3,
+                unique_interlocutors=count(), spaces_created=count(),
+            )
+        return brains, behaviors
+
+    def test_bit_identical(self):
+        brains, behaviors = self._population()
+        ids = list(brains)
+        population = score_population(ids, brains, behaviors)
+        assert list(population) == ids
+        for cid in ids:
+            scalar = score_citizen(cid, brains[cid], behaviors[cid])
+            assert list(population[cid]) == list(scalar) == list(all_formulas())
+            assert [_bits(v) for v in population[cid].values()] == [_bits(v) for v in scalar.values()], cid
+
+    def test_per_citizen_fallback(self):
+        """Formulas that can't run on columns, or raise for some citizens, still match."""
+        def branchy(brain, behavior):
+            if brain.curiosity > 0.5:
+                return CapabilityScore(min(40.0, brain.concept_count * 1.5), 10.0, 0)
+            return CapabilityScore(0.0, behavior.response_rate * 60, 0)
+
+        def divides(brain, behavior):
+            return CapabilityScore(brain.concept_count / brain.curiosity, 0.0, 0)
+
+        formulas = {"branchy": branchy, "divides": divides, "plain": get_formula("exec_complete")}
+        brains, behaviors = self._population(60)
+        ids = list(brains)
+        population = score_population(ids, brains, behaviors, formulas)
+        for cid in ids:
+            scalar = score_citizen(cid, brains[cid], behaviors[cid], formulas)
+            assert [_bits(v) for v in population[cid].values()] == [_bits(v) for v in scalar.values()], cid
+        assert any(population[cid]["divides"] is None for cid in ids)
+
+
 # ── Aggregator with Two-Day Delta ────────────────────────────────────────────
 
 
@@ -493,6 +601,74 @@ class TestAggregatorDelta:
         assert agg_result.yesterday_aggregate is None
         assert len(agg_result.drops) == 0
 
+    def test_prefetched_yesterday(self):
+        """One load_histories() for the day gives the same deltas as per-citizen reads."""
+        today = date(2026, 3, 15)
+        yesterday = today - timedelta(days=1)
+        for cid, score in (("a", 60.0), ("b", 80.0)):
+            save_history(DailyRecord(cid, yesterday.isoformat(), score, {"exec_complete": score}))
+
+        prefetched = load_histories(yesterday)
+        assert set(prefetched) == {"a", "b"}
+        for cid in ("a", "b", "c"):
+            scores = {"exec_complete": 65.0}
+            assert aggregate_scores(cid, scores, today, prefetched) == aggregate_scores(cid, scores, today)
+
+
+# ── History Store ────────────────────────────────────────────────────────────
+
+
+class TestHistoryStore:
+
+    def setup_method(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+        self.store = HistoryStore(self.tmpdir / "history.sqlite3")
+
+    def teardown_method(self):
+        self.store.close()
+
+    def test_roundtrip(self):
+        record = DailyRecord("vox", "2026-03-14", 61.5, {"exec_complete": 70.0, "ethics": None}, True, 0.4, False)
+        self.store.save(record)
+        assert self.store.load("vox", date(2026, 3, 14)) == record
+        assert self.store.load("vox", date(2026, 3, 15)) is None
+
+        # A re-run of the same day replaces the record
+        self.store.save(DailyRecord("vox", "2026-03-14", 40.0, {}))
+        assert self.store.load("vox", date(2026, 3, 14)).aggregate_score == 40.0
+        assert self.store.count() == 1
+
+    def test_day_and_range(self):
+        self.store.save_many(
+            DailyRecord(cid, f"2026-03-{day:02d}", float(day), {})
+            for cid in ("a", "b", "c") for day in range(10, 20)
+        )
+        day = self.store.load_day(date(2026, 3, 12))
+        assert sorted(day) == ["a", "b", "c"]
+        assert all(r.date == "2026-03-12" for r in day.values())
+        assert sorted(self.store.load_day(date(2026, 3, 12), ["b", "z"])) == ["b"]
+
+        records = self.store.load_range(date(2026, 3, 15), date(2026, 3, 17), ["c"])
+        assert [r.date for r in records] == ["2026-03-15", "2026-03-16", "2026-03-17"]
+        series = self.store.aggregate_series(date(2026, 3, 18), date(2026, 3, 30))
+        assert series["a"] == [("2026-03-18", 18.0), ("2026-03-19", 19.0)]
+
+    def test_migrate_json_tree(self):
+        (self.tmpdir / "vox").mkdir()
+        (self.tmpdir / "vox" / "2026-03-14.json").write_text(json.dumps({
+            "citizen_id": "vox", "date": "2026-03-14", "aggregate_score": 55.0,
+            "capability_scores": {"exec_complete": 55.0}, "intervention_sent": False,
+            "stress_stimulus": 0.2, "brain_reachable": True,
+        }, indent=2))
+        (self.tmpdir / "vox" / "2026-03-15.json").write_text("{not json")
+        self.store.save(DailyRecord("vox", "2026-03-16", 50.0, {}))
+
+        assert self.store.migrate_json_tree(self.tmpdir) == (1, 1)
+        assert self.store.load("vox", date(2026, 3, 14)).capability_scores == {"exec_complete": 55.0}
+        # Already imported: nothing new
+        assert self.store.migrate_json_tree(self.tmpdir) == (0, 1)
+        assert self.store.count() == 2
+
 
 # ── Intervention Composer ────────────────────────────────────────────────────
 
@@ -648,3 +824,700 @@ class TestCapabilityScoreClamping:
         """Total is always brain + behavior, ignoring the passed-in total."""
         s = CapabilityScore(brain_component=20.0, behavior_component=30.0, total=999.0)
         assert s.total == 50.0
+
+
+# ── Brain Topology Row Mapping ───────────────────────────────────────────────
+
+
+class _Node:
+    """Stand-in for a falkordb Node (only .properties is read)."""
+
+    def __init__(self, **properties):
+        self.properties = properties
+
+
+class TestBrainStatsFromRows:
+    """Client-side mapping of the consolidated topology query rows."""
+
+    def test_empty_graph(self):
+        brain = brain_stats_from_rows([], [], [])
+        assert brain.total_nodes == 0
+        assert brain.brain_category == "VOID"
+        assert brain.mean_energy_all == 0.0
+        assert brain.newest_node_age_hours == -1.0
+        assert brain.curiosity == 0.0
+        assert brain.cluster_coefficient == 0.0
+
+    def test_type_groups(self):
+        """Null and blank types count as untyped; distribution is ordered by count."""
+        node_rows = [
+            ["concept", 2, None, None],
+            [None, 1, None, None],
+            ["desire", 4, 0.25, None],
+            ["", 2, 0.5, None],
+            ["  ", 1, None, None],
+        ]
+        brain_rows = [[0.4, None, 3.0, 1.0, None, [[None, None]]]]
+        brain = brain_stats_from_rows(node_rows, brain_rows, [[9]])
+        assert list(brain.type_distribution.items()) == [("desire", 4), ("concept", 2)]
+        assert (brain.typed_node_count, brain.untyped_node_count, brain.total_nodes) == (6, 4, 10)
+        assert brain.desire_count == 4
+        assert brain.desire_energy == 0.25
+        assert brain.desire_moment_ratio == 0.75
+        assert brain.desire_persistence == 1.0 / 3.0
+        assert brain.cluster_coefficient == 9 / 90
+        assert brain.link_density == 0.9
+        assert brain.mean_energy_all == 0.4
+
+    def test_drives(self):
+        """limbic_state properties win over drive nodes; first drive node per name otherwise."""
+        drive_rows = [["curiosity", 0.3], ["curiosity", 0.9], ["ambition", None]]
+        brain = brain_stats_from_rows([], [[None, None, 0, 0, None, drive_rows]], [])
+        assert (brain.curiosity, brain.ambition, brain.social_need) == (0.3, 0.0, 0.0)
+
+        state = _Node(curiosity=0.7, drive_ambition=0.2, social_need=None)
+        brain = brain_stats_from_rows([], [[None, None, 0, 0, state, drive_rows]], [])
+        assert (brain.curiosity, brain.ambition, brain.social_need) == (0.7, 0.2, 0.0)
+
+
+class _Result:
+    def __init__(self, rows):
+        self.result_set = rows
+
+
+class _FakeBrainGraph:
+    """Answers the topology queries from canned rows, recording each query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def query(self, cypher, params=None):
+        self.queries.append(cypher)
+        desires = [3.0, 1.0, _Node(curiosity=0.7), []]
+        graph = [0.4, 1_000_000_000.0]
+        return _Result({
+            brain_reader._NODE_QUERY: [["desire", 4, 0.25, None], ["concept", 6, None, None]],
+            brain_reader._DESIRE_QUERY: [desires],
+            brain_reader._GRAPH_QUERY: [graph],
+            brain_reader._BRAIN_QUERY: [graph + desires],
+            brain_reader._LINK_QUERY: [[9]],
+        }[cypher])
+
+
+class TestBrainReader:
+    """Query parts are read only for the fields asked for, once each."""
+
+    def setup_method(self):
+        self.graph = _FakeBrainGraph()
+        self._get_graph = brain_reader._get_graph
+        brain_reader._get_graph = lambda handle: self.graph
+
+    def teardown_method(self):
+        brain_reader._get_graph = self._get_graph
+
+    def test_lazy_parts(self):
+        reader = BrainReader("vox")
+        brain = reader.stats(["curiosity", "desire_moment_ratio"])
+        assert reader.parts_read == {"nodes", "desires"}
+        assert (brain.curiosity, brain.desire_moment_ratio) == (0.7, 0.75)
+        assert brain.total_links == 0 and brain.mean_energy_all == 0.0  # not read yet
+
+        full = reader.stats()
+        assert reader.parts_read == {"nodes", "desires", "graph", "links"}
+        assert len(self.graph.queries) == 4
+        assert (full.total_links, full.mean_energy_all, full.curiosity) == (9, 0.4, 0.7)
+        assert reader.stats().newest_node_age_hours == full.newest_node_age_hours  # one clock
+        assert len(self.graph.queries) == 4
+
+    def test_full_read_matches_rows(self):
+        """All fields at once: three queries, the combined one for desires and graph."""
+        reader = BrainReader("vox")
+        full = reader.stats()
+        assert len(self.graph.queries) == 3
+        assert full == brain_stats_from_rows(
+            [["desire", 4, 0.25, None], ["concept", 6, None, None]],
+            [[0.4, 1_000_000_000.0, 3.0, 1.0, _Node(curiosity=0.7), []]],
+            [[9]],
+            reader.now,
+        )
+
+
+# ── Universe Moment Reader ───────────────────────────────────────────────────
+
+
+class _FakeUniverseGraph:
+    """Answers the reader's four queries from a small moment table, recording each query's params."""
+
+    def __init__(self, moments):
+        # id → (author, created_at, permanence, hierarchy, parent id, space id)
+        self.moments = moments
+        self.params = {}
+
+    def query(self, cypher, params=None):
+        cid = params["cid"]
+        own = {m_id: m for m_id, m in self.moments.items() if m[0] == cid}
+        if "RETURN m.id, m.created_at" in cypher:
+            self.params["moments"] = params
+            rows = [[m_id, m[1], m[2], m[3]] for m_id, m in own.items()]
+        elif "WHERE m.id IN $mids" in cypher:
+            self.params["responses"] = params
+            rows = [[m_id] for m_id in params["mids"]
+                    if m_id in own and own[m_id][4] is not None and self.moments[own[m_id][4]][0] != cid]
+        elif "min(m.created_at) AS first_at" in cypher:
+            self.params["spaces"] = params
+            rows = []
+            for space in sorted({m[5] for m in own.values() if m[5]}):
+                dated = [m for m in self.moments.values() if m[5] == space and m[1] is not None]
+                first_at = min(m[1] for m in dated)
+                rows.append([space, first_at, sorted({m[0] for m in dated if m[1] == first_at})])
+        elif "count(DISTINCT other.id)" in cypher:
+            self.params["interlocutors"] = params
+            spaces = {m[5] for m in own.values() if m[5]}
+            rows = [[len({m[0] for m in self.moments.values() if m[5] in spaces and m[0] != cid})]]
+        else:
+            raise AssertionError(f"unexpected query: {cypher}")
+        return _Result(rows)
+
+
+class TestUniverseMomentReader:
+    """Responses and first-in-space from the set-based queries."""
+
+    NOW = 1_000_000_000.0
+
+    def _reader(self, monkeypatch, citizen_id="alice"):
+        h = 3600.0
+        self.graph = _FakeUniverseGraph({
+            "m1": ("alice", "2001-09-09T01:46:40Z", 0.8, None, None, None),  # NOW, self-initiated
+            "m2": ("alice", self.NOW - 168 * h, None, None, "m5", "s1"),     # replies to bob
+            "m3": ("alice", self.NOW - 336 * h, None, None, "m6", "s2"),     # replies to herself
+            "m4": ("alice", self.NOW - 900 * h, None, None, None, "s3"),     # outside the window, first in s3
+            "m6": ("alice", self.NOW - 400 * h, None, None, None, None),
+            "m5": ("bob", self.NOW - 200 * h, None, None, None, "s1"),       # first in s1, tied with carol
+            "m8": ("carol", self.NOW - 200 * h, None, None, None, "s1"),
+            "m7": ("bob", self.NOW - 336 * h, None, None, None, "s2"),       # first in s2, tied with alice
+        })
+        monkeypatch.setattr(universe_reader, "_get_graph", lambda: self.graph)
+        reader = universe_reader.UniverseMomentReader(citizen_id)
+        reader.now = self.NOW
+        return reader
+
+    def test_responses(self, monkeypatch):
+        stats = self._reader(monkeypatch).stats(["self_initiated_w", "response_rate"])
+        assert set(self.graph.params) == {"moments", "responses"}
+        assert sorted(self.graph.params["responses"]["mids"]) == ["m1", "m2", "m3", "m6"]
+
+        # Only m2 has a parent by another actor; the others add their own temporal weight
+        assert stats.response_rate == 0.25
+        assert stats.self_initiated_w == pytest.approx(1.0 + 0.25 + 0.5 ** (400 / 168))
+        assert stats.total_moments_w == pytest.approx(1.0 + 0.5 + 0.25 + 0.5 ** (400 / 168))
+        assert stats.self_initiated_w < stats.total_moments_w
+
+    def test_first_in_space_with_tied_timestamps(self, monkeypatch):
+        stats = self._reader(monkeypatch).stats(["first_in_space_w", "spaces_created", "distinct_space_count"])
+        assert set(self.graph.params) == {"moments", "spaces"}
+
+        # s1: bob and carol tie before alice; s2: alice ties with bob; s3: alice alone
+        assert stats.distinct_space_count == 3
+        assert stats.spaces_created == 2
+        assert stats.first_in_space_w == pytest.approx(0.5 ** (336 / 168) + 0.5 ** (900 / 168))
+
+        bob = self._reader(monkeypatch, "bob").stats(["spaces_created", "first_in_space_w"])
+        assert bob.spaces_created == 2
+        assert bob.first_in_space_w == pytest.approx(0.5 ** (200 / 168) + 0.5 ** (336 / 168))
+
+    def test_full_read(self, monkeypatch):
+        reader = self._reader(monkeypatch)
+        full = reader.stats()
+        assert set(self.graph.params) == {"moments", "responses", "spaces", "interlocutors"}
+        assert full.unique_interlocutors == 2
+        assert full.high_permanence_w == 1.0
+        assert reader.stats() == full
+
+    def test_no_moments(self, monkeypatch):
+        assert self._reader(monkeypatch, "nobody").stats() == BehaviorStats()
+        assert set(self.graph.params) == {"moments"}
+
+
+# ── Universe Batch Stats ─────────────────────────────────────────────────────
+
+
+class TestBehaviorStatsFromEdges:
+    """One-pass population stats over streamed universe edge pages."""
+
+    NOW = 1_000_000_000.0
+
+    def _universe(self):
+        h = 3600.0
+        moment_rows = [
+            [10, True, self.NOW, 0.8, None],              # alice, now
+            [11, True, self.NOW - 168 * h, 0.2, 0.5],     # bob, one half-life ago, replies to 10
+            [12, True, self.NOW - 744 * h, None, None],   # alice, outside the window, first in s1
+            [13, True, self.NOW - 1 * h, None, None],     # bob, in s1
+            [14, True, None, None, None],                 # alice, undated, in s2
+            [15, True, self.NOW - 2 * h, None, None],     # carol, first in s2
+            [16, True, None, None, None],                 # dave, undated only
+        ]
+        author_rows = [[10, "alice"], [11, "bob"], [12, "alice"], [13, "bob"],
+                       [14, "alice"], [15, "carol"], [16, "dave"]]
+        link_rows = [[10, 11, None], [12, 100, "s1"], [13, 100, "s1"],
+                     [14, 101, "s2"], [15, 101, "s2"]]
+        edges = UniverseEdges()
+        edges.add(moment_rows[:4], author_rows[:3], link_rows[:2])  # two pages
+        edges.add(moment_rows[4:], author_rows[3:], link_rows[2:])
+        return edges
+
+    def test_population(self):
+        stats = behavior_stats_from_edges(
+            self._universe(), citizen_ids=["alice", "bob", "carol", "dave", "nobody"], now=self.NOW,
+        )
+        alice, bob, carol = stats["alice"], stats["bob"], stats["carol"]
+
+        assert alice.total_moments_w == 1.0
+        assert alice.self_initiated_w == 1.0
+        assert alice.response_rate == 0.0
+        assert alice.high_permanence_w == 1.0
+        assert alice.distinct_space_count == 2
+        assert alice.spaces_created == 1
+        assert alice.first_in_space_w == pytest.approx(0.5 ** (744 / 168))
+        assert alice.unique_interlocutors == 2
+
+        assert bob.total_moments_w == pytest.approx(0.5 + 0.5 ** (1 / 168))
+        assert bob.self_initiated_w == pytest.approx(0.5 ** (1 / 168))
+        assert bob.response_rate == 0.5
+        assert bob.elaborative_tentative_w == pytest.approx(0.5)
+        assert (bob.distinct_space_count, bob.spaces_created) == (1, 0)
+        assert bob.unique_interlocutors == 1
+
+        assert carol.spaces_created == 1
+        assert carol.first_in_space_w == pytest.approx(0.5 ** (2 / 168))
+        assert carol.unique_interlocutors == 1
+
+        assert stats["dave"] == BehaviorStats()
+        assert stats["nobody"] == BehaviorStats()
+
+    def test_field_subset(self):
+        """Only the requested sections are computed; they match a full computation."""
+        ids = ["alice", "bob", "carol"]
+        full = behavior_stats_from_edges(self._universe(), ids, now=self.NOW)
+        subset = behavior_stats_from_edges(
+            self._universe(), ids, now=self.NOW, fields=["response_rate", "spaces_created"],
+        )
+        for cid in ids:
+            assert subset[cid].response_rate == full[cid].response_rate
+            assert subset[cid].spaces_created == full[cid].spaces_created
+            assert subset[cid].total_moments_w == full[cid].total_moments_w
+            assert subset[cid].unique_interlocutors == 0
+
+    def test_interlocutor_chunks(self, monkeypatch):
+        """Bitset unions give the same counts however the targets are chunked."""
+        import random
+        import services.health_assessment.universe_batch_reader as batch
+
+        rng = random.Random(7)
+        n_actors = 40
+        pairs = sorted({(rng.randrange(25), rng.randrange(n_actors)) for _ in range(200)})
+        target = np.array([t for t, _ in pairs])
+        actor = np.array([a for _, a in pairs])
+
+        members = {}
+        for t, a in pairs:
+            members.setdefault(t, set()).add(a)
+        expected = []
+        for a in range(n_actors):
+            reached = set().union(*(m for m in members.values() if a in m))
+            expected.append(len(reached - {a}))
+
+        assert list(batch._interlocutor_counts(actor, target, n_actors)) == expected
+        monkeypatch.setattr(batch, "BITSET_CHUNK_BYTES", 1)
+        assert list(batch._interlocutor_counts(actor, target, n_actors)) == expected
+
+
+# ── Snapshot record / replay ─────────────────────────────────────────────────
+
+
+class TestSnapshot:
+    """A recorded run replays offline to the records the run produced."""
+
+    TODAY = date(2026, 3, 15)
+
+    def setup_method(self):
+        self.tmpdir = Path(tempfile.mkdtemp())
+
+    def _yesterday(self, cid, score):
+        return DailyRecord(cid, "2026-03-14", score, {"exec_complete": score, "ethics": None})
+
+    def test_roundtrip(self):
+        brain = _make_brain(type_distribution={"desire": 3}, desire_energy=0.1 + 0.2)
+        behavior = _make_behavior(response_rate=1 / 3)
+        writer = SnapshotWriter(self.tmpdir, self.TODAY)
+        writer.add("b", BrainStats(reachable=False), BehaviorStats())
+        writer.add("a", brain, behavior, self._yesterday("a", 60.0))
+        assert writer.write(["a", "b", "never_read"]) == 2
+
+        snapshot = load_snapshot(self.tmpdir)
+        assert snapshot.today == self.TODAY
+        assert snapshot.citizen_ids == ["a", "b"]
+        assert snapshot.brains == {"a": brain, "b": BrainStats(reachable=False)}
+        assert snapshot.behaviors["a"] == behavior
+        assert snapshot.yesterday_records == {"a": self._yesterday("a", 60.0)}
+        assert load_snapshot(self.tmpdir, ["b"]).citizen_ids == ["b"]
+
+    def test_replay_matches_check(self):
+        """check_citizen with --record, then replay: same record, offline."""
+        from services.health_assessment import daily_check_runner as runner
+
+        behavior = _make_behavior(total_moments_w=2.0, self_initiated_w=1.0)
+        yesterday = {"vox": DailyRecord("vox", "2026-03-14", 90.0, {"exec_complete": 95.0})}
+        writer = SnapshotWriter(self.tmpdir, self.TODAY)
+        reads = {}
+        get_graph = brain_reader._get_graph
+        brain_reader._get_graph = lambda handle: _FakeBrainGraph()
+        try:
+            record = runner.check_citizen(
+                "vox", dry_run=True, today=self.TODAY, behavior=behavior,
+                yesterday_records=yesterday, reads=reads,
+            )
+        finally:
+            brain_reader._get_graph = get_graph
+        writer.add("vox", **reads)
+        writer.write(["vox"])
+
+        records, messages = runner.replay_snapshot(load_snapshot(self.tmpdir))
+        assert records == [record]
+        assert record.intervention_sent and "vox" in messages
+
+    def test_run_records_completed_checks(self, monkeypatch, tmp_path):
+        """Failed and timed-out checks are not recorded; yesterday is the record actually read."""
+        from services.health_assessment import aggregator
+        from services.health_assessment import daily_check_runner as runner
+
+        score_citizen = runner.score_citizen
+        release, slow_thread = threading.Event(), []
+
+        def score(citizen_id, *args):
+            if citizen_id == "bad":
+                raise ValueError("formula error")
+            if citizen_id == "slow":
+                slow_thread.append(threading.current_thread())
+                release.wait(10)
+            return score_citizen(citizen_id, *args)
+
+        # Nothing may reach the real history store, even from the abandoned check
+        monkeypatch.setenv("GRAPHCARE_HISTORY_DIR", str(tmp_path))
+        # No prefetch (it failed): each check reads its own yesterday record
+        monkeypatch.setattr(aggregator, "load_history",
+                            lambda cid, d: self._yesterday(cid, 90.0) if cid == "vox" else None)
+        monkeypatch.setattr(brain_reader, "_get_graph", lambda handle: _FakeBrainGraph())
+        monkeypatch.setattr(runner, "score_citizen", score)
+        behaviors = {cid: _make_behavior() for cid in ("vox", "bad", "slow", "new")}
+        writer = SnapshotWriter(self.tmpdir, self.TODAY)
+
+        try:
+            outcomes, records = runner._run_checks(
+                list(behaviors), True, self.TODAY, workers=4, timeout=0.5, behaviors=behaviors,
+                yesterday_records=None, snapshot=writer,
+            )
+        finally:
+            # Let the abandoned check finish while the patches are still in place
+            release.set()
+            for thread in slow_thread:
+                thread.join(10)
+                assert not thread.is_alive()
+        assert outcomes == {"vox": "ok", "bad": "failed", "slow": "timeout", "new": "ok"}
+        assert writer.write(list(behaviors)) == 2
+
+        snapshot = load_snapshot(self.tmpdir)
+        assert snapshot.citizen_ids == ["vox", "new"]
+        assert snapshot.yesterday_records == {"vox": self._yesterday("vox", 90.0)}
+        assert runner.replay_snapshot(snapshot)[0] == records
+
+
+# ── Replay benchmark ─────────────────────────────────────────────────────────
+
+# Recorded with SnapshotWriter: sol (healthy, up on yesterday), vox (collapsed
+# since yesterday), nova (no yesterday record), ghost (brain unreachable)
+SNAPSHOT_FIXTURE = Path(__file__).parent / "fixtures" / "health_snapshot"
+BENCHMARK_STAGES = ["load", "score_citizen", "score_population", "aggregate", "compose", "replay"]
+
+
+class TestReplayBenchmark:
+    """The benchmark's stages run offline on a checked-in snapshot."""
+
+    def test_replay_fixture(self):
+        from services.health_assessment import daily_check_runner as runner
+
+        records, messages = runner.replay_snapshot(load_snapshot(SNAPSHOT_FIXTURE))
+        assert [(r.citizen_id, r.date, r.brain_reachable, r.intervention_sent) for r in records] == [
+            ("sol", "2026-03-15", True, False),
+            ("vox", "2026-03-15", True, True),
+            ("nova", "2026-03-15", True, True),
+            ("ghost", "2026-03-15", False, True),
+        ]
+        assert [r.aggregate_score for r in records] == pytest.approx([87.55, 14.40, 56.41, 4.76], abs=0.01)
+        assert sorted(messages) == ["ghost", "nova", "vox"]
+        assert "down 71 from yesterday" in messages["vox"]  # vs the recorded yesterday record
+
+    def test_run_benchmark(self):
+        from services.health_assessment.replay_benchmark import run_benchmark, scale_snapshot
+
+        timings = run_benchmark(SNAPSHOT_FIXTURE, repeat=2, scale=3)
+        assert list(timings) == BENCHMARK_STAGES
+        assert all(len(seconds) == 2 and min(seconds) >= 0 for seconds in timings.values())
+
+        scaled = scale_snapshot(load_snapshot(SNAPSHOT_FIXTURE), 3)
+        assert len(scaled.citizen_ids) == 12 and scaled.citizen_ids[4] == "sol~1"
+        assert scaled.yesterday_records["vox~2"].citizen_id == "vox~2"
+
+    def test_main_report(self, monkeypatch, capsys):
+        from services.health_assessment import replay_benchmark
+
+        monkeypatch.setattr(sys, "argv", [
+            "replay_benchmark", str(SNAPSHOT_FIXTURE), "--repeat", "1", "--scale", "2",
+            "--capability", "exec_complete",
+        ])
+        replay_benchmark.main()
+        lines = capsys.readouterr().out.splitlines()
+        assert lines[0] == "8 citizens, 1 formulas, best / median of 1"
+        assert [line.split()[0] for line in lines[1:]] == BENCHMARK_STAGES
+        assert all(line.endswith("us/citizen") for line in lines[1:])
+
+
+# ── Run report ───────────────────────────────────────────────────────────────
+
+
+class TestRunReport:
+    """Per-stage spans of each check, summarised per run."""
+
+    def _timer(self, stage_seconds):
+        timer = RunTimer()
+        for i, seconds in enumerate(stage_seconds):
+            timing = timer.citizen(f"c{i}")
+            timing.seconds = {"fetch_brain": seconds, "score": 0.001}
+            timing.queries = {"fetch_brain": 3, "score": 0}
+        return timer
+
+    def test_span_counts_thread_queries(self):
+        timing = CitizenTiming("vox")
+        for _ in range(2):
+            with timing.span("fetch_brain"):
+                falkordb_pool._thread_stats.queries = falkordb_pool.thread_query_count() + 3
+        with pytest.raises(ValueError):
+            with timing.span("save"):
+                raise ValueError("disk full")
+        assert timing.queries == {"fetch_brain": 6, "save": 0}
+        assert set(timing.seconds) == {"fetch_brain", "save"}
+        assert timing.total == sum(timing.seconds.values())
+
+    def test_build_report(self):
+        timer = self._timer([i / 100 for i in range(1, 21)])  # 0.01 .. 0.20 s
+        timer.set_outcomes({"c19": "timeout", "nobody": "failed"})
+        with timer.phase("load_yesterday"):
+            pass
+        report = json.loads(json.dumps(build_report(timer, date="2026-03-15", citizens=20)))
+
+        assert report["date"] == "2026-03-15" and report["citizens_timed"] == 20
+        assert set(report["stages"]) == {"fetch_brain", "score"}
+        brain = report["stages"]["fetch_brain"]
+        assert brain["count"] == 20 and brain["queries"] == 60
+        assert (brain["p50"], brain["p95"], brain["max"]) == (0.11, 0.20, 0.20)
+        assert report["phases"]["load_yesterday"]["queries"] == 0
+        assert len(report["slowest"]) == 10
+        assert [s["citizen_id"] for s in report["slowest"][:2]] == ["c19", "c18"]
+        assert report["slowest"][0]["outcome"] == "timeout"
+
+    def test_export_to_monitor(self):
+        recorded = []
+
+        class _Monitor:
+            def record_query(self, org, resolver_type, latency_ms, success=True):
+                recorded.append((org, resolver_type, latency_ms, success))
+
+        timer = self._timer([0.5])
+        timer.set_outcomes({"c0": "failed"})
+        export_to_monitor(timer, _Monitor())
+        assert sorted(recorded) == [
+            ("graphcare", "health_fetch_brain", 500.0, False),
+            ("graphcare", "health_score", 1.0, False),
+        ]
+
+    def test_report_while_spans_are_recorded(self):
+        """An abandoned check still adding spans does not break report building or export."""
+
+        class _Monitor:
+            def record_query(self, org, resolver_type, latency_ms, success=True):
+                pass
+
+        timer = RunTimer()
+        timing = timer.citizen("late")
+        stop = threading.Event()
+
+        def record_spans():
+            i = 0
+            while not stop.is_set():
+                with timing.span(f"stage_{i}"):
+                    pass
+                i += 1
+
+        worker = threading.Thread(target=record_spans)
+        worker.start()
+        try:
+            deadline = time.monotonic() + 0.5
+            while time.monotonic() < deadline:
+                export_to_monitor(timer, _Monitor())
+                report = build_report(timer)
+        finally:
+            stop.set()
+            worker.join()
+        assert report["slowest"][0]["seconds"] is not timing.seconds
+        assert len(timing.seconds) >= len(report["slowest"][0]["seconds"]) > 0
+
+    def test_check_citizen_stages(self):
+        """A dry-run check of an unhealthy citizen: no stimulus or save span."""
+        from services.health_assessment import daily_check_runner as runner
+
+        timing = CitizenTiming("vox")
+        get_graph = brain_reader._get_graph
+        brain_reader._get_graph = lambda handle: _FakeBrainGraph()
+        try:
+            runner.check_citizen(
+                "vox", dry_run=True, today=date(2026, 3, 15), behavior=_make_behavior(),
+                yesterday_records={}, timing=timing,
+            )
+        finally:
+            brain_reader._get_graph = get_graph
+        assert list(timing.seconds) == ["fetch_brain", "score", "aggregate", "intervene"]
+
+
+# ── Concurrent checks ────────────────────────────────────────────────────────
+
+
+class TestRunChecks:
+    """_run_checks with a stand-in check_citizen: outcomes, abandonment, order."""
+
+    TODAY = date(2026, 3, 15)
+
+    @pytest.fixture
+    def runner(self):
+        from services.health_assessment import daily_check_runner as runner
+        return runner
+
+    def _record(self, cid):
+        return DailyRecord(cid, self.TODAY.isoformat(), 50.0, {})
+
+    def test_results_in_registry_order(self, runner, monkeypatch):
+        """Later citizens finish first; records and outcomes still follow citizen_ids."""
+        ids = [f"c{i}" for i in range(6)]
+        finished = []
+
+        def check(citizen_id, **kwargs):
+            time.sleep(0.02 * (len(ids) - int(citizen_id[1:])))
+            finished.append(citizen_id)
+            return None if citizen_id == "c3" else self._record(citizen_id)
+
+        monkeypatch.setattr(runner, "check_citizen", check)
+        outcomes, records = runner._run_checks(ids, True, self.TODAY, workers=6, timeout=5.0)
+        assert finished[0] == "c5"
+        assert list(outcomes.items()) == [(cid, "ok") for cid in ids]
+        assert [r.citizen_id for r in records] == ["c0", "c1", "c2", "c4", "c5"]
+
+    def test_failures_and_timeouts(self, runner, monkeypatch):
+        def check(citizen_id, **kwargs):
+            if citizen_id == "bad":
+                raise ValueError("graph down")
+            if citizen_id == "late":
+                raise runner.CitizenTimeout("late: timed out before saving history")
+            return self._record(citizen_id)
+
+        monkeypatch.setattr(runner, "check_citizen", check)
+        outcomes, records = runner._run_checks(["a", "bad", "late", "b"], True, self.TODAY, workers=2, timeout=5.0)
+        assert outcomes == {"a": "ok", "bad": "failed", "late": "timeout", "b": "ok"}
+        assert [r.citizen_id for r in records] == ["a", "b"]
+
+    def test_blocked_check_is_abandoned_and_cancelled(self, runner, monkeypatch):
+        """A check blocked past the timeout is not waited for, and stops at its next side effect."""
+        release = threading.Event()
+        side_effects = []
+        stopped = threading.Event()
+
+        def check(citizen_id, deadline=None, cancelled=None, **kwargs):
+            if citizen_id == "stuck":
+                release.wait(10)
+                try:
+                    runner._check_deadline(citizen_id, deadline, "saving history", cancelled)
+                except runner.CitizenTimeout:
+                    stopped.set()
+                    raise
+                side_effects.append(citizen_id)
+            return self._record(citizen_id)
+
+        monkeypatch.setattr(runner, "check_citizen", check)
+        start = time.monotonic()
+        outcomes, records = runner._run_checks(["a", "stuck", "b"], True, self.TODAY, workers=2, timeout=0.2)
+        assert time.monotonic() - start < 5.0
+        assert outcomes == {"a": "ok", "stuck": "timeout", "b": "ok"}
+        assert [r.citizen_id for r in records] == ["a", "b"]
+
+        release.set()
+        assert stopped.wait(5.0)
+        assert side_effects == []
+
+    def _side_effects(self, runner, monkeypatch, on_compose=None, on_save=None):
+        """Stub check_citizen's side effects; returns the list they are logged to, in order."""
+        sent = []
+
+        def compose(**kwargs):
+            if on_compose:
+                on_compose()
+            return "message"
+
+        def save(record):
+            sent.append(("history", record.date, record.intervention_sent))
+            if on_save:
+                on_save()
+
+        monkeypatch.setattr(brain_reader, "_get_graph", lambda handle: _FakeBrainGraph())
+        monkeypatch.setattr(runner, "compose_intervention", compose)
+        monkeypatch.setattr(runner, "_send_intervention",
+                            lambda cid, message, today: sent.append(("intervention", today)))
+        monkeypatch.setattr(runner, "send_stress_stimulus", lambda cid, stress: sent.append(("stimulus",)))
+        monkeypatch.setattr(runner, "save_history", save)
+        return sent
+
+    def test_no_side_effects_after_cancel(self, runner, monkeypatch):
+        """Cancelled while composing the intervention: nothing is sent, stimulated or saved."""
+        cancelled = threading.Event()
+        sent = self._side_effects(runner, monkeypatch, on_compose=cancelled.set)  # abandoned during the re-read
+
+        with pytest.raises(runner.CitizenTimeout, match="before saving history"):
+            runner.check_citizen(
+                "vox", dry_run=False, today=self.TODAY, behavior=_make_behavior(),
+                yesterday_records={}, cancelled=cancelled,
+            )
+        with pytest.raises(runner.CitizenTimeout, match="before intervention"):
+            runner.check_citizen(
+                "vox", dry_run=False, today=self.TODAY, behavior=_make_behavior(),
+                yesterday_records={}, deadline=time.monotonic() - 1,
+            )
+        assert sent == []
+
+    def test_history_is_saved_before_sending(self, runner, monkeypatch):
+        """Once the record is saved the check sends what it recorded, even if abandoned meanwhile."""
+        cancelled = threading.Event()
+        sent = self._side_effects(runner, monkeypatch, on_save=cancelled.set)
+
+        record = runner.check_citizen(
+            "vox", dry_run=False, today=self.TODAY, behavior=_make_behavior(),
+            yesterday_records={}, cancelled=cancelled,
+        )
+        assert record.intervention_sent
+        # The run's date, not the wall clock's, wherever the run is when it sends
+        assert sent == [("history", "2026-03-15", True), ("intervention", self.TODAY), ("stimulus",)]
+
+    def test_intervention_sent_once_per_day(self, runner, monkeypatch, tmp_path):
+        monkeypatch.setattr(runner, "INTERVENTIONS_DIR", tmp_path / "interventions")
+        assert runner._send_intervention("vox", "first", self.TODAY)
+        assert not runner._send_intervention("vox", "rerun", self.TODAY)
+        assert runner._send_intervention("vox", "next day", self.TODAY + timedelta(days=1))
+
+        assert (tmp_path / "interventions" / "vox_2026-03-15.md").read_text() == "first"
+        assert (tmp_path / "interventions" / "vox_2026-03-16.md").read_text() == "next day"
@@ -0,0 +1,278 @@
+"""
+Tests for incremental (git revision range) sync.
+
+No FalkorDB needed — a temporary git repository supplies the revisions, and
+the graph helpers incremental_sync calls are pointed at an in-memory store.
+A sync of base..head must leave the graph as a sync of the whole history to
+head would (the same as a full ingest of head).
+
+DOCS: tools/ingestion/incremental_sync.py
+"""
+
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.ingestion import incremental_sync
+from tools.ingestion.incremental_sync import SyncError, changed_files, resolve_range, sync_revision_range
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _git(repo, *args):
+    return subprocess.run(
+        ["git", "-C", str(repo), "-c", "user.name=test", "-c", "user.email=test@example.com", *args],
+        check=True, capture_output=True, text=True,
+    ).stdout.strip()
+
+
+@pytest.fixture
+def repo(tmp_path):
+    """An empty repository; commit(files) writes (or, for None, deletes) files and returns the SHA."""
+    path = tmp_path / "repo"
+    path.mkdir()
+    _git(path, "init", "-q")
+    _git(path, "commit", "-q", "--allow-empty", "-m", "root")
+
+    def commit(files, renames=()):
+        for old, new in renames:
+            (path / new).parent.mkdir(parents=True, exist_ok=True)
+            _git(path, "mv", old, new)
+        for name, source in files.items():
+            file_path = path / name
+            if source is None:
+                file_path.unlink()
+            else:
+                file_path.parent.mkdir(parents=True, exist_ok=True)
+                file_path.write_text(source)
+        _git(path, "add", "-A")
+        _git(path, "commit", "-q", "--allow-empty", "-m", "change")
+        return _git(path, "rev-parse", "HEAD")
+
+    commit.path = path
+    commit.root = _git(path, "rev-parse", "HEAD")
+    return commit
+
+
+class _Store:
+    """Artifacts ({path: properties}) and U4_CALLS links, as the graph helpers see them."""
+
+    def __init__(self):
+        self.artifacts = {}
+        self.links = set()
+        self.pruned = []
+
+    def live(self):
+        return {path: props["content_hash"] for path, props in self.artifacts.items() if props.get("valid_to") is None}
+
+    def upsert(self, graph, properties_list):
+        for props in properties_list:
+            current = self.artifacts.get(props["path"])
+            if current is None:
+                self.artifacts[props["path"]] = dict(props)
+            else:
+                current.update({k: v for k, v in props.items() if k not in ("created_at", "valid_from")})
+                current["valid_to"] = None
+        return len(properties_list)
+
+    def detach(self, graph, paths, link_types=("U4_CALLS", "U4_DEPENDS_ON"), outgoing_only=False, scope_ref=None):
+        paths = set(paths)
+        gone = {(s, t) for s, t in self.links if s in paths or (not outgoing_only and t in paths)}
+        self.links -= gone
+        return len(gone)
+
+    def soft_delete(self, graph, paths):
+        for path in paths:
+            self.artifacts[path]["valid_to"] = 1
+        return len(paths)
+
+    def prune(self, graph, scope_ref, paths):
+        for path in paths:
+            del self.artifacts[path]
+            self.links = {(s, t) for s, t in self.links if path not in (s, t)}
+        self.pruned.extend(paths)
+        return len(paths)
+
+    def link(self, graph, links):
+        rows = [(s, t) for s, t in links if s in self.artifacts and t in self.artifacts]
+        self.links.update(rows)
+        return len(rows)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = _Store()
+    patches = {
+        "get_falkordb_connection": lambda *args, **kwargs: store,
+        "fetch_artifact_hashes": lambda graph, scope_ref: {
+            path: (props["content_hash"], props.get("valid_to")) for path, props in store.artifacts.items()
+        },
+        "fetch_function_calls": lambda graph, scope_ref: {
+            path: json.loads(props["calls"]) for path, props in store.artifacts.items()
+            if "calls" in props and props.get("valid_to") is None
+        },
+        "upsert_code_artifact_batch": store.upsert,
+        "detach_artifact_links": store.detach,
+        "soft_delete_artifacts": store.soft_delete,
+        "prune_stale_artifacts": store.prune,
+        "create_call_links_batch": store.link,
+    }
+    for name, fn in patches.items():
+        monkeypatch.setattr(incremental_sync, name, fn)
+    return store
+
+
+def _sync(repo, rev_range, **kwargs):
+    return sync_revision_range(repo.path, rev_range, "g", "scope", generate_embeddings=False, **kwargs)
+
+
+def _rebuilt(repo, monkeypatch, head):
+    """The graph a sync of the whole history (root..head) builds from empty."""
+    with monkeypatch.context() as m:
+        fresh = _Store()
+        m.setattr(incremental_sync, "get_falkordb_connection", lambda *args, **kwargs: fresh)
+        m.setattr(incremental_sync, "fetch_artifact_hashes", lambda graph, scope_ref: {})
+        m.setattr(incremental_sync, "fetch_function_calls", lambda graph, scope_ref: {})
+        m.setattr(incremental_sync, "upsert_code_artifact_batch", fresh.upsert)
+        m.setattr(incremental_sync, "create_call_links_batch", fresh.link)
+        _sync(repo, f"{repo.root}..{head}")
+    return fresh
+
+
+def _path(repo, name):
+    return str(repo.path / name)
+
+
+# ── changed_files / resolve_range ────────────────────────────────────────────
+
+
+class TestChangedFiles:
+
+    def test_name_status_parsing(self, repo):
+        base = repo({"keep.py": "x = 1\n", "edit.py": "x = 1\n", "gone.py": "x = 1\n",
+                     "move.py": "def moved():\n    return 1\n" * 3, "to_txt.py": "y = 2\n" * 5,
+                     "notes.txt": "hello\n"})
+        head = repo({"edit.py": "x = 2\n", "gone.py": None, "new file.py": "z = 3\n",
+                     "notes.txt": "hello again\n"},
+                    renames=[("move.py", "pkg/moved.py"), ("to_txt.py", "to_txt.txt")])
+
+        changes = changed_files(repo.path, base, head)
+        assert sorted(changes.upserted) == ["edit.py", "new file.py", "pkg/moved.py"]
+        assert sorted(changes.removed) == ["gone.py", "move.py", "to_txt.py"]
+
+    def test_limited_to_subdirectory(self, repo):
+        base = repo({"pkg/a.py": "a = 1\n", "other/b.py": "b = 1\n"})
+        head = repo({"pkg/a.py": "a = 2\n", "other/b.py": "b = 2\n"})
+        changes = changed_files(repo.path / "pkg", base, head)
+        assert (changes.upserted, changes.removed) == (["a.py"], [])
+
+    def test_resolve_range(self, repo):
+        first = repo({"a.py": "a = 1\n"})
+        second = repo({"a.py": "a = 2\n"})
+        assert resolve_range(repo.path, f"{first}..{second}") == (first, second)
+        assert resolve_range(repo.path, first) == (first, second)
+        assert resolve_range(repo.path, f"{repo.root}...") == (repo.root, second)
+        with pytest.raises(SyncError, match="rev-parse"):
+            resolve_range(repo.path, "no-such-rev..HEAD")
+
+
+# ── sync_revision_range ──────────────────────────────────────────────────────
+
+
+V1 = {
+    "app.py": "from lib import helper\n\n\ndef main():\n    return helper(1)\n\n\ndef run():\n    return main()\n",
+    "lib.py": "def helper(x):\n    return x\n\n\ndef old(x):\n    return x\n",
+    "util.py": "class Tool:\n    def use(self):\n        return old(2)\n",
+    "caller.py": "def later():\n    return fresh()\n",
+}
+
+
+class TestSyncRevisionRange:
+
+    def test_matches_sync_from_empty(self, repo, store, monkeypatch):
+        v1 = repo(V1)
+        _sync(repo, f"{repo.root}..{v1}")
+        assert store.live() == _rebuilt(repo, monkeypatch, v1).live()
+
+        v2 = repo({
+            "lib.py": "def helper(x):\n    return x + 1\n\n\ndef fresh():\n    return helper(0)\n",
+            "util.py": None,
+        }, renames=[("app.py", "core/app.py")])
+        stats = _sync(repo, f"{v1}..{v2}")
+
+        rebuilt = _rebuilt(repo, monkeypatch, v2)
+        assert store.live() == rebuilt.live()
+        live = store.live()
+        assert {(s, t) for s, t in store.links if s in live and t in live} == rebuilt.links
+        # Retired artifacts keep no links
+        assert all(s in live and t in live for s, t in store.links)
+        assert (stats.files_upserted, stats.files_removed) == (2, 2)
+
+    def test_relinks_callers_in_unchanged_files(self, repo, store):
+        v1 = repo(V1)
+        _sync(repo, f"{repo.root}..{v1}")
+        assert not any(t.endswith("::fresh") for _, t in store.links)
+
+        v2 = repo({"lib.py": V1["lib.py"] + "\n\ndef fresh():\n    return 0\n"})
+        stats = _sync(repo, f"{v1}..{v2}")
+        assert stats.files_upserted == 1
+        # caller.py was not re-extracted; its stored call list links it to the new function
+        assert (_path(repo, "caller.py") + "::later", _path(repo, "lib.py") + "::fresh") in store.links
+        assert stats.artifacts_written == 1 and stats.artifacts_unchanged == 2
+
+    def test_changed_call_list_replaces_outgoing_links(self, repo, store):
+        v1 = repo(V1)
+        _sync(repo, f"{repo.root}..{v1}")
+        main = _path(repo, "app.py") + "::main"
+        assert (main, _path(repo, "lib.py") + "::helper") in store.links
+
+        v2 = repo({"app.py": V1["app.py"].replace("return helper(1)", "return old(1)")})
+        _sync(repo, f"{v1}..{v2}")
+        assert {t for s, t in store.links if s == main} == {_path(repo, "lib.py") + "::old"}
+        # Incoming links of the edited function survive
+        assert (_path(repo, "app.py") + "::run", main) in store.links
+
+    @pytest.mark.parametrize("prune", [False, True])
+    def test_retire_or_prune_removed_file(self, repo, store, prune):
+        v1 = repo(V1)
+        _sync(repo, f"{repo.root}..{v1}")
+        tool = [_path(repo, "util.py") + "::Tool", _path(repo, "util.py") + "::Tool::use"]
+
+        v2 = repo({"util.py": None})
+        stats = _sync(repo, f"{v1}..{v2}", prune=prune)
+        assert not any(tool_path in (s, t) for s, t in store.links for tool_path in tool)
+        if prune:
+            assert stats.artifacts_pruned == 2 and sorted(store.pruned) == sorted(tool)
+            assert not set(tool) & set(store.artifacts)
+        else:
+            assert stats.artifacts_retired == 2 and stats.calls_unlinked == 1
+            assert all(store.artifacts[path]["valid_to"] is not None for path in tool)
+
+    def test_retired_artifact_revives(self, repo, store):
+        v1 = repo(V1)
+        _sync(repo, f"{repo.root}..{v1}")
+        v2 = repo({"lib.py": "def helper(x):\n    return x\n"})
+        _sync(repo, f"{v1}..{v2}")
+        old = _path(repo, "lib.py") + "::old"
+        assert old not in store.live()
+
+        v3 = repo({"lib.py": V1["lib.py"]})
+        stats = _sync(repo, f"{v2}..{v3}")
+        assert old in store.live() and stats.artifacts_written == 1
+        assert (_path(repo, "util.py") + "::Tool::use", old) in store.links
+
+    def test_parse_error_leaves_artifacts(self, repo, store):
+        v1 = repo(V1)
+        _sync(repo, f"{repo.root}..{v1}")
+        before = store.live()
+
+        v2 = repo({"lib.py": "def helper(x:\n"})
+        stats = _sync(repo, f"{v1}..{v2}")
+        assert stats.errors == 1 and stats.artifacts_retired == 0
+        assert store.live() == before
@@ -0,0 +1,241 @@
+"""
+Tests for the streaming ingestion pipeline.
+
+No FalkorDB needed — StreamingPipeline runs plain functions, and
+run_ingest_pipeline is pointed at a stand-in graph.
+
+DOCS: tools/ingestion/ingest_pipeline.py
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.ingestion import ingest_pipeline
+from tools.ingestion.ingest_pipeline import Stage, StreamingPipeline, pattern_scope, run_ingest_pipeline
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+def _run(source, stages, timeout=10.0):
+    """Run a pipeline on a helper thread so a hang fails the test instead of the suite."""
+    pipeline = StreamingPipeline(source, stages, sample_interval=0.01)
+    outcome = {}
+
+    def target():
+        try:
+            outcome["metrics"] = pipeline.run()
+        except BaseException as e:
+            outcome["error"] = e
+
+    runner = threading.Thread(target=target, daemon=True)
+    runner.start()
+    runner.join(timeout)
+    assert not runner.is_alive(), "pipeline did not shut down"
+    return pipeline, outcome
+
+
+# ── StreamingPipeline ────────────────────────────────────────────────────────
+
+
+class TestStreamingPipeline:
+
+    def test_all_items_flow_through(self):
+        collected, lock = [], threading.Lock()
+
+        def collect(batch):
+            with lock:
+                collected.extend(batch)
+            return ()
+
+        _, outcome = _run(range(100), [
+            Stage("double", lambda x: [x, x], workers=3, queue_size=4),
+            Stage("collect", collect, workers=2, batch_size=8, queue_size=4, linger_seconds=0.001),
+        ])
+        metrics = outcome["metrics"]
+        assert sorted(collected) == sorted(list(range(100)) * 2)
+        assert metrics["discover"].items_out == 100
+        assert metrics["double"].items_in == 100 and metrics["double"].items_out == 200
+        assert metrics["collect"].items_in == 200
+        assert metrics["collect"].batches >= 200 // 8
+        assert all(m.finished_at is not None for m in metrics.values())
+
+    def test_queues_are_bounded(self):
+        """A slow stage holds the source back: it never runs more than the queue ahead."""
+        produced, consumed = [0], [0]
+        lead = []
+
+        def source():
+            for i in range(40):
+                produced[0] += 1
+                yield i
+
+        def slow(item):
+            consumed[0] += 1
+            lead.append(produced[0] - consumed[0])
+            time.sleep(0.002)
+            return ()
+
+        _, outcome = _run(source(), [Stage("slow", slow, workers=1, queue_size=3)])
+        metrics = outcome["metrics"]["slow"]
+        assert metrics.items_in == 40
+        assert metrics.queue_capacity == 3
+        assert metrics.queue_depth_max <= 3
+        # Queued items plus the one the source is blocked trying to put
+        assert max(lead) <= 3 + 1
+
+    def test_stage_errors_are_counted_not_fatal(self):
+        out, lock = [], threading.Lock()
+
+        def boom(item):
+            if item % 5 == 0:
+                raise ValueError(f"bad {item}")
+            yield item
+
+        def collect(batch):
+            with lock:
+                out.extend(batch)
+            return ()
+
+        _, outcome = _run(range(20), [
+            Stage("boom", boom, workers=2, queue_size=2),
+            Stage("collect", collect, batch_size=4, queue_size=2, linger_seconds=0.001),
+        ])
+        metrics = outcome["metrics"]
+        assert "error" not in outcome
+        assert metrics["boom"].errors == 4
+        assert sorted(out) == [i for i in range(20) if i % 5]
+
+    def test_partial_output_of_failing_item_is_kept(self):
+        """Outputs produced before an error were already forwarded downstream."""
+        out = []
+
+        def fan(item):
+            yield item
+            raise RuntimeError("after first output")
+
+        _, outcome = _run(range(3), [
+            Stage("fan", fan), Stage("collect", lambda x: out.append(x) or ()),
+        ])
+        assert sorted(out) == [0, 1, 2]
+        assert outcome["metrics"]["fan"].errors == 3
+        assert outcome["metrics"]["fan"].items_out == 3
+
+    def test_source_error_is_raised_after_shutdown(self):
+        """A failing source still ends every stage, then run() re-raises its error."""
+        out = []
+
+        def source():
+            yield 1
+            yield 2
+            raise OSError("disk gone")
+
+        pipeline, outcome = _run(source(), [
+            Stage("double", lambda x: [x * 2], workers=3, queue_size=1),
+            Stage("collect", lambda batch: out.extend(batch) or (), batch_size=4, linger_seconds=0.001),
+        ])
+        assert isinstance(outcome["error"], OSError)
+        assert sorted(out) == [2, 4]
+        assert pipeline.queue_depths() == {"double": 0, "collect": 0}
+        assert not [t for t in threading.enumerate() if t.name.startswith(("double-", "collect-"))]
+
+    def test_empty_source(self):
+        _, outcome = _run(iter(()), [
+            Stage("double", lambda x: [x], workers=4),
+            Stage("collect", lambda batch: (), workers=2, batch_size=8),
+        ])
+        assert all(m.items_in == 0 for m in outcome["metrics"].values())
+
+
+# ── run_ingest_pipeline ──────────────────────────────────────────────────────
+
+
+SOURCE = '''
+class Greeter:
+    def greet(self, name):
+        return helper(name)
+
+
+def helper(name):
+    return name.upper()
+'''
+
+
+@pytest.fixture
+def fake_graph(monkeypatch):
+    """Stub the graph reads/writes run_ingest_pipeline makes; collect what it writes."""
+    written = {"artifacts": [], "links": [], "retired": []}
+    monkeypatch.setattr(ingest_pipeline, "get_falkordb_connection", lambda *args, **kwargs: object())
+    monkeypatch.setattr(ingest_pipeline, "fetch_artifact_hashes", lambda graph, scope_ref: {})
+    monkeypatch.setattr(ingest_pipeline, "upsert_code_artifact_batch",
+                        lambda graph, props: written["artifacts"].extend(props) or len(props))
+    monkeypatch.setattr(ingest_pipeline, "create_call_links_batch",
+                        lambda graph, links: written["links"].extend(links) or len(links))
+    monkeypatch.setattr(ingest_pipeline, "soft_delete_artifacts",
+                        lambda graph, paths: written["retired"].extend(paths) or len(paths))
+    return written
+
+
+class TestRunIngestPipeline:
+
+    @pytest.mark.parametrize("extract_workers", [1, 2])
+    def test_extracts_and_writes(self, tmp_path, fake_graph, extract_workers):
+        (tmp_path / "a.py").write_text(SOURCE)
+        (tmp_path / "broken.py").write_text("def broken(:\n")
+
+        stats, metrics = run_ingest_pipeline(
+            tmp_path, "g", "scope", generate_embeddings=False,
+            extract_workers=extract_workers, write_batch=10,
+        )
+        paths = sorted(p["path"] for p in fake_graph["artifacts"])
+        assert paths == sorted(
+            f"{tmp_path / 'a.py'}::{name}" for name in ("Greeter", "Greeter::greet", "helper")
+        )
+        assert stats.functions_ingested == 2 and stats.classes_ingested == 1
+        assert stats.errors == 1  # broken.py
+        assert fake_graph["links"] == [(f"{tmp_path / 'a.py'}::Greeter::greet", f"{tmp_path / 'a.py'}::helper")]
+        assert metrics["extract"].items_in == 2 and metrics["extract"].workers == extract_workers
+
+    def test_process_pool_uses_cache(self, tmp_path, fake_graph):
+        (tmp_path / "src").mkdir()
+        (tmp_path / "src" / "a.py").write_text(SOURCE)
+        cache_dir = tmp_path / "cache"
+        for _ in range(2):
+            run_ingest_pipeline(tmp_path / "src", "g", "scope", generate_embeddings=False,
+                                extract_workers=2, cache_dir=cache_dir)
+        assert len(fake_graph["artifacts"]) == 6
+        assert any(cache_dir.rglob("*")), "workers did not write the shared cache"
+
+    def test_retires_artifacts_of_deleted_files(self, tmp_path, fake_graph, monkeypatch):
+        src = tmp_path / "src"
+        (src / "pkg").mkdir(parents=True)
+        (src / "pkg" / "a.py").write_text(SOURCE)
+        (src / "pkg" / "broken.py").write_text("def broken(:\n")
+        existing = {
+            f"{src / 'pkg' / 'a.py'}::helper": ("stale", None),
+            f"{src / 'pkg' / 'a.py'}::gone": ("h", None),
+            f"{src / 'pkg' / 'broken.py'}::broken": ("h", None),
+            f"{src / 'pkg' / 'deleted.py'}::f": ("h", None),
+            f"{src / 'pkg' / 'retired.py'}::f": ("h", 1),
+            f"{src / 'other' / 'b.py'}::f": ("h", None),
+            f"{src / 'pkg' / 'web.ts'}::f": ("h", None),
+        }
+        monkeypatch.setattr(ingest_pipeline, "fetch_artifact_hashes", lambda graph, scope_ref: existing)
+
+        stats, _ = run_ingest_pipeline(src, "g", "scope", generate_embeddings=False,
+                                       extract_workers=1, pattern="pkg/**/*.py")
+        assert sorted(fake_graph["retired"]) == [
+            f"{src / 'pkg' / 'a.py'}::gone", f"{src / 'pkg' / 'deleted.py'}::f"
+        ]
+        assert stats.artifacts_retired == 2
+
+    def test_pattern_scope(self, tmp_path):
+        assert pattern_scope(tmp_path) == (str(tmp_path), (".py",))
+        assert pattern_scope(tmp_path, "src/lib/**/*.pyi") == (str(tmp_path / "src" / "lib"), (".pyi",))
+        assert pattern_scope(Path("."), "*.py") == (".", (".py",))
@@ -0,0 +1,77 @@
+"""
+Tests for repository extraction on a process pool.
+
+No repository checkout needed — a small source tree is written to a temporary
+directory and extracted in this process and on worker processes.
+
+DOCS: tools/extractors/python_ast_extractor.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.extractors.python_ast_extractor import extract_repository
+
+
+# ── Helpers ──────────────────────────────────────────────────────────────────
+
+
+SOURCES = {
+    "app/__init__.py": "",
+    "app/main.py": (
+        "import os\nfrom app.util import helper as h\n\n\n"
+        "class Runner(Base):\n    mode = 'fast'\n\n    async def run(self, x: int) -> int:\n"
+        "        if x:\n            return h(x)\n        return os.getpid()\n"
+    ),
+    "app/util.py": "def helper(x):\n    return [i for i in range(x) if i % 2]\n",
+    "app/deep/nested/leaf.py": "@decorator\ndef leaf(*args, **kwargs):\n    return leaf(*args)\n",
+    "broken.py": "def broken(:\n    pass\n",
+    "latin1.py": b"x = '\xe9'\n",
+    "scripts/tool.py": "from app.main import Runner\n\nRunner().run(1)\n",
+}
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "tree"
+    for name, source in SOURCES.items():
+        path = root / name
+        path.parent.mkdir(parents=True, exist_ok=True)
+        if isinstance(source, bytes):
+            path.write_bytes(source)
+        else:
+            path.write_text(source)
+    return root
+
+
+# ── extract_repository ───────────────────────────────────────────────────────
+
+
+class TestWorkers:
+
+    @pytest.mark.parametrize("chunk_size", [1, 2, 64])
+    def test_workers_match_serial(self, tree, chunk_size):
+        serial = extract_repository(tree, workers=1)
+        parallel = extract_repository(tree, workers=3, chunk_size=chunk_size)
+
+        # Same files in the same (discovery) order, with identical results
+        assert list(parallel.file_results) == list(serial.file_results)
+        assert parallel.file_results == serial.file_results
+        assert parallel.to_json() == serial.to_json()
+
+        results = {Path(path).relative_to(tree).as_posix(): result for path, result in serial.file_results.items()}
+        assert set(results) == set(SOURCES)
+        assert results["broken.py"].parse_errors and results["latin1.py"].parse_errors
+        assert [f.name for f in results["app/main.py"].functions] == ["run"]
+
+    def test_workers_with_cache(self, tree, tmp_path):
+        serial = extract_repository(tree, workers=1)
+        cache_dir = tmp_path / "cache"
+        for _ in range(2):  # cold, then every file from the cache
+            parallel = extract_repository(tree, workers=3, chunk_size=2, cache_dir=cache_dir)
+            assert list(parallel.file_results) == list(serial.file_results)
+            assert parallel.file_results == serial.file_results
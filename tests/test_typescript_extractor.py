@@ -0,0 +1,147 @@
+"""
+Tests for the TypeScript extractor's source scanner.
+
+No Node.js needed — mask_source / scan_source are checked on hand-written
+snippets, and TypeScriptExtractor on small files whose structures hide in
+strings, templates, regexes and comments.
+
+DOCS: tools/extractors/typescript_extractor.py
+"""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.extractors.typescript_extractor import TypeScriptExtractor, mask_source, scan_source
+
+
+# ── mask_source ──────────────────────────────────────────────────────────────
+
+
+class TestMaskSource:
+
+    @pytest.mark.parametrize("source, masked", [
+        # Escaped quotes and backslashes stay inside the string
+        (r"""a = 'it\'s { x'; b = "say \"}\" \\"; f(a)""",
+         r"""a = '         '; b = "            "; f(a)"""),
+        ("s = \"// not a comment\"; f(1)",
+         "s = \"                \"; f(1)"),
+        # A quote not closed on its line (JSX text) is a plain character
+        ("<p>Don't {x}</p>", "<p>Don't {x}</p>"),
+    ])
+    def test_strings(self, source, masked):
+        assert mask_source(source) == masked
+
+    def test_template_literals(self):
+        source = "t = `a ${ {k: `in ${x + '}'} b`}.k } c { ` + d;"
+        assert mask_source(source) == "t = `  ${ {k: `   ${x + ' '}  `}.k }     ` + d;"
+
+    def test_template_keeps_line_breaks(self):
+        source = "t = `one {\ntwo ${a}\n}`; f()"
+        masked = mask_source(source)
+        assert masked == "t = `     \n    ${a}\n `; f()"
+        assert masked.count("\n") == source.count("\n")
+
+    @pytest.mark.parametrize("source, masked", [
+        ("r = /[/}]\\/x/g.test(s)", "r = /       /g.test(s)"),
+        ("return /ab+c/i", "return /    /i"),
+        ("f(/}/, x)", "f(/ /, x)"),
+        # Division after an identifier, number or closing bracket
+        ("q = a / b / c", "q = a / b / c"),
+        ("q = (a + 1) / 2 / x[0]", "q = (a + 1) / 2 / x[0]"),
+    ])
+    def test_regex_vs_division(self, source, masked):
+        assert mask_source(source) == masked
+
+    def test_comments(self):
+        source = "x = y // } 'quote\n/* { block\n } */ z = `/*`"
+        assert mask_source(source) == "x = y" + " " * 12 + "\n" + " " * 10 + "\n" + " " * 6 + "z = `  `"
+
+    def test_unclosed_comment_runs_to_end(self):
+        assert mask_source("a /* b {") == "a       "
+
+    def test_offsets_are_preserved(self):
+        source = "const a = \"x\\ny\" /* c */ + `t\n${b}` // d\n"
+        masked = mask_source(source)
+        assert len(masked) == len(source)
+        assert [i for i, c in enumerate(masked) if c == "\n"] == [i for i, c in enumerate(source) if c == "\n"]
+
+
+# ── scan_source ──────────────────────────────────────────────────────────────
+
+
+class TestScanSource:
+
+    def test_brackets_outside_masked_regions(self):
+        source = "f(a, '(', { b: [1, '}'] }) /* ) */"
+        _, closing = scan_source(source)
+        assert closing == {
+            source.index("("): source.index(")"),
+            source.index("{"): source.index("})"),
+            source.index("["): source.index("]"),
+        }
+
+    def test_template_expression_brackets(self):
+        source = "g(`${ h({ a: 1 }) }`)"
+        _, closing = scan_source(source)
+        assert closing[1] == len(source) - 1
+        assert closing[source.index("h(") + 1] == source.index("})") + 1
+
+    def test_unbalanced_closers(self):
+        # A stray closer is ignored; a closer for an outer bracket closes it
+        _, closing = scan_source("} { ( ] }")
+        assert closing == {2: 8}
+
+
+# ── TypeScriptExtractor ──────────────────────────────────────────────────────
+
+
+HIDDEN = '''const banner = `
+function hidden() {}
+class Hidden {}
+`;
+// const fake = () => 1
+/* export class Nope {} */
+const note = "function quoted() {}";
+const real = (a: number) => a / 2;
+export class Real extends Base {
+  re = /\\}/;
+  label = '}';
+}
+'''
+
+BODIES = '''export function render(items: Item[]): string {
+  const open = "{";
+  return items.map(i => `${i.name} {`).join(`
+}`);
+}
+
+const handler = async (e: Event) => {
+  const re = /[{]/;
+  return re.test(e.type) ? '}' : "{";
+};
+
+export const short = (x) => x / 2;
+'''
+
+
+class TestTypeScriptExtractor:
+
+    def test_structures_in_masked_regions_are_ignored(self):
+        result = TypeScriptExtractor(Path("x.ts"), HIDDEN).extract()
+        assert result.parse_errors == []
+        assert [(f.name, f.function_type, f.line_number) for f in result.functions] == [("real", "arrow", 8)]
+        assert [(c.name, c.extends, c.line_number) for c in result.classes] == [("Real", "Base", 9)]
+
+    def test_body_lines_skip_brackets_in_masked_regions(self):
+        result = TypeScriptExtractor(Path("x.ts"), BODIES).extract()
+        functions = {f.name: f for f in result.functions}
+        assert set(functions) == {"render", "handler", "short"}
+        assert (functions["render"].line_number, functions["render"].body_lines) == (1, 5)
+        assert functions["render"].return_type == "string"
+        assert (functions["handler"].line_number, functions["handler"].body_lines) == (7, 4)
+        assert functions["handler"].is_async and functions["handler"].parameters == ["e"]
+        assert (functions["short"].body_lines, functions["short"].is_exported) == (1, True)
@@ -0,0 +1,446 @@
+#!/usr/bin/env python3
+"""
+Export FalkorDB graph to a bulk snapshot (per-label CSVs + JSONL + manifest)
+
+Cypher text (export_graph_cypher.py) has to be replayed statement by statement.
+This exporter writes the layout accepted by `falkordb-bulk-insert --enforce-schema`
+so a client graph can be restored in one bulk load, plus a JSONL variant for our
+own loaders (import_graph_bulk.py).
+
+Snapshot layout:
+    <output_dir>/
+        manifest.json              counts, checksums, schema version
+        nodes.jsonl                one {"id", "labels", "properties"} per line
+        edges.jsonl                one {"id", "type", "src", "dst", "properties"} per line
+        nodes/<Label>.csv          one file per label combination
+        edges/<TYPE>.csv           one file per relationship type
+
+With --since the snapshot is a delta instead (JSONL only, since the bulk loader
+cannot upsert): changed nodes/edges, edges carrying "src_ref"/"dst_ref" natural
+keys, plus tombstones.jsonl. The manifest gets a "delta": {"since", "until"} entry.
+Apply deltas in order with replay_graph_delta.py.
+
+Usage:
+    python3 export_graph_bulk.py <graph_name> <output_dir> [--format both|csv|jsonl] [--since <ts>]
+
+Example:
+    python3 export_graph_bulk.py scopelock snapshots/scopelock_2026-10-19
+    python3 export_graph_bulk.py scopelock deltas/scopelock_2026-10-19T10 --since 2026-10-19T09:00:00
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import sys
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from graph_delta import changed_since, iter_tombstones, node_ref, not_bookkeeping, now_ms, parse_since
+
+SCHEMA_VERSION = 1
+ID_NAMESPACE = "node"
+UNLABELED = "_Unlabeled"  # bulk loader requires a label; removed again on import
+LABEL_FILE_SEPARATOR = "__"
+
+# CSV column types understood by falkordb-bulk-insert --enforce-schema
+_TYPE_RANK = {"BOOLEAN": 0, "INT": 1, "DOUBLE": 2}
+
+
+# ============================================================================
+# Graph Reading (paged by internal ID so memory stays flat)
+# ============================================================================
+
+def _max_node_id(graph) -> int:
+    result = graph.query("MATCH (n) RETURN max(ID(n))")
+    value = result.result_set[0][0] if result.result_set else None
+    return int(value) if value is not None else -1
+
+
+def iter_nodes(graph, batch_size: int = 5000, where: str = "",
+               params: Optional[Dict[str, Any]] = None) -> Iterator[dict]:
+    """Yield node records in internal-ID order, one ID window per query.
+
+    `where` is an extra Cypher predicate on `n` (e.g. "n.updated_at >= $since").
+    """
+    max_id = _max_node_id(graph)
+    extra = f" AND ({where})" if where else ""
+    for lo in range(0, max_id + 1, batch_size):
+        result = graph.query(
+            f"MATCH (n) WHERE ID(n) >= $lo AND ID(n) < $hi{extra} RETURN n",
+            {**(params or {}), "lo": lo, "hi": lo + batch_size},
+        )
+        for row in sorted(result.result_set, key=lambda r: r[0].id):
+            node = row[0]
+            yield {
+                "id": node.id,
+                "labels": list(node.labels or []),
+                "properties": dict(node.properties),
+            }
+
+
+def iter_edges(graph, batch_size: int = 5000, where: str = "",
+               params: Optional[Dict[str, Any]] = None,
+               endpoint_refs: bool = False) -> Iterator[dict]:
+    """Yield relationship records, windowed by source node ID.
+
+    `where` is an extra Cypher predicate on `r` (and may reference `s`, `t`).
+    With `endpoint_refs` each record also carries the endpoints' natural keys
+    ("src_ref" / "dst_ref"), as needed by deltas.
+    """
+    max_id = _max_node_id(graph)
+    extra = f" AND ({where})" if where else ""
+    returns = "s, r, t" if endpoint_refs else "ID(s), r, ID(t)"
+    for lo in range(0, max_id + 1, batch_size):
+        result = graph.query(
+            f"MATCH (s)-[r]->(t) WHERE ID(s) >= $lo AND ID(s) < $hi{extra} RETURN {returns}",
+            {**(params or {}), "lo": lo, "hi": lo + batch_size},
+        )
+        for row in sorted(result.result_set, key=lambda r: r[1].id):
+            source, rel, target = row
+            record = {
+                "id": rel.id,
+                "type": rel.relation,
+                "src": source.id if endpoint_refs else source,
+                "dst": target.id if endpoint_refs else target,
+                "properties": dict(rel.properties),
+            }
+            if endpoint_refs:
+                record["src_ref"] = node_ref(source.labels or [], source.properties)
+                record["dst_ref"] = node_ref(target.labels or [], target.properties)
+            yield record
+
+
+# ============================================================================
+# Value / Schema Helpers
+# ============================================================================
+
+def _json_safe(value: Any) -> Any:
+    """Coerce client values (points, vectors, ...) to JSON-serialisable ones."""
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_safe(v) for v in value]
+    if isinstance(value, dict):
+        return {k: _json_safe(v) for k, v in value.items()}
+    return str(value)
+
+
+def _value_type(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return "BOOLEAN"
+    if isinstance(value, int):
+        return "INT"
+    if isinstance(value, float):
+        return "DOUBLE"
+    if isinstance(value, list):
+        return "ARRAY"
+    return "STRING"
+
+
+def _merge_type(current: Optional[str], new: Optional[str]) -> Optional[str]:
+    """Widen a column type so every value seen so far still fits."""
+    if current is None:
+        return new
+    if new is None or new == current:
+        return current
+    if current in _TYPE_RANK and new in _TYPE_RANK and "BOOLEAN" not in (current, new):
+        return "DOUBLE"  # INT + DOUBLE
+    return "STRING"
+
+
+def _csv_cell(value: Any, col_type: str) -> str:
+    """Render a property value for a typed bulk-loader column."""
+    if value is None:
+        return ""  # empty field == NULL for the bulk loader
+    if col_type == "BOOLEAN":
+        return "true" if value else "false"
+    if col_type in ("INT", "DOUBLE"):
+        return repr(value) if isinstance(value, float) else str(value)
+    if col_type == "ARRAY":
+        return repr(value)  # parsed with ast.literal_eval by the loader
+    if isinstance(value, (dict, list)):
+        return json.dumps(value)
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def label_key(labels: List[str]) -> str:
+    """Label combination as passed to `falkordb-bulk-insert -N`."""
+    return ":".join(labels) if labels else UNLABELED
+
+
+def _file_stem(key: str) -> str:
+    return key.replace(":", LABEL_FILE_SEPARATOR)
+
+
+def sha256_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+# ============================================================================
+# Snapshot Writers
+# ============================================================================
+
+def write_jsonl(records: Iterator[dict], path: Path, schema: Dict[str, Dict[str, Optional[str]]],
+                group_counts: Dict[str, int], group_key) -> int:
+    """Stream records to JSONL, accumulating per-group counts and CSV column schema."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        for record in records:
+            record["properties"] = _json_safe(record["properties"])
+            group = group_key(record)
+            group_counts[group] = group_counts.get(group, 0) + 1
+            columns = schema.setdefault(group, {})
+            for key, value in record["properties"].items():
+                columns[key] = _merge_type(columns.get(key), _value_type(value))
+            f.write(json.dumps(record, ensure_ascii=False, sort_keys=True) + "\n")
+            count += 1
+    return count
+
+
+def _csv_writer(handle):
+    # Matches falkordb-bulk-insert's reader: unquoted fields, backslash escapes.
+    # The csv module only escapes line-break characters that occur in the
+    # lineterminator, so "\r\n" is what gets a bare "\r" in a value escaped too.
+    return csv.writer(handle, quoting=csv.QUOTE_NONE, escapechar="\\", lineterminator="\r\n")
+
+
+def write_node_csvs(nodes_jsonl: Path, out_dir: Path,
+                    schema: Dict[str, Dict[str, Optional[str]]]) -> Dict[str, int]:
+    """Split nodes.jsonl into one enforced-schema CSV per label combination."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    columns = {key: sorted(cols.items()) for key, cols in schema.items()}
+    handles, writers, counts = {}, {}, {}
+    try:
+        with open(nodes_jsonl, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                key = label_key(record["labels"])
+                if key not in writers:
+                    handles[key] = open(out_dir / f"{_file_stem(key)}.csv", "w",
+                                        encoding="utf-8", newline="")
+                    writers[key] = _csv_writer(handles[key])
+                    writers[key].writerow(
+                        [f":ID({ID_NAMESPACE})"]
+                        + [f"{name}:{col_type or 'STRING'}" for name, col_type in columns[key]]
+                    )
+                    counts[key] = 0
+                props = record["properties"]
+                writers[key].writerow(
+                    [record["id"]]
+                    + [_csv_cell(props.get(name), col_type or "STRING") for name, col_type in columns[key]]
+                )
+                counts[key] += 1
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return counts
+
+
+def write_edge_csvs(edges_jsonl: Path, out_dir: Path,
+                    schema: Dict[str, Dict[str, Optional[str]]]) -> Dict[str, int]:
+    """Split edges.jsonl into one enforced-schema CSV per relationship type."""
+    out_dir.mkdir(parents=True, exist_ok=True)
+    columns = {key: sorted(cols.items()) for key, cols in schema.items()}
+    handles, writers, counts = {}, {}, {}
+    try:
+        with open(edges_jsonl, encoding="utf-8") as f:
+            for line in f:
+                record = json.loads(line)
+                rel_type = record["type"]
+                if rel_type not in writers:
+                    handles[rel_type] = open(out_dir / f"{rel_type}.csv", "w",
+                                             encoding="utf-8", newline="")
+                    writers[rel_type] = _csv_writer(handles[rel_type])
+                    writers[rel_type].writerow(
+                        [f":START_ID({ID_NAMESPACE})", f":END_ID({ID_NAMESPACE})"]
+                        + [f"{name}:{col_type or 'STRING'}" for name, col_type in columns[rel_type]]
+                    )
+                    counts[rel_type] = 0
+                props = record["properties"]
+                writers[rel_type].writerow(
+                    [record["src"], record["dst"]]
+                    + [_csv_cell(props.get(name), col_type or "STRING") for name, col_type in columns[rel_type]]
+                )
+                counts[rel_type] += 1
+    finally:
+        for handle in handles.values():
+            handle.close()
+    return counts
+
+
+def _file_entry(root: Path, path: Path, **extra) -> dict:
+    return {
+        "path": str(path.relative_to(root)),
+        "bytes": path.stat().st_size,
+        "sha256": sha256_file(path),
+        **extra,
+    }
+
+
+def write_snapshot(
+    nodes: Iterator[dict],
+    edges: Iterator[dict],
+    output_dir: Path,
+    graph_name: str,
+    formats: Tuple[str, ...] = ("csv", "jsonl"),
+    extra_manifest: Optional[Dict[str, Any]] = None,
+    tombstones: Optional[Iterator[dict]] = None,
+) -> dict:
+    """Write node/edge record streams as a snapshot directory and return its manifest.
+
+    `tombstones` (delta snapshots only) are written verbatim to tombstones.jsonl.
+    """
+    output_dir.mkdir(parents=True, exist_ok=True)
+    node_schema: Dict[str, Dict[str, Optional[str]]] = {}
+    edge_schema: Dict[str, Dict[str, Optional[str]]] = {}
+    by_label: Dict[str, int] = {}
+    by_type: Dict[str, int] = {}
+
+    nodes_jsonl = output_dir / "nodes.jsonl"
+    edges_jsonl = output_dir / "edges.jsonl"
+
+    print("Exporting nodes...")
+    node_count = write_jsonl(nodes, nodes_jsonl, node_schema, by_label, lambda r: label_key(r["labels"]))
+    print(f"✓ Exported {node_count} nodes")
+
+    print("Exporting relationships...")
+    edge_count = write_jsonl(edges, edges_jsonl, edge_schema, by_type, lambda r: r["type"])
+    print(f"✓ Exported {edge_count} relationships")
+
+    files = []
+
+    if "csv" in formats:
+        print("Writing bulk-loader CSVs...")
+        csv_nodes = write_node_csvs(nodes_jsonl, output_dir / "nodes", node_schema)
+        csv_edges = write_edge_csvs(edges_jsonl, output_dir / "edges", edge_schema)
+        for key, rows in sorted(csv_nodes.items()):
+            path = output_dir / "nodes" / f"{_file_stem(key)}.csv"
+            files.append(_file_entry(output_dir, path, format="csv", kind="nodes",
+                                     labels=key, rows=rows))
+        for rel_type, rows in sorted(csv_edges.items()):
+            path = output_dir / "edges" / f"{rel_type}.csv"
+            files.append(_file_entry(output_dir, path, format="csv", kind="edges",
+                                     type=rel_type, rows=rows))
+
+    if "jsonl" in formats:
+        files.append(_file_entry(output_dir, nodes_jsonl, format="jsonl", kind="nodes", rows=node_count))
+        files.append(_file_entry(output_dir, edges_jsonl, format="jsonl", kind="edges", rows=edge_count))
+        if tombstones is not None:
+            tombstones_jsonl = output_dir / "tombstones.jsonl"
+            tombstone_count = 0
+            with open(tombstones_jsonl, "w", encoding="utf-8") as f:
+                for tombstone in tombstones:
+                    f.write(json.dumps(_json_safe(tombstone), ensure_ascii=False, sort_keys=True) + "\n")
+                    tombstone_count += 1
+            print(f"✓ Exported {tombstone_count} tombstones")
+            files.append(_file_entry(output_dir, tombstones_jsonl, format="jsonl", kind="tombstones",
+                                     rows=tombstone_count))
+    else:
+        nodes_jsonl.unlink()
+        edges_jsonl.unlink()
+
+    manifest = {
+        "schema_version": SCHEMA_VERSION,
+        "graph": graph_name,
+        "generated_at": datetime.now().isoformat(),
+        "tool": "export_graph_bulk.py",
+        "formats": list(formats),
+        "id_namespace": ID_NAMESPACE,
+        "unlabeled_label": UNLABELED,
+        "counts": {
+            "nodes": node_count,
+            "edges": edge_count,
+            "nodes_by_label": by_label,
+            "edges_by_type": by_type,
+        },
+        "node_schema": node_schema,
+        "edge_schema": edge_schema,
+        "files": files,
+    }
+    if extra_manifest:
+        manifest.update(extra_manifest)
+
+    (output_dir / "manifest.json").write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    return manifest
+
+
+def export_graph_bulk(
+    graph_name: str,
+    output_dir: Path,
+    formats: Tuple[str, ...] = ("csv", "jsonl"),
+    host: str = "localhost",
+    port: int = 6379,
+    batch_size: int = 5000,
+    since: Optional[int] = None,
+) -> dict:
+    """Export a whole graph as a bulk snapshot, or only changes since `since` (epoch ms)."""
+    from falkordb import FalkorDB
+
+    db = FalkorDB(host=host, port=port)
+    graph = db.select_graph(graph_name)
+
+    if since is None:
+        print(f"Exporting graph: {graph_name} → {output_dir}")
+        manifest = write_snapshot(
+            iter_nodes(graph, batch_size),
+            iter_edges(graph, batch_size),
+            output_dir,
+            graph_name,
+            formats,
+        )
+    else:
+        if "csv" in formats:
+            print("⚠️  Delta snapshots are JSONL only (falkordb-bulk-insert cannot upsert)")
+        until = now_ms()
+        params = {"since": since}
+        print(f"Exporting delta: {graph_name} since {since} → {output_dir}")
+        manifest = write_snapshot(
+            iter_nodes(graph, batch_size, f"({changed_since('n')}) AND {not_bookkeeping('n')}", params),
+            iter_edges(graph, batch_size, changed_since("r"), params, endpoint_refs=True),
+            output_dir,
+            graph_name,
+            ("jsonl",),
+            extra_manifest={"delta": {"since": since, "until": until}},
+            tombstones=iter_tombstones(graph, since, until),
+        )
+
+    print(f"\n✅ Export complete: {output_dir}")
+    print(f"   Nodes: {manifest['counts']['nodes']}")
+    print(f"   Relationships: {manifest['counts']['edges']}")
+    if since is not None:
+        print(f"   Next delta: --since {manifest['delta']['until']}")
+    return manifest
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a FalkorDB graph as a bulk-loader snapshot")
+    parser.add_argument("graph_name", help="FalkorDB graph name (e.g., scopelock)")
+    parser.add_argument("output_dir", type=Path, help="Snapshot directory to create")
+    parser.add_argument("--format", choices=["both", "csv", "jsonl"], default="both",
+                        help="Snapshot formats to write (default: both)")
+    parser.add_argument("--host", default="localhost", help="FalkorDB host (default: localhost)")
+    parser.add_argument("--port", type=int, default=6379, help="FalkorDB port (default: 6379)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Node ID window per query")
+    parser.add_argument("--since", type=parse_since,
+                        help="Write a delta of changes since this time (epoch ms or ISO-8601)")
+    args = parser.parse_args()
+
+    formats = ("csv", "jsonl") if args.format == "both" else (args.format,)
+    export_graph_bulk(args.graph_name, args.output_dir, formats, args.host, args.port,
+                      args.batch_size, args.since)
+    sys.exit(0)
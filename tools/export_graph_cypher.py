@@ -3,25 +3,43 @@
 Export FalkorDB graph to Cypher CREATE statements
 
 Usage:
-    python3 export_graph_cypher.py <graph_name> <output_file>
+    python3 export_graph_cypher.py <graph_name> <output_file> [--since <ts>]
 
 Example:
     python3 export_graph_cypher.py scopelock scopelock_export.cypher
+    python3 export_graph_cypher.py scopelock scopelock_delta.cypher --since 2026-10-19T09:00:00
+
+With --since (epoch ms or ISO-8601) only nodes/edges changed since then are written,
+as idempotent MERGE ... SET statements keyed by natural key (path / id), preceded by
+DELETE statements for tombstones recorded by the ingestors. Apply deltas in order
+with replay_graph_delta.py.
 """
 
+import argparse
 import sys
 import json
 from datetime import datetime
+from pathlib import Path
 from falkordb import FalkorDB
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from graph_delta import (
+    changed_since, iter_tombstones, node_ref, not_bookkeeping, now_ms, parse_since, tombstone_refs,
+)
+from import_graph_bulk import _quote
+
+DELTA_HEADER = "// Delta:"
 
 
 def escape_string(s: str) -> str:
-    """Escape string for Cypher"""
+    """Escape string for Cypher (a statement stays on one \\n-terminated line)"""
     if s is None:
         return "null"
-    # Escape backslashes and quotes
-    s = s.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    # Escape backslashes, quotes and line breaks; other line separators (U+2028, ...)
+    # have no Cypher escape and stay raw, as replay splits statements on \n only
+    s = s.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n").replace("\r", "\\r")
     return f'"{s}"'
 
 
@@ -46,15 +64,98 @@ def format_value(value: Any) -> str:
         return escape_string(str(value))
 
 
-def export_graph(graph_name: str, output_file: str):
-    """Export graph to Cypher CREATE statements"""
-
-    db = FalkorDB(host='localhost', port=6379)
+def format_props(properties: Dict[str, Any]) -> str:
+    """Format a property map as a Cypher map literal"""
+    return "{" + ", ".join(f"{_quote(key)}: {format_value(value)}" for key, value in properties.items()) + "}"
+
+
+def format_match(var: str, ref: Dict[str, Any]) -> str:
+    """Pattern matching a node by natural key, e.g. (n:U4_Code_Artifact {path: "a.py::f"})"""
+    label_str = "".join(f":{_quote(label)}" for label in ref["labels"])
+    return f"({var}{label_str} {{{_quote(ref['key'])}: {format_value(ref['value'])}}})"
+
+
+def export_delta(graph, f, since: int, until: int) -> Dict[str, int]:
+    """Write tombstone DELETEs, then node and edge upserts changed since `since`"""
+    counts = {"deletes": 0, "nodes": 0, "edges": 0, "skipped": 0}
+
+    # Deletes first: a node deleted and re-created inside the window ends up present
+    print("Exporting tombstones...")
+    for tombstone in iter_tombstones(graph, since, until):
+        ref, rel_type, target_ref = tombstone_refs(tombstone)
+        if rel_type:
+            f.write(f"MATCH {format_match('s', ref)}-[r:{_quote(rel_type)}]->{format_match('t', target_ref)} DELETE r;\n")
+        else:
+            f.write(f"MATCH {format_match('n', ref)} DETACH DELETE n;\n")
+        counts["deletes"] += 1
+    print(f"✓ Exported {counts['deletes']} deletes")
+
+    print("Exporting changed nodes...")
+    nodes_result = graph.query(
+        f"MATCH (n) WHERE ({changed_since('n')}) AND {not_bookkeeping('n')} RETURN n",
+        {"since": since},
+    )
+    for row in nodes_result.result_set:
+        node = row[0]
+        ref = node_ref(node.labels or [], node.properties)
+        if ref is None:
+            counts["skipped"] += 1
+            continue
+        f.write(f"MERGE {format_match('n', ref)} SET n += {format_props(node.properties)};\n")
+        counts["nodes"] += 1
+    print(f"✓ Exported {counts['nodes']} nodes")
+
+    print("Exporting changed relationships...")
+    rels_result = graph.query(
+        f"MATCH (s)-[r]->(t) WHERE {changed_since('r')} RETURN s, r, t",
+        {"since": since},
+    )
+    for row in rels_result.result_set:
+        source, rel, target = row
+        source_ref = node_ref(source.labels or [], source.properties)
+        target_ref = node_ref(target.labels or [], target.properties)
+        if source_ref is None or target_ref is None:
+            counts["skipped"] += 1
+            continue
+        f.write(
+            f"MATCH {format_match('s', source_ref)} MATCH {format_match('t', target_ref)} "
+            f"MERGE (s)-[r:{_quote(rel.relation)}]->(t) SET r += {format_props(rel.properties)};\n"
+        )
+        counts["edges"] += 1
+    print(f"✓ Exported {counts['edges']} relationships")
+
+    if counts["skipped"]:
+        print(f"  ⚠️  Skipped {counts['skipped']} entities without a natural key (path / id)")
+    return counts
+
+
+def export_graph(graph_name: str, output_file: str, since: Optional[int] = None,
+                 host: str = 'localhost', port: int = 6379):
+    """Export graph to Cypher CREATE statements (or a MERGE delta when `since` is set)"""
+
+    db = FalkorDB(host=host, port=port)
     graph = db.select_graph(graph_name)
 
+    if since is not None:
+        # Capture the upper bound before reading so the next delta can start here
+        until = now_ms()
+        print(f"Exporting delta: {graph_name} (since {since})")
+        with open(output_file, 'w', encoding='utf-8', newline='\n') as f:
+            f.write(f"// FalkorDB Graph Delta: {graph_name}\n")
+            f.write(f"// Generated: {datetime.now().isoformat()}\n")
+            f.write(f"// Tool: export_graph_cypher.py\n")
+            f.write(f"{DELTA_HEADER} {json.dumps({'graph': graph_name, 'since': since, 'until': until})}\n\n")
+            counts = export_delta(graph, f, since, until)
+            f.write(f"\n// Delta complete: {counts['deletes']} deletes, {counts['nodes']} nodes, "
+                    f"{counts['edges']} relationships\n")
+
+        print(f"\n✅ Delta export complete: {output_file}")
+        print(f"   Next delta: --since {until}")
+        return
+
     print(f"Exporting graph: {graph_name}")
 
-    with open(output_file, 'w', encoding='utf-8') as f:
+    with open(output_file, 'w', encoding='utf-8', newline='\n') as f:
         # Write header
         f.write(f"// FalkorDB Graph Export: {graph_name}\n")
         f.write(f"// Generated: {datetime.now().isoformat()}\n")
@@ -78,12 +179,12 @@ def export_graph(graph_name: str, output_file: str):
             node_id_map[node.id] = var_name
 
             # Build label string
-            label_str = ":".join(labels) if labels else ""
+            label_str = ":".join(_quote(label) for label in labels) if labels else ""
 
             # Build properties
             props = []
             for key, value in properties.items():
-                props.append(f"{key}: {format_value(value)}")
+                props.append(f"{_quote(key)}: {format_value(value)}")
 
             props_str = "{" + ", ".join(props) + "}" if props else ""
 
@@ -120,12 +221,12 @@ def export_graph(graph_name: str, output_file: str):
             target_var = node_id_map.get(target.id, f"n{target.id}")
 
             # Build relationship type
-            rel_type = rel.relation
+            rel_type = _quote(rel.relation)
 
             # Build properties
             props = []
             for key, value in rel.properties.items():
-                props.append(f"{key}: {format_value(value)}")
+                props.append(f"{_quote(key)}: {format_value(value)}")
 
             props_str = "{" + ", ".join(props) + "}" if props else ""
 
@@ -149,12 +250,13 @@ def export_graph(graph_name: str, output_file: str):
 
 
 if __name__ == "__main__":
-    if len(sys.argv) != 3:
-        print("Usage: python3 export_graph_cypher.py <graph_name> <output_file>")
-        print("Example: python3 export_graph_cypher.py scopelock scopelock_export.cypher")
-        sys.exit(1)
-
-    graph_name = sys.argv[1]
-    output_file = sys.argv[2]
-
-    export_graph(graph_name, output_file)
+    parser = argparse.ArgumentParser(description="Export a FalkorDB graph to Cypher statements")
+    parser.add_argument("graph_name", help="FalkorDB graph name (e.g., scopelock)")
+    parser.add_argument("output_file", help="Cypher file to write")
+    parser.add_argument("--since", type=parse_since,
+                        help="Only export changes since this time (epoch ms or ISO-8601)")
+    parser.add_argument("--host", default="localhost", help="FalkorDB host (default: localhost)")
+    parser.add_argument("--port", type=int, default=6379, help="FalkorDB port (default: 6379)")
+    args = parser.parse_args()
+
+    export_graph(args.graph_name, args.output_file, args.since, args.host, args.port)
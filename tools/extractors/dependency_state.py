@@ -0,0 +1,603 @@
+"""
+Incremental Dependency Graph State for GraphCare
+
+dependency_analyzer.py rebuilds every graph from a full extraction. This module
+keeps the result between runs instead, and updates it from per-file deltas:
+
+    files        projected extraction of every file (ANALYSIS_FIELDS)
+    call graph   adjacency + reverse adjacency + SCC id per function
+    import graph adjacency + reverse adjacency + SCC id per module
+
+apply({file: file_data or None}) re-indexes only the changed files, re-resolves
+only the callers whose call names could now resolve differently, and recomputes
+only the strongly connected components the changed edges can touch. It returns
+the cycles that appeared and disappeared, which is what a per-commit
+"circular dependency introduced" alert needs.
+
+Usage:
+    python dependency_state.py init <extraction.jsonl> <repo_root> <state.json>
+    python dependency_state.py update <state.json> <base>..<head> [--fail-on-new-cycles]
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+import argparse
+import json
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dependency_analyzer import (
+    ANALYSIS_FIELDS,
+    CallGraphBuilder,
+    CalleeResolver,
+    CircularDependency,
+    CircularDependencyDetector,
+    ImportGraphBuilder,
+    ModuleIndex,
+    module_path,
+)
+from extraction_stream import load_extraction, project_file
+
+STATE_FORMAT = "graphcare-dependency-state"
+STATE_VERSION = 1
+
+
+class DependencyStateError(Exception):
+    """State file is missing, corrupt, or of another format version."""
+
+
+# ============================================================================
+# Incremental Graph
+# ============================================================================
+
+class IncrementalGraph:
+    """
+    A directed graph with its strongly connected components, kept up to date as
+    edges change.
+
+    After an update, only nodes whose component may have changed are re-run
+    through Tarjan:
+        - members of components that contained a removed edge or removed node
+          (the component may split)
+        - nodes reachable from the head and reaching the tail of an added edge
+          (a new cycle through that edge can only use those)
+    Every other component provably stays as it was.
+    """
+
+    def __init__(self):
+        self.out: Dict[str, Set[str]] = {}  # node → nodes it depends on
+        self.inc: Dict[str, Set[str]] = {}  # node → nodes depending on it
+        self.scc_of: Dict[str, int] = {}  # node → component id
+        self.members: Dict[int, Set[str]] = {}  # component id → nodes
+        self._next_id = 0
+
+    @classmethod
+    def from_edges(cls, edges: Dict[str, Iterable[str]], scc_of: Optional[Dict[str, int]] = None) -> "IncrementalGraph":
+        """Build from node → targets (targets outside `edges` are dropped); SCCs are computed unless given."""
+        graph = cls()
+        for node in edges:
+            graph.out[node] = set()
+            graph.inc[node] = set()
+        for node, targets in edges.items():
+            for target in targets:
+                if target in graph.out:
+                    graph.out[node].add(target)
+                    graph.inc[target].add(node)
+
+        if scc_of is None:
+            graph._assign_components(list(graph.out))
+        else:
+            graph.scc_of = dict(scc_of)
+            for node, component_id in graph.scc_of.items():
+                graph.members.setdefault(component_id, set()).add(node)
+            graph._next_id = max(graph.members, default=-1) + 1
+        return graph
+
+    def is_cyclic(self, members: Set[str], out: Optional[Dict[str, Set[str]]] = None) -> bool:
+        """True if a component is a circular dependency (2+ nodes, or a node depending on itself)."""
+        if len(members) > 1:
+            return True
+        node = next(iter(members))
+        return node in (out or self.out).get(node, ())
+
+    def cycles(self) -> List[Set[str]]:
+        """Members of every cyclic component."""
+        return [members for members in self.members.values() if self.is_cyclic(members)]
+
+    def update(self, new_out: Dict[str, Set[str]], removed: Iterable[str] = (),
+               cycle_type: str = "function_call") -> Tuple[List[CircularDependency], List[CircularDependency]]:
+        """
+        Replace the out-edges of `new_out` nodes (adding nodes that are new) and
+        delete `removed` nodes with all their edges (removal wins over new_out).
+
+        Returns:
+            (cycles introduced, cycles removed), as CircularDependency of `cycle_type`
+        """
+        removed = [node for node in removed if node in self.out]
+        gone = set(removed)
+        new_out = {node: targets for node, targets in new_out.items() if node not in gone}
+        added_edges: Set[Tuple[str, str]] = set()
+        removed_edges: Set[Tuple[str, str]] = set()
+
+        for node in new_out:
+            if node not in self.out:
+                self.out[node] = set()
+                self.inc[node] = set()
+        for node in removed:
+            removed_edges.update((node, target) for target in self.out[node])
+            removed_edges.update((source, node) for source in self.inc[node])
+        for node, targets in new_out.items():
+            targets = {target for target in targets if target in self.out and target not in gone}
+            removed_edges.update((node, target) for target in self.out[node] - targets)
+            added_edges.update((node, target) for target in targets - self.out[node])
+
+        # Components that may split, and their cycles before the update
+        touched: Set[int] = {self.scc_of[n] for edge in removed_edges for n in edge if n in self.scc_of}
+        before = {
+            frozenset(self.members[cid]): self._describe(self.members[cid], cycle_type, added_edges, removed_edges)
+            for cid in touched if self.is_cyclic(self.members[cid], self._old_out(self.members[cid], added_edges, removed_edges))
+        }
+
+        # Apply edge changes
+        for source, target in removed_edges:
+            self.out[source].discard(target)
+            self.inc[target].discard(source)
+        for source, target in added_edges:
+            self.out[source].add(target)
+            self.inc[target].add(source)
+        emptied = set()
+        for node in removed:
+            del self.out[node], self.inc[node]
+            cid = self.scc_of.pop(node)
+            self.members[cid].discard(node)
+            emptied.add(cid)
+
+        # Nodes that may be in a new cycle through an added edge
+        merging: Set[str] = set()
+        if added_edges:
+            reachable = self._reach({target for _, target in added_edges}, self.out)
+            reaching = self._reach({source for source, _ in added_edges}, self.inc)
+            merging = reachable & reaching
+            for node in merging:
+                if node in self.scc_of:
+                    cid = self.scc_of[node]
+                    members = self.members[cid]
+                    if cid not in touched and self.is_cyclic(members, self._old_out(members, added_edges, removed_edges)):
+                        before[frozenset(members)] = self._describe(members, cycle_type, added_edges, removed_edges)
+                    touched.add(cid)
+
+        region: Set[str] = set(merging)
+        for cid in touched:
+            region.update(self.members.pop(cid))
+        for cid in emptied - touched:
+            if not self.members[cid]:
+                del self.members[cid]  # removed nodes that had no edges
+        region.update(node for node in new_out if node not in self.scc_of)
+        new_components = self._assign_components(sorted(region))
+
+        after = {
+            frozenset(members): members for members in new_components if self.is_cyclic(members)
+        }
+        new_cycles = [self._describe(set(members), cycle_type) for members in after if members not in before]
+        removed_cycles = [cycle for members, cycle in before.items() if members not in after]
+        return new_cycles, removed_cycles
+
+    # ------------------------------------------------------------------------
+    # Helpers
+    # ------------------------------------------------------------------------
+
+    def _assign_components(self, nodes: List[str]) -> List[Set[str]]:
+        """Run Tarjan on the subgraph induced by `nodes` and record its components."""
+        index_of = {node: i for i, node in enumerate(nodes)}
+        adjacency = [[index_of[t] for t in self.out[node] if t in index_of] for node in nodes]
+        components = []
+        for component in CircularDependencyDetector.strongly_connected_components(adjacency):
+            members = {nodes[i] for i in component}
+            component_id = self._next_id
+            self._next_id += 1
+            self.members[component_id] = members
+            for node in members:
+                self.scc_of[node] = component_id
+            components.append(members)
+        return components
+
+    @staticmethod
+    def _reach(starts: Set[str], edges: Dict[str, Set[str]]) -> Set[str]:
+        seen = set(starts)
+        queue = deque(starts)
+        while queue:
+            for neighbour in edges.get(queue.popleft(), ()):
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        return seen
+
+    def _old_out(self, members: Set[str], added_edges: Set[Tuple[str, str]],
+                 removed_edges: Set[Tuple[str, str]]) -> Dict[str, Set[str]]:
+        """Out-edges of `members` as they were before the pending update."""
+        old = {node: set(self.out.get(node, ())) for node in members}
+        for source, target in added_edges:
+            if source in old:
+                old[source].discard(target)
+        for source, target in removed_edges:
+            if source in old:
+                old[source].add(target)
+        return old
+
+    def _describe(self, members: Set[str], cycle_type: str, added_edges: Set[Tuple[str, str]] = frozenset(),
+                  removed_edges: Set[Tuple[str, str]] = frozenset()) -> CircularDependency:
+        """CircularDependency for a component (edges as before the pending update, if given)."""
+        out = self._old_out(members, added_edges, removed_edges) if (added_edges or removed_edges) else self.out
+        nodes = sorted(members)
+        index_of = {node: i for i, node in enumerate(nodes)}
+        adjacency = [[index_of[t] for t in out[node] if t in index_of] for node in nodes]
+        cycle = CircularDependencyDetector.shortest_cycle(adjacency, list(range(len(nodes))))
+        return CircularDependency(
+            cycle=[nodes[i] for i in cycle],
+            cycle_type=cycle_type,
+            severity=CircularDependencyDetector.severity(len(nodes)),
+            members=nodes
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "edges": {node: sorted(targets) for node, targets in self.out.items()},
+            "scc": self.scc_of,
+        }
+
+
+# ============================================================================
+# Dependency Graph State
+# ============================================================================
+
+@dataclass
+class StateDelta:
+    """What one apply() changed."""
+    files_changed: int = 0
+    files_removed: int = 0
+    callers_resolved: int = 0  # Functions whose calls were re-resolved
+    new_cycles: List[CircularDependency] = field(default_factory=list)
+    removed_cycles: List[CircularDependency] = field(default_factory=list)
+    seconds: float = 0.0
+
+
+def _call_name(call: str) -> str:
+    """Name a call resolves by: the last attribute (`self.x.run` → run)."""
+    return call.rpartition(".")[2]
+
+
+class DependencyGraphState:
+    """Persisted call / import graphs with SCCs, updated from per-file extraction deltas."""
+
+    def __init__(self, repo_path: str, repo_root: Path, files: Dict[str, Dict[str, Any]],
+                 calls: IncrementalGraph, imports: IncrementalGraph):
+        self.repo_path = repo_path
+        self.repo_root = Path(repo_root)
+        self.files = files
+        self.calls = calls
+        self.imports = imports
+
+        self.modules = ModuleIndex(files, repo_path)
+        self.resolver = CalleeResolver(files, self.modules, function_id=CallGraphBuilder.function_id)
+        self._functions: Dict[str, Tuple[str, Optional[str], List[str]]] = {}  # id → (file, class, calls)
+        self._callers_of: Dict[str, Set[str]] = {}  # call name → function IDs calling it
+        self._functions_in: Dict[str, Set[str]] = {}  # file → function IDs
+        self._importers_of: Dict[str, Set[str]] = {}  # absolute dotted name → files importing it
+        for file_path, file_data in files.items():
+            self._index_functions(file_path, file_data)
+            self._index_imports(file_path, file_data)
+
+    # ------------------------------------------------------------------------
+    # Construction / persistence
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, data: Dict[str, Any], repo_root: Path) -> "DependencyGraphState":
+        """Full build from load_extraction(path, keep=ANALYSIS_FIELDS) output."""
+        call_graph = CallGraphBuilder(data).build()
+        import_graph = ImportGraphBuilder(data, repo_root).build()
+        return cls(
+            data["repo_path"], repo_root, data["files"],
+            IncrementalGraph.from_edges({node_id: node.callees for node_id, node in call_graph.items()}),
+            IncrementalGraph.from_edges({name: node.imports for name, node in import_graph.items()}),
+        )
+
+    def save(self, path: Path) -> None:
+        state = {
+            "format": STATE_FORMAT,
+            "version": STATE_VERSION,
+            "repo_path": self.repo_path,
+            "repo_root": str(self.repo_root),
+            "files": self.files,
+            "call_graph": self.calls.to_dict(),
+            "import_graph": self.imports.to_dict(),
+        }
+        tmp = Path(path).with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, separators=(",", ":")), encoding="utf-8")
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "DependencyGraphState":
+        try:
+            state = json.loads(Path(path).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError) as e:
+            raise DependencyStateError(f"{path}: cannot read dependency state: {e}")
+        if state.get("format") != STATE_FORMAT or state.get("version") != STATE_VERSION:
+            raise DependencyStateError(
+                f"{path}: unsupported dependency state {state.get('format')} v{state.get('version')}"
+            )
+        return cls(
+            state["repo_path"], Path(state["repo_root"]), state["files"],
+            IncrementalGraph.from_edges(state["call_graph"]["edges"], state["call_graph"]["scc"]),
+            IncrementalGraph.from_edges(state["import_graph"]["edges"], state["import_graph"]["scc"]),
+        )
+
+    # ------------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------------
+
+    def apply(self, changes: Dict[str, Optional[Dict[str, Any]]]) -> StateDelta:
+        """
+        Apply per-file extraction deltas.
+
+        Args:
+            changes: file path (as in the extraction) → new file dict (python_ast_extractor
+                shape, projected or not), or None if the file was deleted
+
+        Returns:
+            StateDelta with the cycles introduced and removed
+        """
+        started = time.monotonic()
+        delta = StateDelta()
+        old_files = {file_path: self.files.get(file_path) for file_path in changes}
+        new_files = {
+            file_path: project_file(file_data, ANALYSIS_FIELDS) if file_data is not None else None
+            for file_path, file_data in changes.items()
+        }
+        delta.files_changed = sum(1 for data in new_files.values() if data is not None)
+        delta.files_removed = len(new_files) - delta.files_changed
+
+        # Names whose resolution may change anywhere: everything the changed files define or re-export,
+        # plus the methods of classes whose hierarchy changed
+        affected_names: Set[str] = set()
+        for file_path in changes:
+            for file_data in (old_files[file_path], new_files[file_path]):
+                if file_data is not None:
+                    affected_names |= self._defined_names(file_data)
+        affected_names |= self._hierarchy_names(old_files, new_files)
+
+        # Re-index the changed files
+        file_set_changed = any((old is None) != (new_files[path] is None) for path, old in old_files.items())
+        removed_functions: Set[str] = set()
+        for file_path, old in old_files.items():
+            if old is not None:
+                self.resolver.remove_file(file_path, old)
+                removed_functions |= self._unindex_functions(file_path, old)
+                self._unindex_imports(file_path, old)
+                del self.files[file_path]
+        for file_path, new in new_files.items():
+            if new is not None:
+                self.files[file_path] = new
+                self.resolver.add_file(file_path, new)
+                removed_functions -= self._index_functions(file_path, new)
+        affected_names |= self._hierarchy_names(old_files, new_files)
+
+        # Files whose imports now load different modules (only when files were added or removed)
+        old_modules = self.modules
+        if file_set_changed:
+            self.modules = ModuleIndex(self.files, self.repo_path)
+            self.resolver.modules = self.modules
+        for file_path, new in new_files.items():
+            if new is not None:
+                self._index_imports(file_path, new)  # relative names need the file in the module index
+        import_files = {path for path, new in new_files.items() if new is not None}
+        if file_set_changed:
+            # Adding or removing a file only changes the lookup of its module name and its trailing names
+            for file_path, new in new_files.items():
+                if (old_files[file_path] is None) != (new is None):
+                    index = old_modules if new is None else self.modules
+                    parts = index.module_of[file_path].split(".")
+                    for i in range(len(parts)):
+                        import_files |= self._importers_of.get(".".join(parts[i:]), set())
+            import_files &= self.files.keys()
+
+        # Call graph: re-resolve the callers that can see a change
+        callers = {func_id for name in affected_names for func_id in self._callers_of.get(name, ())}
+        callers |= {func_id for file_path in import_files for func_id in self._functions_in.get(file_path, ())}
+        callers = {func_id for func_id in callers if func_id in self._functions}
+        call_out = {}
+        for func_id in callers:
+            file_path, parent_class, calls = self._functions[func_id]
+            call_out[func_id] = {
+                callee for call in calls for callee in self.resolver.resolve(file_path, parent_class, call)
+            }
+        delta.callers_resolved = len(call_out)
+        new_call_cycles, removed_call_cycles = self.calls.update(call_out, removed_functions, "function_call")
+
+        # Import graph: re-resolve the import statements of affected files
+        import_out = {}
+        for file_path in import_files:
+            import_out[module_path(file_path, self.repo_root)] = {
+                module_path(target, self.repo_root)
+                for imp in self.files[file_path].get("imports", [])
+                for target in self.modules.import_targets(file_path, imp)[1]
+            }
+        removed_modules = [module_path(path, self.repo_root) for path, new in new_files.items() if new is None]
+        new_import_cycles, removed_import_cycles = self.imports.update(import_out, removed_modules, "module_import")
+        delta.new_cycles = new_call_cycles + new_import_cycles
+        delta.removed_cycles = removed_call_cycles + removed_import_cycles
+        delta.seconds = round(time.monotonic() - started, 3)
+        return delta
+
+    # ------------------------------------------------------------------------
+    # Indexes
+    # ------------------------------------------------------------------------
+
+    def _index_functions(self, file_path: str, file_data: Dict[str, Any]) -> Set[str]:
+        added = set()
+        for func in file_data.get("functions", []):
+            func_id = CallGraphBuilder.function_id(file_path, func)
+            self._functions[func_id] = (file_path, func.get("parent_class"), func["calls"])
+            for call in func["calls"]:
+                self._callers_of.setdefault(_call_name(call), set()).add(func_id)
+            added.add(func_id)
+        self._functions_in[file_path] = added
+        return added
+
+    def _unindex_functions(self, file_path: str, file_data: Dict[str, Any]) -> Set[str]:
+        removed = set()
+        for func in file_data.get("functions", []):
+            func_id = CallGraphBuilder.function_id(file_path, func)
+            if self._functions.pop(func_id, None) is None:
+                continue
+            for call in func["calls"]:
+                callers = self._callers_of.get(_call_name(call))
+                if callers is not None:
+                    callers.discard(func_id)
+            removed.add(func_id)
+        self._functions_in.pop(file_path, None)
+        return removed
+
+    def _imported_names(self, file_path: str, file_data: Dict[str, Any]) -> Set[str]:
+        """Absolute dotted names the imports of a file look up (module, and module.name for from-imports)."""
+        names = set()
+        for imp in file_data.get("imports", []):
+            module = imp["module"]
+            names.add(self.modules.absolute(module, file_path))
+            if imp.get("is_from_import"):
+                separator = "" if module.endswith(".") else "."
+                names.update(self.modules.absolute(f"{module}{separator}{name}", file_path)
+                             for name in imp["names"] if name != "*")
+        return names
+
+    def _index_imports(self, file_path: str, file_data: Dict[str, Any]) -> None:
+        for name in self._imported_names(file_path, file_data):
+            self._importers_of.setdefault(name, set()).add(file_path)
+
+    def _unindex_imports(self, file_path: str, file_data: Dict[str, Any]) -> None:
+        for name in self._imported_names(file_path, file_data):
+            importers = self._importers_of.get(name)
+            if importers is not None:
+                importers.discard(file_path)
+                if not importers:
+                    del self._importers_of[name]
+
+    @staticmethod
+    def _defined_names(file_data: Dict[str, Any]) -> Set[str]:
+        names = {func["name"] for func in file_data.get("functions", [])}
+        names |= {cls["name"] for cls in file_data.get("classes", [])}
+        for imp in file_data.get("imports", []):
+            if imp.get("is_from_import"):
+                names.update(imp["names"])
+            else:
+                names.add(imp.get("alias") or imp["module"].split(".", 1)[0])
+        return names
+
+    def _hierarchy_names(self, old_files: Dict[str, Optional[Dict[str, Any]]],
+                         new_files: Dict[str, Optional[Dict[str, Any]]]) -> Set[str]:
+        """
+        Method names of the ancestors of changed classes (as currently indexed).
+
+        A subclass elsewhere calling self.m() resolves m through these, so they
+        are collected once before and once after re-indexing.
+        """
+        names: Set[str] = set()
+        for file_path in old_files:
+            classes = set()
+            for file_data in (old_files[file_path], new_files[file_path]):
+                if file_data is not None:
+                    classes.update(cls["name"] for cls in file_data.get("classes", []))
+            for class_name in classes:
+                for ancestor_file, ancestor in self.resolver.ancestors(file_path, class_name):
+                    names.update(
+                        func["name"] for func in self.files.get(ancestor_file, {}).get("functions", [])
+                        if func.get("parent_class") == ancestor
+                    )
+        return names
+
+
+# ============================================================================
+# CLI Interface
+# ============================================================================
+
+def _print_cycles(title: str, cycles: List[CircularDependency]) -> None:
+    print(f"\n{title}: {len(cycles)}")
+    for cycle in cycles:
+        print(f"  [{cycle.severity}] {cycle.cycle_type}, {len(cycle.members)} nodes")
+        for node in cycle.cycle:
+            print(f"    → {node}")
+
+
+def cmd_init(args) -> int:
+    if not args.extraction.exists():
+        print(f"Error: Extraction output not found: {args.extraction}")
+        return 1
+    started = time.monotonic()
+    data = load_extraction(args.extraction, keep=ANALYSIS_FIELDS)
+    state = DependencyGraphState.build(data, args.repo_root)
+    state.save(args.state)
+    print(f"✅ Dependency state: {len(state.calls.out)} functions, {len(state.imports.out)} modules, "
+          f"{len(state.calls.cycles())} call cycles, {len(state.imports.cycles())} import cycles "
+          f"({time.monotonic() - started:.1f}s) → {args.state}")
+    return 0
+
+
+def cmd_update(args) -> int:
+    sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+    from tools.extractors.python_ast_extractor import PythonASTExtractor, file_result_to_dict
+    from tools.ingestion.incremental_sync import SyncError, changed_files, read_at_revision, resolve_range
+
+    try:
+        state = DependencyGraphState.load(args.state)
+        base, head = resolve_range(state.repo_root, args.rev_range)
+        changes = changed_files(state.repo_root, base, head)
+        deltas: Dict[str, Optional[Dict[str, Any]]] = {
+            str(Path(state.repo_path) / rel): None for rel in changes.removed
+        }
+        for rel in changes.upserted:
+            file_key = str(Path(state.repo_path) / rel)
+            source = read_at_revision(state.repo_root, head, rel)
+            deltas[file_key] = file_result_to_dict(PythonASTExtractor(Path(file_key), source).extract())
+    except (DependencyStateError, SyncError) as e:
+        print(f"❌ {e}")
+        return 1
+
+    delta = state.apply(deltas)
+    state.save(args.state)
+    print(f"{base[:10]}..{head[:10]}: {delta.files_changed} files changed, {delta.files_removed} removed, "
+          f"{delta.callers_resolved} callers re-resolved ({delta.seconds:.3f}s)")
+    _print_cycles("⚠️  New cycles" if delta.new_cycles else "✅ New cycles", delta.new_cycles)
+    _print_cycles("Removed cycles", delta.removed_cycles)
+    return 2 if args.fail_on_new_cycles and delta.new_cycles else 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Incremental dependency graph state")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    init = sub.add_parser("init", help="Build the state from a full extraction")
+    init.add_argument("extraction", type=Path, help="python_ast_extractor.py output (JSONL or legacy JSON)")
+    init.add_argument("repo_root", type=Path, help="Repository root")
+    init.add_argument("state", type=Path, help="State file to write")
+    init.set_defaults(func=cmd_init)
+
+    update = sub.add_parser("update", help="Apply the Python changes of a git revision range")
+    update.add_argument("state", type=Path, help="State file (updated in place)")
+    update.add_argument("rev_range", help="base..head, base...head, or base (= base..HEAD)")
+    update.add_argument("--fail-on-new-cycles", action="store_true",
+                        help="Exit with status 2 if the range introduces a circular dependency")
+    update.set_defaults(func=cmd_update)
+
+    args = parser.parse_args()
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
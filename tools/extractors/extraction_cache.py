@@ -0,0 +1,166 @@
+"""
+On-disk Extraction Cache for GraphCare
+
+Stores one extraction result per (file content sha256, extractor fingerprint), so
+re-extracting an unchanged repository reads and hashes files but parses nothing:
+
+    <cache_dir>/<extractor>/<fingerprint>/<sha256[:2]>/<sha256>.pkl
+
+- The fingerprint hashes the extractor's own source (and this module), so changing
+  extractor code invalidates everything it cached; cleanup() removes the old
+  fingerprint directories.
+- Entries are results packed into plain tuples (pack_result) and pickled: compact,
+  and loadable whether the extractor ran as a script or was imported.
+- Hits refresh the entry's mtime; cleanup() evicts least recently used entries
+  until the cache fits in max_bytes.
+- Entries are written to a temp file and renamed into place, so parallel
+  extraction workers can share one cache directory.
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+import hashlib
+import os
+import pickle
+import shutil
+import tempfile
+from dataclasses import fields
+from pathlib import Path
+from typing import Any, Optional, Sequence, Tuple
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024  # 512 MB per extractor
+
+
+def content_digest(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def source_fingerprint(*paths: Path) -> str:
+    """Short hash of source files; changes whenever any of them is edited."""
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(Path(path).read_bytes())
+    return digest.hexdigest()[:16]
+
+
+def default_cache_dir(repo_path: Path) -> Path:
+    """Per-repository cache directory under ~/.cache/graphcare (keeps client repos clean)."""
+    repo_key = hashlib.sha256(str(Path(repo_path).resolve()).encode("utf-8")).hexdigest()[:16]
+    return Path.home() / ".cache" / "graphcare" / "extraction" / repo_key
+
+
+# ============================================================================
+# Packing (dataclass results ⇄ plain tuples)
+# ============================================================================
+
+def _item_fields(item_type: type) -> Tuple[str, ...]:
+    return tuple(f.name for f in fields(item_type) if f.name != "file_path")
+
+
+def pack_result(result: Any, group_types: Sequence[Tuple[str, type]]) -> tuple:
+    """
+    Flatten an extraction result into (file_path, groups, parse_errors).
+
+    group_types lists the result's item lists in order, e.g. ("functions", FunctionMetadata).
+    Each item becomes a tuple of its field values; file_path (identical on every
+    item) is stored once.
+    """
+    return (
+        result.file_path,
+        tuple(
+            [tuple(getattr(item, name) for name in _item_fields(item_type)) for item in getattr(result, group)]
+            for group, item_type in group_types
+        ),
+        result.parse_errors,
+    )
+
+
+def unpack_result(packed: tuple, result_type: type, group_types: Sequence[Tuple[str, type]],
+                  file_path: Optional[str] = None) -> Any:
+    """Rebuild a result packed by pack_result(), optionally for a different file_path."""
+    packed_path, groups, parse_errors = packed
+    file_path = file_path or packed_path
+    kwargs = {}
+    for (group, item_type), items in zip(group_types, groups):
+        names = _item_fields(item_type)
+        kwargs[group] = [item_type(file_path=file_path, **dict(zip(names, values))) for values in items]
+    return result_type(file_path=file_path, parse_errors=list(parse_errors), **kwargs)
+
+
+# ============================================================================
+# Cache
+# ============================================================================
+
+class ExtractionCache:
+    """Content-addressed cache of packed extraction results for one extractor."""
+
+    def __init__(self, cache_dir: Path, extractor: str, fingerprint: str,
+                 max_bytes: int = DEFAULT_MAX_BYTES):
+        self.base = Path(cache_dir) / extractor
+        self.dir = self.base / fingerprint
+        self.max_bytes = max_bytes
+
+    def _entry(self, digest: str) -> Path:
+        return self.dir / digest[:2] / f"{digest}.pkl"
+
+    def get(self, digest: str) -> Optional[tuple]:
+        path = self._entry(digest)
+        try:
+            with open(path, "rb") as f:
+                value = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception:
+            # Truncated / corrupt entry: drop it and re-extract
+            path.unlink(missing_ok=True)
+            return None
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return value
+
+    def put(self, digest: str, value: tuple) -> None:
+        path = self._entry(digest)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=path.parent, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp, path)
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+
+    def cleanup(self) -> int:
+        """
+        Drop entries of other extractor versions, then evict least recently used
+        entries until the cache is within max_bytes.
+
+        Returns:
+            Number of bytes freed
+        """
+        freed = 0
+        if not self.base.exists():
+            return freed
+
+        for stale in self.base.iterdir():
+            if stale.is_dir() and stale != self.dir:
+                freed += sum(p.stat().st_size for p in stale.rglob("*") if p.is_file())
+                shutil.rmtree(stale, ignore_errors=True)
+
+        if not self.dir.exists():
+            return freed
+        entries = []
+        for path in self.dir.rglob("*.pkl"):
+            stat = path.stat()
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total -= size
+            freed += size
+        return freed
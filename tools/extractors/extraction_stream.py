@@ -0,0 +1,221 @@
+"""
+Streaming (JSONL) Extraction Output for GraphCare
+
+The legacy extraction JSON is one document holding every file, so writing it
+needs the whole repository in memory and reading it needs the whole document
+parsed. The JSONL format is one record per line:
+
+    {"type": "header", "format": "graphcare-extraction", "version": 1, "extractor": "python", "repo_path": ...}
+    {"type": "file", "path": "<file>", "functions": [...], "classes": [...], ...}   (one per file)
+    {"type": "summary", "summary": {"total_files": ..., "total_functions": ..., ...}}
+
+File records have exactly the per-file shape of the legacy "files" map, and are
+written as soon as each file is extracted. The summary comes last; a stream
+without one was cut short and is rejected by the reader.
+
+Readers (iter_extraction_files, load_extraction) accept both formats, so every
+consumer works on old and new output alike.
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+STREAM_FORMAT = "graphcare-extraction"
+STREAM_VERSION = 1
+
+
+class ExtractionStreamError(Exception):
+    """Extraction output is truncated or not in a known format."""
+
+
+# ============================================================================
+# Writer
+# ============================================================================
+
+class ExtractionStreamWriter:
+    """
+    Write extraction results as JSONL, one file at a time.
+
+    Usage:
+        with ExtractionStreamWriter(output_path, repo_path, "python") as writer:
+            for file_path, file_data in ...:
+                writer.write_file(file_path, file_data, {"functions": 3, "calls": 12})
+    """
+
+    def __init__(self, output_path: Path, repo_path: str, extractor: str):
+        self.output_path = Path(output_path)
+        self.totals: Dict[str, int] = {"files": 0}
+        self._file = open(self.output_path, "w", encoding="utf-8")
+        self._write({
+            "type": "header",
+            "format": STREAM_FORMAT,
+            "version": STREAM_VERSION,
+            "extractor": extractor,
+            "repo_path": str(repo_path),
+        })
+
+    def _write(self, record: Dict[str, Any]) -> None:
+        self._file.write(json.dumps(record, separators=(",", ":")))
+        self._file.write("\n")
+
+    def write_file(self, file_path: str, file_data: Dict[str, Any], counts: Dict[str, int]) -> None:
+        """
+        Append one file record.
+
+        Args:
+            file_path: Key of the file (as in the legacy "files" map)
+            file_data: Per-file dict (e.g. file_result_to_dict())
+            counts: Item counts for the summary, e.g. {"functions": 3, "classes": 1}
+        """
+        self._write({"type": "file", "path": file_path, **file_data})
+        self.totals["files"] += 1
+        for key, count in counts.items():
+            self.totals[key] = self.totals.get(key, 0) + count
+
+    def summary(self) -> Dict[str, int]:
+        return {f"total_{key}": count for key, count in self.totals.items()}
+
+    def close(self) -> Dict[str, int]:
+        """Write the summary record and close the file. Returns the summary."""
+        summary = self.summary()
+        self._write({"type": "summary", "summary": summary})
+        self._file.close()
+        return summary
+
+    def __enter__(self) -> "ExtractionStreamWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            # No summary: readers will see the stream as truncated
+            self._file.close()
+
+
+# ============================================================================
+# Readers
+# ============================================================================
+
+def _read_header(path: Path) -> Optional[Dict[str, Any]]:
+    """The JSONL header record, or None if `path` is a legacy JSON document."""
+    with open(path, encoding="utf-8") as f:
+        first_line = f.readline()
+    try:
+        record = json.loads(first_line)
+    except json.JSONDecodeError:
+        return None  # legacy JSON spans many lines (indent=2)
+    if isinstance(record, dict) and record.get("type") == "header":
+        if record.get("format") != STREAM_FORMAT or record.get("version") != STREAM_VERSION:
+            raise ExtractionStreamError(
+                f"{path}: unsupported extraction stream {record.get('format')} v{record.get('version')}"
+            )
+        return record
+    return None
+
+
+def is_stream(path: Path) -> bool:
+    """True if `path` is JSONL extraction output (False for the legacy JSON document)."""
+    return _read_header(path) is not None
+
+
+def _iter_stream_records(path: Path) -> Iterator[Dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def iter_extraction_files(path: Path) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Yield (file_path, file_data) from extraction output in either format.
+
+    JSONL is read one line at a time; the legacy document is loaded whole.
+    Raises ExtractionStreamError at the end of a JSONL stream with no summary.
+    """
+    if _read_header(path) is None:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        yield from data["files"].items()
+        return
+
+    complete = False
+    for record in _iter_stream_records(path):
+        kind = record.pop("type", None)
+        if kind == "file":
+            yield record.pop("path"), record
+        elif kind == "summary":
+            complete = True
+    if not complete:
+        raise ExtractionStreamError(f"{path}: extraction stream has no summary (truncated?)")
+
+
+def read_extraction_meta(path: Path) -> Dict[str, Any]:
+    """
+    {"repo_path", "summary"} of extraction output in either format.
+
+    For JSONL only the header and the last line are read.
+    """
+    header = _read_header(path)
+    if header is None:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        return {"repo_path": data["repo_path"], "summary": data.get("summary")}
+
+    summary = None
+    with open(path, "rb") as f:
+        f.seek(0, 2)
+        position = f.tell()
+        tail = b""
+        while position > 0 and tail.count(b"\n") < 2:
+            step = min(4096, position)
+            position -= step
+            f.seek(position)
+            tail = f.read(step) + tail
+    last_line = tail.rstrip(b"\n").rsplit(b"\n", 1)[-1]
+    record = json.loads(last_line) if last_line else {}
+    if record.get("type") == "summary":
+        summary = record["summary"]
+    return {"repo_path": header["repo_path"], "summary": summary}
+
+
+def project_file(file_data: Dict[str, Any], keep: Dict[str, Optional[Iterable[str]]]) -> Dict[str, Any]:
+    """Per-file dict reduced to the `keep` projection (see load_extraction); parse_errors always kept."""
+    projected = {"parse_errors": file_data.get("parse_errors", [])}
+    for list_name, item_fields in keep.items():
+        items = file_data.get(list_name, [])
+        if item_fields is not None:
+            item_fields = tuple(item_fields)
+            items = [{name: item.get(name) for name in item_fields} for item in items]
+        projected[list_name] = items
+    return projected
+
+
+def load_extraction(path: Path, keep: Optional[Dict[str, Iterable[str]]] = None) -> Dict[str, Any]:
+    """
+    Load extraction output as a legacy-shaped dict {"repo_path", "summary", "files"}.
+
+    Args:
+        path: Extraction output (JSONL or legacy JSON)
+        keep: Optional projection {list_name: item fields} applied per file while
+            streaming, e.g. {"functions": ["name", "calls"], "imports": None}
+            (None keeps whole items); lists not named are dropped.
+
+    With `keep`, only the projected data is ever held in memory.
+    """
+    if _read_header(path) is None:
+        data = json.loads(Path(path).read_text(encoding="utf-8"))
+        entries = data["files"].items()
+        meta = {"repo_path": data["repo_path"], "summary": data.get("summary")}
+    else:
+        entries = iter_extraction_files(path)
+        meta = None
+
+    files: Dict[str, Dict[str, Any]] = {}
+    for file_path, file_data in entries:
+        files[file_path] = project_file(file_data, keep) if keep is not None else file_data
+
+    meta = meta or read_extraction_meta(path)
+    return {"repo_path": meta["repo_path"], "summary": meta["summary"], "files": files}
@@ -1,25 +1,41 @@
 """
 Python AST Extractor for GraphCare
 
-Extracts functions, classes, imports, and calls from Python source code using ast.NodeVisitor pattern.
-Based on Mind Protocol's mp-lint scanner architecture.
+Extracts functions, classes, imports, and calls from Python source code in a single
+iterative pass over the AST (explicit context stack, no recursion).
+Originally based on Mind Protocol's mp-lint scanner architecture.
 
 Author: Kai (Chief Engineer, GraphCare)
 Created: 2025-11-04
 """
 
 import ast
+import sys
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
+from functools import partial
 from pathlib import Path
-from typing import List, Dict, Set, Optional, Tuple, Any
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 import json
 
+sys.path.insert(0, str(Path(__file__).parent))
+
+import extraction_cache
+from extraction_stream import ExtractionStreamWriter
+from extraction_cache import (
+    DEFAULT_MAX_BYTES, ExtractionCache, content_digest, default_cache_dir, pack_result,
+    source_fingerprint, unpack_result,
+)
+
+# Cached results are only reused by the exact extractor code that produced them
+EXTRACTOR_FINGERPRINT = source_fingerprint(Path(__file__), Path(extraction_cache.__file__))
+
 
 # ============================================================================
 # Data Models
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class FunctionMetadata:
     """Metadata for a Python function."""
     name: str
@@ -37,7 +53,7 @@ class FunctionMetadata:
     complexity: int  # Cyclomatic complexity
 
 
-@dataclass
+@dataclass(slots=True)
 class ClassMetadata:
     """Metadata for a Python class."""
     name: str
@@ -51,7 +67,7 @@ class ClassMetadata:
     attributes: List[str]  # Instance/class attributes
 
 
-@dataclass
+@dataclass(slots=True)
 class ImportMetadata:
     """Metadata for an import statement."""
     module: str  # Module being imported (e.g., "os", "pathlib.Path")
@@ -62,7 +78,7 @@ class ImportMetadata:
     is_from_import: bool  # True for "from X import Y", False for "import X"
 
 
-@dataclass
+@dataclass(slots=True)
 class CallMetadata:
     """Metadata for a function call."""
     function_name: str  # Name of function being called
@@ -84,21 +100,67 @@ class ExtractionResult:
 
 
 # ============================================================================
-# AST Visitors (Following Mind Protocol mp-lint pattern)
+# AST Traversal
 # ============================================================================
 
-class PythonASTExtractor(ast.NodeVisitor):
+_FUNCTION_NODES = (ast.FunctionDef, ast.AsyncFunctionDef)
+_BRANCH_NODES = (ast.If, ast.While, ast.For, ast.AsyncFor, ast.ExceptHandler)
+
+
+def _decision_points(node: ast.AST) -> int:
+    """Cyclomatic complexity contributed by one node (if, while, for, except, and/or, comprehension ifs)."""
+    if isinstance(node, _BRANCH_NODES):
+        return 1
+    if isinstance(node, ast.BoolOp):
+        return len(node.values) - 1
+    if isinstance(node, ast.comprehension):
+        return len(node.ifs)
+    return 0
+
+
+class _FunctionFrame:
+    """Open function on the context stack."""
+    __slots__ = ("meta", "calls", "decisions_at_entry", "init_attributes")
+
+    def __init__(self, meta: FunctionMetadata, decisions_at_entry: int, init_attributes: Optional[Set[str]]):
+        self.meta = meta
+        self.calls: List[str] = []
+        self.decisions_at_entry = decisions_at_entry
+        self.init_attributes = init_attributes  # owning class's attribute set if this is its __init__
+
+
+class _ClassFrame:
+    """Open class on the context stack."""
+    __slots__ = ("meta", "attributes", "init_nodes")
+
+    def __init__(self, meta: ClassMetadata, attributes: Set[str], init_nodes: Set[int]):
+        self.meta = meta
+        self.attributes = attributes
+        self.init_nodes = init_nodes  # id() of the __init__ defs in the class body
+
+
+class PythonASTExtractor:
     """
-    Main extractor using ast.NodeVisitor pattern.
+    Main extractor: one iterative pre/post-order traversal of the AST.
 
     Extracts all functions, classes, imports, and calls from Python source code.
-    Handles nesting (methods inside classes, nested functions).
+    Nesting (methods inside classes, nested functions) is tracked on an explicit
+    context stack instead of recursion, so deeply nested code cannot hit Python's
+    recursion limit. Complexity, calls and class attributes are accumulated in the
+    same pass; no subtree is walked twice.
+
+    Semantics:
+        - A function's calls are the calls in its own body, decorators and default
+          arguments; calls inside a nested def belong to the nested function
+        - Complexity counts every decision point under the def, nested defs included
+        - A def anywhere inside a class (even nested in a method) is a method of it
+        - Functions are listed when their body ends (inner before outer); classes,
+          imports and calls in source order
     """
 
     def __init__(self, file_path: Path, source_code: str):
         self.file_path = str(file_path)
         self.source_code = source_code
-        self.source_lines = source_code.splitlines()
 
         # Extraction results
         self.functions: List[FunctionMetadata] = []
@@ -108,18 +170,16 @@ class PythonASTExtractor(ast.NodeVisitor):
 
         # Context tracking (for nested structures)
         self.current_class: Optional[str] = None
-        self.current_function: Optional[str] = None
-        self.function_calls_buffer: List[str] = []  # Calls within current function
-
-        # Parent tracking (for walking with context)
-        self._parent_map: Dict[ast.AST, Optional[ast.AST]] = {}
+        self.current_function: Optional[_FunctionFrame] = None
+        self._class_frames: List[_ClassFrame] = []
+        self._init_attribute_sets: List[Set[str]] = []  # classes whose __init__ we are inside
+        self._decisions = 0  # running count of decision points seen so far
 
     def extract(self) -> ExtractionResult:
         """Main extraction method. Returns complete extraction results."""
         try:
             tree = ast.parse(self.source_code, filename=self.file_path)
-            self._build_parent_map(tree)
-            self.visit(tree)
+            self._traverse(tree)
 
             return ExtractionResult(
                 file_path=self.file_path,
@@ -140,15 +200,44 @@ class PythonASTExtractor(ast.NodeVisitor):
                 parse_errors=[f"Extraction error: {str(e)}"]
             )
 
-    def _build_parent_map(self, node: ast.AST, parent: Optional[ast.AST] = None):
-        """Build parent reference map for context-aware traversal."""
-        self._parent_map[node] = parent
-        for child in ast.iter_child_nodes(node):
-            self._build_parent_map(child, node)
+    def _traverse(self, tree: ast.AST) -> None:
+        """
+        Depth-first traversal with an explicit stack.
+
+        Entering a def/class pushes a context frame and an exit marker below its
+        children; popping the marker closes the frame and restores the outer context.
+        """
+        stack: List[Tuple[ast.AST, Any]] = [(tree, None)]
+        while stack:
+            node, exit_frame = stack.pop()
+            if exit_frame is not None:
+                self._exit(exit_frame)
+                continue
+
+            self._decisions += _decision_points(node)
+
+            frame = None
+            if isinstance(node, _FUNCTION_NODES):
+                frame = self._enter_function(node)
+            elif isinstance(node, ast.ClassDef):
+                frame = self._enter_class(node)
+            elif isinstance(node, ast.Call):
+                self._record_call(node)
+            elif isinstance(node, ast.Import):
+                self._record_import(node)
+            elif isinstance(node, ast.ImportFrom):
+                self._record_import_from(node)
+            elif isinstance(node, ast.Assign) and self._init_attribute_sets:
+                self._record_instance_attributes(node)
+
+            if frame is not None:
+                stack.append((node, frame))
+            children = list(ast.iter_child_nodes(node))
+            stack.extend((child, None) for child in reversed(children))
 
-    def _get_parent(self, node: ast.AST) -> Optional[ast.AST]:
-        """Get parent node."""
-        return self._parent_map.get(node)
+    # ========================================================================
+    # Node Helpers
+    # ========================================================================
 
     def _get_docstring(self, node: ast.AST) -> Optional[str]:
         """Extract docstring from function/class node."""
@@ -175,27 +264,6 @@ class PythonASTExtractor(ast.NodeVisitor):
                 decorators.append(ast.unparse(dec))
         return decorators
 
-    def _calculate_complexity(self, node: ast.AST) -> int:
-        """
-        Calculate cyclomatic complexity for a function.
-
-        Complexity = 1 + number of decision points (if, while, for, except, and, or, etc.)
-        """
-        complexity = 1
-
-        for child in ast.walk(node):
-            # Decision points that increase complexity
-            if isinstance(child, (ast.If, ast.While, ast.For, ast.AsyncFor)):
-                complexity += 1
-            elif isinstance(child, ast.ExceptHandler):
-                complexity += 1
-            elif isinstance(child, ast.BoolOp) and isinstance(child.op, (ast.And, ast.Or)):
-                complexity += len(child.values) - 1
-            elif isinstance(child, ast.comprehension) and child.ifs:
-                complexity += len(child.ifs)
-
-        return complexity
-
     def _get_line_end(self, node: ast.AST) -> int:
         """Get the ending line number of a node."""
         if hasattr(node, 'end_lineno') and node.end_lineno is not None:
@@ -203,79 +271,46 @@ class PythonASTExtractor(ast.NodeVisitor):
         return node.lineno  # Fallback to start line
 
     # ========================================================================
-    # Visitors
+    # Functions and Classes
     # ========================================================================
 
-    def visit_FunctionDef(self, node: ast.FunctionDef):
-        """Extract function metadata."""
-        self._extract_function(node, is_async=False)
-        self.generic_visit(node)
-
-    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef):
-        """Extract async function metadata."""
-        self._extract_function(node, is_async=True)
-        self.generic_visit(node)
-
-    def _extract_function(self, node: ast.AST, is_async: bool):
-        """Common logic for extracting function/method metadata."""
-        # Save previous context
-        prev_function = self.current_function
-        prev_calls = self.function_calls_buffer
-
-        # Set current context
-        self.current_function = node.name
-        self.function_calls_buffer = []
-
-        # Extract parameters
-        parameters = [arg.arg for arg in node.args.args]
-
+    def _enter_function(self, node: ast.AST) -> Tuple[_FunctionFrame, Optional[_FunctionFrame], Optional[str]]:
+        """Open a function/method frame; children are visited in its context."""
         # Extract return type (if annotated)
-        return_type = None
-        if node.returns:
-            return_type = ast.unparse(node.returns)
+        return_type = ast.unparse(node.returns) if node.returns else None
 
         # Check if this is a method (inside a class)
         is_method = self.current_class is not None
 
-        # Create metadata
         func_meta = FunctionMetadata(
             name=node.name,
             file_path=self.file_path,
             line_start=node.lineno,
             line_end=self._get_line_end(node),
-            parameters=parameters,
+            parameters=[arg.arg for arg in node.args.args],
             return_type=return_type,
             decorators=self._get_decorator_names(node),
             docstring=self._get_docstring(node),
-            is_async=is_async,
+            is_async=isinstance(node, ast.AsyncFunctionDef),
             is_method=is_method,
             parent_class=self.current_class if is_method else None,
-            calls=[],  # Will be filled after visiting children
-            complexity=self._calculate_complexity(node)
+            calls=[],  # Filled when the frame closes
+            complexity=1
         )
 
-        # Visit children to collect calls
-        for child in ast.iter_child_nodes(node):
-            self.visit(child)
+        # __init__ directly in a class body collects that class's self.x attributes
+        owner = self._class_frames[-1] if self._class_frames else None
+        init_attributes = owner.attributes if owner and id(node) in owner.init_nodes else None
+        if init_attributes is not None:
+            self._init_attribute_sets.append(init_attributes)
 
-        # Assign collected calls
-        func_meta.calls = self.function_calls_buffer.copy()
-
-        # Save function metadata
-        self.functions.append(func_meta)
-
-        # Restore previous context
-        self.current_function = prev_function
-        self.function_calls_buffer = prev_calls
-
-    def visit_ClassDef(self, node: ast.ClassDef):
-        """Extract class metadata."""
-        # Save previous context
-        prev_class = self.current_class
-
-        # Set current context
-        self.current_class = node.name
+        frame = _FunctionFrame(func_meta, self._decisions, init_attributes)
+        outer = (frame, self.current_function, self.current_class)
+        self.current_function = frame
+        return outer
 
+    def _enter_class(self, node: ast.ClassDef) -> Tuple[_ClassFrame, Optional[_FunctionFrame], Optional[str]]:
+        """Open a class frame; nested defs become its methods."""
         # Extract base classes
         bases = []
         for base in node.bases:
@@ -284,16 +319,22 @@ class PythonASTExtractor(ast.NodeVisitor):
             elif isinstance(base, ast.Attribute):
                 bases.append(ast.unparse(base))
 
-        # Extract methods (will be filled during traversal)
+        # Methods and class-level attributes come from the class body itself
         methods = []
+        init_nodes = set()
+        attributes = set()
         for item in node.body:
-            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)):
+            if isinstance(item, _FUNCTION_NODES):
                 methods.append(item.name)
+                if item.name == "__init__":
+                    init_nodes.add(id(item))
+            elif isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
+                attributes.add(item.target.id)
+            elif isinstance(item, ast.Assign):
+                for target in item.targets:
+                    if isinstance(target, ast.Name):
+                        attributes.add(target.id)
 
-        # Extract attributes (simple heuristic: assignments in __init__ or at class level)
-        attributes = self._extract_class_attributes(node)
-
-        # Create metadata
         class_meta = ClassMetadata(
             name=node.name,
             file_path=self.file_path,
@@ -303,79 +344,71 @@ class PythonASTExtractor(ast.NodeVisitor):
             decorators=self._get_decorator_names(node),
             docstring=self._get_docstring(node),
             methods=methods,
-            attributes=attributes
+            attributes=[]  # Filled when the frame closes (instance attributes come from __init__)
         )
-
-        # Save class metadata
         self.classes.append(class_meta)
 
-        # Visit children (will extract methods)
-        self.generic_visit(node)
-
-        # Restore previous context
-        self.current_class = prev_class
-
-    def _extract_class_attributes(self, node: ast.ClassDef) -> List[str]:
-        """Extract instance and class attributes."""
-        attributes = set()
-
-        # Class-level assignments
-        for item in node.body:
-            if isinstance(item, ast.AnnAssign) and isinstance(item.target, ast.Name):
-                attributes.add(item.target.id)
-            elif isinstance(item, ast.Assign):
-                for target in item.targets:
-                    if isinstance(target, ast.Name):
-                        attributes.add(target.id)
-
-        # Instance attributes in __init__ (self.x = ...)
-        for item in node.body:
-            if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name == "__init__":
-                for stmt in ast.walk(item):
-                    if isinstance(stmt, ast.Assign):
-                        for target in stmt.targets:
-                            if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) and target.value.id == "self":
-                                attributes.add(target.attr)
+        frame = _ClassFrame(class_meta, attributes, init_nodes)
+        self._class_frames.append(frame)
+        outer = (frame, self.current_function, self.current_class)
+        self.current_class = node.name
+        return outer
+
+    def _exit(self, exit_frame: Tuple[Any, Optional[_FunctionFrame], Optional[str]]) -> None:
+        """Close a function/class frame and restore the enclosing context."""
+        frame, self.current_function, self.current_class = exit_frame
+
+        if isinstance(frame, _FunctionFrame):
+            frame.meta.calls = frame.calls
+            frame.meta.complexity = 1 + self._decisions - frame.decisions_at_entry
+            if frame.init_attributes is not None:
+                self._init_attribute_sets.pop()
+            self.functions.append(frame.meta)
+        else:
+            frame.meta.attributes = sorted(frame.attributes)
+            self._class_frames.pop()
+
+    def _record_instance_attributes(self, node: ast.Assign) -> None:
+        """self.x = ... anywhere inside a class's __init__."""
+        for target in node.targets:
+            if isinstance(target, ast.Attribute) and isinstance(target.value, ast.Name) and target.value.id == "self":
+                for attributes in self._init_attribute_sets:
+                    attributes.add(target.attr)
 
-        return sorted(list(attributes))
+    # ========================================================================
+    # Imports and Calls
+    # ========================================================================
 
-    def visit_Import(self, node: ast.Import):
+    def _record_import(self, node: ast.Import) -> None:
         """Extract import statements (import X, import Y as Z)."""
         for alias in node.names:
-            import_meta = ImportMetadata(
+            self.imports.append(ImportMetadata(
                 module=alias.name,
                 names=[alias.name],
                 alias=alias.asname,
                 file_path=self.file_path,
                 line_number=node.lineno,
                 is_from_import=False
-            )
-            self.imports.append(import_meta)
-
-        self.generic_visit(node)
+            ))
 
-    def visit_ImportFrom(self, node: ast.ImportFrom):
+    def _record_import_from(self, node: ast.ImportFrom) -> None:
         """Extract from-import statements (from X import Y, Z)."""
         module = node.module or ""
-        names = [alias.name for alias in node.names]
 
         # Handle "from . import X" (relative imports)
         if node.level > 0:
             module = "." * node.level + module
 
-        import_meta = ImportMetadata(
+        self.imports.append(ImportMetadata(
             module=module,
-            names=names,
+            names=[alias.name for alias in node.names],
             alias=None,  # from-imports don't have module-level alias
             file_path=self.file_path,
             line_number=node.lineno,
             is_from_import=True
-        )
-        self.imports.append(import_meta)
-
-        self.generic_visit(node)
+        ))
 
-    def visit_Call(self, node: ast.Call):
+    def _record_call(self, node: ast.Call) -> None:
         """Extract function calls."""
         # Get function name
         func_name = None
@@ -384,22 +417,21 @@ class PythonASTExtractor(ast.NodeVisitor):
         elif isinstance(node.func, ast.Attribute):
             func_name = ast.unparse(node.func)
 
-        if func_name:
-            # Add to current function's call list
-            if self.current_function:
-                self.function_calls_buffer.append(func_name)
+        if not func_name:
+            return
 
-            # Create call metadata
-            call_meta = CallMetadata(
-                function_name=func_name,
-                file_path=self.file_path,
-                line_number=node.lineno,
-                caller_function=self.current_function,
-                caller_class=self.current_class
-            )
-            self.calls.append(call_meta)
+        # Add to current function's call list
+        function = self.current_function
+        if function is not None:
+            function.calls.append(func_name)
 
-        self.generic_visit(node)
+        self.calls.append(CallMetadata(
+            function_name=func_name,
+            file_path=self.file_path,
+            line_number=node.lineno,
+            caller_function=function.meta.name if function is not None else None,
+            caller_class=self.current_class
+        ))
 
 
 # ============================================================================
@@ -445,140 +477,339 @@ class RepositoryExtractionResult:
         return calls
 
     def to_json(self) -> str:
-        """Export results as JSON."""
+        """Export results as one JSON document (legacy format; see write_jsonl)."""
+        totals = {"files": len(self.file_results), "functions": 0, "classes": 0, "imports": 0, "calls": 0}
+        for result in self.file_results.values():
+            for key, count in result_counts(result).items():
+                totals[key] += count
+
         data = {
             "repo_path": self.repo_path,
-            "summary": {
-                "total_files": len(self.file_results),
-                "total_functions": len(self.all_functions),
-                "total_classes": len(self.all_classes),
-                "total_imports": len(self.all_imports),
-                "total_calls": len(self.all_calls)
-            },
+            "summary": {f"total_{key}": count for key, count in totals.items()},
             "files": {}
         }
 
         for file_path, result in self.file_results.items():
-            data["files"][file_path] = {
-                "functions": [
-                    {
-                        "name": f.name,
-                        "line_start": f.line_start,
-                        "line_end": f.line_end,
-                        "parameters": f.parameters,
-                        "return_type": f.return_type,
-                        "decorators": f.decorators,
-                        "is_async": f.is_async,
-                        "is_method": f.is_method,
-                        "parent_class": f.parent_class,
-                        "calls": f.calls,
-                        "complexity": f.complexity
-                    }
-                    for f in result.functions
-                ],
-                "classes": [
-                    {
-                        "name": c.name,
-                        "line_start": c.line_start,
-                        "line_end": c.line_end,
-                        "bases": c.bases,
-                        "decorators": c.decorators,
-                        "methods": c.methods,
-                        "attributes": c.attributes
-                    }
-                    for c in result.classes
-                ],
-                "imports": [
-                    {
-                        "module": i.module,
-                        "names": i.names,
-                        "alias": i.alias,
-                        "line_number": i.line_number,
-                        "is_from_import": i.is_from_import
-                    }
-                    for i in result.imports
-                ],
-                "parse_errors": result.parse_errors
-            }
+            data["files"][file_path] = file_result_to_dict(result)
 
         return json.dumps(data, indent=2)
 
 
-def extract_repository(repo_path: Path, pattern: str = "**/*.py") -> RepositoryExtractionResult:
+def result_counts(result: ExtractionResult) -> Dict[str, int]:
+    """Item counts of one file, for extraction summaries."""
+    return {
+        "functions": len(result.functions),
+        "classes": len(result.classes),
+        "imports": len(result.imports),
+        "calls": len(result.calls)
+    }
+
+
+def file_result_to_dict(result: ExtractionResult) -> Dict[str, Any]:
+    """Per-file entry of the extraction JSON (the shape the ingestors consume)."""
+    return {
+        "functions": [
+            {
+                "name": f.name,
+                "line_start": f.line_start,
+                "line_end": f.line_end,
+                "parameters": f.parameters,
+                "return_type": f.return_type,
+                "decorators": f.decorators,
+                "is_async": f.is_async,
+                "is_method": f.is_method,
+                "parent_class": f.parent_class,
+                "calls": f.calls,
+                "complexity": f.complexity
+            }
+            for f in result.functions
+        ],
+        "classes": [
+            {
+                "name": c.name,
+                "line_start": c.line_start,
+                "line_end": c.line_end,
+                "bases": c.bases,
+                "decorators": c.decorators,
+                "methods": c.methods,
+                "attributes": c.attributes
+            }
+            for c in result.classes
+        ],
+        "imports": [
+            {
+                "module": i.module,
+                "names": i.names,
+                "alias": i.alias,
+                "line_number": i.line_number,
+                "is_from_import": i.is_from_import
+            }
+            for i in result.imports
+        ],
+        "parse_errors": result.parse_errors
+    }
+
+
+def extract_file(file_path: Path, cache: Optional[ExtractionCache] = None) -> ExtractionResult:
+    """Read and extract a single Python file. Read errors become parse_errors."""
+    if cache is not None:
+        return _unpack_result(_extract_packed(file_path, cache)[0], str(file_path))
+    try:
+        source_code = file_path.read_text(encoding="utf-8")
+    except Exception as e:
+        return ExtractionResult(
+            file_path=str(file_path),
+            parse_errors=[f"Read error: {str(e)}"]
+        )
+    return PythonASTExtractor(file_path, source_code).extract()
+
+
+# ============================================================================
+# Parallel Extraction (process pool)
+# ============================================================================
+
+# Item lists of an ExtractionResult, in the order they are packed
+_PACKED_GROUPS = (
+    ("functions", FunctionMetadata),
+    ("classes", ClassMetadata),
+    ("imports", ImportMetadata),
+    ("calls", CallMetadata),
+)
+
+
+def _pack_result(result: ExtractionResult) -> tuple:
+    """
+    Flatten an ExtractionResult into plain tuples (for worker results and the cache).
+
+    Dataclass instances pickle with their class reference and a per-object field
+    dict; tuples of values are several times smaller.
+    """
+    return pack_result(result, _PACKED_GROUPS)
+
+
+def _unpack_result(packed: tuple, file_path: Optional[str] = None) -> ExtractionResult:
+    """Rebuild the ExtractionResult packed by _pack_result()."""
+    return unpack_result(packed, ExtractionResult, _PACKED_GROUPS, file_path)
+
+
+def _extract_packed(file_path: Path, cache: Optional[ExtractionCache]) -> Tuple[tuple, bool]:
+    """Packed result for one file, from the cache when its content was seen before.
+
+    Returns:
+        (packed result, cache hit)
     """
-    Extract all Python files from a repository.
+    try:
+        data = file_path.read_bytes()
+        # Same text read_text() would give (universal newlines)
+        source_code = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    except Exception as e:
+        return _pack_result(ExtractionResult(
+            file_path=str(file_path),
+            parse_errors=[f"Read error: {str(e)}"]
+        )), False
+
+    digest = None
+    if cache is not None:
+        digest = content_digest(data)
+        packed = cache.get(digest)
+        if packed is not None:
+            return packed, True
+
+    packed = _pack_result(PythonASTExtractor(file_path, source_code).extract())
+    if cache is not None:
+        cache.put(digest, packed)
+    return packed, False
+
+
+def _extract_chunk(file_paths: List[str], cache_dir: Optional[str] = None,
+                   cache_max_bytes: int = DEFAULT_MAX_BYTES) -> List[Tuple[tuple, bool]]:
+    """Worker entry point: extract a chunk of files, return (packed result, cache hit) pairs."""
+    cache = open_extraction_cache(Path(cache_dir), cache_max_bytes) if cache_dir else None
+    return [_extract_packed(Path(file_path), cache) for file_path in file_paths]
+
+
+def open_extraction_cache(cache_dir: Path, max_bytes: int = DEFAULT_MAX_BYTES) -> ExtractionCache:
+    """The Python extractor's cache inside `cache_dir` (see extraction_cache.py)."""
+    return ExtractionCache(cache_dir, "python", EXTRACTOR_FINGERPRINT, max_bytes)
+
+
+def _report_file(repo_path: Path, file_path: Path, file_result: ExtractionResult) -> None:
+    print(f"Extracting: {file_path.relative_to(repo_path)}")
+    if file_result.parse_errors:
+        print(f"  ⚠️  Parse errors: {file_result.parse_errors}")
+    else:
+        print(f"  ✅ Extracted: {len(file_result.functions)} functions, {len(file_result.classes)} classes")
+
+
+def iter_extract_repository(
+    repo_path: Path,
+    pattern: str = "**/*.py",
+    workers: int = 1,
+    chunk_size: int = 64,
+    cache_dir: Optional[Path] = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES
+) -> Iterator[Tuple[str, ExtractionResult]]:
+    """
+    Extract all Python files from a repository, yielding (file_path, result) as each completes.
 
     Args:
         repo_path: Path to repository root
         pattern: Glob pattern for files to extract (default: **/*.py)
-
-    Returns:
-        RepositoryExtractionResult with all extracted data
+        workers: Worker processes (1 = extract in this process)
+        chunk_size: Files per task sent to a worker process
+        cache_dir: Extraction cache directory (None = no cache); files whose content
+            was extracted before by this extractor version are not re-parsed
+        cache_max_bytes: Size bound of the cache, enforced after the run
+
+    Files are yielded in discovery order whatever the worker count, so output is
+    identical for any `workers`. Nothing is retained between files.
     """
-    result = RepositoryExtractionResult(repo_path=str(repo_path))
+    cache = open_extraction_cache(cache_dir, cache_max_bytes) if cache_dir else None
+    cache_hits = 0
 
     # Find all Python files
     python_files = list(repo_path.glob(pattern))
 
     print(f"Found {len(python_files)} Python files in {repo_path}")
 
-    for file_path in python_files:
-        print(f"Extracting: {file_path.relative_to(repo_path)}")
-
-        try:
-            source_code = file_path.read_text(encoding="utf-8")
-            extractor = PythonASTExtractor(file_path, source_code)
-            file_result = extractor.extract()
-            result.file_results[str(file_path)] = file_result
-
-            if file_result.parse_errors:
-                print(f"  ⚠️  Parse errors: {file_result.parse_errors}")
+    if workers <= 1 or len(python_files) <= chunk_size:
+        for file_path in python_files:
+            if cache is None:
+                file_result = extract_file(file_path)
             else:
-                print(f"  ✅ Extracted: {len(file_result.functions)} functions, {len(file_result.classes)} classes")
+                packed, hit = _extract_packed(file_path, cache)
+                file_result = _unpack_result(packed, str(file_path))
+                cache_hits += hit
+            _report_file(repo_path, file_path, file_result)
+            yield str(file_path), file_result
+    else:
+        chunks = [
+            [str(file_path) for file_path in python_files[start:start + chunk_size]]
+            for start in range(0, len(python_files), chunk_size)
+        ]
+        print(f"Extracting with {workers} worker processes ({len(chunks)} chunks of ≤{chunk_size} files)")
+        extract_chunk = partial(
+            _extract_chunk, cache_dir=str(cache_dir) if cache_dir else None, cache_max_bytes=cache_max_bytes
+        )
 
-        except Exception as e:
-            print(f"  ❌ Failed to extract {file_path}: {e}")
-            result.file_results[str(file_path)] = ExtractionResult(
-                file_path=str(file_path),
-                parse_errors=[f"Read error: {str(e)}"]
-            )
+        # map() yields chunks in submission order, so progress and results stay ordered
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for chunk, chunk_results in zip(chunks, executor.map(extract_chunk, chunks)):
+                for file_path, (packed, hit) in zip(chunk, chunk_results):
+                    file_result = _unpack_result(packed, file_path)
+                    cache_hits += hit
+                    _report_file(repo_path, Path(file_path), file_result)
+                    yield file_path, file_result
+
+    if cache is not None:
+        freed = cache.cleanup()
+        print(f"Extraction cache: {cache_hits}/{len(python_files)} files reused"
+              + (f", {freed / 1024 / 1024:.1f} MB evicted" if freed else ""))
+
+
+def extract_repository(
+    repo_path: Path,
+    pattern: str = "**/*.py",
+    workers: int = 1,
+    chunk_size: int = 64,
+    cache_dir: Optional[Path] = None,
+    cache_max_bytes: int = DEFAULT_MAX_BYTES
+) -> RepositoryExtractionResult:
+    """
+    Extract all Python files from a repository (see iter_extract_repository for arguments).
 
+    Returns:
+        RepositoryExtractionResult with all extracted data
+    """
+    result = RepositoryExtractionResult(repo_path=str(repo_path))
+    for file_path, file_result in iter_extract_repository(
+        repo_path, pattern, workers, chunk_size, cache_dir, cache_max_bytes
+    ):
+        result.file_results[file_path] = file_result
     return result
 
 
+def write_jsonl(
+    file_results: Iterable[Tuple[str, ExtractionResult]],
+    output_path: Path,
+    repo_path: Path
+) -> Dict[str, int]:
+    """
+    Stream extraction results to JSONL (extraction_stream.py), one line per file.
+
+    Returns:
+        Summary counts (also written as the last line)
+    """
+    with ExtractionStreamWriter(output_path, str(repo_path), "python") as writer:
+        for file_path, file_result in file_results:
+            writer.write_file(file_path, file_result_to_dict(file_result), result_counts(file_result))
+    return writer.summary()
+
+
 # ============================================================================
 # CLI Interface
 # ============================================================================
 
 if __name__ == "__main__":
-    import sys
-
-    if len(sys.argv) < 2:
-        print("Usage: python python_ast_extractor.py <repo_path> [output.json]")
-        sys.exit(1)
-
-    repo_path = Path(sys.argv[1])
-    output_path = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Extract functions, classes, imports and calls from a Python repository")
+    parser.add_argument("repo_path", type=Path, help="Repository root")
+    parser.add_argument("output", type=Path, nargs="?",
+                        help="Write extraction results to this file (JSONL, one line per file)")
+    parser.add_argument("--legacy-json", action="store_true",
+                        help="Write the single-document JSON format instead of JSONL (holds the whole repo in memory)")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (default: 1)")
+    parser.add_argument("--chunk-size", type=int, default=64, help="Files per worker task (default: 64)")
+    parser.add_argument("--cache-dir", type=Path, help="Extraction cache directory (default: ~/.cache/graphcare/extraction/<repo>)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every file, without reading or writing the cache")
+    args = parser.parse_args()
+
+    repo_path = args.repo_path
+    output_path = args.output
 
     if not repo_path.exists():
         print(f"Error: Repository path does not exist: {repo_path}")
         sys.exit(1)
 
+    cache_dir = None if args.no_cache else (args.cache_dir or default_cache_dir(repo_path))
+
     print(f"Extracting repository: {repo_path}")
     print("=" * 80)
 
-    result = extract_repository(repo_path)
+    # Summary statistics are accumulated per file, so streaming never holds the repo
+    totals = {"files": 0, "functions": 0, "classes": 0, "imports": 0, "calls": 0}
+    complexities: List[int] = []
+    legacy_result = RepositoryExtractionResult(repo_path=str(repo_path)) if args.legacy_json else None
+
+    def tally(file_results):
+        for file_path, file_result in file_results:
+            totals["files"] += 1
+            for key, count in result_counts(file_result).items():
+                totals[key] += count
+            complexities.extend(f.complexity for f in file_result.functions)
+            if legacy_result is not None:
+                legacy_result.file_results[file_path] = file_result
+            yield file_path, file_result
+
+    file_results = tally(iter_extract_repository(
+        repo_path, workers=args.workers, chunk_size=args.chunk_size, cache_dir=cache_dir
+    ))
+    if output_path and not args.legacy_json:
+        write_jsonl(file_results, output_path, repo_path)
+    else:
+        for _ in file_results:
+            pass
 
     print("=" * 80)
     print(f"\nExtraction Summary:")
-    print(f"  Files processed: {len(result.file_results)}")
-    print(f"  Total functions: {len(result.all_functions)}")
-    print(f"  Total classes: {len(result.all_classes)}")
-    print(f"  Total imports: {len(result.all_imports)}")
-    print(f"  Total calls: {len(result.all_calls)}")
+    print(f"  Files processed: {totals['files']}")
+    print(f"  Total functions: {totals['functions']}")
+    print(f"  Total classes: {totals['classes']}")
+    print(f"  Total imports: {totals['imports']}")
+    print(f"  Total calls: {totals['calls']}")
 
     # Calculate complexity statistics
-    complexities = [f.complexity for f in result.all_functions]
     if complexities:
         avg_complexity = sum(complexities) / len(complexities)
         max_complexity = max(complexities)
@@ -589,7 +820,8 @@ if __name__ == "__main__":
         print(f"  Max complexity: {max_complexity}")
         print(f"  Functions with high complexity (>15): {high_complexity_count}")
 
-    # Export to JSON if requested
+    # Export if requested
     if output_path:
-        output_path.write_text(result.to_json(), encoding="utf-8")
+        if legacy_result is not None:
+            output_path.write_text(legacy_result.to_json(), encoding="utf-8")
         print(f"\nResults exported to: {output_path}")
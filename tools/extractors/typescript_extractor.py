@@ -2,7 +2,7 @@
 TypeScript/TSX Extractor for GraphCare
 
 Extracts functions, components, classes, and imports from TypeScript/TSX source code.
-Uses regex-based parsing for Python compatibility (no Node.js required).
+Uses a string/comment-aware scanner plus regex patterns (no Node.js required).
 
 Author: Kai (Chief Engineer, GraphCare)
 Created: 2025-11-04
@@ -10,9 +10,23 @@ Created: 2025-11-04
 
 import re
 import json
+import sys
+from bisect import bisect_right
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+import extraction_cache
+from extraction_stream import ExtractionStreamWriter
+from extraction_cache import (
+    DEFAULT_MAX_BYTES, ExtractionCache, content_digest, default_cache_dir, pack_result,
+    source_fingerprint, unpack_result,
+)
+
+# Cached results are only reused by the exact extractor code that produced them
+EXTRACTOR_FINGERPRINT = source_fingerprint(Path(__file__), Path(extraction_cache.__file__))
 
 
 # ============================================================================
@@ -79,12 +93,189 @@ class TSExtractionResult:
     parse_errors: List[str] = field(default_factory=list)
 
 
+# ============================================================================
+# Scanner
+# ============================================================================
+
+# Where the scanner stops in code; everything else is skipped by the regex engine.
+# Braces only matter inside a template literal's ${...} (to find its end).
+_SCAN_TOKEN = re.compile(r"""//|/\*|['"`/]""")
+_SCAN_TOKEN_IN_TEMPLATE = re.compile(r"""//|/\*|['"`/{}]""")
+_STRING_BODY = {
+    "'": re.compile(r"(?:[^'\\\n]|\\.)*"),
+    '"': re.compile(r'(?:[^"\\\n]|\\.)*'),
+}
+_TEMPLATE_BODY = re.compile(r"(?:[^`\\$]|\\.|\$(?!\{))*", re.DOTALL)
+_REGEX_BODY = re.compile(r"(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/")
+_REGEX_KEYWORD_BEFORE = re.compile(
+    r"\b(?:return|typeof|case|do|else|in|of|new|delete|void|throw|yield|await)$"
+)
+# A `/` after one of these starts a regex literal rather than a division
+_REGEX_PRECEDERS = frozenset("(,=:[!&|?{;+-*%~^")
+_BRACKET = re.compile(r"[{}()\[\]]")
+_OPENERS = {"}": "{", ")": "(", "]": "["}
+_NOT_NEWLINE = re.compile(r"[^\n]")
+_ARROW_BODY_END = re.compile(r"[;\n{(\[]")
+
+
+def scan_source(source: str) -> Tuple[str, Dict[int, int]]:
+    """
+    Two linear passes over TypeScript/JavaScript source.
+
+    Returns:
+        (masked, closing): `masked` is the source with the contents of comments,
+        strings, template literals and regex literals blanked to spaces (same
+        length and line breaks, so offsets and line numbers carry over);
+        `closing` maps the offset of every matched {, ( and [ in code to the
+        offset of its closing bracket.
+
+    Quotes that are not closed on their line (apostrophes in JSX text) are
+    treated as plain characters rather than opening a string.
+    """
+    masked = mask_source(source)
+    closing: Dict[int, int] = {}
+    stack: List[Tuple[str, int]] = []
+    for match in _BRACKET.finditer(masked):
+        char = match.group()
+        if char in "{([":
+            stack.append((char, match.start()))
+            continue
+        opener = _OPENERS[char]
+        if stack and stack[-1][0] == opener:
+            closing[stack.pop()[1]] = match.start()
+            continue
+        # Pop to the matching opener (brackets left open inside it stay unmatched);
+        # a closer with no opener at all is ignored
+        for depth in range(len(stack) - 2, -1, -1):
+            if stack[depth][0] == opener:
+                closing[stack[depth][1]] = match.start()
+                del stack[depth:]
+                break
+    return masked, closing
+
+
+def mask_source(source: str) -> str:
+    """Blank comments, strings, template literals and regex literals (see scan_source)."""
+    pieces: List[str] = []
+    copied = 0
+    template_depths: List[int] = []  # brace depth inside each open template ${...}
+    pos = 0
+    end_of_source = len(source)
+
+    def blank(start: int, end: int) -> None:
+        nonlocal copied
+        if end > start:
+            pieces.append(source[copied:start])
+            newline = source.find("\n", start, end)
+            # Comments and strings rarely span lines; keep their line breaks when they do
+            pieces.append(" " * (end - start) if newline < 0 else _NOT_NEWLINE.sub(" ", source[start:end]))
+            copied = end
+
+    def template_from(start: int) -> int:
+        """Blank a template literal body from `start`; returns where code resumes."""
+        end = _TEMPLATE_BODY.match(source, start).end()
+        blank(start, end)
+        if source.startswith("${", end):
+            template_depths.append(0)
+            return end + 2
+        return end + 1  # past the closing backtick (or the end of the source)
+
+    while True:
+        token_pattern = _SCAN_TOKEN_IN_TEMPLATE if template_depths else _SCAN_TOKEN
+        match = token_pattern.search(source, pos)
+        if match is None:
+            break
+        token, start = match.group(), match.start()
+        pos = start + 1
+
+        if token == "//":
+            end = source.find("\n", start)
+            end = end_of_source if end < 0 else end
+            blank(start, end)
+            pos = end
+        elif token == "/*":
+            end = source.find("*/", start + 2)
+            end = end_of_source if end < 0 else end + 2
+            blank(start, end)
+            pos = end
+        elif token == "/":
+            if _regex_allowed(source, start):
+                body = _REGEX_BODY.match(source, start + 1)
+                if body:
+                    blank(start + 1, body.end() - 1)
+                    pos = body.end()
+        elif token == "`":
+            pos = template_from(start + 1)
+        elif token == "{":
+            template_depths[-1] += 1
+        elif token == "}":
+            if template_depths[-1]:
+                template_depths[-1] -= 1
+            else:
+                template_depths.pop()
+                pos = template_from(start + 1)
+        else:  # quote
+            end = _STRING_BODY[token].match(source, start + 1).end()
+            if end < end_of_source and source[end] == token:
+                blank(start + 1, end)
+                pos = end + 1
+
+    pieces.append(source[copied:])
+    return "".join(pieces)
+
+
+def _regex_allowed(source: str, slash: int) -> bool:
+    """Whether a `/` at `slash` starts a regex literal (by the preceding token)."""
+    i = slash - 1
+    while i >= 0 and source[i] in " \t\r\n":
+        i -= 1
+    if i < 0 or source[i] in _REGEX_PRECEDERS:
+        return True
+    return bool(_REGEX_KEYWORD_BEFORE.search(source, max(0, i - 9), i + 1))
+
+
 # ============================================================================
 # TypeScript Extractor
 # ============================================================================
 
+# Matched against the masked source, so nothing inside comments or strings is
+# picked up. Whitespace does not cross lines, except inside the brackets of
+# import lists and of parameter lists without nested parentheses (multi-line
+# imports and signatures).
+_WS = r"[ \t]"
+_IDENT = r"[a-zA-Z_$][a-zA-Z0-9_$]*"
+_STRUCTURE_PATTERN = re.compile(rf"""
+    (?P<import>\bimport{_WS}+
+        (?:(?P<import_type>type{_WS}+)?\{{(?P<named>[^}}]+)\}}
+          |\*{_WS}+as{_WS}+(?P<namespace>[a-zA-Z0-9]+)
+          |(?P<default>[A-Z][a-zA-Z0-9]*))
+        {_WS}+from{_WS}+['"](?P<module>[^'"\n]+)['"])
+  | (?P<function>\b(?P<f_export>export{_WS}+)?(?P<f_default>default{_WS}+)?(?P<f_async>async{_WS}+)?
+        function{_WS}+(?P<f_name>{_IDENT}){_WS}*\((?P<f_params>[^()]*|[^)\n]*)\){_WS}*
+        (?::{_WS}*(?P<f_return>[^{{\n]+))?\s*\{{)
+  | (?P<arrow>\b(?P<a_export>export{_WS}+)?(?P<a_default>default{_WS}+)?
+        const{_WS}+(?P<a_name>{_IDENT}){_WS}*={_WS}*(?P<a_async>async{_WS}+)?\((?P<a_params>[^()]*|[^)\n]*)\){_WS}*
+        (?::{_WS}*(?P<a_return>[^=>{{\n]+))?{_WS}*=>)
+  | (?P<class>\b(?P<c_export>export{_WS}+)?(?:default{_WS}+)?
+        class{_WS}+(?P<c_name>[A-Z][a-zA-Z0-9_]*){_WS}*
+        (?:extends{_WS}+(?P<c_extends>[A-Z][a-zA-Z0-9_<>, \t]*?))?{_WS}*
+        (?:implements{_WS}+(?P<c_implements>[A-Z][a-zA-Z0-9_<>, \t]*))?{_WS}*\{{)
+  | (?P<component>\bexport{_WS}+default{_WS}+(?:function{_WS}+)?(?P<k_name>[A-Z][a-zA-Z0-9]*))
+""", re.VERBOSE)
+# Every alternative above starts with one of these words
+_STRUCTURE_KEYWORD = re.compile(r"\b(?:import|export|default|async|function|const|class)\b")
+_DECLARED_NAME = {"function": "f_name", "arrow": "a_name", "class": "c_name", "component": "k_name"}
+
+
 class TypeScriptExtractor:
-    """Extracts TypeScript/TSX code structures using regex patterns."""
+    """
+    Extracts TypeScript/TSX code structures.
+
+    The source is scanned once (scan_source) to blank comments and string
+    contents and match brackets; one regex sweep over the result then records
+    imports, functions, classes and components in source order. Function body
+    sizes come from the matched brackets, so nothing is rescanned per function.
+    """
 
     def __init__(self, file_path: Path, source_code: str):
         self.file_path = str(file_path)
@@ -100,10 +291,7 @@ class TypeScriptExtractor:
     def extract(self) -> TSExtractionResult:
         """Main extraction method."""
         try:
-            self._extract_imports()
-            self._extract_functions()
-            self._extract_classes()
-            self._extract_react_components()
+            self._extract_structures()
 
             return TSExtractionResult(
                 file_path=self.file_path,
@@ -120,173 +308,139 @@ class TypeScriptExtractor:
                 parse_errors=[f"Extraction error: {str(e)}"]
             )
 
-    def _extract_imports(self):
-        """Extract import statements."""
-        named_import_pattern = r"import\s+(?:type\s+)?\{([^}]+)\}\s+from\s+['\"]([^'\"]+)['\"]"
-        default_import_pattern = r"import\s+([A-Z][a-zA-Z0-9]*)\s+from\s+['\"]([^'\"]+)['\"]"
-        namespace_import_pattern = r"import\s+\*\s+as\s+([a-zA-Z0-9]+)\s+from\s+['\"]([^'\"]+)['\"]"
+    def _extract_structures(self):
+        """Extract imports, functions, classes and component candidates in one sweep."""
+        masked, self._closing = scan_source(self.source_code)
+        self._masked = masked
+        self._line_starts = [0]
+        self._line_starts.extend(m.end() for m in re.finditer("\n", masked))
+        line_of = self._line_of
 
-        for i, line in enumerate(self.lines, 1):
-            line = line.strip()
-            is_type_import = 'import type' in line
+        # export default <Name> is a component unless <Name> is a function of this file
+        component_candidates: List[Tuple[str, int]] = []
 
-            # Named imports
-            match = re.search(named_import_pattern, line)
-            if match:
-                imports_str = match.group(1)
-                module = match.group(2)
-                imports = [imp.strip() for imp in imports_str.split(',')]
+        for match in self._iter_structures(masked):
+            kind = match.lastgroup
+            line_number = line_of(match.start())
 
+            if kind == "import":
+                module = self.source_code[match.start("module"):match.end("module")]
+                named = match.group("named")
                 self.imports.append(TSImportMetadata(
                     module=module,
-                    imports=imports,
-                    default_import=None,
+                    imports=[imp.strip() for imp in named.split(",") if imp.strip()] if named else [],
+                    default_import=match.group("namespace") or match.group("default"),
                     file_path=self.file_path,
-                    line_number=i,
-                    is_type_import=is_type_import
+                    line_number=line_number,
+                    is_type_import=bool(match.group("import_type"))
                 ))
-                continue
-
-            # Default import
-            match = re.search(default_import_pattern, line)
-            if match:
-                default_import = match.group(1)
-                module = match.group(2)
-
-                self.imports.append(TSImportMetadata(
-                    module=module,
-                    imports=[],
-                    default_import=default_import,
-                    file_path=self.file_path,
-                    line_number=i,
-                    is_type_import=is_type_import
-                ))
-                continue
-
-            # Namespace import
-            match = re.search(namespace_import_pattern, line)
-            if match:
-                namespace = match.group(1)
-                module = match.group(2)
-
-                self.imports.append(TSImportMetadata(
-                    module=module,
-                    imports=[],
-                    default_import=namespace,
-                    file_path=self.file_path,
-                    line_number=i,
-                    is_type_import=is_type_import
-                ))
-
-    def _extract_functions(self):
-        """Extract function declarations."""
-        func_pattern = r"(export\s+)?(default\s+)?(async\s+)?function\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*\(([^)]*)\)\s*(?::\s*([^{]+))?\s*\{"
-        arrow_pattern = r"(export\s+)?(default\s+)?const\s+([a-zA-Z_$][a-zA-Z0-9_$]*)\s*=\s*(async\s+)?\(([^)]*)\)\s*(?::\s*([^=>{]+))?\s*=>"
-
-        for i, line in enumerate(self.lines, 1):
-            # Function declarations
-            match = re.search(func_pattern, line)
-            if match:
-                is_exported = bool(match.group(1))
-                is_default = bool(match.group(2))
-                is_async = bool(match.group(3))
-                name = match.group(4)
-                params_str = match.group(5) or ""
-                return_type = match.group(6).strip() if match.group(6) else None
-
-                params = self._parse_parameters(params_str)
-                body_lines = self._estimate_body_lines(i - 1)
 
+            elif kind == "function":
                 self.functions.append(TSFunctionMetadata(
-                    name=name,
+                    name=match.group("f_name"),
                     file_path=self.file_path,
-                    line_number=i,
+                    line_number=line_number,
                     function_type="function",
-                    parameters=params,
-                    return_type=return_type,
-                    is_async=is_async,
-                    is_exported=is_exported,
-                    is_default_export=is_default,
-                    body_lines=body_lines
+                    parameters=self._parse_parameters(match.group("f_params")),
+                    return_type=match.group("f_return").strip() if match.group("f_return") else None,
+                    is_async=bool(match.group("f_async")),
+                    is_exported=bool(match.group("f_export")),
+                    is_default_export=bool(match.group("f_default")),
+                    body_lines=self._block_lines(line_number, match.end() - 1)
                 ))
 
-            # Arrow functions
-            match = re.search(arrow_pattern, line)
-            if match:
-                is_exported = bool(match.group(1))
-                is_default = bool(match.group(2))
-                name = match.group(3)
-                is_async = bool(match.group(4))
-                params_str = match.group(5) or ""
-                return_type = match.group(6).strip() if match.group(6) else None
-
-                params = self._parse_parameters(params_str)
-                body_lines = self._estimate_body_lines(i - 1)
-
+            elif kind == "arrow":
                 self.functions.append(TSFunctionMetadata(
-                    name=name,
+                    name=match.group("a_name"),
                     file_path=self.file_path,
-                    line_number=i,
+                    line_number=line_number,
                     function_type="arrow",
-                    parameters=params,
-                    return_type=return_type,
-                    is_async=is_async,
-                    is_exported=is_exported,
-                    is_default_export=is_default,
-                    body_lines=body_lines
+                    parameters=self._parse_parameters(match.group("a_params")),
+                    return_type=match.group("a_return").strip() if match.group("a_return") else None,
+                    is_async=bool(match.group("a_async")),
+                    is_exported=bool(match.group("a_export")),
+                    is_default_export=bool(match.group("a_default")),
+                    body_lines=self._arrow_body_lines(line_number, match.end())
                 ))
 
-    def _extract_classes(self):
-        """Extract class declarations."""
-        class_pattern = r"(export\s+)?(default\s+)?class\s+([A-Z][a-zA-Z0-9_]*)\s*(?:extends\s+([A-Z][a-zA-Z0-9_<>,\s]*))?\s*(?:implements\s+([A-Z][a-zA-Z0-9_<>,\s]*))?\s*\{"
-
-        for i, line in enumerate(self.lines, 1):
-            match = re.search(class_pattern, line)
-            if match:
-                is_exported = bool(match.group(1))
-                name = match.group(3)
-                extends = match.group(4).strip() if match.group(4) else None
-                implements_str = match.group(5).strip() if match.group(5) else ""
-
-                implements = [i.strip() for i in implements_str.split(',')] if implements_str else []
-
+            elif kind == "class":
+                implements_str = (match.group("c_implements") or "").strip()
                 self.classes.append(TSClassMetadata(
-                    name=name,
+                    name=match.group("c_name"),
                     file_path=self.file_path,
-                    line_number=i,
-                    extends=extends,
-                    implements=implements,
-                    is_exported=is_exported
+                    line_number=line_number,
+                    extends=match.group("c_extends").strip() if match.group("c_extends") else None,
+                    implements=[i.strip() for i in implements_str.split(',')] if implements_str else [],
+                    is_exported=bool(match.group("c_export"))
                 ))
 
-    def _extract_react_components(self):
-        """Extract React components."""
-        # Look for default exports that are likely components (capitalized names)
-        export_default_pattern = r"export\s+default\s+(?:function\s+)?([A-Z][a-zA-Z0-9]*)"
+            else:  # component
+                component_candidates.append((match.group("k_name"), line_number))
 
-        for i, line in enumerate(self.lines, 1):
-            match = re.search(export_default_pattern, line)
+        function_names = {f.name for f in self.functions}
+        for name, line_number in component_candidates:
+            # Check if it's already captured as a function, then if it returns JSX (heuristic)
+            if name in function_names or not self._check_jsx_return(line_number - 1):
+                continue
+            self.components.append(TSComponentMetadata(
+                name=name,
+                file_path=self.file_path,
+                line_number=line_number,
+                component_type="function_component",
+                props_type=None,
+                is_exported=True,
+                is_default_export=True
+            ))
+
+    @staticmethod
+    def _iter_structures(masked: str):
+        """
+        Matches of _STRUCTURE_PATTERN in masked, tried only where a keyword starts.
+
+        Scanning resumes after the declared name, not after the whole match, so a
+        declaration inside another one's parameter list is still found.
+        """
+        resume = 0
+        for keyword in _STRUCTURE_KEYWORD.finditer(masked):
+            if keyword.start() < resume:
+                continue
+            match = _STRUCTURE_PATTERN.match(masked, keyword.start())
             if match:
-                name = match.group(1)
-
-                # Check if it's already captured as a function
-                already_captured = any(f.name == name for f in self.functions)
-                if already_captured:
-                    continue
-
-                # Check if it returns JSX (heuristic)
-                is_jsx = self._check_jsx_return(i - 1)
-
-                if is_jsx:
-                    self.components.append(TSComponentMetadata(
-                        name=name,
-                        file_path=self.file_path,
-                        line_number=i,
-                        component_type="function_component",
-                        props_type=None,
-                        is_exported=True,
-                        is_default_export=True
-                    ))
+                resume = match.end(_DECLARED_NAME.get(match.lastgroup, match.lastgroup))
+                yield match
+
+    def _line_of(self, offset: int) -> int:
+        """1-based line number of a source offset."""
+        return bisect_right(self._line_starts, offset)
+
+    def _block_lines(self, start_line: int, open_offset: int) -> int:
+        """Lines from start_line through the bracket closing the one at open_offset (1 if unclosed)."""
+        close_offset = self._closing.get(open_offset)
+        if close_offset is None:
+            return 1
+        return self._line_of(close_offset) - start_line + 1
+
+    def _arrow_body_lines(self, start_line: int, body_offset: int) -> int:
+        """
+        Lines of an arrow function whose body starts at body_offset: a block
+        body ends at its closing brace, an expression body at the first `;` or
+        line break outside brackets.
+        """
+        masked = self._masked
+        pos = body_offset
+        while pos < len(masked) and masked[pos] in " \t\r\n":
+            pos += 1
+        while True:
+            match = _ARROW_BODY_END.search(masked, pos)
+            if match is None:
+                return self._line_of(len(masked)) - start_line + 1
+            char = match.group()
+            if char in ";\n":
+                return self._line_of(match.start()) - start_line + 1
+            close_offset = self._closing.get(match.start())
+            if close_offset is None:
+                return 1
+            pos = close_offset + 1
 
     def _parse_parameters(self, params_str: str) -> List[str]:
         """Parse parameter string into list of parameter names."""
@@ -304,29 +458,11 @@ class TypeScriptExtractor:
                 params.append(param)
         return params
 
-    def _estimate_body_lines(self, start_line: int) -> int:
-        """Estimate function body line count by finding closing brace."""
-        brace_count = 0
-        started = False
-
-        for i in range(start_line, len(self.lines)):
-            line = self.lines[i]
-            for char in line:
-                if char == '{':
-                    brace_count += 1
-                    started = True
-                elif char == '}':
-                    brace_count -= 1
-
-            if started and brace_count == 0:
-                return i - start_line + 1
-
-        return 1
-
     def _check_jsx_return(self, start_line: int) -> bool:
         """Check if function returns JSX (heuristic)."""
-        for i in range(start_line, min(start_line + 20, len(self.lines))):
-            line = self.lines[i]
+        masked_lines = self._masked.split("\n")
+        for i in range(start_line, min(start_line + 20, len(masked_lines))):
+            line = masked_lines[i]
             if 'return <' in line or ('return' in line and '<' in line):
                 return True
             if 'return null' in line or 'return false' in line:
@@ -345,75 +481,119 @@ class TSRepositoryExtractionResult:
     file_results: Dict[str, TSExtractionResult] = field(default_factory=dict)
 
     def to_json(self) -> str:
-        """Export results as JSON."""
+        """Export results as one JSON document (legacy format; see write_jsonl)."""
+        totals = {"files": len(self.file_results), "functions": 0, "components": 0, "classes": 0, "imports": 0}
+        for result in self.file_results.values():
+            for key, count in ts_result_counts(result).items():
+                totals[key] += count
+
         data = {
             "repo_path": self.repo_path,
-            "summary": {
-                "total_files": len(self.file_results),
-                "total_functions": sum(len(r.functions) for r in self.file_results.values()),
-                "total_components": sum(len(r.components) for r in self.file_results.values()),
-                "total_classes": sum(len(r.classes) for r in self.file_results.values()),
-                "total_imports": sum(len(r.imports) for r in self.file_results.values())
-            },
-            "files": {}
-        }
-
-        for file_path, result in self.file_results.items():
-            data["files"][file_path] = {
-                "functions": [
-                    {
-                        "name": f.name,
-                        "line_number": f.line_number,
-                        "function_type": f.function_type,
-                        "parameters": f.parameters,
-                        "return_type": f.return_type,
-                        "is_async": f.is_async,
-                        "is_exported": f.is_exported,
-                        "is_default_export": f.is_default_export,
-                        "body_lines": f.body_lines
-                    }
-                    for f in result.functions
-                ],
-                "components": [
-                    {
-                        "name": c.name,
-                        "line_number": c.line_number,
-                        "component_type": c.component_type,
-                        "props_type": c.props_type,
-                        "is_exported": c.is_exported,
-                        "is_default_export": c.is_default_export
-                    }
-                    for c in result.components
-                ],
-                "classes": [
-                    {
-                        "name": c.name,
-                        "line_number": c.line_number,
-                        "extends": c.extends,
-                        "implements": c.implements,
-                        "is_exported": c.is_exported
-                    }
-                    for c in result.classes
-                ],
-                "imports": [
-                    {
-                        "module": i.module,
-                        "imports": i.imports,
-                        "default_import": i.default_import,
-                        "line_number": i.line_number,
-                        "is_type_import": i.is_type_import
-                    }
-                    for i in result.imports
-                ],
-                "parse_errors": result.parse_errors
+            "summary": {f"total_{key}": count for key, count in totals.items()},
+            "files": {
+                file_path: ts_file_result_to_dict(result)
+                for file_path, result in self.file_results.items()
             }
+        }
 
         return json.dumps(data, indent=2)
 
 
-def extract_typescript_repository(repo_path: Path) -> TSRepositoryExtractionResult:
-    """Extract all TypeScript/TSX files from a repository."""
-    result = TSRepositoryExtractionResult(repo_path=str(repo_path))
+def ts_result_counts(result: TSExtractionResult) -> Dict[str, int]:
+    """Item counts of one file, for extraction summaries."""
+    return {
+        "functions": len(result.functions),
+        "components": len(result.components),
+        "classes": len(result.classes),
+        "imports": len(result.imports)
+    }
+
+
+def ts_file_result_to_dict(result: TSExtractionResult) -> Dict:
+    """Per-file JSON shape of a TSExtractionResult (as in the "files" map of to_json())."""
+    return {
+        "functions": [
+            {
+                "name": f.name,
+                "line_number": f.line_number,
+                "function_type": f.function_type,
+                "parameters": f.parameters,
+                "return_type": f.return_type,
+                "is_async": f.is_async,
+                "is_exported": f.is_exported,
+                "is_default_export": f.is_default_export,
+                "body_lines": f.body_lines
+            }
+            for f in result.functions
+        ],
+        "components": [
+            {
+                "name": c.name,
+                "line_number": c.line_number,
+                "component_type": c.component_type,
+                "props_type": c.props_type,
+                "is_exported": c.is_exported,
+                "is_default_export": c.is_default_export
+            }
+            for c in result.components
+        ],
+        "classes": [
+            {
+                "name": c.name,
+                "line_number": c.line_number,
+                "extends": c.extends,
+                "implements": c.implements,
+                "is_exported": c.is_exported
+            }
+            for c in result.classes
+        ],
+        "imports": [
+            {
+                "module": i.module,
+                "imports": i.imports,
+                "default_import": i.default_import,
+                "line_number": i.line_number,
+                "is_type_import": i.is_type_import
+            }
+            for i in result.imports
+        ],
+        "parse_errors": result.parse_errors
+    }
+
+
+# Item lists of a TSExtractionResult, in the order they are packed for the cache
+_PACKED_GROUPS = (
+    ("functions", TSFunctionMetadata),
+    ("components", TSComponentMetadata),
+    ("classes", TSClassMetadata),
+    ("imports", TSImportMetadata),
+)
+
+
+def _extract_cached(file_path: Path, source_code: str, data: bytes,
+                    cache: ExtractionCache) -> Tuple[TSExtractionResult, bool]:
+    """Extract a file, reusing the cached result for identical content. Returns (result, cache hit)."""
+    digest = content_digest(data)
+    packed = cache.get(digest)
+    if packed is not None:
+        return unpack_result(packed, TSExtractionResult, _PACKED_GROUPS, str(file_path)), True
+
+    file_result = TypeScriptExtractor(file_path, source_code).extract()
+    cache.put(digest, pack_result(file_result, _PACKED_GROUPS))
+    return file_result, False
+
+
+def iter_extract_typescript_repository(
+    repo_path: Path, cache_dir: Optional[Path] = None, cache_max_bytes: int = DEFAULT_MAX_BYTES
+) -> Iterator[Tuple[str, TSExtractionResult]]:
+    """
+    Extract all TypeScript/TSX files from a repository, yielding (file_path, result) per file.
+
+    With a cache_dir, files whose content was extracted before by this extractor
+    version are not re-parsed (see extraction_cache.py).
+    """
+    cache = ExtractionCache(cache_dir, "typescript", EXTRACTOR_FINGERPRINT, cache_max_bytes) if cache_dir else None
+    cache_hits = 0
 
     ts_files = list(repo_path.glob("**/*.ts")) + list(repo_path.glob("**/*.tsx"))
     js_files = list(repo_path.glob("**/*.js")) + list(repo_path.glob("**/*.jsx"))
@@ -425,10 +605,15 @@ def extract_typescript_repository(repo_path: Path) -> TSRepositoryExtractionResu
         print(f"Extracting: {file_path.relative_to(repo_path)}")
 
         try:
-            source_code = file_path.read_text(encoding="utf-8")
-            extractor = TypeScriptExtractor(file_path, source_code)
-            file_result = extractor.extract()
-            result.file_results[str(file_path)] = file_result
+            if cache is None:
+                source_code = file_path.read_text(encoding="utf-8")
+                file_result = TypeScriptExtractor(file_path, source_code).extract()
+            else:
+                data = file_path.read_bytes()
+                # Same text read_text() would give (universal newlines)
+                source_code = data.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+                file_result, hit = _extract_cached(file_path, source_code, data, cache)
+                cache_hits += hit
 
             if file_result.parse_errors:
                 print(f"  ⚠️  Parse errors: {file_result.parse_errors}")
@@ -437,45 +622,102 @@ def extract_typescript_repository(repo_path: Path) -> TSRepositoryExtractionResu
 
         except Exception as e:
             print(f"  ❌ Failed to extract {file_path}: {e}")
-            result.file_results[str(file_path)] = TSExtractionResult(
+            file_result = TSExtractionResult(
                 file_path=str(file_path),
                 parse_errors=[f"Read error: {str(e)}"]
             )
 
+        yield str(file_path), file_result
+
+    if cache is not None:
+        freed = cache.cleanup()
+        print(f"Extraction cache: {cache_hits}/{len(all_files)} files reused"
+              + (f", {freed / 1024 / 1024:.1f} MB evicted" if freed else ""))
+
+
+def extract_typescript_repository(repo_path: Path, cache_dir: Optional[Path] = None,
+                                  cache_max_bytes: int = DEFAULT_MAX_BYTES) -> TSRepositoryExtractionResult:
+    """Extract all TypeScript/TSX files from a repository (see iter_extract_typescript_repository)."""
+    result = TSRepositoryExtractionResult(repo_path=str(repo_path))
+    for file_path, file_result in iter_extract_typescript_repository(repo_path, cache_dir, cache_max_bytes):
+        result.file_results[file_path] = file_result
     return result
 
 
+def write_jsonl(
+    file_results: Iterable[Tuple[str, TSExtractionResult]],
+    output_path: Path,
+    repo_path: Path
+) -> Dict[str, int]:
+    """
+    Stream extraction results to JSONL (extraction_stream.py), one line per file.
+
+    Returns:
+        Summary counts (also written as the last line)
+    """
+    with ExtractionStreamWriter(output_path, str(repo_path), "typescript") as writer:
+        for file_path, file_result in file_results:
+            writer.write_file(file_path, ts_file_result_to_dict(file_result), ts_result_counts(file_result))
+    return writer.summary()
+
+
 # ============================================================================
 # CLI Interface
 # ============================================================================
 
 if __name__ == "__main__":
-    import sys
+    import argparse
 
-    if len(sys.argv) < 2:
-        print("Usage: python typescript_extractor.py <repo_path> [output.json]")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(description="Extract functions, components, classes and imports from a TypeScript repository")
+    parser.add_argument("repo_path", type=Path, help="Repository root")
+    parser.add_argument("output", type=Path, nargs="?",
+                        help="Write extraction results to this file (JSONL, one line per file)")
+    parser.add_argument("--legacy-json", action="store_true",
+                        help="Write the single-document JSON format instead of JSONL (holds the whole repo in memory)")
+    parser.add_argument("--cache-dir", type=Path, help="Extraction cache directory (default: ~/.cache/graphcare/extraction/<repo>)")
+    parser.add_argument("--no-cache", action="store_true", help="Re-parse every file, without reading or writing the cache")
+    args = parser.parse_args()
 
-    repo_path = Path(sys.argv[1])
-    output_path = Path(sys.argv[2]) if len(sys.argv) > 2 else None
+    repo_path = args.repo_path
+    output_path = args.output
 
     if not repo_path.exists():
         print(f"Error: Repository path does not exist: {repo_path}")
         sys.exit(1)
 
+    cache_dir = None if args.no_cache else (args.cache_dir or default_cache_dir(repo_path))
+
     print(f"Extracting TypeScript repository: {repo_path}")
     print("=" * 80)
 
-    result = extract_typescript_repository(repo_path)
+    totals = {"files": 0, "functions": 0, "components": 0, "classes": 0, "imports": 0}
+    legacy_result = TSRepositoryExtractionResult(repo_path=str(repo_path)) if args.legacy_json else None
+
+    def tally(file_results):
+        for file_path, file_result in file_results:
+            totals["files"] += 1
+            for key, count in ts_result_counts(file_result).items():
+                totals[key] += count
+            if legacy_result is not None:
+                legacy_result.file_results[file_path] = file_result
+            yield file_path, file_result
+
+    file_results = tally(iter_extract_typescript_repository(repo_path, cache_dir=cache_dir))
+    if output_path and not args.legacy_json:
+        write_jsonl(file_results, output_path, repo_path)
+    else:
+        for _ in file_results:
+            pass
 
     print("=" * 80)
     print(f"\nExtraction Summary:")
-    print(f"  Files processed: {len(result.file_results)}")
-    print(f"  Total functions: {sum(len(r.functions) for r in result.file_results.values())}")
-    print(f"  Total components: {sum(len(r.components) for r in result.file_results.values())}")
-    print(f"  Total classes: {sum(len(r.classes) for r in result.file_results.values())}")
-    print(f"  Total imports: {sum(len(r.imports) for r in result.file_results.values())}")
+    print(f"  Files processed: {totals['files']}")
+    print(f"  Total functions: {totals['functions']}")
+    print(f"  Total components: {totals['components']}")
+    print(f"  Total classes: {totals['classes']}")
+    print(f"  Total imports: {totals['imports']}")
 
     if output_path:
-        output_path.write_text(result.to_json(), encoding="utf-8")
+        if legacy_result is not None:
+            output_path.write_text(legacy_result.to_json(), encoding="utf-8")
         print(f"\nResults exported to: {output_path}")
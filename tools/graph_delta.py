@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Shared helpers for delta export / replay
+
+A delta is everything that changed in a graph inside a time window [since, until):
+    - nodes/edges whose created_at, updated_at or valid_from falls after `since`
+    - U4_Tombstone nodes recorded by the ingestors when they delete something
+
+Deltas are keyed by natural keys (U4_Code_Artifact.path, U4_Knowledge_Object.id),
+never by internal node IDs, so they can be replayed onto any copy of the graph.
+Every statement in a delta is an upsert (MERGE ... SET) or a delete, which makes
+replaying the same delta twice a no-op.
+
+Timestamps are UTC epoch milliseconds (now_ms()); the ingestors stamp their
+writes with now_ms() too, so windows and stamps agree whatever the host's TZ.
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+TOMBSTONE_LABEL = "U4_Tombstone"
+REPLAY_STATE_LABEL = "U4_Replay_State"
+
+# Bookkeeping labels that never travel inside a delta
+DELTA_EXCLUDED_LABELS = (TOMBSTONE_LABEL, REPLAY_STATE_LABEL)
+
+# Property used to identify a node across graphs, in priority order
+NATURAL_KEYS = ("path", "id")
+
+# Properties that mark a node / edge as changed
+CHANGE_PROPS = ("updated_at", "valid_from", "created_at")
+
+
+def now_ms() -> int:
+    return int(datetime.now(timezone.utc).timestamp() * 1000)
+
+
+def parse_since(value: str) -> int:
+    """Parse --since as epoch milliseconds or an ISO-8601 timestamp (UTC if naive)."""
+    value = value.strip()
+    if value.lstrip("-").isdigit():
+        return int(value)
+    parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return int(parsed.timestamp() * 1000)
+
+
+def changed_since(var: str, param: str = "since") -> str:
+    """Cypher predicate: entity `var` was created or modified at/after $param."""
+    return " OR ".join(f"{var}.{prop} >= ${param}" for prop in CHANGE_PROPS)
+
+
+def not_bookkeeping(var: str) -> str:
+    """Cypher predicate excluding tombstone / replay-state nodes."""
+    return " AND ".join(f"NOT {var}:{label}" for label in DELTA_EXCLUDED_LABELS)
+
+
+def node_ref(labels: List[str], properties: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Natural-key reference to a node, or None if it has no usable key."""
+    for key in NATURAL_KEYS:
+        if properties.get(key) is not None:
+            return {"labels": list(labels), "key": key, "value": properties[key]}
+    return None
+
+
+# ============================================================================
+# Tombstones
+# ============================================================================
+
+def record_tombstone(
+    graph,
+    ref: Dict[str, Any],
+    rel_type: Optional[str] = None,
+    target_ref: Optional[Dict[str, Any]] = None,
+    scope_ref: Optional[str] = None,
+) -> int:
+    """
+    Record a deletion so delta exports can replay it.
+
+    Args:
+        graph: FalkorDB graph connection
+        ref: node_ref() of the deleted node (or the edge's source)
+        rel_type: Relationship type when an edge was deleted
+        target_ref: node_ref() of the edge's target when an edge was deleted
+        scope_ref: Client scope, for housekeeping queries
+
+    Returns:
+        deleted_at timestamp (epoch ms)
+    """
+    deleted_at = now_ms()
+    props = {
+        "kind": "edge" if rel_type else "node",
+        "labels": ":".join(ref["labels"]),
+        "key": ref["key"],
+        "value": ref["value"],
+        "deleted_at": deleted_at,
+    }
+    if rel_type:
+        props.update({
+            "rel_type": rel_type,
+            "target_labels": ":".join(target_ref["labels"]),
+            "target_key": target_ref["key"],
+            "target_value": target_ref["value"],
+        })
+    if scope_ref:
+        props["scope_ref"] = scope_ref
+
+    graph.query(f"CREATE (d:{TOMBSTONE_LABEL}) SET d = $props", {"props": props})
+    return deleted_at
+
+
+def tombstone_refs(tombstone: Dict[str, Any]):
+    """Split a U4_Tombstone's properties back into (ref, rel_type, target_ref)."""
+    ref = {
+        "labels": [l for l in tombstone["labels"].split(":") if l],
+        "key": tombstone["key"],
+        "value": tombstone["value"],
+    }
+    if tombstone.get("kind") != "edge":
+        return ref, None, None
+    target_ref = {
+        "labels": [l for l in tombstone["target_labels"].split(":") if l],
+        "key": tombstone["target_key"],
+        "value": tombstone["target_value"],
+    }
+    return ref, tombstone["rel_type"], target_ref
+
+
+def iter_tombstones(graph, since: int, until: int):
+    """Yield tombstone property dicts with since <= deleted_at < until, oldest first."""
+    result = graph.query(
+        f"MATCH (d:{TOMBSTONE_LABEL}) WHERE d.deleted_at >= $since AND d.deleted_at < $until "
+        "RETURN d ORDER BY d.deleted_at",
+        {"since": since, "until": until},
+    )
+    for row in result.result_set:
+        yield dict(row[0].properties)
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+GraphCare command line
+
+Subcommands:
+    ingest <repo_path>               Streaming extract → embed → ingest (tools/ingestion/ingest_pipeline.py)
+    sync <repo_path> <base>..<head>  Apply a git revision range incrementally (tools/ingestion/incremental_sync.py)
+
+Usage:
+    python3 tools/graphcare.py ingest <repo_path> --graph <graph> --scope <scope_ref> [options]
+    python3 tools/graphcare.py sync <repo_path> <rev_range> --graph <graph> --scope <scope_ref> [options]
+
+Example:
+    python3 tools/graphcare.py ingest clients/scopelock/repo --graph scopelock --scope org_scopelock \
+        --extract-workers 8 --metrics-json scopelock_ingest_metrics.json
+    python3 tools/graphcare.py sync clients/scopelock/repo HEAD~1..HEAD --graph scopelock --scope org_scopelock
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+import argparse
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+
+def cmd_ingest(args) -> int:
+    from tools.extractors.extraction_cache import default_cache_dir
+    from tools.ingestion.ingest_pipeline import format_metrics_table, run_ingest_pipeline
+
+    if not args.repo_path.exists():
+        print(f"Error: Repository path does not exist: {args.repo_path}")
+        return 1
+
+    print(f"Ingesting repository (streaming): {args.repo_path}")
+    print(f"  Graph: {args.graph}")
+    print(f"  Scope: {args.scope}")
+    print(f"  FalkorDB: {args.host}:{args.port}")
+    print(f"  Embeddings: {'Disabled' if args.no_embeddings else 'Enabled'}")
+    print("=" * 80)
+
+    last_report = [0.0]
+
+    def report_progress(metrics):
+        now = time.monotonic()
+        if now - last_report[0] < args.progress_interval:
+            return
+        last_report[0] = now
+        print("  " + " | ".join(
+            f"{m.name}: {m.items_in} in (q≤{m.queue_depth_max})" for m in metrics.values()
+        ))
+
+    started = time.monotonic()
+    stats, metrics = run_ingest_pipeline(
+        repo_path=args.repo_path,
+        graph_name=args.graph,
+        scope_ref=args.scope,
+        language=args.language,
+        generate_embeddings=not args.no_embeddings,
+        falkordb_host=args.host,
+        falkordb_port=args.port,
+        pattern=args.pattern,
+        extract_workers=args.extract_workers,
+        embed_workers=args.embed_workers,
+        embed_batch=args.embed_batch,
+        write_workers=args.write_workers,
+        write_batch=args.write_batch,
+        queue_size=args.queue_size,
+        prune=args.prune,
+        on_sample=report_progress,
+        cache_dir=None if args.no_cache else (args.cache_dir or default_cache_dir(args.repo_path)),
+    )
+    elapsed = time.monotonic() - started
+
+    print("=" * 80)
+    print("\nIngestion Summary:")
+    print(f"  Functions ingested: {stats.functions_ingested}")
+    print(f"  Classes ingested: {stats.classes_ingested}")
+    print(f"  Embeddings generated: {stats.embeddings_generated}")
+    print(f"  U4_CALLS links created: {stats.calls_linked}")
+    print(f"  Unchanged (skipped): {stats.artifacts_unchanged}")
+    if args.prune:
+        print(f"  Stale artifacts pruned: {stats.artifacts_pruned}")
+    else:
+        print(f"  Removed artifacts soft-deleted: {stats.artifacts_retired}")
+    print(f"  Errors: {stats.errors}")
+    print(f"  Wall time: {elapsed:.1f}s")
+    print("\nStage Metrics:")
+    print(format_metrics_table(metrics))
+
+    if args.metrics_json:
+        args.metrics_json.write_text(json.dumps({
+            "repo_path": str(args.repo_path),
+            "graph": args.graph,
+            "wall_seconds": round(elapsed, 3),
+            "stages": {name: m.to_dict() for name, m in metrics.items()},
+        }, indent=2), encoding="utf-8")
+        print(f"\nMetrics written to: {args.metrics_json}")
+
+    print("\n✅ Ingestion complete!")
+    return 0
+
+
+def cmd_sync(args) -> int:
+    from tools.ingestion.incremental_sync import SyncError, sync_revision_range
+
+    if not args.repo_path.exists():
+        print(f"Error: Repository path does not exist: {args.repo_path}")
+        return 1
+
+    print(f"Syncing {args.rev_range} of {args.repo_path}")
+    print(f"  Graph: {args.graph}")
+    print(f"  Scope: {args.scope}")
+    print(f"  FalkorDB: {args.host}:{args.port}")
+    print(f"  Embeddings: {'Disabled' if args.no_embeddings else 'Enabled'}")
+    print("=" * 80)
+
+    try:
+        stats = sync_revision_range(
+            repo_path=args.repo_path,
+            rev_range=args.rev_range,
+            graph_name=args.graph,
+            scope_ref=args.scope,
+            language=args.language,
+            generate_embeddings=not args.no_embeddings,
+            falkordb_host=args.host,
+            falkordb_port=args.port,
+            prune=args.prune,
+            write_batch=args.write_batch,
+            embed_batch=args.embed_batch,
+        )
+    except SyncError as e:
+        print(f"❌ {e}")
+        return 1
+
+    print("=" * 80)
+    print(f"\nSync Summary ({stats.base[:10]}..{stats.head[:10]}):")
+    print(f"  Files re-extracted: {stats.files_upserted}")
+    print(f"  Files removed: {stats.files_removed}")
+    print(f"  Artifacts written: {stats.artifacts_written}")
+    print(f"  Unchanged (skipped): {stats.artifacts_unchanged}")
+    if args.prune:
+        print(f"  Stale artifacts pruned: {stats.artifacts_pruned}")
+    else:
+        print(f"  Removed artifacts soft-deleted: {stats.artifacts_retired}")
+    print(f"  U4_CALLS links removed: {stats.calls_unlinked}")
+    print(f"  U4_CALLS links created: {stats.calls_linked}")
+    print(f"  Errors: {stats.errors}")
+    print("\nLatency:")
+    for phase, seconds in stats.phase_seconds.items():
+        print(f"  {phase:<10} {seconds:>8.3f}s")
+    print(f"  {'sync':<10} {stats.sync_seconds:>8.3f}s")
+    print(f"  commit → graph: {stats.commit_to_graph_seconds:.1f}s")
+
+    if args.metrics_json:
+        args.metrics_json.write_text(json.dumps({
+            "repo_path": str(args.repo_path),
+            "graph": args.graph,
+            "rev_range": args.rev_range,
+            **stats.to_dict(),
+        }, indent=2), encoding="utf-8")
+        print(f"\nMetrics written to: {args.metrics_json}")
+
+    print("\n✅ Sync complete!")
+    return 0
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="graphcare", description="GraphCare command line")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    ingest = sub.add_parser("ingest", help="Extract, embed and ingest a repository in one streaming pass")
+    ingest.add_argument("repo_path", type=Path, help="Repository root")
+    ingest.add_argument("--graph", required=True, help="FalkorDB graph name (e.g., scopelock)")
+    ingest.add_argument("--scope", required=True, help="Client scope ref (e.g., org_scopelock)")
+    ingest.add_argument("--language", default="python", help="Programming language (default: python)")
+    ingest.add_argument("--pattern", default="**/*.py", help="Glob for source files (default: **/*.py)")
+    ingest.add_argument("--no-embeddings", action="store_true", help="Skip embedding generation")
+    ingest.add_argument("--prune", action="store_true",
+                        help="Hard-delete (and tombstone) removed artifacts instead of soft-deleting them")
+    ingest.add_argument("--host", default="localhost", help="FalkorDB host (default: localhost)")
+    ingest.add_argument("--port", type=int, default=6379, help="FalkorDB port (default: 6379)")
+    ingest.add_argument("--extract-workers", type=int, default=4,
+                        help="Extraction worker processes (default: 4; 1 parses in-process)")
+    ingest.add_argument("--embed-workers", type=int, default=1, help="Embedding threads (default: 1)")
+    ingest.add_argument("--embed-batch", type=int, default=32, help="Artifacts per embedding batch (default: 32)")
+    ingest.add_argument("--write-workers", type=int, default=2, help="DB writer threads (default: 2)")
+    ingest.add_argument("--write-batch", type=int, default=200, help="Artifacts per UNWIND write (default: 200)")
+    ingest.add_argument("--queue-size", type=int, default=256, help="Bounded queue size between stages (default: 256)")
+    ingest.add_argument("--progress-interval", type=float, default=5.0, help="Seconds between progress lines")
+    ingest.add_argument("--metrics-json", type=Path, help="Write per-stage metrics to this JSON file")
+    ingest.add_argument("--cache-dir", type=Path,
+                        help="Extraction cache directory (default: ~/.cache/graphcare/extraction/<repo>)")
+    ingest.add_argument("--no-cache", action="store_true", help="Re-parse every file, ignoring the extraction cache")
+    ingest.set_defaults(func=cmd_ingest)
+
+    sync = sub.add_parser("sync", help="Re-ingest only what changed in a git revision range")
+    sync.add_argument("repo_path", type=Path, help="Repository root (same path as used for ingest)")
+    sync.add_argument("rev_range", help="base..head, base...head, or base (= base..HEAD)")
+    sync.add_argument("--graph", required=True, help="FalkorDB graph name (e.g., scopelock)")
+    sync.add_argument("--scope", required=True, help="Client scope ref (e.g., org_scopelock)")
+    sync.add_argument("--language", default="python", help="Programming language (default: python)")
+    sync.add_argument("--no-embeddings", action="store_true", help="Skip embedding generation")
+    sync.add_argument("--prune", action="store_true",
+                      help="Hard-delete (and tombstone) removed artifacts instead of soft-deleting them")
+    sync.add_argument("--host", default="localhost", help="FalkorDB host (default: localhost)")
+    sync.add_argument("--port", type=int, default=6379, help="FalkorDB port (default: 6379)")
+    sync.add_argument("--embed-batch", type=int, default=32, help="Artifacts per embedding batch (default: 32)")
+    sync.add_argument("--write-batch", type=int, default=200, help="Artifacts per UNWIND write (default: 200)")
+    sync.add_argument("--metrics-json", type=Path, help="Write counts and latency to this JSON file")
+    sync.set_defaults(func=cmd_sync)
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
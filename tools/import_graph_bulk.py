@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+Restore a FalkorDB graph from a bulk snapshot written by export_graph_bulk.py
+
+Two restore paths:
+    csv    Hands the per-label/per-type CSVs to `falkordb-bulk-insert --enforce-schema`
+           (pip install falkordb-bulk-loader). Fastest; the target graph must not exist.
+    jsonl  Our own loader: batched UNWIND ... CREATE over nodes.jsonl / edges.jsonl.
+           Works against an existing graph and needs only the falkordb client.
+
+Every file is checked against its manifest sha256 before loading.
+
+Usage:
+    python3 import_graph_bulk.py <snapshot_dir> <graph_name> [--mode csv|jsonl]
+
+Example:
+    python3 import_graph_bulk.py snapshots/scopelock_2026-10-19 scopelock_restore
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+import argparse
+import json
+import re
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from export_graph_bulk import SCHEMA_VERSION, UNLABELED, sha256_file, label_key
+
+SNAPSHOT_ID_PROP = "_snapshot_id"  # temporary join key, removed after restore
+_IDENTIFIER = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+
+class SnapshotError(Exception):
+    """Snapshot is missing, corrupt, or from an unsupported schema version."""
+
+
+# ============================================================================
+# Manifest
+# ============================================================================
+
+def load_manifest(snapshot_dir: Path) -> dict:
+    path = snapshot_dir / "manifest.json"
+    if not path.exists():
+        raise SnapshotError(f"No manifest.json in {snapshot_dir}")
+    manifest = json.loads(path.read_text(encoding="utf-8"))
+    if manifest.get("schema_version") != SCHEMA_VERSION:
+        raise SnapshotError(
+            f"Unsupported snapshot schema_version {manifest.get('schema_version')} "
+            f"(expected {SCHEMA_VERSION})"
+        )
+    return manifest
+
+
+def verify_snapshot(snapshot_dir: Path, manifest: dict, fmt: str) -> List[dict]:
+    """Check every file of one format against its manifest checksum."""
+    entries = [f for f in manifest["files"] if f["format"] == fmt]
+    if not entries:
+        raise SnapshotError(f"Snapshot has no {fmt} files (formats: {manifest.get('formats')})")
+    for entry in entries:
+        path = snapshot_dir / entry["path"]
+        if not path.exists():
+            raise SnapshotError(f"Missing snapshot file: {entry['path']}")
+        if sha256_file(path) != entry["sha256"]:
+            raise SnapshotError(f"Checksum mismatch: {entry['path']}")
+    print(f"✓ Verified {len(entries)} {fmt} files against manifest")
+    return entries
+
+
+def _quote(name: str) -> str:
+    """Backtick-quote a label, relationship type or property key for interpolation into Cypher."""
+    if _IDENTIFIER.match(name):
+        return name
+    return "`" + name.replace("`", "``") + "`"
+
+
+def _labels_clause(key: str) -> str:
+    return ":" + ":".join(_quote(label) for label in key.split(":"))
+
+
+# ============================================================================
+# CSV Restore (falkordb-bulk-insert)
+# ============================================================================
+
+def bulk_insert_command(snapshot_dir: Path, manifest: dict, graph_name: str,
+                        server_url: str) -> List[str]:
+    """Build the falkordb-bulk-insert command line for a verified snapshot."""
+    cmd = ["falkordb-bulk-insert", graph_name, "--enforce-schema", "--server-url", server_url]
+    for entry in manifest["files"]:
+        if entry["format"] != "csv":
+            continue
+        path = str(snapshot_dir / entry["path"])
+        if entry["kind"] == "nodes":
+            cmd += ["--nodes-with-label", entry["labels"], path]
+        else:
+            cmd += ["--relations-with-type", entry["type"], path]
+    return cmd
+
+
+def restore_with_bulk_loader(snapshot_dir: Path, graph_name: str,
+                             host: str = "localhost", port: int = 6379) -> None:
+    manifest = load_manifest(snapshot_dir)
+    verify_snapshot(snapshot_dir, manifest, "csv")
+
+    if shutil.which("falkordb-bulk-insert") is None:
+        raise SnapshotError("falkordb-bulk-insert not found. Run: pip install falkordb-bulk-loader")
+
+    cmd = bulk_insert_command(snapshot_dir, manifest, graph_name, f"redis://{host}:{port}")
+    print(f"Running falkordb-bulk-insert ({len(manifest['files'])} files)...")
+    subprocess.run(cmd, check=True)
+
+    if manifest["counts"]["nodes_by_label"].get(UNLABELED):
+        from falkordb import FalkorDB
+        graph = FalkorDB(host=host, port=port).select_graph(graph_name)
+        graph.query(f"MATCH (n:{UNLABELED}) REMOVE n:{UNLABELED}")
+        print(f"✓ Removed placeholder label {UNLABELED}")
+
+
+# ============================================================================
+# JSONL Restore (batched UNWIND)
+# ============================================================================
+
+def _read_jsonl(path: Path) -> Iterator[dict]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _load_bucketed(records: Iterator[dict], group_key: Callable[[dict], Any],
+                   flush: Callable[[Any, List[dict]], None], batch_size: int) -> int:
+    """Bucket records by group (label / rel type) and flush each bucket in batches.
+
+    Records whose group is None are dropped. Returns the number of records flushed.
+    """
+    buckets: Dict[Any, List[dict]] = {}
+    loaded = 0
+    for record in records:
+        group = group_key(record)
+        if group is None:
+            continue
+        bucket = buckets.setdefault(group, [])
+        bucket.append(record)
+        if len(bucket) >= batch_size:
+            flush(group, bucket)
+            loaded += len(bucket)
+            buckets[group] = []
+    for group, bucket in buckets.items():
+        if bucket:
+            flush(group, bucket)
+            loaded += len(bucket)
+    return loaded
+
+
+def restore_from_jsonl(snapshot_dir: Path, graph_name: str, host: str = "localhost",
+                       port: int = 6379, batch_size: int = 1000) -> Dict[str, int]:
+    """Load nodes.jsonl / edges.jsonl with one UNWIND query per batch."""
+    from falkordb import FalkorDB
+
+    manifest = load_manifest(snapshot_dir)
+    verify_snapshot(snapshot_dir, manifest, "jsonl")
+    graph = FalkorDB(host=host, port=port).select_graph(graph_name)
+
+    # Index the temporary join key on every label combination we are about to create
+    label_keys = list(manifest["counts"]["nodes_by_label"].keys())
+    for key in label_keys:
+        first_label = key.split(":")[0]
+        try:
+            graph.query(f"CREATE INDEX FOR (n:{_quote(first_label)}) ON (n.{SNAPSHOT_ID_PROP})")
+        except Exception:
+            pass  # index already exists
+
+    print("Importing nodes...")
+    node_labels: Dict[int, str] = {}
+
+    def create_nodes(key: str, batch: List[dict]) -> None:
+        graph.query(
+            f"UNWIND $rows AS row CREATE (n{_labels_clause(key)}) "
+            f"SET n = row.props, n.{SNAPSHOT_ID_PROP} = row.id",
+            {"rows": [{"id": r["id"], "props": r["properties"]} for r in batch]},
+        )
+        for r in batch:
+            node_labels[r["id"]] = key.split(":")[0]
+
+    nodes_created = _load_bucketed(
+        _read_jsonl(snapshot_dir / "nodes.jsonl"),
+        lambda r: label_key(r["labels"]),
+        create_nodes,
+        batch_size,
+    )
+    print(f"✓ Imported {nodes_created} nodes")
+
+    print("Importing relationships...")
+    skipped = 0
+
+    def edge_group(r):
+        nonlocal skipped
+        src_label, dst_label = node_labels.get(r["src"]), node_labels.get(r["dst"])
+        if src_label is None or dst_label is None:
+            skipped += 1
+            return None
+        return (r["type"], src_label, dst_label)
+
+    def create_edges(group, batch: List[dict]) -> None:
+        rel_type, src_label, dst_label = group
+        graph.query(
+            f"UNWIND $rows AS row "
+            f"MATCH (a:{_quote(src_label)} {{{SNAPSHOT_ID_PROP}: row.src}}) "
+            f"MATCH (b:{_quote(dst_label)} {{{SNAPSHOT_ID_PROP}: row.dst}}) "
+            f"CREATE (a)-[r:{_quote(rel_type)}]->(b) SET r = row.props",
+            {"rows": [{"src": r["src"], "dst": r["dst"], "props": r["properties"]} for r in batch]},
+        )
+
+    edges_created = _load_bucketed(
+        _read_jsonl(snapshot_dir / "edges.jsonl"), edge_group, create_edges, batch_size,
+    )
+    print(f"✓ Imported {edges_created} relationships")
+    if skipped:
+        print(f"  ⚠️  Skipped {skipped} relationships with endpoints outside the snapshot")
+
+    # Drop the temporary join key and placeholder label
+    graph.query(f"MATCH (n) WHERE n.{SNAPSHOT_ID_PROP} IS NOT NULL SET n.{SNAPSHOT_ID_PROP} = NULL")
+    if UNLABELED in label_keys:
+        graph.query(f"MATCH (n:{UNLABELED}) REMOVE n:{UNLABELED}")
+
+    return {"nodes": nodes_created, "edges": edges_created}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Restore a FalkorDB graph from a bulk snapshot")
+    parser.add_argument("snapshot_dir", type=Path, help="Directory written by export_graph_bulk.py")
+    parser.add_argument("graph_name", help="Target FalkorDB graph name")
+    parser.add_argument("--mode", choices=["csv", "jsonl"], default="csv",
+                        help="csv = falkordb-bulk-insert (new graph only), jsonl = batched UNWIND")
+    parser.add_argument("--host", default="localhost", help="FalkorDB host (default: localhost)")
+    parser.add_argument("--port", type=int, default=6379, help="FalkorDB port (default: 6379)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per UNWIND query (jsonl mode)")
+    args = parser.parse_args()
+
+    try:
+        if args.mode == "csv":
+            restore_with_bulk_loader(args.snapshot_dir, args.graph_name, args.host, args.port)
+        else:
+            restore_from_jsonl(args.snapshot_dir, args.graph_name, args.host, args.port, args.batch_size)
+    except SnapshotError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"\n✅ Restore complete: {args.graph_name}")
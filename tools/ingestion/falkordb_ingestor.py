@@ -8,18 +8,20 @@ Author: Kai (Chief Engineer, GraphCare)
 Created: 2025-11-04
 """
 
+import hashlib
 import json
 import sys
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
-from datetime import datetime
 import logging
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from services.embedding.embedding_service import get_embedding_service
+from tools.extractors.extraction_stream import iter_extraction_files, read_extraction_meta
+from tools.graph_delta import now_ms, record_tombstone
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -63,8 +65,21 @@ def get_falkordb_connection(graph_name: str, host: str = 'localhost', port: int
 # Node Creation
 # ============================================================================
 
-def create_code_artifact_node(
-    graph,
+# Properties written when an artifact is first created (MERGE ... ON CREATE)
+ARTIFACT_CREATE_PROPS = [
+    'name', 'description', 'type_name', 'level', 'scope_ref',
+    'created_at', 'updated_at', 'valid_from', 'language', 'visibility'
+]
+
+# Properties written on every ingest when present (ON CREATE and ON MATCH)
+# `calls` (JSON list, functions only) lets incremental sync re-link callers without re-extracting them
+ARTIFACT_OPTIONAL_PROPS = [
+    'lines_of_code', 'complexity', 'is_method', 'parent_class', 'embedding', 'embedding_dim', 'content_hash',
+    'calls'
+]
+
+
+def build_artifact_properties(
     path: str,
     name: str,
     description: str,
@@ -75,30 +90,12 @@ def create_code_artifact_node(
     is_method: bool = False,
     parent_class: Optional[str] = None,
     embedding: Optional[List[float]] = None,
-    extra_properties: Optional[Dict[str, Any]] = None
-) -> str:
-    """
-    Create U4_Code_Artifact node in FalkorDB.
-
-    Args:
-        graph: FalkorDB graph connection
-        path: Code path (file::class::function format)
-        name: Artifact name (function/class name)
-        description: Human-readable description
-        scope_ref: Client organization ID (e.g., "org_scopelock")
-        language: Programming language
-        lines_of_code: Optional LOC count
-        complexity: Optional cyclomatic complexity
-        is_method: Whether this is a method (inside class)
-        parent_class: Parent class name if method
-        embedding: Optional 768-dim embedding vector
-        extra_properties: Optional additional properties
-
-    Returns:
-        Node ID (path)
-    """
+    extra_properties: Optional[Dict[str, Any]] = None,
+    content_hash: Optional[str] = None
+) -> Dict[str, Any]:
+    """Build the full property map for a U4_Code_Artifact node."""
     # Current timestamp
-    now = int(datetime.utcnow().timestamp() * 1000)
+    now = now_ms()
 
     # Build properties
     properties = {
@@ -128,41 +125,81 @@ def create_code_artifact_node(
         # Store embedding as string (FalkorDB doesn't support array properties natively)
         properties['embedding'] = json.dumps(embedding)
         properties['embedding_dim'] = len(embedding)
+    if content_hash:
+        properties['content_hash'] = content_hash
 
     # Add extra properties
     if extra_properties:
         properties.update(extra_properties)
 
+    return properties
+
+
+def _artifact_set_maps(properties: Dict[str, Any]) -> Tuple[Dict[str, Any], Dict[str, Any]]:
+    """Split artifact properties into (ON CREATE, ON MATCH) property maps."""
+    optional = {prop: properties[prop] for prop in ARTIFACT_OPTIONAL_PROPS if prop in properties}
+    on_create = {prop: properties[prop] for prop in ARTIFACT_CREATE_PROPS}
+    on_create.update(optional)
+    # valid_to = null revives an artifact that was soft-deleted and has come back
+    on_match = {'updated_at': properties['updated_at'], 'valid_to': None, **optional}
+    return on_create, on_match
+
+
+def create_code_artifact_node(
+    graph,
+    path: str,
+    name: str,
+    description: str,
+    scope_ref: str,
+    language: str,
+    lines_of_code: Optional[int] = None,
+    complexity: Optional[int] = None,
+    is_method: bool = False,
+    parent_class: Optional[str] = None,
+    embedding: Optional[List[float]] = None,
+    extra_properties: Optional[Dict[str, Any]] = None,
+    content_hash: Optional[str] = None
+) -> str:
+    """
+    Create U4_Code_Artifact node in FalkorDB.
+
+    Args:
+        graph: FalkorDB graph connection
+        path: Code path (file::class::function format)
+        name: Artifact name (function/class name)
+        description: Human-readable description
+        scope_ref: Client organization ID (e.g., "org_scopelock")
+        language: Programming language
+        lines_of_code: Optional LOC count
+        complexity: Optional cyclomatic complexity
+        is_method: Whether this is a method (inside class)
+        parent_class: Parent class name if method
+        embedding: Optional 768-dim embedding vector
+        extra_properties: Optional additional properties
+        content_hash: Optional artifact_content_hash() for change detection
+
+    Returns:
+        Node ID (path)
+    """
+    properties = build_artifact_properties(
+        path, name, description, scope_ref, language, lines_of_code, complexity,
+        is_method, parent_class, embedding, extra_properties, content_hash
+    )
+
+    on_create, on_match = _artifact_set_maps(properties)
+
     # Build Cypher MERGE query (idempotent)
     # Use path as unique identifier
-    cypher = f"""
-    MERGE (artifact:U4_Code_Artifact {{path: $path}})
-    ON CREATE SET
-        artifact.name = $name,
-        artifact.description = $description,
-        artifact.type_name = $type_name,
-        artifact.level = $level,
-        artifact.scope_ref = $scope_ref,
-        artifact.created_at = $created_at,
-        artifact.updated_at = $updated_at,
-        artifact.valid_from = $valid_from,
-        artifact.language = $language,
-        artifact.visibility = $visibility
-    ON MATCH SET
-        artifact.updated_at = $updated_at
-    """
-
-    # Add optional properties to SET clause
-    optional_props = ['lines_of_code', 'complexity', 'is_method', 'parent_class', 'embedding', 'embedding_dim']
-    for prop in optional_props:
-        if prop in properties:
-            cypher += f",\n        artifact.{prop} = ${prop}"
-
-    cypher += "\n    RETURN artifact.path as node_id"
+    cypher = """
+    MERGE (artifact:U4_Code_Artifact {path: $path})
+    ON CREATE SET artifact += $on_create
+    ON MATCH SET artifact += $on_match
+    RETURN artifact.path as node_id
+    """
 
     # Execute query
     try:
-        result = graph.query(cypher, properties)
+        result = graph.query(cypher, {'path': path, 'on_create': on_create, 'on_match': on_match})
         node_id = result.result_set[0][0] if result.result_set else path
         return node_id
 
@@ -172,6 +209,37 @@ def create_code_artifact_node(
         raise
 
 
+def upsert_code_artifact_batch(graph, properties_list: List[Dict[str, Any]]) -> int:
+    """
+    Upsert many U4_Code_Artifact nodes in one UNWIND query.
+
+    Same ON CREATE / ON MATCH semantics as create_code_artifact_node().
+
+    Args:
+        graph: FalkorDB graph connection
+        properties_list: Property maps from build_artifact_properties()
+
+    Returns:
+        Number of artifacts written
+    """
+    if not properties_list:
+        return 0
+
+    rows = []
+    for properties in properties_list:
+        on_create, on_match = _artifact_set_maps(properties)
+        rows.append({'path': properties['path'], 'on_create': on_create, 'on_match': on_match})
+
+    cypher = """
+    UNWIND $rows AS row
+    MERGE (artifact:U4_Code_Artifact {path: row.path})
+    ON CREATE SET artifact += row.on_create
+    ON MATCH SET artifact += row.on_match
+    """
+    graph.query(cypher, {'rows': rows})
+    return len(rows)
+
+
 def create_relationship_link(
     graph,
     source_path: str,
@@ -194,7 +262,7 @@ def create_relationship_link(
     Returns:
         True if successful
     """
-    now = int(datetime.utcnow().timestamp() * 1000)
+    now = now_ms()
 
     # Build link properties
     link_props = {
@@ -236,6 +304,400 @@ def create_relationship_link(
         return False
 
 
+# ============================================================================
+# Artifact Building (shared by the serial ingestor and ingest_pipeline.py)
+# ============================================================================
+
+def function_path(file_path: str, func: Dict[str, Any]) -> str:
+    """Artifact path for a function (file::class::function or file::function)."""
+    if func.get("is_method") and func.get("parent_class"):
+        return f"{file_path}::{func['parent_class']}::{func['name']}"
+    return f"{file_path}::{func['name']}"
+
+
+def function_artifact(file_path: str, func: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Describe a function from the extraction JSON as an artifact.
+
+    Returns:
+        {'path', 'description', 'snippet' (text to embed), 'fields' (create_code_artifact_node kwargs)}
+    """
+    artifact_path = function_path(file_path, func)
+
+    # Build description
+    desc_parts = []
+    if func.get("docstring"):
+        desc_parts.append(func["docstring"].split("\n")[0][:200])  # First line, max 200 chars
+    if func.get("parameters"):
+        params = ", ".join(func["parameters"])
+        desc_parts.append(f"Parameters: {params}")
+    description = ". ".join(desc_parts) if desc_parts else f"Function: {func['name']}"
+
+    # Build code snippet for embedding (signature + docstring)
+    code_snippet = f"def {func['name']}({', '.join(func['parameters'])})"
+    if func.get("return_type"):
+        code_snippet += f" -> {func['return_type']}"
+    if func.get("docstring"):
+        code_snippet += f":\n    \"\"\"{func['docstring'][:300]}\"\"\""
+
+    # Calculate LOC (approximation from line_start/line_end)
+    loc = func['line_end'] - func['line_start'] + 1 if func.get('line_end') else None
+
+    return {
+        'path': artifact_path,
+        'description': description,
+        'snippet': code_snippet,
+        'fields': {
+            'path': artifact_path,
+            'name': func['name'],
+            'description': description,
+            'lines_of_code': loc,
+            'complexity': func.get('complexity'),
+            'is_method': func.get('is_method', False),
+            'parent_class': func.get('parent_class'),
+            'extra_properties': {
+                'is_async': func.get('is_async', False),
+                'decorators': json.dumps(func.get('decorators', [])),
+                'parameters': json.dumps(func.get('parameters', [])),
+                'return_type': func.get('return_type', ''),
+                'calls': json.dumps(func.get('calls', []))
+            }
+        }
+    }
+
+
+def class_artifact(file_path: str, cls: Dict[str, Any]) -> Dict[str, Any]:
+    """Describe a class from the extraction JSON as an artifact (see function_artifact)."""
+    # Build path (file::class)
+    artifact_path = f"{file_path}::{cls['name']}"
+
+    # Build description
+    desc_parts = []
+    if cls.get("docstring"):
+        desc_parts.append(cls["docstring"].split("\n")[0][:200])
+    if cls.get("bases"):
+        desc_parts.append(f"Inherits from: {', '.join(cls['bases'])}")
+    description = ". ".join(desc_parts) if desc_parts else f"Class: {cls['name']}"
+
+    # Build code snippet
+    code_snippet = f"class {cls['name']}"
+    if cls.get("bases"):
+        code_snippet += f"({', '.join(cls['bases'])})"
+    if cls.get("docstring"):
+        code_snippet += f":\n    \"\"\"{cls['docstring'][:300]}\"\"\""
+
+    # Calculate LOC
+    loc = cls['line_end'] - cls['line_start'] + 1 if cls.get('line_end') else None
+
+    return {
+        'path': artifact_path,
+        'description': description,
+        'snippet': code_snippet,
+        'fields': {
+            'path': artifact_path,
+            'name': cls['name'],
+            'description': description,
+            'lines_of_code': loc,
+            'extra_properties': {
+                'bases': json.dumps(cls.get('bases', [])),
+                'decorators': json.dumps(cls.get('decorators', [])),
+                'methods': json.dumps(cls.get('methods', [])),
+                'attributes': json.dumps(cls.get('attributes', []))
+            }
+        }
+    }
+
+
+class FunctionIndex:
+    """
+    Function name → artifact paths, for resolving U4_CALLS targets.
+
+    A call `foo` or `obj.foo` links to every function named `foo`
+    (simple heuristic; real resolution would need imports / namespaces).
+    """
+
+    def __init__(self):
+        self._by_name: Dict[str, List[str]] = {}
+
+    def add(self, file_path: str, func: Dict[str, Any]) -> None:
+        self.add_path(function_path(file_path, func))
+
+    def add_path(self, artifact_path: str) -> None:
+        """Index a function by its artifact path (the name is the last path segment)."""
+        self._by_name.setdefault(artifact_path.rsplit("::", 1)[1], []).append(artifact_path)
+
+    def resolve(self, called_func: str) -> List[str]:
+        targets = list(self._by_name.get(called_func, []))
+        if "." in called_func:
+            targets += self._by_name.get(called_func.rsplit(".", 1)[1], [])
+        return targets
+
+
+def create_call_links_batch(graph, links: List[Tuple[str, str]], confidence: float = 1.0) -> int:
+    """Create U4_CALLS links for (source_path, target_path) pairs in one UNWIND query."""
+    if not links:
+        return 0
+
+    now = now_ms()
+    cypher = """
+    UNWIND $rows AS row
+    MATCH (source:U4_Code_Artifact {path: row.source})
+    MATCH (target:U4_Code_Artifact {path: row.target})
+    MERGE (source)-[r:U4_CALLS]->(target)
+    ON CREATE SET
+        r.confidence = $confidence,
+        r.created_at = $now,
+        r.valid_from = $now
+    RETURN count(r)
+    """
+    result = graph.query(cypher, {
+        'rows': [{'source': source, 'target': target} for source, target in links],
+        'confidence': confidence,
+        'now': now
+    })
+    return result.result_set[0][0] if result.result_set else 0
+
+
+# ============================================================================
+# Change Detection (content_hash)
+# ============================================================================
+
+def content_hash(payload: Dict[str, Any]) -> str:
+    """sha256 of a canonical JSON encoding of `payload`."""
+    encoded = json.dumps(payload, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+
+def artifact_content_hash(artifact: Dict[str, Any], scope_ref: str, language: str, embedded: bool) -> str:
+    """
+    Hash everything that determines what an artifact ingest would write.
+
+    Covers the node properties and the embedding input, plus whether an embedding
+    is generated at all, so switching --no-embeddings off re-ingests everything.
+    """
+    return content_hash({
+        'fields': artifact['fields'],
+        'snippet': artifact['snippet'],
+        'scope_ref': scope_ref,
+        'language': language,
+        'embedded': embedded
+    })
+
+
+# path -> (content_hash, valid_to); valid_to is set on soft-deleted artifacts
+ExistingArtifacts = Dict[str, Tuple[Optional[str], Optional[int]]]
+
+
+def fetch_artifact_hashes(graph, scope_ref: str) -> ExistingArtifacts:
+    """Fetch (path, content_hash, valid_to) for every artifact in scope, in one query."""
+    result = graph.query(
+        """
+        MATCH (artifact:U4_Code_Artifact {scope_ref: $scope_ref})
+        RETURN artifact.path, artifact.content_hash, artifact.valid_to
+        """,
+        {'scope_ref': scope_ref}
+    )
+    return {path: (hash_, valid_to) for path, hash_, valid_to in result.result_set}
+
+
+def fetch_function_calls(graph, scope_ref: str) -> Dict[str, List[str]]:
+    """
+    Fetch path → called names for every live function artifact in scope, in one query.
+
+    Only artifacts ingested with the `calls` property are returned (classes and
+    artifacts from other extractors have none).
+    """
+    result = graph.query(
+        """
+        MATCH (artifact:U4_Code_Artifact {scope_ref: $scope_ref})
+        WHERE artifact.calls IS NOT NULL AND artifact.valid_to IS NULL
+        RETURN artifact.path, artifact.calls
+        """,
+        {'scope_ref': scope_ref}
+    )
+    return {path: json.loads(calls) for path, calls in result.result_set}
+
+
+def is_unchanged(existing: ExistingArtifacts, path: str, hash_: str) -> bool:
+    """True if the artifact is live in the graph with the same content_hash."""
+    current = existing.get(path)
+    return current is not None and current[0] == hash_ and current[1] is None
+
+
+def find_stale_artifacts(
+    existing: ExistingArtifacts,
+    file_paths: List[str],
+    live_paths: set,
+    include_retired: bool = False,
+    root: Optional[str] = None,
+    extracted_files: Optional[List[str]] = None,
+    suffixes: Tuple[str, ...] = ('.py',)
+) -> List[str]:
+    """
+    Artifacts that no longer exist in the source.
+
+    Files re-extracted here (`file_paths`) lose the artifacts not in `live_paths`.
+    After a full extraction of `root`, pass every file it covered as
+    `extracted_files` (parse errors included): a file under `root` ending in one
+    of `suffixes` that is not among them was deleted, and all its artifacts are
+    stale. Artifacts of other files (not re-extracted, other repositories or
+    languages in the scope) are left alone. Already soft-deleted artifacts are
+    skipped unless `include_retired`.
+    """
+    files = set(file_paths)
+    extracted = set(extracted_files) if root is not None and extracted_files is not None else None
+    prefix = root.rstrip("/") + "/" if root not in (None, "", ".") else ""
+
+    def deleted(file_path: str) -> bool:
+        if extracted is None or file_path in extracted or not file_path.endswith(suffixes):
+            return False
+        # Relative roots ("." included) give relative file keys
+        return file_path.startswith(prefix) if prefix else not file_path.startswith("/")
+
+    stale = []
+    for path, (_, valid_to) in existing.items():
+        if valid_to is not None and not include_retired:
+            continue
+        file_path = path.split("::", 1)[0]
+        if (file_path in files and path not in live_paths) or deleted(file_path):
+            stale.append(path)
+    return sorted(stale)
+
+
+def soft_delete_artifacts(graph, paths: List[str]) -> int:
+    """Mark artifacts as no longer valid (valid_to = now) without deleting them."""
+    if not paths:
+        return 0
+
+    now = now_ms()
+    graph.query(
+        """
+        UNWIND $paths AS path
+        MATCH (artifact:U4_Code_Artifact {path: path})
+        SET artifact.valid_to = $now, artifact.updated_at = $now
+        """,
+        {'paths': paths, 'now': now}
+    )
+    return len(paths)
+
+
+# ============================================================================
+# Deletion (tombstoned for delta export)
+# ============================================================================
+
+def _artifact_ref(path: str) -> Dict[str, Any]:
+    return {'labels': ['U4_Code_Artifact'], 'key': 'path', 'value': path}
+
+
+def delete_code_artifact_node(graph, path: str, scope_ref: Optional[str] = None) -> bool:
+    """
+    Delete a U4_Code_Artifact node (and its links) and record a tombstone.
+
+    Args:
+        graph: FalkorDB graph connection
+        path: Artifact path
+        scope_ref: Client organization ID, stored on the tombstone
+
+    Returns:
+        True if a node was deleted
+    """
+    result = graph.query(
+        "MATCH (artifact:U4_Code_Artifact {path: $path}) DETACH DELETE artifact",
+        {'path': path}
+    )
+    if not result.nodes_deleted:
+        return False
+
+    record_tombstone(graph, _artifact_ref(path), scope_ref=scope_ref)
+    return True
+
+
+def delete_relationship_link(
+    graph,
+    source_path: str,
+    target_path: str,
+    link_type: str,
+    scope_ref: Optional[str] = None
+) -> bool:
+    """
+    Delete a relationship link between code artifacts and record a tombstone.
+
+    Returns:
+        True if a link was deleted
+    """
+    cypher = f"""
+    MATCH (source:U4_Code_Artifact {{path: $source_path}})-[r:{link_type}]->(target:U4_Code_Artifact {{path: $target_path}})
+    DELETE r
+    """
+    result = graph.query(cypher, {'source_path': source_path, 'target_path': target_path})
+    if not result.relationships_deleted:
+        return False
+
+    record_tombstone(
+        graph, _artifact_ref(source_path),
+        rel_type=link_type, target_ref=_artifact_ref(target_path), scope_ref=scope_ref
+    )
+    return True
+
+
+def detach_artifact_links(
+    graph,
+    paths: List[str],
+    link_types: Tuple[str, ...] = ('U4_CALLS', 'U4_DEPENDS_ON'),
+    outgoing_only: bool = False,
+    scope_ref: Optional[str] = None
+) -> int:
+    """
+    Delete links touching the given artifacts and record a tombstone per link.
+
+    Args:
+        graph: FalkorDB graph connection
+        paths: Artifact paths
+        link_types: Relationship types to delete
+        outgoing_only: Only delete links whose source is one of `paths`
+        scope_ref: Client organization ID, stored on the tombstones
+
+    Returns:
+        Number of links deleted
+    """
+    if not paths:
+        return 0
+
+    types = "|".join(link_types)
+    patterns = [f"(source:U4_Code_Artifact {{path: path}})-[r:{types}]->(target:U4_Code_Artifact)"]
+    if not outgoing_only:
+        patterns.append(f"(source:U4_Code_Artifact)-[r:{types}]->(target:U4_Code_Artifact {{path: path}})")
+
+    links = set()
+    for pattern in patterns:
+        result = graph.query(
+            f"UNWIND $paths AS path MATCH {pattern} RETURN source.path, type(r), target.path",
+            {'paths': paths}
+        )
+        links.update(tuple(row) for row in result.result_set)
+
+    deleted = 0
+    for source_path, link_type, target_path in sorted(links):
+        if delete_relationship_link(graph, source_path, target_path, link_type, scope_ref=scope_ref):
+            deleted += 1
+    return deleted
+
+
+def prune_stale_artifacts(graph, scope_ref: str, stale_paths: List[str]) -> int:
+    """
+    Hard-delete stale artifacts (see find_stale_artifacts), recording tombstones.
+
+    Returns:
+        Number of artifacts deleted
+    """
+    pruned = 0
+    for path in stale_paths:
+        if delete_code_artifact_node(graph, path, scope_ref=scope_ref):
+            logger.info(f"  🗑️  Pruned: {path}")
+            pruned += 1
+    return pruned
+
+
 # ============================================================================
 # Ingestion Pipeline
 # ============================================================================
@@ -248,6 +710,9 @@ class IngestionStats:
     embeddings_generated: int = 0
     calls_linked: int = 0
     imports_linked: int = 0
+    artifacts_unchanged: int = 0
+    artifacts_retired: int = 0
+    artifacts_pruned: int = 0
     errors: int = 0
 
 
@@ -258,28 +723,35 @@ def ingest_extraction_results(
     language: str,
     generate_embeddings: bool = True,
     falkordb_host: str = 'localhost',
-    falkordb_port: int = 6379
+    falkordb_port: int = 6379,
+    prune: bool = False
 ) -> IngestionStats:
     """
     Ingest extraction results into FalkorDB.
 
     Args:
-        extraction_json_path: Path to extraction JSON from python_ast_extractor.py
+        extraction_json_path: Path to extraction output from python_ast_extractor.py
+            (JSONL, read one file at a time, or legacy JSON)
         graph_name: FalkorDB graph name (e.g., "scopelock")
         scope_ref: Client organization ID (e.g., "org_scopelock")
         language: Programming language (e.g., "python")
         generate_embeddings: Whether to generate semantic embeddings
         falkordb_host: FalkorDB host (default: 'localhost', prod: 'mindprotocol.onrender.com')
         falkordb_port: FalkorDB port (default: 6379)
+        prune: Hard-delete (and tombstone) artifacts that no longer exist, instead
+            of soft-deleting them (valid_to)
+
+    Artifacts whose content_hash matches the graph are skipped entirely (no
+    embedding, no write), so re-ingesting an unchanged repository costs one read.
+    The extraction covers the whole repository, so artifacts of files deleted
+    from it are retired along with those removed from re-extracted files.
 
     Returns:
         IngestionStats with counts
     """
     stats = IngestionStats()
 
-    # Load extraction results
-    logger.info(f"Loading extraction results from: {extraction_json_path}")
-    extraction_data = json.loads(extraction_json_path.read_text(encoding="utf-8"))
+    logger.info(f"Reading extraction results from: {extraction_json_path}")
 
     # Connect to FalkorDB
     graph = get_falkordb_connection(graph_name, host=falkordb_host, port=falkordb_port)
@@ -290,76 +762,74 @@ def ingest_extraction_results(
         logger.info("Initializing embedding service...")
         embedding_service = get_embedding_service()
 
+    # One read up front: what is already in the graph, and with which content
+    existing = fetch_artifact_hashes(graph, scope_ref)
+    logger.info(f"Found {len(existing)} existing artifacts in scope {scope_ref}")
+
+    # Paths seen in this extraction, ingested or not (used for stale detection)
+    live_paths = set()
+    # Paths written in this run (U4_CALLS only need refreshing around these)
+    changed_paths = set()
+    # Kept from the single pass over the extraction for linking: (function path, calls)
+    function_index = FunctionIndex()
+    function_calls: List[Tuple[str, List[str]]] = []
+    # Files with parse errors are skipped below, so their artifacts are not stale
+    parsed_files = []
+    # Every file in the extraction: artifacts of other files under the repo were deleted
+    extracted_files = []
+    repo_root = read_extraction_meta(extraction_json_path)["repo_path"]
+
     # Process each file
-    for file_path, file_data in extraction_data["files"].items():
+    for file_path, file_data in iter_extraction_files(extraction_json_path):
         logger.info(f"\nProcessing: {file_path}")
+        extracted_files.append(file_path)
+
+        for func in file_data["functions"]:
+            function_index.add(file_path, func)
+            function_calls.append((function_path(file_path, func), func.get("calls", [])))
 
         # Skip files with parse errors
         if file_data.get("parse_errors"):
             logger.warning(f"  ⚠️  Skipping (parse errors): {file_data['parse_errors']}")
             stats.errors += 1
             continue
+        parsed_files.append(file_path)
 
         # Ingest functions
         for func in file_data["functions"]:
             try:
-                # Build path (file::class::function or file::function)
-                if func.get("is_method") and func.get("parent_class"):
-                    artifact_path = f"{file_path}::{func['parent_class']}::{func['name']}"
-                else:
-                    artifact_path = f"{file_path}::{func['name']}"
-
-                # Build description
-                desc_parts = []
-                if func.get("docstring"):
-                    desc_parts.append(func["docstring"].split("\n")[0][:200])  # First line, max 200 chars
-                if func.get("parameters"):
-                    params = ", ".join(func["parameters"])
-                    desc_parts.append(f"Parameters: {params}")
-                description = ". ".join(desc_parts) if desc_parts else f"Function: {func['name']}"
+                artifact = function_artifact(file_path, func)
+                artifact_path = artifact['path']
+                live_paths.add(artifact_path)
+
+                # Skip unchanged artifacts (no embedding, no write)
+                artifact_hash = artifact_content_hash(artifact, scope_ref, language, embedding_service is not None)
+                if is_unchanged(existing, artifact_path, artifact_hash):
+                    stats.artifacts_unchanged += 1
+                    continue
 
                 # Generate embedding
                 embedding = None
                 if embedding_service:
-                    # Build code snippet for embedding (signature + docstring)
-                    code_snippet = f"def {func['name']}({', '.join(func['parameters'])})"
-                    if func.get("return_type"):
-                        code_snippet += f" -> {func['return_type']}"
-                    if func.get("docstring"):
-                        code_snippet += f":\n    \"\"\"{func['docstring'][:300]}\"\"\""
-
                     metadata = {
                         'path': artifact_path,
                         'lang': language,
-                        'description': description
+                        'description': artifact['description']
                     }
 
-                    _, embedding = embedding_service.embed_code_artifact(code_snippet, metadata)
+                    _, embedding = embedding_service.embed_code_artifact(artifact['snippet'], metadata)
                     stats.embeddings_generated += 1
 
-                # Calculate LOC (approximation from line_start/line_end)
-                loc = func['line_end'] - func['line_start'] + 1 if func.get('line_end') else None
-
                 # Create node
                 create_code_artifact_node(
                     graph=graph,
-                    path=artifact_path,
-                    name=func['name'],
-                    description=description,
                     scope_ref=scope_ref,
                     language=language,
-                    lines_of_code=loc,
-                    complexity=func.get('complexity'),
-                    is_method=func.get('is_method', False),
-                    parent_class=func.get('parent_class'),
                     embedding=embedding,
-                    extra_properties={
-                        'is_async': func.get('is_async', False),
-                        'decorators': json.dumps(func.get('decorators', [])),
-                        'parameters': json.dumps(func.get('parameters', [])),
-                        'return_type': func.get('return_type', '')
-                    }
+                    content_hash=artifact_hash,
+                    **artifact['fields']
                 )
+                changed_paths.add(artifact_path)
 
                 stats.functions_ingested += 1
                 logger.info(f"  ✅ Function: {artifact_path}")
@@ -371,56 +841,38 @@ def ingest_extraction_results(
         # Ingest classes
         for cls in file_data["classes"]:
             try:
-                # Build path (file::class)
-                artifact_path = f"{file_path}::{cls['name']}"
+                artifact = class_artifact(file_path, cls)
+                artifact_path = artifact['path']
+                live_paths.add(artifact_path)
 
-                # Build description
-                desc_parts = []
-                if cls.get("docstring"):
-                    desc_parts.append(cls["docstring"].split("\n")[0][:200])
-                if cls.get("bases"):
-                    desc_parts.append(f"Inherits from: {', '.join(cls['bases'])}")
-                description = ". ".join(desc_parts) if desc_parts else f"Class: {cls['name']}"
+                # Skip unchanged artifacts (no embedding, no write)
+                artifact_hash = artifact_content_hash(artifact, scope_ref, language, embedding_service is not None)
+                if is_unchanged(existing, artifact_path, artifact_hash):
+                    stats.artifacts_unchanged += 1
+                    continue
 
                 # Generate embedding
                 embedding = None
                 if embedding_service:
-                    # Build code snippet
-                    code_snippet = f"class {cls['name']}"
-                    if cls.get("bases"):
-                        code_snippet += f"({', '.join(cls['bases'])})"
-                    if cls.get("docstring"):
-                        code_snippet += f":\n    \"\"\"{cls['docstring'][:300]}\"\"\""
-
                     metadata = {
                         'path': artifact_path,
                         'lang': language,
-                        'description': description
+                        'description': artifact['description']
                     }
 
-                    _, embedding = embedding_service.embed_code_artifact(code_snippet, metadata)
+                    _, embedding = embedding_service.embed_code_artifact(artifact['snippet'], metadata)
                     stats.embeddings_generated += 1
 
-                # Calculate LOC
-                loc = cls['line_end'] - cls['line_start'] + 1 if cls.get('line_end') else None
-
                 # Create node
                 create_code_artifact_node(
                     graph=graph,
-                    path=artifact_path,
-                    name=cls['name'],
-                    description=description,
                     scope_ref=scope_ref,
                     language=language,
-                    lines_of_code=loc,
                     embedding=embedding,
-                    extra_properties={
-                        'bases': json.dumps(cls.get('bases', [])),
-                        'decorators': json.dumps(cls.get('decorators', [])),
-                        'methods': json.dumps(cls.get('methods', [])),
-                        'attributes': json.dumps(cls.get('attributes', []))
-                    }
+                    content_hash=artifact_hash,
+                    **artifact['fields']
                 )
+                changed_paths.add(artifact_path)
 
                 stats.classes_ingested += 1
                 logger.info(f"  ✅ Class: {artifact_path}")
@@ -431,33 +883,30 @@ def ingest_extraction_results(
 
     # Second pass: Create U4_CALLS links
     logger.info("\n\nCreating U4_CALLS links...")
-    for file_path, file_data in extraction_data["files"].items():
-        for func in file_data["functions"]:
-            # Build source path
-            if func.get("is_method") and func.get("parent_class"):
-                source_path = f"{file_path}::{func['parent_class']}::{func['name']}"
-            else:
-                source_path = f"{file_path}::{func['name']}"
-
-            # Create links for each call
-            for called_func in func.get("calls", []):
-                # Try to find target function (simple heuristic: match by name)
-                # Real implementation would need better resolution (imports, namespaces)
-                for target_file, target_data in extraction_data["files"].items():
-                    for target_func in target_data["functions"]:
-                        if target_func["name"] == called_func or called_func.endswith(f".{target_func['name']}"):
-                            # Build target path
-                            if target_func.get("is_method") and target_func.get("parent_class"):
-                                target_path = f"{target_file}::{target_func['parent_class']}::{target_func['name']}"
-                            else:
-                                target_path = f"{target_file}::{target_func['name']}"
-
-                            # Create link
-                            if create_relationship_link(graph, source_path, target_path, "U4_CALLS"):
-                                stats.calls_linked += 1
+    for source_path, calls in function_calls:
+        # Create links for each call (links between two unchanged artifacts already exist)
+        for called_func in calls:
+            for target_path in function_index.resolve(called_func):
+                if source_path not in changed_paths and target_path not in changed_paths:
+                    continue
+                if create_relationship_link(graph, source_path, target_path, "U4_CALLS"):
+                    stats.calls_linked += 1
 
     logger.info(f"  ✅ Created {stats.calls_linked} U4_CALLS links")
 
+    if prune:
+        logger.info("\n\nPruning stale artifacts...")
+        stale = find_stale_artifacts(
+            existing, parsed_files, live_paths, include_retired=True, root=repo_root, extracted_files=extracted_files
+        )
+        stats.artifacts_pruned = prune_stale_artifacts(graph, scope_ref, stale)
+        logger.info(f"  ✅ Pruned {stats.artifacts_pruned} stale artifacts")
+    else:
+        stale = find_stale_artifacts(existing, parsed_files, live_paths, root=repo_root, extracted_files=extracted_files)
+        stats.artifacts_retired = soft_delete_artifacts(graph, stale)
+        if stale:
+            logger.info(f"  ✅ Soft-deleted {stats.artifacts_retired} removed artifacts (valid_to set)")
+
     return stats
 
 
@@ -469,13 +918,14 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Ingest code extraction results into FalkorDB")
-    parser.add_argument("extraction_json", type=Path, help="Path to extraction JSON file")
+    parser.add_argument("extraction_json", type=Path, help="Path to extraction output (JSONL or legacy JSON)")
     parser.add_argument("--graph", required=True, help="FalkorDB graph name (e.g., scopelock)")
     parser.add_argument("--scope", required=True, help="Client scope ref (e.g., org_scopelock)")
     parser.add_argument("--language", default="python", help="Programming language (default: python)")
     parser.add_argument("--no-embeddings", action="store_true", help="Skip embedding generation")
     parser.add_argument("--host", default="localhost", help="FalkorDB host (default: localhost, prod: mindprotocol.onrender.com)")
     parser.add_argument("--port", type=int, default=6379, help="FalkorDB port (default: 6379)")
+    parser.add_argument("--prune", action="store_true", help="Hard-delete artifacts no longer in the repository (tombstoned for delta export) instead of soft-deleting them")
 
     args = parser.parse_args()
 
@@ -498,7 +948,8 @@ if __name__ == "__main__":
         language=args.language,
         generate_embeddings=not args.no_embeddings,
         falkordb_host=args.host,
-        falkordb_port=args.port
+        falkordb_port=args.port,
+        prune=args.prune
     )
 
     print("=" * 80)
@@ -508,5 +959,10 @@ if __name__ == "__main__":
     print(f"  Embeddings generated: {stats.embeddings_generated}")
     print(f"  U4_CALLS links created: {stats.calls_linked}")
     print(f"  U4_DEPENDS_ON links created: {stats.imports_linked}")
+    print(f"  Unchanged (skipped): {stats.artifacts_unchanged}")
+    if args.prune:
+        print(f"  Stale artifacts pruned: {stats.artifacts_pruned}")
+    else:
+        print(f"  Removed artifacts soft-deleted: {stats.artifacts_retired}")
     print(f"  Errors: {stats.errors}")
     print("\n✅ Ingestion complete!")
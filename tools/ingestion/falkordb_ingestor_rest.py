@@ -14,13 +14,14 @@ import requests
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-from datetime import datetime
 import logging
 
 # Add parent directory to path for imports
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 from services.embedding.embedding_service import get_embedding_service
+from tools.extractors.extraction_stream import iter_extraction_files
+from tools.graph_delta import now_ms
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -119,7 +120,7 @@ def create_code_artifact_node(
     Returns:
         Node ID (path)
     """
-    now = int(datetime.utcnow().timestamp() * 1000)
+    now = now_ms()
 
     # Build properties
     properties = {
@@ -236,7 +237,7 @@ def create_relationship_link(
     Returns:
         True if successful
     """
-    now = int(datetime.utcnow().timestamp() * 1000)
+    now = now_ms()
 
     def escape(s):
         if s is None:
@@ -291,7 +292,7 @@ def ingest_extraction_results(
     Ingest extraction results via REST API.
 
     Args:
-        extraction_json_path: Path to extraction JSON
+        extraction_json_path: Path to extraction output (JSONL, read one file at a time, or legacy JSON)
         graph_name: FalkorDB graph name
         scope_ref: Client organization ID
         language: Programming language
@@ -302,9 +303,7 @@ def ingest_extraction_results(
     """
     stats = IngestionStats()
 
-    # Load extraction results
-    logger.info(f"Loading extraction results from: {extraction_json_path}")
-    extraction_data = json.loads(extraction_json_path.read_text(encoding="utf-8"))
+    logger.info(f"Reading extraction results from: {extraction_json_path}")
 
     # Initialize embedding service if needed
     embedding_service = None
@@ -312,10 +311,23 @@ def ingest_extraction_results(
         logger.info("Initializing embedding service...")
         embedding_service = get_embedding_service()
 
+    # Kept from the single pass for linking: (source path, calls), and the first
+    # function path seen for each name (in file order), which a call links to
+    function_calls = []
+    first_path_by_name: Dict[str, str] = {}
+
     # Process each file
-    for file_path, file_data in extraction_data["files"].items():
+    for file_path, file_data in iter_extraction_files(extraction_json_path):
         logger.info(f"\nProcessing: {file_path}")
 
+        for func in file_data["functions"]:
+            if func.get("is_method") and func.get("parent_class"):
+                func_path = f"{file_path}::{func['parent_class']}::{func['name']}"
+            else:
+                func_path = f"{file_path}::{func['name']}"
+            function_calls.append((func_path, func.get("calls", [])))
+            first_path_by_name.setdefault(func["name"], func_path)
+
         # Skip files with parse errors
         if file_data.get("parse_errors"):
             logger.warning(f"  ⚠️  Skipping (parse errors): {file_data['parse_errors']}")
@@ -450,41 +462,21 @@ def ingest_extraction_results(
 
     # Create call relationships
     logger.info("\n\nCreating U4_CALLS relationships...")
-    for file_path, file_data in extraction_data["files"].items():
-        for func in file_data["functions"]:
-            # Build source path
-            if func.get("is_method") and func.get("parent_class"):
-                source_path = f"{file_path}::{func['parent_class']}::{func['name']}"
-            else:
-                source_path = f"{file_path}::{func['name']}"
-
-            # Link calls
-            for call in func.get("calls", []):
-                # Try to find target in extraction data
-                target_path = None
-
-                # Search for function in all files
-                for search_file, search_data in extraction_data["files"].items():
-                    for search_func in search_data["functions"]:
-                        if search_func["name"] == call:
-                            if search_func.get("is_method") and search_func.get("parent_class"):
-                                target_path = f"{search_file}::{search_func['parent_class']}::{search_func['name']}"
-                            else:
-                                target_path = f"{search_file}::{search_func['name']}"
-                            break
-                    if target_path:
-                        break
-
-                if target_path:
-                    created = create_relationship_link(
-                        graph_name=graph_name,
-                        source_path=source_path,
-                        target_path=target_path,
-                        link_type="U4_CALLS",
-                        confidence=0.8  # Medium confidence (static analysis)
-                    )
-                    if created:
-                        stats.calls_linked += 1
+    for source_path, calls in function_calls:
+        # Link calls
+        for call in calls:
+            target_path = first_path_by_name.get(call)
+
+            if target_path:
+                created = create_relationship_link(
+                    graph_name=graph_name,
+                    source_path=source_path,
+                    target_path=target_path,
+                    link_type="U4_CALLS",
+                    confidence=0.8  # Medium confidence (static analysis)
+                )
+                if created:
+                    stats.calls_linked += 1
 
     return stats
 
@@ -497,7 +489,7 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Ingest code extraction results via REST API")
-    parser.add_argument("extraction_json", type=Path, help="Path to extraction JSON file")
+    parser.add_argument("extraction_json", type=Path, help="Path to extraction output (JSONL or legacy JSON)")
     parser.add_argument("--graph", required=True, help="FalkorDB graph name (e.g., scopelock)")
     parser.add_argument("--scope", required=True, help="Client scope ref (e.g., org_scopelock)")
     parser.add_argument("--language", default="python", help="Programming language (default: python)")
@@ -4,6 +4,7 @@ Import documentation structure to FalkorDB.
 Handles U4_Knowledge_Object nodes and U4_MEMBER_OF relationships.
 """
 
+import hashlib
 import json
 import sys
 import requests
@@ -39,6 +40,33 @@ def escape_string(s: str) -> str:
         return ""
     return s.replace("\\", "\\\\").replace("'", "\\'").replace('"', '\\"').replace("\n", "\\n")
 
+def knowledge_object_hash(node: dict) -> str:
+    """content_hash of a knowledge object: sha256 over its canonical properties."""
+    encoded = json.dumps(node['properties'], sort_keys=True, separators=(',', ':'))
+    return hashlib.sha256(encoded.encode('utf-8')).hexdigest()
+
+def fetch_knowledge_object_hashes(scope_refs: list) -> dict:
+    """Fetch {id: (content_hash, valid_to)} for knowledge objects in scope, in one query."""
+    scopes = ", ".join(f"'{escape_string(scope)}'" for scope in scope_refs)
+    result = execute_cypher(
+        f"MATCH (n:U4_Knowledge_Object) WHERE n.scope_ref IN [{scopes}] "
+        "RETURN n.id, n.content_hash, n.valid_to"
+    )
+    if not result['success']:
+        raise RuntimeError(f"Failed to fetch existing knowledge objects: {result['error']}")
+
+    rows = result['data'].get('result', [[], []])
+    rows = rows[1] if len(rows) >= 2 else []
+    return {row[0]: (row[1], row[2]) for row in rows}
+
+def soft_delete_knowledge_objects(ids: list) -> dict:
+    """Mark knowledge objects as no longer valid (valid_to = now) without deleting them."""
+    id_list = ", ".join(f"'{escape_string(node_id)}'" for node_id in ids)
+    return execute_cypher(
+        f"MATCH (n:U4_Knowledge_Object) WHERE n.id IN [{id_list}] "
+        "SET n.valid_to = timestamp(), n.updated_at = timestamp()"
+    )
+
 def create_knowledge_object_node(node: dict) -> str:
     """Generate Cypher for U4_Knowledge_Object node."""
     props = node['properties']
@@ -60,12 +88,14 @@ def create_knowledge_object_node(node: dict) -> str:
         content = escape_string(props['markdown_content'][:500])  # Limit size
         prop_parts.append(f"markdown_content: '{content}'")
 
+    prop_parts.append(f"content_hash: '{knowledge_object_hash(node)}'")
+
     props_str = ", ".join(prop_parts)
 
     cypher = f"""
     MERGE (n:U4_Knowledge_Object {{id: '{node['id']}'}})
-    ON CREATE SET n += {{{props_str}}}
-    ON MATCH SET n += {{{props_str}}}
+    ON CREATE SET n += {{{props_str}}}, n.created_at = timestamp(), n.updated_at = timestamp()
+    ON MATCH SET n += {{{props_str}}}, n.updated_at = timestamp(), n.valid_to = null
     """
 
     return cypher
@@ -85,6 +115,7 @@ def create_relationship(rel: dict) -> str:
     MATCH (source {{id: '{rel['source']}'}})
     MATCH (target {{id: '{rel['target']}'}})
     MERGE (source)-[r:U4_MEMBER_OF {{{props_str}}}]->(target)
+    ON CREATE SET r.created_at = timestamp()
     """
 
     return cypher
@@ -113,12 +144,25 @@ def main():
     print(f"  Relationships: {len(relationships)}")
     print()
 
+    # One read up front; unchanged knowledge objects are not rewritten
+    scope_refs = sorted({node['properties']['scope_ref'] for node in nodes})
+    existing = fetch_knowledge_object_hashes(scope_refs) if scope_refs else {}
+    print(f"Existing knowledge objects in scope: {len(existing)}")
+
     # Import nodes
     print("Creating U4_Knowledge_Object nodes...")
     nodes_created = 0
+    nodes_unchanged = 0
+    changed_ids = set()
     errors = 0
 
     for i, node in enumerate(nodes):
+        current = existing.get(node['id'])
+        if current is not None and current[0] == knowledge_object_hash(node) and current[1] is None:
+            nodes_unchanged += 1
+            continue
+
+        changed_ids.add(node['id'])
         cypher = create_knowledge_object_node(node)
         result = execute_cypher(cypher)
 
@@ -130,13 +174,31 @@ def main():
             errors += 1
             print(f"  ❌ Error creating node {node['id']}: {result['error']}")
 
-    print(f"✅ Nodes created: {nodes_created}/{len(nodes)}")
+    print(f"✅ Nodes created: {nodes_created}/{len(nodes)} ({nodes_unchanged} unchanged, skipped)")
+
+    # Soft-delete knowledge objects that are no longer extracted
+    current_ids = {node['id'] for node in nodes}
+    stale_ids = sorted(
+        node_id for node_id, (_, valid_to) in existing.items()
+        if node_id not in current_ids and valid_to is None
+    )
+    if stale_ids:
+        result = soft_delete_knowledge_objects(stale_ids)
+        if result['success']:
+            print(f"✅ Soft-deleted {len(stale_ids)} removed knowledge objects")
+        else:
+            errors += 1
+            print(f"  ❌ Error soft-deleting removed knowledge objects: {result['error']}")
 
     # Import relationships
     print("\nCreating U4_MEMBER_OF relationships...")
     rels_created = 0
 
     for i, rel in enumerate(relationships):
+        # Relationships between two unchanged nodes already exist
+        if rel['source'] not in changed_ids and rel['target'] not in changed_ids:
+            continue
+
         cypher = create_relationship(rel)
         result = execute_cypher(cypher)
 
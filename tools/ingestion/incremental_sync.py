@@ -0,0 +1,347 @@
+"""
+Incremental (git revision range) Sync for GraphCare
+
+Brings a graph that was fully ingested (graphcare ingest / falkordb_ingestor.py)
+up to date with a range of commits, touching only what the commits touched:
+
+    git diff --name-status base..head
+        added / modified / renamed-to   → re-extract (from `head`, not the work tree)
+        deleted / renamed-from          → retire their artifacts
+
+    1. Upsert artifacts of re-extracted files whose content_hash changed
+    2. Retire artifacts that are gone (soft-delete + drop their links, or --prune)
+    3. Re-link U4_CALLS:
+         - outgoing calls of changed functions whose call list changed
+         - calls from *any* function (including unchanged files) into functions
+           that are new in this range, resolved from the `calls` property stored
+           on each function artifact, so unchanged files are never re-extracted
+
+Artifact paths must be built the same way as the full ingest: pass the same
+repo_path string that was used for `graphcare ingest`.
+
+Functions ingested before `calls` was stored on artifacts are invisible as callers
+until the next full ingest (which rewrites them, since their content_hash changes).
+
+Latency is reported per phase, plus commit → graph (head commit timestamp to the
+moment the sync finished), which is what the "< 1h" real-time sync tier promises.
+
+Usage:
+    python3 tools/graphcare.py sync <repo_path> <base>..<head> --graph <graph> --scope <scope_ref>
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+import logging
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from tools.extractors.python_ast_extractor import PythonASTExtractor, file_result_to_dict
+from tools.ingestion.falkordb_ingestor import (
+    FunctionIndex,
+    artifact_content_hash,
+    build_artifact_properties,
+    class_artifact,
+    create_call_links_batch,
+    detach_artifact_links,
+    fetch_artifact_hashes,
+    fetch_function_calls,
+    find_stale_artifacts,
+    function_artifact,
+    get_falkordb_connection,
+    is_unchanged,
+    prune_stale_artifacts,
+    soft_delete_artifacts,
+    upsert_code_artifact_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class SyncError(Exception):
+    """Revision range cannot be resolved or diffed."""
+
+
+# ============================================================================
+# Git
+# ============================================================================
+
+def _git(repo_path: Path, *args: str) -> str:
+    try:
+        result = subprocess.run(
+            ["git", "-C", str(repo_path), *args],
+            check=True, capture_output=True, text=True
+        )
+    except FileNotFoundError:
+        raise SyncError("git not found on PATH")
+    except subprocess.CalledProcessError as e:
+        raise SyncError(f"git {' '.join(args)} failed: {e.stderr.strip()}")
+    return result.stdout
+
+
+def resolve_range(repo_path: Path, rev_range: str) -> Tuple[str, str]:
+    """
+    Resolve `base..head`, `base...head` (from the merge base) or `base` (up to HEAD)
+    to a pair of commit SHAs.
+    """
+    if "..." in rev_range:
+        base, head = rev_range.split("...", 1)
+        head = head or "HEAD"
+        base = _git(repo_path, "merge-base", base, head).strip()
+    elif ".." in rev_range:
+        base, head = rev_range.split("..", 1)
+        head = head or "HEAD"
+    else:
+        base, head = rev_range, "HEAD"
+
+    return (
+        _git(repo_path, "rev-parse", "--verify", f"{base}^{{commit}}").strip(),
+        _git(repo_path, "rev-parse", "--verify", f"{head}^{{commit}}").strip(),
+    )
+
+
+@dataclass
+class FileChanges:
+    """Files changed between two revisions, relative to repo_path."""
+    upserted: List[str] = field(default_factory=list)  # added, modified, renamed-to, copied
+    removed: List[str] = field(default_factory=list)   # deleted, renamed-from
+
+
+def changed_files(repo_path: Path, base: str, head: str, suffixes: Tuple[str, ...] = (".py",)) -> FileChanges:
+    """Source files changed in base..head (rename detection on), limited to repo_path."""
+    output = _git(repo_path, "diff", "--name-status", "-M", "--relative", "-z", base, head)
+    fields = output.split("\0")
+    changes = FileChanges()
+
+    i = 0
+    while i < len(fields) and fields[i]:
+        status = fields[i][0]
+        if status in ("R", "C"):
+            old_path, new_path = fields[i + 1], fields[i + 2]
+            i += 3
+            if status == "R" and old_path.endswith(suffixes):
+                changes.removed.append(old_path)
+            if new_path.endswith(suffixes):
+                changes.upserted.append(new_path)
+            continue
+
+        path = fields[i + 1]
+        i += 2
+        if not path.endswith(suffixes):
+            continue
+        if status == "D":
+            changes.removed.append(path)
+        else:  # A, M, T
+            changes.upserted.append(path)
+    return changes
+
+
+def commit_timestamp(repo_path: Path, rev: str) -> int:
+    """Committer timestamp of `rev` (epoch seconds)."""
+    return int(_git(repo_path, "log", "-1", "--format=%ct", rev).strip())
+
+
+def read_at_revision(repo_path: Path, rev: str, rel_path: str) -> str:
+    return _git(repo_path, "show", f"{rev}:./{rel_path}")
+
+
+# ============================================================================
+# Sync
+# ============================================================================
+
+@dataclass
+class SyncStats:
+    """Track incremental sync statistics and latency."""
+    base: str = ""
+    head: str = ""
+    files_upserted: int = 0
+    files_removed: int = 0
+    artifacts_written: int = 0
+    artifacts_unchanged: int = 0
+    artifacts_retired: int = 0
+    artifacts_pruned: int = 0
+    embeddings_generated: int = 0
+    calls_unlinked: int = 0
+    calls_linked: int = 0
+    errors: int = 0
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    sync_seconds: float = 0.0
+    commit_to_graph_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+
+def sync_revision_range(
+    repo_path: Path,
+    rev_range: str,
+    graph_name: str,
+    scope_ref: str,
+    language: str = "python",
+    generate_embeddings: bool = True,
+    falkordb_host: str = 'localhost',
+    falkordb_port: int = 6379,
+    prune: bool = False,
+    write_batch: int = 200,
+    embed_batch: int = 32
+) -> SyncStats:
+    """
+    Apply the source changes of a git revision range to an ingested graph.
+
+    Args:
+        repo_path: Repository root, exactly as passed to the full ingest
+        rev_range: `base..head`, `base...head` or `base` (= base..HEAD)
+        graph_name: FalkorDB graph name (e.g., "scopelock")
+        scope_ref: Client organization ID (e.g., "org_scopelock")
+        language: Programming language (only python has an extractor here)
+        generate_embeddings: Whether to generate semantic embeddings
+        falkordb_host: FalkorDB host
+        falkordb_port: FalkorDB port
+        prune: Hard-delete (and tombstone) removed artifacts instead of soft-deleting them
+        write_batch: Rows per UNWIND write
+        embed_batch: Texts per embedding batch
+
+    Returns:
+        SyncStats with counts, per-phase timings and commit → graph latency
+    """
+    started = time.monotonic()
+    stats = SyncStats()
+    phase_started = [started]
+
+    def end_phase(name: str) -> None:
+        now = time.monotonic()
+        stats.phase_seconds[name] = round(now - phase_started[0], 3)
+        phase_started[0] = now
+
+    # 1. What changed
+    base, head = resolve_range(repo_path, rev_range)
+    stats.base, stats.head = base, head
+    changes = changed_files(repo_path, base, head)
+    stats.files_upserted, stats.files_removed = len(changes.upserted), len(changes.removed)
+    logger.info(f"{base[:10]}..{head[:10]}: {len(changes.upserted)} files to re-extract, "
+                f"{len(changes.removed)} removed")
+    end_phase("diff")
+
+    graph = get_falkordb_connection(graph_name, host=falkordb_host, port=falkordb_port)
+    existing = fetch_artifact_hashes(graph, scope_ref)
+    graph_calls = fetch_function_calls(graph, scope_ref)
+    end_phase("fetch")
+
+    embedding_service = None
+    if generate_embeddings:
+        from services.embedding.embedding_service import get_embedding_service
+        embedding_service = get_embedding_service()
+
+    # 2. Re-extract changed files at `head`
+    affected_files = [str(repo_path / rel) for rel in changes.removed]
+    head_calls: Dict[str, List[str]] = {}  # function path → calls, for re-extracted files
+    live_paths = set()
+    pending: List[Dict[str, Any]] = []
+
+    for rel in changes.upserted:
+        file_key = str(repo_path / rel)
+        try:
+            source = read_at_revision(repo_path, head, rel)
+        except SyncError as e:
+            logger.warning(f"  ⚠️  Skipping {file_key}: {e}")
+            stats.errors += 1
+            continue
+        file_data = file_result_to_dict(PythonASTExtractor(Path(file_key), source).extract())
+        if file_data["parse_errors"]:
+            # Leave the file's artifacts as they are rather than retiring them
+            logger.warning(f"  ⚠️  Skipping {file_key} (parse errors): {file_data['parse_errors']}")
+            stats.errors += 1
+            continue
+        affected_files.append(file_key)
+
+        artifacts = [function_artifact(file_key, func) for func in file_data["functions"]]
+        for artifact, func in zip(artifacts, file_data["functions"]):
+            head_calls[artifact['path']] = func.get("calls", [])
+        artifacts += [class_artifact(file_key, cls) for cls in file_data["classes"]]
+
+        for artifact in artifacts:
+            live_paths.add(artifact['path'])
+            artifact['content_hash'] = artifact_content_hash(
+                artifact, scope_ref, language, embedding_service is not None
+            )
+            if is_unchanged(existing, artifact['path'], artifact['content_hash']):
+                stats.artifacts_unchanged += 1
+            else:
+                pending.append(artifact)
+    end_phase("extract")
+
+    if embedding_service and pending:
+        texts = [
+            embedding_service.code_artifact_text(a['snippet'], {
+                'path': a['path'], 'lang': language, 'description': a['description']
+            })
+            for a in pending
+        ]
+        for artifact, vector in zip(pending, embedding_service.embed_batch(texts, batch_size=embed_batch)):
+            artifact['embedding'] = vector
+        stats.embeddings_generated = len(pending)
+    end_phase("embed")
+
+    # 3. Upsert changed artifacts
+    for start in range(0, len(pending), write_batch):
+        chunk = pending[start:start + write_batch]
+        upsert_code_artifact_batch(graph, [
+            build_artifact_properties(
+                scope_ref=scope_ref, language=language, embedding=a.get('embedding'),
+                content_hash=a['content_hash'], **a['fields']
+            )
+            for a in chunk
+        ])
+        stats.artifacts_written += len(chunk)
+    end_phase("write")
+
+    # 4. Retire artifacts that no longer exist at `head`
+    stale = find_stale_artifacts(existing, affected_files, live_paths, include_retired=prune)
+    if prune:
+        stats.artifacts_pruned = prune_stale_artifacts(graph, scope_ref, stale)
+    else:
+        stats.calls_unlinked += detach_artifact_links(graph, stale, scope_ref=scope_ref)
+        stats.artifacts_retired = soft_delete_artifacts(graph, stale)
+    end_phase("retire")
+
+    # 5. Re-link U4_CALLS around the changed functions
+    def is_live(path: str) -> bool:
+        return path in existing and existing[path][1] is None
+
+    affected = set(affected_files)
+    callers = {path: calls for path, calls in graph_calls.items() if path.split("::", 1)[0] not in affected}
+    callers.update(head_calls)
+
+    function_index = FunctionIndex()
+    for path in callers:
+        function_index.add_path(path)
+
+    # Functions whose call list changed lose their old outgoing links and get all new ones
+    relinked = [path for path, calls in head_calls.items() if is_live(path) and graph_calls.get(path) != calls]
+    stats.calls_unlinked += detach_artifact_links(
+        graph, relinked, link_types=('U4_CALLS',), outgoing_only=True, scope_ref=scope_ref
+    )
+    relink_sources = set(relinked) | {path for path in head_calls if not is_live(path)}
+    # Functions that did not exist before: every caller of their name, in any file, links in
+    new_targets = {path for path in head_calls if not is_live(path)}
+
+    links = sorted({
+        (source_path, target_path)
+        for source_path, calls in callers.items()
+        for called in calls
+        for target_path in function_index.resolve(called)
+        if source_path in relink_sources or target_path in new_targets
+    })
+    for start in range(0, len(links), write_batch):
+        stats.calls_linked += create_call_links_batch(graph, links[start:start + write_batch])
+    end_phase("link")
+
+    stats.sync_seconds = round(time.monotonic() - started, 3)
+    stats.commit_to_graph_seconds = round(time.time() - commit_timestamp(repo_path, head), 3)
+    return stats
@@ -0,0 +1,540 @@
+"""
+Streaming Ingestion Pipeline for GraphCare
+
+Extract → embed → ingest in one process, without the intermediate extraction JSON:
+
+    discover ──▶ [extract ×N] ──▶ [embed ×M, batched] ──▶ [write ×K, batched] ──▶ link U4_CALLS
+
+Each stage runs on its own worker threads. Stages are connected by bounded queues,
+so a slow stage (usually embedding) pushes back on the stages before it instead of
+letting extracted artifacts pile up in memory. Batched stages take whatever is
+queued (up to their batch size), so batches grow as load does.
+
+AST parsing is CPU-bound and holds the GIL, so extract threads alone would not
+parse in parallel. With extract_workers > 1, each extract thread sends its file to
+a process pool of the same size (the worker entry point extract_repository uses)
+and only builds artifacts from the packed result. Embedding and DB writes wait on
+I/O and stay on threads.
+
+Per-stage metrics (items in/out, errors, busy time, throughput, queue depth) are
+collected in StageMetrics and reported at the end of the run.
+
+Usage:
+    python3 tools/graphcare.py ingest <repo_path> --graph <graph> --scope <scope_ref>
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+import logging
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent))
+
+from tools.extractors.python_ast_extractor import (
+    _extract_chunk,
+    _unpack_result,
+    extract_file,
+    file_result_to_dict,
+    open_extraction_cache,
+)
+from tools.ingestion.falkordb_ingestor import (
+    FunctionIndex,
+    IngestionStats,
+    artifact_content_hash,
+    build_artifact_properties,
+    class_artifact,
+    create_call_links_batch,
+    fetch_artifact_hashes,
+    find_stale_artifacts,
+    function_artifact,
+    function_path,
+    get_falkordb_connection,
+    is_unchanged,
+    prune_stale_artifacts,
+    soft_delete_artifacts,
+    upsert_code_artifact_batch,
+)
+
+logger = logging.getLogger(__name__)
+
+_END = object()  # end-of-stream marker, one per downstream worker
+
+
+# ============================================================================
+# Generic Streaming Pipeline
+# ============================================================================
+
+@dataclass
+class StageMetrics:
+    """Counters for one pipeline stage."""
+    name: str
+    workers: int
+    batch_size: int = 1
+    queue_capacity: int = 0
+    items_in: int = 0
+    items_out: int = 0
+    batches: int = 0
+    errors: int = 0
+    busy_seconds: float = 0.0
+    queue_depth_max: int = 0
+    queue_depth_sum: int = 0
+    queue_depth_samples: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Input items per second over the stage's lifetime."""
+        elapsed = self.elapsed_seconds
+        return self.items_in / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def queue_depth_avg(self) -> float:
+        if not self.queue_depth_samples:
+            return 0.0
+        return self.queue_depth_sum / self.queue_depth_samples
+
+    @property
+    def utilisation(self) -> float:
+        """Fraction of worker time spent processing (vs. waiting on queues)."""
+        capacity = self.elapsed_seconds * self.workers
+        return self.busy_seconds / capacity if capacity > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data.pop("started_at")
+        data.pop("finished_at")
+        data.update({
+            "elapsed_seconds": round(self.elapsed_seconds, 3),
+            "throughput_per_s": round(self.throughput, 2),
+            "queue_depth_avg": round(self.queue_depth_avg, 2),
+            "utilisation": round(self.utilisation, 3),
+            "busy_seconds": round(self.busy_seconds, 3),
+        })
+        return data
+
+
+@dataclass
+class Stage:
+    """
+    One pipeline stage.
+
+    `fn` receives one item (or a list of up to `batch_size` items when batch_size > 1)
+    and returns an iterable of output items for the next stage.
+    """
+    name: str
+    fn: Callable[[Any], Iterable[Any]]
+    workers: int = 1
+    batch_size: int = 1
+    queue_size: int = 256
+    linger_seconds: float = 0.05  # how long a batched stage waits to fill a batch
+
+
+class StreamingPipeline:
+    """
+    Runs `source` through `stages` concurrently with bounded queues between them.
+
+    Stage errors are logged and counted, never fatal: the failing item (or batch)
+    is dropped and the stage carries on.
+    """
+
+    def __init__(
+        self,
+        source: Iterable[Any],
+        stages: List[Stage],
+        sample_interval: float = 0.5,
+        on_sample: Optional[Callable[[Dict[str, StageMetrics]], None]] = None
+    ):
+        self.source = source
+        self.stages = stages
+        self.sample_interval = sample_interval
+        self.on_sample = on_sample
+
+        self.queues = [queue.Queue(maxsize=stage.queue_size) for stage in stages]
+        self.metrics: Dict[str, StageMetrics] = {"discover": StageMetrics(name="discover", workers=1)}
+        for stage, q in zip(stages, self.queues):
+            self.metrics[stage.name] = StageMetrics(
+                name=stage.name, workers=stage.workers,
+                batch_size=stage.batch_size, queue_capacity=q.maxsize
+            )
+
+        self._locks = {name: threading.Lock() for name in self.metrics}
+        self._remaining = [stage.workers for stage in stages]
+        self._remaining_lock = threading.Lock()
+        self._source_error: Optional[BaseException] = None
+
+    # ------------------------------------------------------------------------
+
+    def _feed(self) -> None:
+        metrics = self.metrics["discover"]
+        metrics.started_at = time.monotonic()
+        try:
+            for item in self.source:
+                metrics.items_in += 1
+                metrics.items_out += 1
+                self.queues[0].put(item)
+        except BaseException as e:  # re-raised from run()
+            self._source_error = e
+        finally:
+            metrics.finished_at = time.monotonic()
+            for _ in range(self.stages[0].workers):
+                self.queues[0].put(_END)
+
+    def _next_batch(self, index: int) -> Tuple[List[Any], bool]:
+        """Block for one item, then take what arrives within the linger window."""
+        stage, q = self.stages[index], self.queues[index]
+        first = q.get()
+        if first is _END:
+            return [], True
+
+        batch = [first]
+        deadline = time.monotonic() + stage.linger_seconds
+        while len(batch) < stage.batch_size:
+            try:
+                item = q.get(timeout=max(0.0, deadline - time.monotonic()))
+            except queue.Empty:
+                break
+            if item is _END:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _work(self, index: int) -> None:
+        stage = self.stages[index]
+        metrics, lock = self.metrics[stage.name], self._locks[stage.name]
+        q = self.queues[index]
+        out_q = self.queues[index + 1] if index + 1 < len(self.queues) else None
+
+        with lock:
+            if metrics.started_at is None:
+                metrics.started_at = time.monotonic()
+
+        finished = False
+        while not finished:
+            depth = q.qsize()
+            if stage.batch_size > 1:
+                batch, finished = self._next_batch(index)
+                if not batch:
+                    break
+                arg = batch
+            else:
+                item = q.get()
+                if item is _END:
+                    break
+                batch, arg = [item], item
+
+            with lock:
+                metrics.items_in += len(batch)
+                metrics.batches += 1
+                metrics.queue_depth_sum += depth
+                metrics.queue_depth_samples += 1
+                metrics.queue_depth_max = max(metrics.queue_depth_max, depth)
+
+            started = time.monotonic()
+            produced = 0
+            try:
+                # Outputs are forwarded as they are produced; a full out_q blocks here (backpressure)
+                for output in stage.fn(arg):
+                    produced += 1
+                    if out_q is not None:
+                        out_q.put(output)
+            except Exception as e:
+                logger.error(f"[{stage.name}] failed on {len(batch)} item(s): {e}")
+                with lock:
+                    metrics.errors += 1
+            finally:
+                with lock:
+                    metrics.items_out += produced
+                    metrics.busy_seconds += time.monotonic() - started
+
+        # Last worker out signals the next stage
+        with self._remaining_lock:
+            self._remaining[index] -= 1
+            last = self._remaining[index] == 0
+        if last:
+            metrics.finished_at = time.monotonic()
+            if out_q is not None:
+                for _ in range(self.stages[index + 1].workers):
+                    out_q.put(_END)
+
+    def _monitor(self, stop: threading.Event) -> None:
+        while not stop.wait(self.sample_interval):
+            if self.on_sample:
+                self.on_sample(self.metrics)
+
+    def queue_depths(self) -> Dict[str, int]:
+        return {stage.name: q.qsize() for stage, q in zip(self.stages, self.queues)}
+
+    def run(self) -> Dict[str, StageMetrics]:
+        """Run to completion and return per-stage metrics."""
+        threads = [threading.Thread(target=self._feed, name="discover", daemon=True)]
+        for index, stage in enumerate(self.stages):
+            for n in range(stage.workers):
+                threads.append(threading.Thread(
+                    target=self._work, args=(index,), name=f"{stage.name}-{n}", daemon=True
+                ))
+
+        stop = threading.Event()
+        monitor = threading.Thread(target=self._monitor, args=(stop,), name="monitor", daemon=True)
+
+        for thread in threads:
+            thread.start()
+        monitor.start()
+        for thread in threads:
+            thread.join()
+        stop.set()
+        monitor.join()
+
+        if self._source_error is not None:
+            raise self._source_error
+        return self.metrics
+
+
+# ============================================================================
+# Ingestion Stages
+# ============================================================================
+
+def discover_files(repo_path: Path, pattern: str = "**/*.py") -> Iterator[Path]:
+    """Lazily yield source files (same selection as extract_repository)."""
+    for file_path in repo_path.glob(pattern):
+        if file_path.is_file():
+            yield file_path
+
+
+def pattern_scope(repo_path: Path, pattern: str = "**/*.py") -> Tuple[str, Tuple[str, ...]]:
+    """
+    (root, suffixes) of the files discover_files can yield, for find_stale_artifacts.
+
+    The root is repo_path plus the pattern's literal leading directories; the
+    suffix is the pattern's (none for patterns like "**/*").
+    """
+    root = repo_path
+    for part in Path(pattern).parts[:-1]:
+        if any(char in part for char in "*?["):
+            break
+        root = root / part
+    return str(root), (Path(pattern).suffix,)
+
+
+def run_ingest_pipeline(
+    repo_path: Path,
+    graph_name: str,
+    scope_ref: str,
+    language: str = "python",
+    generate_embeddings: bool = True,
+    falkordb_host: str = 'localhost',
+    falkordb_port: int = 6379,
+    pattern: str = "**/*.py",
+    extract_workers: int = 4,
+    embed_workers: int = 1,
+    embed_batch: int = 32,
+    write_workers: int = 2,
+    write_batch: int = 200,
+    queue_size: int = 256,
+    prune: bool = False,
+    on_sample: Optional[Callable[[Dict[str, StageMetrics]], None]] = None,
+    cache_dir: Optional[Path] = None
+) -> Tuple[IngestionStats, Dict[str, StageMetrics]]:
+    """
+    Extract, embed and ingest a repository in one streaming pass.
+
+    Produces the same U4_Code_Artifact nodes and U4_CALLS links as running
+    python_ast_extractor.py followed by falkordb_ingestor.py, including the
+    content_hash skip: unchanged artifacts are dropped right after extraction,
+    before they reach the embedding stage. With a cache_dir, files extracted
+    before (same content, same extractor version) are not re-parsed either.
+
+    Returns:
+        (IngestionStats, per-stage metrics)
+    """
+    stats = IngestionStats()
+    stats_lock = threading.Lock()
+    graph = get_falkordb_connection(graph_name, host=falkordb_host, port=falkordb_port)
+    existing = fetch_artifact_hashes(graph, scope_ref)
+
+    extraction_cache = open_extraction_cache(cache_dir) if cache_dir else None
+
+    function_index = FunctionIndex()
+    all_calls: List[Tuple[str, List[str]]] = []  # (source_path, called names)
+    live_paths = set()
+    changed_paths = set()
+    parsed_files: List[str] = []
+    # Every discovered file, parse errors included: other files under the pattern were deleted
+    extracted_files: List[str] = []
+    index_lock = threading.Lock()
+
+    embedding_service = None
+    if generate_embeddings:
+        from services.embedding.embedding_service import get_embedding_service
+        logger.info("Initializing embedding service...")
+        embedding_service = get_embedding_service()
+
+    # Parsing runs in worker processes; extract threads just wait on them and build artifacts
+    executor = ProcessPoolExecutor(max_workers=extract_workers) if extract_workers > 1 else None
+
+    def extract(file_path: Path) -> Iterator[Dict[str, Any]]:
+        file_key = str(file_path)
+        with index_lock:
+            extracted_files.append(file_key)
+        if executor is not None:
+            [(packed, _)] = executor.submit(
+                _extract_chunk, [file_key], str(cache_dir) if cache_dir else None
+            ).result()
+            file_data = file_result_to_dict(_unpack_result(packed, file_key))
+        else:
+            file_data = file_result_to_dict(extract_file(file_path, extraction_cache))
+        if file_data["parse_errors"]:
+            logger.warning(f"  ⚠️  Skipping {file_key} (parse errors): {file_data['parse_errors']}")
+            with stats_lock:
+                stats.errors += 1
+            return
+
+        artifacts = []
+        for func in file_data["functions"]:
+            artifact = function_artifact(file_key, func)
+            artifact['kind'] = 'function'
+            artifacts.append(artifact)
+        for cls in file_data["classes"]:
+            artifact = class_artifact(file_key, cls)
+            artifact['kind'] = 'class'
+            artifacts.append(artifact)
+
+        with index_lock:
+            parsed_files.append(file_key)
+            for func in file_data["functions"]:
+                function_index.add(file_key, func)
+                all_calls.append((function_path(file_key, func), func.get("calls", [])))
+            live_paths.update(a['path'] for a in artifacts)
+
+        unchanged = 0
+        for artifact in artifacts:
+            artifact['content_hash'] = artifact_content_hash(
+                artifact, scope_ref, language, embedding_service is not None
+            )
+            if is_unchanged(existing, artifact['path'], artifact['content_hash']):
+                unchanged += 1
+                continue
+            yield artifact
+        with stats_lock:
+            stats.artifacts_unchanged += unchanged
+
+    def embed(batch: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        texts = [
+            embedding_service.code_artifact_text(a['snippet'], {
+                'path': a['path'], 'lang': language, 'description': a['description']
+            })
+            for a in batch
+        ]
+        for artifact, vector in zip(batch, embedding_service.embed_batch(texts, batch_size=embed_batch)):
+            artifact['embedding'] = vector
+            yield artifact
+        with stats_lock:
+            stats.embeddings_generated += len(batch)
+
+    def write(batch: List[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        properties = [
+            build_artifact_properties(
+                scope_ref=scope_ref, language=language, embedding=a.get('embedding'),
+                content_hash=a['content_hash'], **a['fields']
+            )
+            for a in batch
+        ]
+        try:
+            upsert_code_artifact_batch(graph, properties)
+        except Exception:
+            with stats_lock:
+                stats.errors += len(batch)
+            raise
+
+        functions = [a for a in batch if a['kind'] == 'function']
+        with stats_lock:
+            stats.functions_ingested += len(functions)
+            stats.classes_ingested += len(batch) - len(functions)
+        with index_lock:
+            changed_paths.update(a['path'] for a in batch)
+        return iter(())
+
+    stages = [Stage("extract", extract, workers=extract_workers, queue_size=queue_size)]
+    if embedding_service:
+        stages.append(Stage("embed", embed, workers=embed_workers, batch_size=embed_batch, queue_size=queue_size))
+    stages.append(Stage("write", write, workers=write_workers, batch_size=write_batch, queue_size=queue_size))
+
+    pipeline = StreamingPipeline(discover_files(repo_path, pattern), stages, on_sample=on_sample)
+    try:
+        metrics = pipeline.run()
+    finally:
+        if executor is not None:
+            executor.shutdown()
+    if extraction_cache is not None:
+        extraction_cache.cleanup()
+
+    # U4_CALLS needs every function in the index, so it runs once the stream has drained
+    link_metrics = StageMetrics(name="link", workers=1, batch_size=write_batch)
+    link_metrics.started_at = time.monotonic()
+    # Links between two unchanged artifacts already exist
+    links = [
+        (source_path, target_path)
+        for source_path, calls in all_calls
+        for called in calls
+        for target_path in function_index.resolve(called)
+        if source_path in changed_paths or target_path in changed_paths
+    ]
+    link_metrics.items_in = len(links)
+    for start in range(0, len(links), write_batch):
+        chunk = links[start:start + write_batch]
+        link_metrics.batches += 1
+        try:
+            linked = create_call_links_batch(graph, chunk)
+            stats.calls_linked += linked
+            link_metrics.items_out += linked
+        except Exception as e:
+            logger.warning(f"Failed to create {len(chunk)} U4_CALLS links: {e}")
+            link_metrics.errors += 1
+    link_metrics.finished_at = time.monotonic()
+    link_metrics.busy_seconds = link_metrics.elapsed_seconds
+    metrics["link"] = link_metrics
+
+    root, suffixes = pattern_scope(repo_path, pattern)
+    if prune:
+        stale = find_stale_artifacts(
+            existing, parsed_files, live_paths, include_retired=True,
+            root=root, extracted_files=extracted_files, suffixes=suffixes
+        )
+        stats.artifacts_pruned = prune_stale_artifacts(graph, scope_ref, stale)
+    else:
+        stats.artifacts_retired = soft_delete_artifacts(
+            graph, find_stale_artifacts(
+                existing, parsed_files, live_paths,
+                root=root, extracted_files=extracted_files, suffixes=suffixes
+            )
+        )
+
+    return stats, metrics
+
+
+def format_metrics_table(metrics: Dict[str, StageMetrics]) -> str:
+    """Human-readable per-stage summary."""
+    lines = [
+        f"  {'stage':<10} {'workers':>7} {'in':>8} {'out':>8} {'err':>5} "
+        f"{'items/s':>9} {'busy':>6} {'q avg':>7} {'q max':>6}"
+    ]
+    for m in metrics.values():
+        lines.append(
+            f"  {m.name:<10} {m.workers:>7} {m.items_in:>8} {m.items_out:>8} {m.errors:>5} "
+            f"{m.throughput:>9.1f} {m.utilisation:>6.0%} {m.queue_depth_avg:>7.1f} {m.queue_depth_max:>6}"
+        )
+    return "\n".join(lines)
@@ -12,15 +12,22 @@ import sys
 from pathlib import Path
 from typing import Dict, List, Any, Optional
 from dataclasses import dataclass
-from datetime import datetime
 import logging
 
 sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 from services.embedding.embedding_service import get_embedding_service
+from tools.extractors.extraction_stream import iter_extraction_files, read_extraction_meta
+from tools.graph_delta import now_ms
+from tools.ingestion.falkordb_ingestor import (
+    content_hash, fetch_artifact_hashes, find_stale_artifacts, is_unchanged, soft_delete_artifacts
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Sources the TypeScript extractor covers (a file with one of these missing from a full extraction was deleted)
+TS_SUFFIXES = (".ts", ".tsx", ".js", ".jsx")
+
 
 def get_falkordb_connection(graph_name: str):
     """Get FalkorDB graph connection."""
@@ -47,10 +54,11 @@ def create_typescript_artifact_node(
     language: str,
     artifact_type: str,
     embedding: Optional[List[float]] = None,
-    extra_properties: Optional[Dict[str, Any]] = None
+    extra_properties: Optional[Dict[str, Any]] = None,
+    content_hash: Optional[str] = None
 ) -> str:
     """Create U4_Code_Artifact node for TypeScript code."""
-    now = int(datetime.utcnow().timestamp() * 1000)
+    now = now_ms()
 
     properties = {
         'name': name,
@@ -71,6 +79,9 @@ def create_typescript_artifact_node(
         properties['embedding'] = json.dumps(embedding)
         properties['embedding_dim'] = len(embedding)
 
+    if content_hash:
+        properties['content_hash'] = content_hash
+
     if extra_properties:
         properties.update(extra_properties)
 
@@ -89,10 +100,13 @@ def create_typescript_artifact_node(
         artifact.visibility = $visibility,
         artifact.artifact_type = $artifact_type
     ON MATCH SET
-        artifact.updated_at = $updated_at
+        artifact.updated_at = $updated_at,
+        artifact.valid_to = null
     """
 
-    optional_props = ['embedding', 'embedding_dim', 'is_async', 'is_exported', 'body_lines', 'function_type']
+    optional_props = [
+        'embedding', 'embedding_dim', 'is_async', 'is_exported', 'body_lines', 'function_type', 'content_hash'
+    ]
     for prop in optional_props:
         if prop in properties:
             cypher += f",\n        artifact.{prop} = ${prop}"
@@ -116,6 +130,8 @@ class TSIngestionStats:
     components_ingested: int = 0
     classes_ingested: int = 0
     embeddings_generated: int = 0
+    artifacts_unchanged: int = 0
+    artifacts_retired: int = 0
     errors: int = 0
 
 
@@ -130,7 +146,8 @@ def ingest_typescript_results(
     Ingest TypeScript extraction results into FalkorDB.
 
     Args:
-        extraction_json_path: Path to extraction JSON from typescript_extractor.py
+        extraction_json_path: Path to extraction output from typescript_extractor.py
+            (JSONL, read one file at a time, or legacy JSON)
         graph_name: FalkorDB graph name
         scope_ref: Client organization ID
         language: Programming language (typescript, javascript)
@@ -141,8 +158,7 @@ def ingest_typescript_results(
     """
     stats = TSIngestionStats()
 
-    logger.info(f"Loading extraction results from: {extraction_json_path}")
-    extraction_data = json.loads(extraction_json_path.read_text(encoding="utf-8"))
+    logger.info(f"Reading extraction results from: {extraction_json_path}")
 
     graph = get_falkordb_connection(graph_name)
 
@@ -151,13 +167,35 @@ def ingest_typescript_results(
         logger.info("Initializing embedding service...")
         embedding_service = get_embedding_service()
 
-    for file_path, file_data in extraction_data["files"].items():
+    # One read up front; unchanged artifacts skip embedding and writes
+    existing = fetch_artifact_hashes(graph, scope_ref)
+    live_paths = set()
+    parsed_files = []
+    # Every file in the extraction: artifacts of other source files under the repo were deleted
+    extracted_files = []
+    repo_root = read_extraction_meta(extraction_json_path)["repo_path"]
+
+    def artifact_hash(artifact_path, description, code_snippet, artifact_type, extra_properties):
+        return content_hash({
+            'path': artifact_path,
+            'description': description,
+            'snippet': code_snippet,
+            'artifact_type': artifact_type,
+            'extra_properties': extra_properties,
+            'scope_ref': scope_ref,
+            'language': language,
+            'embedded': embedding_service is not None
+        })
+
+    for file_path, file_data in iter_extraction_files(extraction_json_path):
         logger.info(f"\nProcessing: {file_path}")
+        extracted_files.append(file_path)
 
         if file_data.get("parse_errors"):
             logger.warning(f"  ⚠️  Skipping (parse errors): {file_data['parse_errors']}")
             stats.errors += 1
             continue
+        parsed_files.append(file_path)
 
         # Ingest functions
         for func in file_data["functions"]:
@@ -170,12 +208,26 @@ def ingest_typescript_results(
                 if return_type:
                     description += f" -> {return_type}"
 
+                code_snippet = f"function {func['name']}({params})"
+                if return_type:
+                    code_snippet += f": {return_type}"
+
+                extra_properties = {
+                    'is_async': func.get('is_async', False),
+                    'is_exported': func.get('is_exported', False),
+                    'body_lines': func.get('body_lines', 0),
+                    'function_type': func.get('function_type', 'function'),
+                    'parameters': json.dumps(func.get('parameters', []))
+                }
+
+                live_paths.add(artifact_path)
+                hash_ = artifact_hash(artifact_path, description, code_snippet, "function", extra_properties)
+                if is_unchanged(existing, artifact_path, hash_):
+                    stats.artifacts_unchanged += 1
+                    continue
+
                 embedding = None
                 if embedding_service:
-                    code_snippet = f"function {func['name']}({params})"
-                    if return_type:
-                        code_snippet += f": {return_type}"
-
                     metadata = {
                         'path': artifact_path,
                         'lang': language,
@@ -194,13 +246,8 @@ def ingest_typescript_results(
                     language=language,
                     artifact_type="function",
                     embedding=embedding,
-                    extra_properties={
-                        'is_async': func.get('is_async', False),
-                        'is_exported': func.get('is_exported', False),
-                        'body_lines': func.get('body_lines', 0),
-                        'function_type': func.get('function_type', 'function'),
-                        'parameters': json.dumps(func.get('parameters', []))
-                    }
+                    extra_properties=extra_properties,
+                    content_hash=hash_
                 )
 
                 stats.functions_ingested += 1
@@ -219,12 +266,24 @@ def ingest_typescript_results(
                 if comp.get('props_type'):
                     description += f" (props: {comp['props_type']})"
 
+                code_snippet = f"React component {comp['name']}"
+                if comp.get('props_type'):
+                    code_snippet += f" with props: {comp['props_type']}"
+
+                extra_properties = {
+                    'component_type': comp['component_type'],
+                    'is_exported': comp.get('is_exported', False),
+                    'is_default_export': comp.get('is_default_export', False)
+                }
+
+                live_paths.add(artifact_path)
+                hash_ = artifact_hash(artifact_path, description, code_snippet, "component", extra_properties)
+                if is_unchanged(existing, artifact_path, hash_):
+                    stats.artifacts_unchanged += 1
+                    continue
+
                 embedding = None
                 if embedding_service:
-                    code_snippet = f"React component {comp['name']}"
-                    if comp.get('props_type'):
-                        code_snippet += f" with props: {comp['props_type']}"
-
                     metadata = {
                         'path': artifact_path,
                         'lang': language,
@@ -243,11 +302,8 @@ def ingest_typescript_results(
                     language=language,
                     artifact_type="component",
                     embedding=embedding,
-                    extra_properties={
-                        'component_type': comp['component_type'],
-                        'is_exported': comp.get('is_exported', False),
-                        'is_default_export': comp.get('is_default_export', False)
-                    }
+                    extra_properties=extra_properties,
+                    content_hash=hash_
                 )
 
                 stats.components_ingested += 1
@@ -266,12 +322,24 @@ def ingest_typescript_results(
                 if cls.get('extends'):
                     description += f" extends {cls['extends']}"
 
+                code_snippet = f"class {cls['name']}"
+                if cls.get('extends'):
+                    code_snippet += f" extends {cls['extends']}"
+
+                extra_properties = {
+                    'extends': cls.get('extends', ''),
+                    'implements': json.dumps(cls.get('implements', [])),
+                    'is_exported': cls.get('is_exported', False)
+                }
+
+                live_paths.add(artifact_path)
+                hash_ = artifact_hash(artifact_path, description, code_snippet, "class", extra_properties)
+                if is_unchanged(existing, artifact_path, hash_):
+                    stats.artifacts_unchanged += 1
+                    continue
+
                 embedding = None
                 if embedding_service:
-                    code_snippet = f"class {cls['name']}"
-                    if cls.get('extends'):
-                        code_snippet += f" extends {cls['extends']}"
-
                     metadata = {
                         'path': artifact_path,
                         'lang': language,
@@ -290,11 +358,8 @@ def ingest_typescript_results(
                     language=language,
                     artifact_type="class",
                     embedding=embedding,
-                    extra_properties={
-                        'extends': cls.get('extends', ''),
-                        'implements': json.dumps(cls.get('implements', [])),
-                        'is_exported': cls.get('is_exported', False)
-                    }
+                    extra_properties=extra_properties,
+                    content_hash=hash_
                 )
 
                 stats.classes_ingested += 1
@@ -304,6 +369,14 @@ def ingest_typescript_results(
                 logger.error(f"  ❌ Failed to ingest class {cls['name']}: {e}")
                 stats.errors += 1
 
+    # Soft-delete artifacts that disappeared from re-extracted files or with their file
+    stats.artifacts_retired = soft_delete_artifacts(
+        graph, find_stale_artifacts(
+            existing, parsed_files, live_paths,
+            root=repo_root, extracted_files=extracted_files, suffixes=TS_SUFFIXES
+        )
+    )
+
     return stats
 
 
@@ -311,7 +384,7 @@ if __name__ == "__main__":
     import argparse
 
     parser = argparse.ArgumentParser(description="Ingest TypeScript extraction results into FalkorDB")
-    parser.add_argument("extraction_json", type=Path, help="Path to extraction JSON file")
+    parser.add_argument("extraction_json", type=Path, help="Path to extraction output (JSONL or legacy JSON)")
     parser.add_argument("--graph", required=True, help="FalkorDB graph name")
     parser.add_argument("--scope", required=True, help="Client scope ref")
     parser.add_argument("--language", default="typescript", help="Programming language")
@@ -343,5 +416,7 @@ if __name__ == "__main__":
     print(f"  Components ingested: {stats.components_ingested}")
     print(f"  Classes ingested: {stats.classes_ingested}")
     print(f"  Embeddings generated: {stats.embeddings_generated}")
+    print(f"  Unchanged (skipped): {stats.artifacts_unchanged}")
+    print(f"  Removed artifacts soft-deleted: {stats.artifacts_retired}")
     print(f"  Errors: {stats.errors}")
     print("\n✅ Ingestion complete!")
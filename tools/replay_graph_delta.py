@@ -0,0 +1,234 @@
+#!/usr/bin/env python3
+"""
+Replay graph deltas onto a FalkorDB graph, in order, idempotently
+
+Accepts both delta formats:
+    <file>.cypher   written by export_graph_cypher.py --since
+    <dir>/          written by export_graph_bulk.py --since (JSONL + manifest)
+
+Deltas are sorted by their [since, until) window. The target graph remembers how far
+it has been brought up to date (a U4_Replay_State node per source graph), so:
+    - deltas that end at or before that point are skipped (already applied)
+    - a delta starting after that point is refused, since changes would be missing
+      (override with --allow-gap)
+Every delta statement is a MERGE upsert or a delete, so re-applying one is harmless.
+
+Usage:
+    python3 replay_graph_delta.py <graph_name> <delta> [<delta> ...] [--allow-gap]
+
+Example:
+    python3 replay_graph_delta.py scopelock_replica deltas/scopelock_*.cypher
+
+Author: Kai (Chief Engineer, GraphCare)
+Created: 2026-10-19
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from export_graph_cypher import DELTA_HEADER
+from graph_delta import REPLAY_STATE_LABEL, node_ref, tombstone_refs
+from import_graph_bulk import (
+    SnapshotError, _labels_clause, _load_bucketed, _quote, _read_jsonl, load_manifest, verify_snapshot,
+)
+
+
+class DeltaError(Exception):
+    """Delta file is not a delta, or deltas cannot be applied in sequence."""
+
+
+# ============================================================================
+# Delta Discovery
+# ============================================================================
+
+def load_delta(path: Path) -> dict:
+    """Read a delta's header: {"path", "format", "graph", "since", "until"}."""
+    if path.is_dir():
+        try:
+            manifest = load_manifest(path)
+        except SnapshotError as e:
+            raise DeltaError(str(e))
+        if "delta" not in manifest:
+            raise DeltaError(f"{path} is a full snapshot, not a delta (restore it with import_graph_bulk.py)")
+        return {"path": path, "format": "bulk", "graph": manifest["graph"], **manifest["delta"]}
+
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.startswith(DELTA_HEADER):
+                header = json.loads(line[len(DELTA_HEADER):])
+                return {"path": path, "format": "cypher", **header}
+            if line.strip() and not line.startswith("//"):
+                break
+    raise DeltaError(f"{path} has no '{DELTA_HEADER}' header (not written with --since)")
+
+
+# ============================================================================
+# Replay State
+# ============================================================================
+
+def get_watermark(graph, source_graph: str) -> Optional[int]:
+    result = graph.query(
+        f"MATCH (s:{REPLAY_STATE_LABEL} {{source: $source}}) RETURN s.applied_until",
+        {"source": source_graph},
+    )
+    return result.result_set[0][0] if result.result_set else None
+
+
+def set_watermark(graph, source_graph: str, until: int) -> None:
+    graph.query(
+        f"MERGE (s:{REPLAY_STATE_LABEL} {{source: $source}}) SET s.applied_until = $until",
+        {"source": source_graph, "until": until},
+    )
+
+
+# ============================================================================
+# Appliers
+# ============================================================================
+
+def apply_cypher_delta(graph, path: Path) -> int:
+    """Run each statement of a Cypher delta (one statement per \\n-terminated line)."""
+    statements = 0
+    # Only \n ends a statement: a raw U+2028 etc. may sit inside a string literal
+    with open(path, encoding="utf-8", newline="\n") as f:
+        for line in f:
+            line = line.strip()
+            if not line or line.startswith("//"):
+                continue
+            graph.query(line.rstrip(";"))
+            statements += 1
+    return statements
+
+
+def _match_ref(var: str, labels: List[str], key: str, param: str) -> str:
+    labels_str = _labels_clause(":".join(labels)) if labels else ""
+    return f"({var}{labels_str} {{{_quote(key)}: {param}}})"
+
+
+def apply_bulk_delta(graph, delta_dir: Path, batch_size: int = 1000) -> int:
+    """Apply a JSONL delta: tombstones first, then batched UNWIND ... MERGE upserts."""
+    manifest = load_manifest(delta_dir)
+    verify_snapshot(delta_dir, manifest, "jsonl")
+    applied = 0
+
+    tombstones_path = delta_dir / "tombstones.jsonl"
+    if tombstones_path.exists():
+        for tombstone in _read_jsonl(tombstones_path):
+            ref, rel_type, target_ref = tombstone_refs(tombstone)
+            if rel_type:
+                cypher = (f"MATCH {_match_ref('s', ref['labels'], ref['key'], '$src')}"
+                          f"-[r:{_quote(rel_type)}]->"
+                          f"{_match_ref('t', target_ref['labels'], target_ref['key'], '$dst')} DELETE r")
+                graph.query(cypher, {"src": ref["value"], "dst": target_ref["value"]})
+            else:
+                cypher = f"MATCH {_match_ref('n', ref['labels'], ref['key'], '$value')} DETACH DELETE n"
+                graph.query(cypher, {"value": ref["value"]})
+            applied += 1
+
+    def node_group(record):
+        ref = node_ref(record["labels"], record["properties"])
+        return (tuple(ref["labels"]), ref["key"]) if ref else None
+
+    def merge_nodes(group, batch: List[dict]) -> None:
+        labels, key = group
+        graph.query(
+            f"UNWIND $rows AS row MERGE {_match_ref('n', list(labels), key, 'row.value')} SET n += row.props",
+            {"rows": [{"value": r["properties"][key], "props": r["properties"]} for r in batch]},
+        )
+
+    applied += _load_bucketed(_read_jsonl(delta_dir / "nodes.jsonl"), node_group, merge_nodes, batch_size)
+
+    def edge_group(record):
+        src, dst = record.get("src_ref"), record.get("dst_ref")
+        if not src or not dst:
+            return None
+        return (record["type"], tuple(src["labels"]), src["key"], tuple(dst["labels"]), dst["key"])
+
+    def merge_edges(group, batch: List[dict]) -> None:
+        rel_type, src_labels, src_key, dst_labels, dst_key = group
+        graph.query(
+            f"UNWIND $rows AS row "
+            f"MATCH {_match_ref('s', list(src_labels), src_key, 'row.src')} "
+            f"MATCH {_match_ref('t', list(dst_labels), dst_key, 'row.dst')} "
+            f"MERGE (s)-[r:{_quote(rel_type)}]->(t) SET r += row.props",
+            {"rows": [{"src": r["src_ref"]["value"], "dst": r["dst_ref"]["value"],
+                       "props": r["properties"]} for r in batch]},
+        )
+
+    applied += _load_bucketed(_read_jsonl(delta_dir / "edges.jsonl"), edge_group, merge_edges, batch_size)
+    return applied
+
+
+# ============================================================================
+# Replay
+# ============================================================================
+
+def replay_deltas(graph_name: str, delta_paths: List[Path], host: str = "localhost",
+                  port: int = 6379, allow_gap: bool = False, batch_size: int = 1000) -> Dict[str, int]:
+    """Apply deltas oldest-first, skipping those already applied to the target graph."""
+    from falkordb import FalkorDB
+
+    deltas = sorted((load_delta(p) for p in delta_paths), key=lambda d: (d["since"], d["until"]))
+    sources = {d["graph"] for d in deltas}
+    if len(sources) > 1:
+        raise DeltaError(f"Deltas come from different graphs: {sorted(sources)}")
+
+    graph = FalkorDB(host=host, port=port).select_graph(graph_name)
+    summary = {"applied": 0, "skipped": 0, "statements": 0}
+    if not deltas:
+        return summary
+
+    source = deltas[0]["graph"]
+    watermark = get_watermark(graph, source)
+    if watermark is None:
+        print(f"⚠️  No replay state for {source} on {graph_name}; assuming it is current as of the first delta")
+
+    for delta in deltas:
+        name = delta["path"].name
+        if watermark is not None and delta["until"] <= watermark:
+            print(f"  ↷ {name}: already applied (until {delta['until']} <= {watermark})")
+            summary["skipped"] += 1
+            continue
+        if watermark is not None and delta["since"] > watermark and not allow_gap:
+            raise DeltaError(
+                f"{name} starts at {delta['since']} but {graph_name} is only current to {watermark}; "
+                "an intermediate delta is missing (use --allow-gap to apply anyway)"
+            )
+
+        if delta["format"] == "bulk":
+            count = apply_bulk_delta(graph, delta["path"], batch_size)
+        else:
+            count = apply_cypher_delta(graph, delta["path"])
+
+        watermark = max(watermark or 0, delta["until"])
+        set_watermark(graph, source, watermark)
+        summary["applied"] += 1
+        summary["statements"] += count
+        print(f"  ✓ {name}: {count} changes (now current to {watermark})")
+
+    return summary
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Replay graph deltas in order")
+    parser.add_argument("graph_name", help="Target FalkorDB graph name")
+    parser.add_argument("deltas", type=Path, nargs="+", help="Delta .cypher files or bulk delta directories")
+    parser.add_argument("--allow-gap", action="store_true", help="Apply deltas even if one appears to be missing")
+    parser.add_argument("--host", default="localhost", help="FalkorDB host (default: localhost)")
+    parser.add_argument("--port", type=int, default=6379, help="FalkorDB port (default: 6379)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per UNWIND query (bulk deltas)")
+    args = parser.parse_args()
+
+    print(f"Replaying {len(args.deltas)} deltas onto {args.graph_name}...")
+    try:
+        summary = replay_deltas(args.graph_name, args.deltas, args.host, args.port,
+                                args.allow_gap, args.batch_size)
+    except (DeltaError, SnapshotError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"\n✅ Replay complete: {summary['applied']} applied, {summary['skipped']} skipped")